@@ -8,3 +8,11 @@ s += "####################################################################"
 s += cr
 
 print(s)
+
+
+def warmup(cache_dir=None, modules=None, verbose=True):
+    """ Compile the Numba kernels of the library into the Numba cache so that
+    later processes can load them. See financepy.utils.jit_warmup.warmup. It
+    can also be run as "python -m financepy warmup --cache-dir DIR". """
+    from .utils.jit_warmup import warmup as _warmup
+    return _warmup(cache_dir, modules, verbose)
@@ -0,0 +1,47 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+# Command line tools. For example to compile all of the Numba kernels into a
+# cache directory that is shipped with a deployment
+#
+#   python -m financepy warmup --cache-dir /opt/financepy/numba_cache
+#
+# and then set NUMBA_CACHE_DIR=/opt/financepy/numba_cache at run time.
+
+import argparse
+
+###############################################################################
+
+
+def main(argv=None):
+    """ Parse the command line and run the requested command. """
+
+    parser = argparse.ArgumentParser(prog="financepy")
+    subparsers = parser.add_subparsers(dest="command")
+
+    warmup_parser = subparsers.add_parser(
+        "warmup", help="compile the Numba kernels into the Numba cache")
+    warmup_parser.add_argument("--cache-dir", default=None,
+                               help="directory for the Numba cache")
+    warmup_parser.add_argument("--module", action="append", dest="modules",
+                               help="only warm up this module (repeatable)")
+    warmup_parser.add_argument("--quiet", action="store_true",
+                               help="do not print the table of kernels")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "warmup":
+        from .utils.jit_warmup import warmup
+        results = warmup(args.cache_dir, args.modules, not args.quiet)
+        failed = [r for r in results if r[2].startswith("IMPORT FAILED")]
+        return 1 if len(failed) > 0 else 0
+
+    parser.print_help()
+    return 0
+
+###############################################################################
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
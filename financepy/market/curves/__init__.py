@@ -1,9 +1,21 @@
-from .interpolator import *
-from .discount_curve import *
-from .discount_curve_flat import *
-from .discount_curve_ns import *
-from .discount_curve_nss import *
-from .discount_curve_pwf import *
-from .discount_curve_pwl import *
-from .discount_curve_poly import *
-from .discount_curve_zeros import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'interpolator': ['interpolate', 'Interpolator', 'InterpTypes'],
+    'discount_curve': ['annual_frequency', 'DateArray', 'DayCount',
+                       'DiscountCurve', 'gDaysInYear', 'Schedule'],
+    'discount_curve_flat': ['DiscountCurveFlat'],
+    'discount_curve_ns': ['DiscountCurveNS'],
+    'discount_curve_nss': ['DiscountCurveNSS'],
+    'discount_curve_pwf': ['DiscountCurvePWF'],
+    'discount_curve_pwl': ['DiscountCurvePWL'],
+    'discount_curve_poly': ['DiscountCurvePoly', 'gSmall'],
+    'discount_curve_zeros': ['check_argument_types', 'DayCountTypes',
+                             'DiscountCurveZeros', 'FrequencyTypes',
+                             'test_monotonicity', 'times_from_dates'],
+    'curve_cache': ['BUILT_ATTRIBUTES', 'built_curve_key', 'curve_key',
+                    'CurveCache', 'Date', 'FinError', 'get_curve_cache',
+                    'label_to_string', 'MARKET_INPUTS', 'set_curve_cache']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
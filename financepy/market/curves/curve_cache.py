@@ -0,0 +1,342 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+# A cache of built curves. A curve is found from a hash of its market inputs
+# - its class, valuation date, the type, dates, quotes and conventions of its
+# calibration instruments, the inputs of any curves it is built on and its
+# interpolation scheme. Values which instruments store when they are valued
+# are not part of the key. A curve built from the same market data is then
+# only built once and is shared by every valuation that asks for it. Cached
+# curves must therefore be treated as read only. To bump a curve, copy it,
+# bump the copy's inputs and pass the copy to build so that the bumped curve
+# is also cached. The library cache has a size of zero, which turns it off,
+# until it is replaced with set_curve_cache.
+
+import hashlib
+from collections import OrderedDict
+from enum import Enum
+
+import numpy as np
+
+from ...utils.date import Date
+from ...utils.error import FinError
+from ...utils.helpers import label_to_string
+
+# The attributes of a curve which are set when it is built from its inputs
+BUILT_ATTRIBUTES = ('_times', '_dfs', '_values', '_interpolator',
+                    '_jacobian', '_built_ok', '_segments')
+
+# The market inputs of the curves and calibration instruments of the library.
+# Objects of other classes are keyed by all of their attributes.
+MARKET_INPUTS = {
+    'IborDeposit': ('_start_dt', '_maturity_dt', '_deposit_rate', '_dc_type',
+                    '_notional', '_cal_type', '_bd_type'),
+    'IborFRA': ('_start_dt', '_maturity_dt', '_fra_rate', '_dc_type',
+                '_notional', '_pay_fixed_rate', '_cal_type', '_bd_type'),
+    'IborSwap': ('_effective_dt', '_termination_dt', '_maturity_dt',
+                 '_fixed_leg', '_float_leg'),
+    'OIS': ('_effective_dt', '_termination_dt', '_maturity_dt',
+            '_fixed_leg', '_float_leg'),
+    'SwapFixedLeg': ('_effective_dt', '_end_dt', '_maturity_dt', '_leg_type',
+                     '_cpn', '_freq_type', '_dc_type', '_notional',
+                     '_principal', '_payment_lag', '_cal_type', '_bd_type',
+                     '_dg_type', '_end_of_month'),
+    'SwapFloatLeg': ('_effective_dt', '_end_dt', '_maturity_dt', '_leg_type',
+                     '_spread', '_freq_type', '_dc_type', '_notional',
+                     '_principal', '_payment_lag', '_cal_type', '_bd_type',
+                     '_dg_type', '_end_of_month'),
+    'CDS': ('_step_in_dt', '_maturity_dt', '_running_cpn', '_notional',
+            '_long_protection', '_freq_type', '_dc_type', '_cal_type',
+            '_bd_type', '_dg_type'),
+    'DiscountCurveFlat': ('_value_dt', '_flat_rate', '_freq_type',
+                          '_dc_type'),
+    'IborSingleCurve': ('_value_dt', '_usedDeposits', '_usedFRAs',
+                        '_usedSwaps', '_interp_type', '_check_refit',
+                        '_build_type'),
+    'OISCurve': ('_value_dt', '_usedDeposits', '_usedFRAs', '_usedSwaps',
+                 '_interp_type', '_check_refit', '_build_type'),
+    'IborDualCurve': ('_value_dt', '_discount_curve', '_usedDeposits',
+                      '_usedFRAs', '_usedSwaps', '_interp_type',
+                      '_check_refit', '_build_type'),
+    'CDSCurve': ('_value_dt', '_cds_contracts', '_libor_curve',
+                 '_recovery_rate', '_interp_method')}
+
+###############################################################################
+
+
+def _add_key_parts(value, parts, seen):
+    """ Add the parts of the key of a value to a list of strings. Objects are
+    keyed by their class and the values of their attributes so two objects
+    with the same contents have the same key. Lists of numbers and dates are
+    added in one step. """
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        parts.append(type(value).__name__ + repr(value))
+
+    elif isinstance(value, Date):
+        parts.append('D' + repr(value._excel_dt))
+
+    elif isinstance(value, Enum):
+        parts.append(type(value).__name__ + '.' + value.name)
+
+    elif isinstance(value, np.ndarray):
+        parts.append('A' + str(value.dtype) + str(value.shape))
+        parts.append(np.ascontiguousarray(value).tobytes().hex())
+
+    elif isinstance(value, (list, tuple)):
+        parts.append('L' + str(len(value)))
+
+        if len(value) > 0 and all(type(v) is float for v in value):
+            parts.append(repr(value))
+        elif len(value) > 0 and all(type(v) is Date for v in value):
+            parts.append(repr([v._excel_dt for v in value]))
+        else:
+            for v in value:
+                _add_key_parts(v, parts, seen)
+
+    elif isinstance(value, dict):
+        parts.append('M' + str(len(value)))
+        for k in sorted(value, key=repr):
+            _add_key_parts(k, parts, seen)
+            _add_key_parts(value[k], parts, seen)
+
+    elif isinstance(value, (np.floating, np.integer, np.bool_)):
+        _add_key_parts(value.item(), parts, seen)
+
+    elif callable(value) and hasattr(value, '__qualname__'):
+        parts.append('F' + str(getattr(value, '__module__', '')) + '.' +
+                     value.__qualname__)
+
+    elif hasattr(value, '__dict__'):
+        _add_object_key_parts(value, parts, seen, ())
+
+    else:
+        parts.append('U' + type(value).__qualname__ + repr(value))
+
+###############################################################################
+
+
+def _add_object_key_parts(value, parts, seen, excluded):
+    """ Add the parts of the key of an object. The market inputs of the
+    classes in MARKET_INPUTS are used, otherwise all of the attributes which
+    are not excluded. """
+
+    # An object seen before is added as a reference to avoid cycles
+    if id(value) in seen:
+        parts.append('R' + str(seen[id(value)]))
+        return
+
+    seen[id(value)] = len(seen)
+    class_name = type(value).__qualname__
+    parts.append('O' + class_name)
+
+    attributes = vars(value)
+    names = MARKET_INPUTS.get(class_name)
+
+    if names is None:
+        names = sorted(name for name in attributes if name not in excluded)
+
+    for name in names:
+        parts.append(name)
+        _add_key_parts(attributes.get(name), parts, seen)
+
+###############################################################################
+
+
+def _hash_parts(parts):
+    """ Return a short hash of the parts of a key. """
+
+    data = '\x1f'.join(parts).encode()
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+###############################################################################
+
+
+def curve_key(curve_class, *args, **kwargs):
+    """ Return a hash of a curve class and of the arguments used to create
+    it. Two sets of arguments with the same contents have the same hash. """
+
+    parts = [curve_class.__qualname__]
+    seen = {}
+    _add_key_parts(list(args), parts, seen)
+    _add_key_parts(kwargs, parts, seen)
+    return _hash_parts(parts)
+
+###############################################################################
+
+
+def built_curve_key(curve):
+    """ Return a hash of the market inputs of a curve object. The attributes
+    which are set by building the curve are left out so the curve does not
+    need to have been built. """
+
+    parts = []
+    _add_object_key_parts(curve, parts, {}, BUILT_ATTRIBUTES)
+    return _hash_parts(parts)
+
+###############################################################################
+
+
+class CurveCache():
+    """ A least recently used cache of built curves keyed by a hash of their
+    market data. When it holds max_size curves the one used least recently
+    is removed to make room. Curves can be removed by valuation date, for
+    example when the market data for a date is updated, or all together. """
+
+    def __init__(self,
+                 max_size: int = 256):
+        """ Create a cache which holds up to max_size curves. A maximum size
+        of zero turns the cache off so that each curve is built. """
+
+        if max_size < 0:
+            raise FinError("Cache size must not be negative.")
+
+        self._max_size = max_size
+        self._curves = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    ###########################################################################
+
+    def curve(self,
+              curve_class,
+              *args,
+              **kwargs):
+        """ Return the curve created by curve_class(*args, **kwargs). If a
+        curve of this class has been created with arguments with the same
+        contents then the cached curve is returned and nothing is built. """
+
+        key = curve_key(curve_class, *args, **kwargs)
+        curve = self._lookup(key)
+
+        if curve is None:
+            curve = curve_class(*args, **kwargs)
+            self._store(key, curve)
+
+        return curve
+
+    ###########################################################################
+
+    def build(self,
+              curve):
+        """ Build a curve object whose inputs have been set, for example a
+        copy of a curve with bumped quotes. If a curve with the same inputs
+        has been built then the cached curve is returned in its place. """
+
+        key = built_curve_key(curve)
+        cached_curve = self._lookup(key)
+
+        if cached_curve is not None:
+            return cached_curve
+
+        curve._build_curve()
+        self._store(key, curve)
+        return curve
+
+    ###########################################################################
+
+    def invalidate(self,
+                   value_dt: Date = None):
+        """ Remove the curves with the valuation date given or all of the
+        curves if no date is given. """
+
+        if value_dt is None:
+            self._curves.clear()
+            return
+
+        for key in list(self._curves):
+            if self._curves[key]._value_dt == value_dt:
+                del self._curves[key]
+
+    ###########################################################################
+
+    def clear(self):
+        """ Remove all of the curves and reset the hit and miss counts. """
+
+        self._curves.clear()
+        self._hits = 0
+        self._misses = 0
+
+    ###########################################################################
+
+    def _lookup(self, key):
+        """ Return the curve with the key or None. A curve that is found
+        becomes the most recently used. """
+
+        curve = self._curves.get(key)
+
+        if curve is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._curves.move_to_end(key)
+        return curve
+
+    ###########################################################################
+
+    def _store(self, key, curve):
+        """ Add a curve removing the least recently used if it is full. """
+
+        if self._max_size == 0:
+            return
+
+        self._curves[key] = curve
+        self._curves.move_to_end(key)
+
+        while len(self._curves) > self._max_size:
+            self._curves.popitem(last=False)
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._curves)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("MAX SIZE", self._max_size)
+        s += label_to_string("NUM CURVES", len(self._curves))
+        s += label_to_string("HITS", self._hits)
+        s += label_to_string("MISSES", self._misses)
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """ Simple print function for backward compatibility. """
+        print(self)
+
+###############################################################################
+
+
+# The library does not cache curves unless a cache is set by the user
+_curve_cache = CurveCache(0)
+
+###############################################################################
+
+
+def get_curve_cache():
+    """ Return the cache used by the library when it rebuilds curves, for
+    example with bumped quotes in the CDS risk functions. """
+    return _curve_cache
+
+###############################################################################
+
+
+def set_curve_cache(cache: CurveCache):
+    """ Replace the cache used by the library when it rebuilds curves. By
+    default the library uses CurveCache(0) which turns caching off. Curves
+    held by the cache are kept alive and are shared by the risk functions,
+    so they must not be changed. """
+
+    global _curve_cache
+
+    if not isinstance(cache, CurveCache):
+        raise FinError("Cache must be a CurveCache")
+
+    _curve_cache = cache
+
+###############################################################################
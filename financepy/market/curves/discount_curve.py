@@ -6,8 +6,10 @@
 import numpy as np
 
 from .interpolator import Interpolator, InterpTypes, interpolate
+from .interpolator import _vinterpolate_jacobian, _vinterpolate_gradient
 
 from ...utils.date import Date
+from ...utils.date_array import DateArray
 from ...utils.error import FinError
 from ...utils.global_vars import gDaysInYear, gSmall
 from ...utils.frequency import annual_frequency, FrequencyTypes
@@ -118,7 +120,7 @@ class DiscountCurve:
 
     def _df_to_zero(self,
                     dfs: (float, np.ndarray),
-                    maturity_dts: (Date, list),
+                    maturity_dts: (Date, list, DateArray),
                     freq_type: FrequencyTypes,
                     dc_type: DayCountTypes):
         """ Given a dates this first generates the discount factors. It then
@@ -127,48 +129,42 @@ class DiscountCurve:
         frequency which are all choices of FrequencyTypes. Returns a list of
         discount factor. """
 
-        f = annual_frequency(freq_type)
-
-        if isinstance(maturity_dts, Date):
-            date_list = [maturity_dts]
-        else:
-            date_list = maturity_dts
+        times = times_from_dates(maturity_dts, self._value_dt, dc_type)
 
-        if isinstance(dfs, float):
-            df_list = [dfs]
-        else:
-            df_list = dfs
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        dfs = np.atleast_1d(np.asarray(dfs, dtype=np.float64))
 
-        if len(date_list) != len(df_list):
+        if len(times) != len(dfs):
             raise FinError("Date list and df list do not have same length")
 
-        num_dts = len(date_list)
-        zero_rates = []
-
-        times = times_from_dates(
-            date_list, self._value_dt, dc_type)
+        return self._df_to_zero_times(dfs, times, freq_type)
 
-        for i in range(0, num_dts):
-
-            df = df_list[i]
+    ###########################################################################
 
-            t = max(times[i], gSmall)
+    def _df_to_zero_times(self,
+                          dfs: np.ndarray,
+                          times: np.ndarray,
+                          freq_type: FrequencyTypes):
+        """ Convert a vector of discount factors at a vector of year
+        fractions to zero rates with the chosen compounding frequency. This is
+        done in one vectorised step without any loop over the points. """
 
-            if freq_type == FrequencyTypes.CONTINUOUS:
-                r = -np.log(df) / t
-            elif freq_type == FrequencyTypes.SIMPLE:
-                r = (1.0 / df - 1.0) / t
-            else:
-                r = (np.power(df, -1.0 / (t * f)) - 1.0) * f
+        t = np.maximum(times, gSmall)
 
-            zero_rates.append(r)
+        if freq_type == FrequencyTypes.CONTINUOUS:
+            zero_rates = -np.log(dfs) / t
+        elif freq_type == FrequencyTypes.SIMPLE:
+            zero_rates = (1.0 / dfs - 1.0) / t
+        else:
+            f = annual_frequency(freq_type)
+            zero_rates = (np.power(dfs, -1.0 / (t * f)) - 1.0) * f
 
-        return np.array(zero_rates)
+        return zero_rates
 
     ###########################################################################
 
     def zero_rate(self,
-                  dts: (list, Date),
+                  dts: (list, Date, DateArray),
                   freq_type: FrequencyTypes = FrequencyTypes.CONTINUOUS,
                   dc_type: DayCountTypes = DayCountTypes.ACT_360):
         """ Calculation of zero rates with specified frequency. This
@@ -190,8 +186,6 @@ class DiscountCurve:
         else:
             return np.array(zero_rates)
 
-        return zero_rates
-
     ###########################################################################
 
     def cc_rate(self,
@@ -209,7 +203,7 @@ class DiscountCurve:
 
     def swap_rate(self,
                   effective_dt: Date,
-                  maturity_dt: (list, Date),
+                  maturity_dt: (list, Date, DateArray),
                   freq_type=FrequencyTypes.ANNUAL,
                   dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360):
         """ Calculate the swap rate to maturity date. This is the rate paid by
@@ -236,45 +230,53 @@ class DiscountCurve:
 
         if isinstance(maturity_dt, Date):
             maturity_dts = [maturity_dt]
+        elif isinstance(maturity_dt, DateArray):
+            maturity_dts = maturity_dt.to_dates()
         else:
             maturity_dts = maturity_dt
 
-        par_rates = []
+        # The coupon periods of all of the swaps are stacked so that the
+        # discount and accrual factors are calculated in one vectorised call
+        start_serials = []
+        end_serials = []
+        num_flows = []
 
-        for maturity_dt in maturity_dts:
+        for dt in maturity_dts:
 
-            if maturity_dt <= effective_dt:
+            if dt <= effective_dt:
                 raise FinError("Maturity date is before the swap start date.")
 
             schedule = Schedule(effective_dt,
-                                maturity_dt,
+                                dt,
                                 freq_type)
 
             flow_dts = schedule._generate()
             flow_dts[0] = effective_dt
 
-            day_counter = DayCount(dc_type)
-            prev_dt = flow_dts[0]
-            pv01 = 0.0
-            df = 1.0
+            flow_serials = [flow_dt.excel_dt() for flow_dt in flow_dts]
+            start_serials += flow_serials[:-1]
+            end_serials += flow_serials[1:]
+            num_flows.append(len(flow_serials) - 1)
 
-            for next_dt in flow_dts[1:]:
-                df = self.df(next_dt)
-                alpha = day_counter.year_frac(prev_dt, next_dt)[0]
-                pv01 += alpha * df
-                prev_dt = next_dt
+        prev_dts = DateArray(np.array(start_serials))
+        next_dts = DateArray(np.array(end_serials))
 
-            if abs(pv01) < gSmall:
-                par_rate = 0.0
-            else:
-                df_start = self.df(effective_dt)
-                par_rate = (df_start - df) / pv01
+        day_counter = DayCount(dc_type)
+        alphas = day_counter.year_frac(prev_dts, next_dts)[0]
+        dfs = self.df(next_dts)
+
+        num_flows = np.array(num_flows)
+        last_flows = np.cumsum(num_flows) - 1
+        first_flows = last_flows - num_flows + 1
 
-            par_rates.append(par_rate)
+        pv01s = np.add.reduceat(alphas * dfs, first_flows)
+        df_start = self.df(effective_dt)
 
-        par_rates = np.array(par_rates)
+        par_rates = np.zeros(len(num_flows))
+        valid = np.abs(pv01s) >= gSmall
+        par_rates[valid] = (df_start - dfs[last_flows][valid]) / pv01s[valid]
 
-        if isinstance(maturity_dts, Date):
+        if isinstance(maturity_dt, Date):
             return par_rates[0]
         else:
             return par_rates
@@ -282,11 +284,12 @@ class DiscountCurve:
     ###########################################################################
 
     def df(self,
-           dt: (list, Date),
+           dt: (list, Date, DateArray),
            day_count=DayCountTypes.ACT_ACT_ISDA):
         ''' Function to calculate a discount factor from a date or a
         vector of dates. The day count determines how dates get converted to
-        years. I allow this to default to ACT_ACT_ISDA unless specified. '''
+        years. I allow this to default to ACT_ACT_ISDA unless specified. A
+        DateArray is converted to times without creating any Date objects. '''
 
         times = times_from_dates(dt, self._value_dt, day_count)
         dfs = self._df(times)
@@ -320,6 +323,127 @@ class DiscountCurve:
 
     ###########################################################################
 
+    def df_jacobian(self,
+                    dt: (list, Date, DateArray),
+                    day_count=DayCountTypes.ACT_ACT_ISDA):
+        """ Return the matrix of sensitivities of the discount factors at the
+        dates provided (rows) to the discount factors at the curve pillar
+        times (columns). For the local interpolation schemes each row has at
+        most three non-zero entries. """
+
+        times = times_from_dates(dt, self._value_dt, day_count)
+        return self._df_jacobian(times)
+
+    ###########################################################################
+
+    def _df_jacobian(self,
+                     t: (float, np.ndarray)):
+        """ Hidden function to calculate the sensitivity of the discount
+        factors at a time or vector of times to the pillar discount factors.
+        """
+
+        self._check_pillar_curve()
+
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+
+        if np.any(t < 0.0):
+            raise FinError("Interpolate times must all be >= 0")
+
+        if self._interp_type is InterpTypes.FLAT_FWD_RATES or \
+                self._interp_type is InterpTypes.LINEAR_ZERO_RATES or \
+                self._interp_type is InterpTypes.LINEAR_FWD_RATES:
+
+            jac = _vinterpolate_jacobian(t,
+                                         self._times,
+                                         self._dfs,
+                                         self._interp_type.value)
+
+        else:
+
+            jac = self._interpolator.jacobian(t)
+
+        return jac
+
+    ###########################################################################
+
+    def df_gradient(self,
+                    dt: (list, Date, DateArray),
+                    weights: (float, list, np.ndarray),
+                    day_count=DayCountTypes.ACT_ACT_ISDA):
+        """ Return the sensitivity of the weighted sum of discount factors at
+        the dates provided to each of the pillar discount factors. With the
+        weights set to cash flow amounts this is the sensitivity of their PV.
+        This is calculated in a single pass over the dates without building
+        the Jacobian for the local interpolation schemes. """
+
+        times = times_from_dates(dt, self._value_dt, day_count)
+        return self._df_gradient(times, weights)
+
+    ###########################################################################
+
+    def _df_gradient(self,
+                     t: (float, np.ndarray),
+                     weights: (float, list, np.ndarray)):
+        """ Hidden function to calculate the sensitivity of the weighted sum
+        of discount factors at a vector of times to the pillar discount
+        factors. """
+
+        self._check_pillar_curve()
+
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        weights = np.atleast_1d(np.asarray(weights, dtype=np.float64))
+
+        if len(t) != len(weights):
+            raise FinError("Times and weights are not the same length")
+
+        if np.any(t < 0.0):
+            raise FinError("Interpolate times must all be >= 0")
+
+        if self._interp_type is InterpTypes.FLAT_FWD_RATES or \
+                self._interp_type is InterpTypes.LINEAR_ZERO_RATES or \
+                self._interp_type is InterpTypes.LINEAR_FWD_RATES:
+
+            grad = _vinterpolate_gradient(t,
+                                          weights,
+                                          self._times,
+                                          self._dfs,
+                                          self._interp_type.value)
+
+        else:
+
+            grad = weights @ self._interpolator.jacobian(t)
+
+        return grad
+
+    ###########################################################################
+
+    def zero_deltas(self,
+                    df_gradient: np.ndarray,
+                    bump_size: float = 0.0001):
+        """ Convert a sensitivity to the pillar discount factors into the
+        change in value for an increase of bump_size in the continuously
+        compounded zero rate at each pillar, holding the other pillars fixed.
+        This is the bucketed delta to first order. """
+
+        df_gradient = np.asarray(df_gradient, dtype=np.float64)
+
+        if len(df_gradient) != len(self._dfs):
+            raise FinError("Gradient is not the same length as the curve")
+
+        return -bump_size * self._times * self._dfs * df_gradient
+
+    ###########################################################################
+
+    def _check_pillar_curve(self):
+        """ Sensitivities are taken to the pillar discount factors and so
+        are only available for curves which interpolate between them. """
+
+        if type(self).df is not DiscountCurve.df or \
+                type(self)._df is not DiscountCurve._df:
+            raise FinError("Sensitivities need an interpolated curve.")
+
+    ###########################################################################
+
     def survival_prob(self,
                       dt: Date):
         """ This returns a survival probability to a specified date based on
@@ -333,7 +457,7 @@ class DiscountCurve:
     ###########################################################################
 
     def fwd(self,
-            dts: Date):
+            dts: (Date, list, DateArray)):
         """ Calculate the continuously compounded forward rate at the forward
         Date provided. This is done by perturbing the time by one day only
         and measuring the change in the log of the discount factor divided by
@@ -343,10 +467,8 @@ class DiscountCurve:
         if isinstance(dts, Date):
             dts_plus_one_days = [dts.add_days(1)]
         else:
-            dts_plus_one_days = []
-            for dt in dts:
-                dts_plus_one_day = dt.add_days(1)
-                dts_plus_one_days.append(dts_plus_one_day)
+            dts = DateArray(dts)
+            dts_plus_one_days = dts.add_days(1)
 
         df1 = self.df(dts)
         df2 = self.df(dts_plus_one_days)
@@ -401,46 +523,54 @@ class DiscountCurve:
     ###########################################################################
 
     def fwd_rate(self,
-                 start_dt: (list, Date),
-                 date_or_tenor: (Date, str),
+                 start_dt: (list, Date, DateArray),
+                 date_or_tenor: (Date, str, list, DateArray),
                  dc_type: DayCountTypes = DayCountTypes.ACT_360):
         """ Calculate the forward rate between two forward dates according to
         the specified day count convention. This defaults to Actual 360. The
         first date is specified and the second is given as a date or as a tenor
-        which is added to the first date. """
-
-        if isinstance(start_dt, Date):
-            start_dts = []
-            start_dts.append(start_dt)
-        elif isinstance(start_dt, list):
-            start_dts = start_dt
-        else:
-            raise FinError("Start date and end date must be same types.")
+        which is added to the first date. A vector of start dates is handled
+        in a single vectorised pass over all of the dates. """
 
         day_count = DayCount(dc_type)
 
-        num_dts = len(start_dts)
-        fwd_rates = []
-        for i in range(0, num_dts):
-            dt1 = start_dts[i]
+        if isinstance(start_dt, Date):
 
             if isinstance(date_or_tenor, str):
-                dt2 = dt1.add_tenor(date_or_tenor)
+                end_dt = start_dt.add_tenor(date_or_tenor)
             elif isinstance(date_or_tenor, Date):
-                dt2 = date_or_tenor
-            elif isinstance(date_or_tenor, list):
-                dt2 = date_or_tenor[i]
+                end_dt = date_or_tenor
+            elif isinstance(date_or_tenor, (list, DateArray)):
+                end_dt = date_or_tenor[0]
+            else:
+                raise FinError("Unknown end date or tenor type.")
 
-            year_frac = day_count.year_frac(dt1, dt2)[0]
-            df1 = self.df(dt1)
-            df2 = self.df(dt2)
+            year_frac = day_count.year_frac(start_dt, end_dt)[0]
+            df1 = self.df(start_dt)
+            df2 = self.df(end_dt)
             fwd_rate = (df1 / df2 - 1.0) / year_frac
-            fwd_rates.append(fwd_rate)
+            return fwd_rate
 
-        if isinstance(start_dt, Date):
-            return fwd_rates[0]
+        elif isinstance(start_dt, (list, DateArray)):
+            start_dts = DateArray(start_dt)
+        else:
+            raise FinError("Start date and end date must be same types.")
+
+        if isinstance(date_or_tenor, str):
+            end_dts = start_dts.add_tenor(date_or_tenor)
+        elif isinstance(date_or_tenor, Date):
+            end_dts = DateArray(np.full(len(start_dts),
+                                        date_or_tenor.excel_dt()))
+        elif isinstance(date_or_tenor, (list, DateArray)):
+            end_dts = DateArray(date_or_tenor)
         else:
-            return np.array(fwd_rates)
+            raise FinError("Unknown end date or tenor type.")
+
+        year_fracs = day_count.year_frac(start_dts, end_dts)[0]
+        df1 = self.df(start_dts)
+        df2 = self.df(end_dts)
+        fwd_rates = (df1 / df2 - 1.0) / year_fracs
+        return fwd_rates
 
     ###########################################################################
 
@@ -462,3 +592,28 @@ class DiscountCurve:
         print(self)
 
 ###############################################################################
+
+
+def _curve_dfs(curve, *serials):
+    """ Return the discount factors of a curve at one or more vectors of
+    Excel serial dates. All of the dates are passed to the curve in a single
+    call and each distinct date is only passed once. Curves that are not
+    derived from DiscountCurve are called date by date. """
+
+    all_serials = np.concatenate(serials)
+
+    if len(all_serials) == 0:
+        return [np.zeros(0) for _ in serials]
+
+    unique_serials, inverse = np.unique(all_serials, return_inverse=True)
+    unique_dts = DateArray(unique_serials)
+
+    if isinstance(curve, DiscountCurve):
+        dfs = np.asarray(curve.df(unique_dts), dtype=np.float64)
+    else:
+        dfs = np.array([curve.df(dt) for dt in unique_dts.to_dates()])
+
+    splits = np.cumsum([len(s) for s in serials])[:-1]
+    return np.split(dfs[inverse], splits)
+
+###############################################################################
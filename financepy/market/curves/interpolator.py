@@ -170,6 +170,134 @@ def _uinterpolate(t, times, dfs, method):
         raise FinError("Invalid interpolation scheme.")
 
 
+###############################################################################
+
+@njit(float64[:, :](float64[:], float64[:], int64),
+      fastmath=True, cache=True, nogil=True)
+def _segment_coeffs(times, dfs, method):
+    """ Precompute for each segment the reference time and the coefficients
+    c0, c1, c2 such that log(df(t)) = c0 + s * (c1 + s * c2) where s is the
+    time from the reference time. Row i is used for times in the interval
+    (times[i-1], times[i]] and the last row is used for extrapolation. This
+    reproduces the schemes in _uinterpolate for times after the first knot. """
+
+    small = 1e-10
+    num_points = times.size
+    coeffs = np.zeros((num_points + 1, 4))
+
+    if num_points < 2:
+        return coeffs
+
+    for i in range(1, num_points + 1):
+
+        if method == InterpTypes.FLAT_FWD_RATES.value:
+
+            j = min(i, num_points - 1)
+            rt1 = -np.log(dfs[j - 1])
+            rt2 = -np.log(dfs[j])
+            dt = times[j] - times[j - 1]
+            coeffs[i, 0] = times[j - 1]
+            coeffs[i, 1] = -rt1
+            coeffs[i, 2] = -(rt2 - rt1) / dt
+
+        elif method == InterpTypes.LINEAR_ZERO_RATES.value:
+
+            if i == 1:
+                r = -np.log(dfs[i]) / times[i]
+                coeffs[i, 0] = times[i - 1]
+                coeffs[i, 1] = -r * times[i - 1]
+                coeffs[i, 2] = -r
+            elif i < num_points:
+                r1 = -np.log(dfs[i - 1]) / times[i - 1]
+                r2 = -np.log(dfs[i]) / times[i]
+                dr = (r2 - r1) / (times[i] - times[i - 1])
+                coeffs[i, 0] = times[i - 1]
+                coeffs[i, 1] = -r1 * times[i - 1]
+                coeffs[i, 2] = -(r1 + dr * times[i - 1])
+                coeffs[i, 3] = -dr
+            else:
+                r = -np.log(dfs[i - 1]) / times[i - 1]
+                coeffs[i, 0] = times[i - 1]
+                coeffs[i, 1] = -r * times[i - 1]
+                coeffs[i, 2] = -r
+
+        elif method == InterpTypes.LINEAR_FWD_RATES.value:
+
+            if i == 1:
+                r = -np.log(dfs[i] + small) / (times[i] + small)
+                coeffs[i, 0] = times[i - 1]
+                coeffs[i, 1] = -r * times[i - 1]
+                coeffs[i, 2] = -r
+            elif i < num_points:
+                fwd1 = -np.log(dfs[i - 1] / dfs[i - 2]) / \
+                    (times[i - 1] - times[i - 2])
+                fwd2 = -np.log(dfs[i] / dfs[i - 1]) / \
+                    (times[i] - times[i - 1])
+                coeffs[i, 0] = times[i - 1]
+                coeffs[i, 1] = np.log(dfs[i - 1])
+                coeffs[i, 2] = -fwd1
+                coeffs[i, 3] = -(fwd2 - fwd1) / (times[i] - times[i - 1])
+            else:
+                fwd = -np.log(dfs[i - 1] / dfs[i - 2]) / \
+                    (times[i - 1] - times[i - 2])
+                coeffs[i, 0] = times[i - 1]
+                coeffs[i, 1] = np.log(dfs[i - 1])
+                coeffs[i, 2] = -fwd
+
+        else:
+            raise FinError("Invalid interpolation scheme.")
+
+    return coeffs
+
+
+###############################################################################
+
+
+@njit(float64[:](float64[:], float64[:], float64[:], float64[:, :], int64),
+      fastmath=True, cache=True, nogil=True)
+def _vinterpolate_segments(xValues, xvector, dfs, coeffs, method):
+    """ Evaluate the interpolated values at a vector of times using the
+    segment coefficients from _segment_coeffs. While the times are increasing
+    the segment is found by walking forward from the previous one, and a
+    binary search is used after a decrease or a long jump so that unsorted
+    vectors are handled too. Times at or before the first knot are passed to
+    _uinterpolate. """
+
+    num_points = xvector.size
+    n = xValues.size
+    yvalues = np.empty(n)
+
+    i = 0
+    t_prev = xvector[0]
+
+    for k in range(0, n):
+
+        t = xValues[k]
+
+        if num_points < 2 or t <= xvector[0]:
+            yvalues[k] = _uinterpolate(t, xvector, dfs, method)
+            continue
+
+        if t >= t_prev:
+            steps = 0
+            while i < num_points and xvector[i] < t and steps < 8:
+                i += 1
+                steps += 1
+
+            if i < num_points and xvector[i] < t:
+                i += np.searchsorted(xvector[i:], t)
+        else:
+            i = np.searchsorted(xvector, t)
+
+        t_prev = t
+
+        s = t - coeffs[i, 0]
+        yvalues[k] = np.exp(coeffs[i, 1] + s * (coeffs[i, 2] +
+                                                s * coeffs[i, 3]))
+
+    return yvalues
+
+
 ###############################################################################
 
 @njit(float64[:](float64[:], float64[:], float64[:], int64),
@@ -183,12 +311,209 @@ def _vinterpolate(xValues,
     interpolation are linear in y (as a function of x), linear in log(y) and
     piecewise flat in the continuously compounded forward y rate. """
 
+    coeffs = _segment_coeffs(xvector, dfs, method)
+    return _vinterpolate_segments(xValues, xvector, dfs, coeffs, method)
+
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def _uinterpolate_weights(t, times, dfs, method):
+    """ Return the sensitivity of the interpolated value at time t to the
+    values at the knots for the schemes handled by _uinterpolate. As these
+    schemes are local at most three knots have a non-zero sensitivity. The
+    output is the index of the first of these knots and the derivatives with
+    respect to it and the two knots that follow it. """
+
+    small = 1e-10
+    num_points = times.size
+
+    if t == times[0]:
+        return 0, 1.0, 0.0, 0.0
+
+    if t < times[0] or num_points < 2:
+        raise FinError("Sensitivities need times after the first knot.")
+
+    i = np.searchsorted(times, t)
+
+    a0 = 0.0
+    a1 = 0.0
+    a2 = 0.0
+
+    # The log of the interpolated value is a linear combination of the log of
+    # the knot values with weights a0, a1 and a2
+    if method == InterpTypes.FLAT_FWD_RATES.value:
+
+        j = min(i, num_points - 1)
+        w = (t - times[j - 1]) / (times[j] - times[j - 1])
+        j0 = j - 1
+        a0 = 1.0 - w
+        a1 = w
+
+    elif method == InterpTypes.LINEAR_ZERO_RATES.value:
+
+        if i == 1:
+            j0 = 1
+            a0 = t / times[1]
+        elif i < num_points:
+            w = (t - times[i - 1]) / (times[i] - times[i - 1])
+            j0 = i - 1
+            a0 = (1.0 - w) * t / times[i - 1]
+            a1 = w * t / times[i]
+        else:
+            j0 = num_points - 1
+            a0 = t / times[num_points - 1]
+
+    elif method == InterpTypes.LINEAR_FWD_RATES.value:
+
+        if i == 1:
+            a = t / (times[1] + small)
+            y = np.exp(a * np.log(dfs[1] + small))
+            return 1, y * a / (dfs[1] + small), 0.0, 0.0
+        elif i < num_points:
+            dt1 = times[i - 1] - times[i - 2]
+            dt2 = times[i] - times[i - 1]
+            s = t - times[i - 1]
+            w = s / dt2
+            j0 = i - 2
+            a0 = -s * (1.0 - w) / dt1
+            a1 = 1.0 + s * (1.0 - w) / dt1 - s * w / dt2
+            a2 = s * w / dt2
+        else:
+            dt1 = times[num_points - 1] - times[num_points - 2]
+            s = t - times[num_points - 1]
+            j0 = num_points - 2
+            a0 = -s / dt1
+            a1 = 1.0 + s / dt1
+
+    else:
+        raise FinError("Invalid interpolation scheme.")
+
+    log_y = a0 * np.log(dfs[j0])
+    if a1 != 0.0:
+        log_y += a1 * np.log(dfs[j0 + 1])
+    if a2 != 0.0:
+        log_y += a2 * np.log(dfs[j0 + 2])
+
+    y = np.exp(log_y)
+    d0 = y * a0 / dfs[j0]
+    d1 = 0.0
+    d2 = 0.0
+
+    if a1 != 0.0:
+        d1 = y * a1 / dfs[j0 + 1]
+    if a2 != 0.0:
+        d2 = y * a2 / dfs[j0 + 2]
+
+    return j0, d0, d1, d2
+
+
+###############################################################################
+
+
+@njit(float64[:, :](float64[:], float64[:], float64[:], int64),
+      fastmath=True, cache=True, nogil=True)
+def _vinterpolate_jacobian(xValues, xvector, dfs, method):
+    """ Return the matrix of sensitivities of the interpolated values at
+    each of the times in xValues (rows) to the values at the knots (columns).
+    """
+
     n = xValues.size
-    yvalues = np.empty(n)
-    for i in range(0, n):
-        yvalues[i] = _uinterpolate(xValues[i], xvector, dfs, method)
+    num_points = xvector.size
+    jac = np.zeros((n, num_points))
 
-    return yvalues
+    for k in range(0, n):
+        j0, d0, d1, d2 = _uinterpolate_weights(xValues[k], xvector, dfs,
+                                               method)
+        jac[k, j0] = d0
+        if d1 != 0.0:
+            jac[k, j0 + 1] = d1
+        if d2 != 0.0:
+            jac[k, j0 + 2] = d2
+
+    return jac
+
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def _add_uinterpolate_gradient(t, weight, times, dfs, method, grad):
+    """ Add the sensitivity of weight times the interpolated value at time t
+    to the knot values into the gradient vector grad. This is used to chain
+    the sensitivity of a valuation to the interpolated values back to the
+    knots inside compiled valuation code. """
+
+    j0, d0, d1, d2 = _uinterpolate_weights(t, times, dfs, method)
+
+    grad[j0] += weight * d0
+    if d1 != 0.0:
+        grad[j0 + 1] += weight * d1
+    if d2 != 0.0:
+        grad[j0 + 2] += weight * d2
+
+
+###############################################################################
+
+
+@njit(float64[:](float64[:], float64[:], float64[:], float64[:], int64),
+      fastmath=True, cache=True, nogil=True)
+def _vinterpolate_gradient(xValues, weights, xvector, dfs, method):
+    """ Return the sensitivity of the weighted sum of the interpolated values
+    at the times in xValues to the values at each knot. This is the product of
+    the weights with the Jacobian but is calculated in a single pass without
+    building the Jacobian. """
+
+    grad = np.zeros(xvector.size)
+
+    for k in range(0, xValues.size):
+        _add_uinterpolate_gradient(xValues[k], weights[k], xvector, dfs,
+                                   method, grad)
+
+    return grad
+
+
+###############################################################################
+
+
+@njit(float64[:](float64[:], float64[:], float64[:, :], int64),
+      fastmath=True, cache=True, nogil=True)
+def _vpoly_interpolate(ts, knots, coeffs, method):
+    """ Evaluate the piecewise cubic fitted by scipy (stored as the knots and
+    the (k, m) coefficient matrix of a PPoly) at a vector of times and map the
+    result back to discount factors. Points beyond the knots are extrapolated
+    using the polynomial of the nearest segment, as scipy does. """
+
+    n = ts.size
+    num_segments = knots.size - 1
+    k = coeffs.shape[0]
+    out = np.empty(n)
+
+    log_discount = (method == InterpTypes.NATCUBIC_LOG_DISCOUNT.value or
+                    method == InterpTypes.PCHIP_LOG_DISCOUNT.value)
+
+    for j in range(0, n):
+
+        t = ts[j]
+        i = np.searchsorted(knots, t, side='right') - 1
+
+        if i < 0:
+            i = 0
+        elif i > num_segments - 1:
+            i = num_segments - 1
+
+        dx = t - knots[i]
+        v = coeffs[0, i]
+        for p in range(1, k):
+            v = v * dx + coeffs[p, i]
+
+        if log_discount:
+            out[j] = np.exp(v)
+        else:
+            out[j] = np.exp(-t * v)
+
+    return out
 
 
 ###############################################################################
@@ -203,6 +528,9 @@ class Interpolator():
         self._interp_fn = None
         self._times = None
         self._dfs = None
+        self._knots = None
+        self._coeffs = None
+        self._segment_coeffs = None
         self._refit_curve = False
 
     ###########################################################################
@@ -213,10 +541,23 @@ class Interpolator():
 
         self._times = times
         self._dfs = dfs
+        self._knots = None
+        self._coeffs = None
+        self._segment_coeffs = None
 
         if len(times) == 1:
             return
 
+        if self._interp_type in (InterpTypes.FLAT_FWD_RATES,
+                                 InterpTypes.LINEAR_ZERO_RATES,
+                                 InterpTypes.LINEAR_FWD_RATES):
+
+            self._times = np.asarray(times, dtype=np.float64)
+            self._dfs = np.asarray(dfs, dtype=np.float64)
+            self._segment_coeffs = _segment_coeffs(self._times, self._dfs,
+                                                   self._interp_type.value)
+            return
+
         if self._interp_type == InterpTypes.PCHIP_LOG_DISCOUNT:
 
             log_dfs = np.log(self._dfs)
@@ -278,6 +619,17 @@ class Interpolator():
     #            self._interp_fn = interp1d(self._times, log_dfs,
     #                                      fill_value="extrapolate")
 
+        # The spline coefficients are copied out so that the evaluation of
+        # all schemes is done in a single compiled call
+        if self._interp_fn is not None:
+            self._knots = np.ascontiguousarray(self._interp_fn.x,
+                                               dtype=np.float64)
+            self._coeffs = np.ascontiguousarray(self._interp_fn.c,
+                                                dtype=np.float64)
+        else:
+            self._knots = None
+            self._coeffs = None
+
     ###########################################################################
 
     def interpolate(self,
@@ -311,42 +663,112 @@ class Interpolator():
         else:
             raise FinError("t is not a recognized type")
 
-        if self._interp_type == InterpTypes.PCHIP_LOG_DISCOUNT:
+        tvec = np.ascontiguousarray(tvec, dtype=np.float64)
 
-            out = np.exp(self._interp_fn(tvec))
+        if self._coeffs is not None:
 
-        elif self._interp_type == InterpTypes.PCHIP_ZERO_RATES:
+            # PCHIP and cubic spline schemes in log discount or zero rates
+            out = _vpoly_interpolate(tvec, self._knots, self._coeffs,
+                                     self._interp_type.value)
 
-            out = np.exp(-tvec * self._interp_fn(tvec))
+        elif self._segment_coeffs is not None:
 
-        # if self._interp_type == InterpTypes.FINCUBIC_LOG_DISCOUNT:
+            out = _vinterpolate_segments(tvec, self._times, self._dfs,
+                                         self._segment_coeffs,
+                                         self._interp_type.value)
 
-        #     out = np.exp(self._interp_fn(tvec))
+        else:
 
-        elif self._interp_type == InterpTypes.FINCUBIC_ZERO_RATES:
+            out = _vinterpolate(tvec, self._times, self._dfs,
+                                self._interp_type.value)
 
-            out = np.exp(-tvec * self._interp_fn(tvec))
+        if isinstance(t, (float, np.float64)):
+            return out[0]
+        else:
+            return out
 
-        elif self._interp_type == InterpTypes.NATCUBIC_LOG_DISCOUNT:
+    ###########################################################################
 
-            out = np.exp(self._interp_fn(tvec))
+    def jacobian(self,
+                 t: (float, np.ndarray)):
+        """ Return the matrix of sensitivities of the interpolated values at
+        the times t (rows) to the discount factors at the knots (columns). The
+        local schemes are done analytically. The cubic splines are linear in
+        the values they fit so they are also done analytically. The PCHIP
+        schemes are not and so these are done by refitting with each knot
+        value perturbed. """
 
-        elif self._interp_type == InterpTypes.NATCUBIC_ZERO_RATES:
+        if self._dfs is None:
+            raise FinError("Dfs have not been set.")
 
-            out = np.exp(-tvec * self._interp_fn(tvec))
+        tvec = np.atleast_1d(np.asarray(t, dtype=np.float64))
 
-        #        elif self._interp_type == InterpTypes.LINEAR_LOG_DISCOUNT:
-        #
-        #            out = np.exp(self._interp_fn(tvec))
+        if np.any(tvec < 0.0):
+            raise FinError("Interpolate times must all be >= 0")
+
+        if self._segment_coeffs is not None:
+            return _vinterpolate_jacobian(tvec, self._times, self._dfs,
+                                          self._interp_type.value)
+
+        if self._interp_type in (InterpTypes.FINCUBIC_ZERO_RATES,
+                                 InterpTypes.NATCUBIC_LOG_DISCOUNT,
+                                 InterpTypes.NATCUBIC_ZERO_RATES):
+            return self._spline_jacobian(tvec)
+
+        num_points = len(self._dfs)
+        jac = np.zeros((len(tvec), num_points))
+        bumped = Interpolator(self._interp_type)
+
+        for j in range(0, num_points):
+            h = self._dfs[j] * 1e-6
+            dfs = np.array(self._dfs, dtype=np.float64)
+
+            dfs[j] = self._dfs[j] + h
+            bumped.fit(self._times, dfs)
+            df_up = bumped.interpolate(tvec)
+
+            dfs[j] = self._dfs[j] - h
+            bumped.fit(self._times, dfs)
+            df_down = bumped.interpolate(tvec)
+
+            jac[:, j] = (df_up - df_down) / (2.0 * h)
+
+        return jac
 
+    ###########################################################################
+
+    def _spline_jacobian(self,
+                         tvec: np.ndarray):
+        """ The cubic spline through the knot values y is a sum of basis
+        splines weighted by y. These are found by fitting a spline to each
+        column of the identity matrix. The chain rule then takes us from the
+        sensitivity to y to the sensitivity to the knot discount factors. """
+
+        num_points = len(self._dfs)
+        times = np.asarray(self._times, dtype=np.float64)
+        dfs = np.asarray(self._dfs, dtype=np.float64)
+
+        # The end conditions apply to each of the basis splines
+        if self._interp_type == InterpTypes.FINCUBIC_ZERO_RATES:
+            zeros = np.zeros(num_points)
+            bc_type = ((2, zeros), (1, zeros))
         else:
+            bc_type = 'natural'
 
-            out = _vinterpolate(tvec, self._times, self._dfs,
-                                self._interp_type.value)
+        basis = CubicSpline(times, np.eye(num_points), bc_type=bc_type)
+        basis_values = basis(tvec)
 
-        if isinstance(t, (float, np.float64)):
-            return out[0]
+        out = self.interpolate(tvec)
+
+        if self._interp_type == InterpTypes.NATCUBIC_LOG_DISCOUNT:
+            dy_ddf = np.diag(1.0 / dfs)
+            scale = out
         else:
-            return out
+            dy_ddf = np.diag(-1.0 / (dfs * (times + gSmall)))
+            if times[0] == 0.0:
+                dy_ddf[0, :] = dy_ddf[1, :]
+            scale = -tvec * out
+
+        return scale[:, np.newaxis] * (basis_values @ dy_ddf)
 
 ###############################################################################
@@ -1,5 +1,23 @@
-from .equity_vol_curve import *
-from .equity_vol_surface import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'equity_vol_curve': ['EquityVolCurve', 'test_monotonicity'],
+    'equity_vol_surface': ['bs_delta', 'EquityVolSurface', 'vol_function_ssvi',
+                           'vol_function_svi'],
+    'fx_vol_surface_plus': ['BlackScholes', 'bs_value', 'check_argument_types',
+                            'DiscountCurve', 'fast_delta', 'FinDistribution',
+                            'FinFXATMMethod', 'FinFXDeltaMethod',
+                            'FinSolverTypes', 'FXVanillaOption',
+                            'FXVolSurfacePlus', 'nelder_mead', 'newton_secant',
+                            'norminvcdf', 'option_implied_dbn', 'OptionTypes',
+                            'solve_for_strike', 'vol_function',
+                            'vol_function_bloomberg', 'vol_function_clark',
+                            'vol_function_sabr', 'vol_function_sabr_beta_half',
+                            'vol_function_sabr_beta_one', 'VolFuncTypes'],
+    'ibor_cap_vol_curve': ['Date', 'DayCount', 'DayCountTypes', 'FinError',
+                           'gDaysInYear', 'IborCapVolCurve', 'label_to_string']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
+
 # from .fx_vol_surface import *
-from .fx_vol_surface_plus import *
-from .ibor_cap_vol_curve import *
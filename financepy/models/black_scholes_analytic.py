@@ -7,9 +7,9 @@ from numba import float64, int64, vectorize, njit
 
 from ..utils.global_types import OptionTypes
 from ..utils.global_vars import gSmall
-from ..utils.math import N, n_vect, n_prime_vect
+from ..utils.math import N, n_vect, n_prime_vect, nprime
 from ..utils.error import FinError
-from ..utils.solver_1d import bisection, newton, newton_secant
+from ..utils.solver_1d import newton_secant
 
 ###############################################################################
 # Analytical Black Scholes model implementation and approximations
@@ -186,34 +186,59 @@ def bs_vanna(s, t, k, r, q, v, option_type_value):
 
 
 @njit(fastmath=True, cache=True)
-def _f(sigma, args):
-
-    s = args[0]
-    t = args[1]
-    k = args[2]
-    r = args[3]
-    q = args[4]
-    price = args[5]
-    option_type_value = int(args[6])
-
-    bsPrice = bs_value(s, t, k, r, q, sigma, option_type_value)
-    obj = bsPrice - price
-    return obj
-
-##############################################################################
-
-
-@njit(fastmath=True, cache=True)
-def _fvega(sigma, args):
-
-    s = args[0]
-    t = args[1]
-    k = args[2]
-    r = args[3]
-    q = args[4]
-    option_type_value = int(args[6])
-    vega = bs_vega(s, t, k, r, q, sigma, option_type_value)
-    return vega
+def bs_greeks(s, t, k, r, q, v, option_type_value):
+    """ Calculate the Black-Scholes value, delta, gamma, vega, theta, rho and
+    vanna of a vector of European options in a single pass. The inputs are
+    one-dimensional arrays of the same length. The d1 and d2 terms and the
+    discounting are computed once per option and shared by all of the
+    outputs, which agree with bs_value, bs_delta and the other functions. """
+
+    num_options = len(s)
+
+    values = np.empty(num_options)
+    deltas = np.empty(num_options)
+    gammas = np.empty(num_options)
+    vegas = np.empty(num_options)
+    thetas = np.empty(num_options)
+    rhos = np.empty(num_options)
+    vannas = np.empty(num_options)
+
+    for i in range(0, num_options):
+
+        if option_type_value[i] == OptionTypes.EUROPEAN_CALL.value:
+            phi = 1.0
+        elif option_type_value[i] == OptionTypes.EUROPEAN_PUT.value:
+            phi = -1.0
+        else:
+            raise FinError("Unknown option type value")
+
+        kk = max(k[i], gSmall)
+        tt = max(t[i], gSmall)
+        vv = max(v[i], gSmall)
+
+        sqrtT = np.sqrt(tt)
+        vsqrtT = vv * sqrtT
+        dq = np.exp(-q[i]*tt)
+        dr = np.exp(-r[i]*tt)
+        ss = s[i] * dq
+        kdr = kk * dr
+        d1 = np.log(ss/kdr) / vsqrtT + vsqrtT / 2.0
+        d2 = d1 - vsqrtT
+
+        nd1 = N(phi * d1)
+        nd2 = N(phi * d2)
+        npd1 = nprime(d1)
+
+        values[i] = phi * ss * nd1 - phi * kdr * nd2
+        deltas[i] = phi * dq * nd1
+        gammas[i] = dq * npd1 / s[i] / vsqrtT
+        vegas[i] = ss * sqrtT * npd1
+        thetas[i] = - ss * npd1 * vv / 2.0 / sqrtT \
+            - phi * r[i] * kdr * nd2 + phi * q[i] * ss * nd1
+        rhos[i] = phi * kdr * tt * nd2
+        vannas[i] = dq * sqrtT * npd1 * (d2 / vv)
+
+    return values, deltas, gammas, vegas, thetas, rhos, vannas
 
 ###############################################################################
 
@@ -236,117 +261,100 @@ def bs_intrinsic(s, t, k, r, q, option_type_value):
 ###############################################################################
 
 
-# @vectorize([float64(float64, float64, float64, float64, float64, float64,
-#                    int64)], fastmath=True, cache=True,  forceobj=True)
+@vectorize([float64(float64, float64, float64, float64, float64, float64,
+                    int64)], cache=True)
 def bs_implied_volatility(s, t, k, r, q, price, option_type_value):
     """ Calculate the Black-Scholes implied volatility of a European
-    vanilla option using Newton with a fallback to bisection. """
-
-    fwd = s * np.exp((r-q)*t)
+    vanilla option. This is compiled and vectorised so arrays of prices,
+    strikes and expiries can be inverted in one call. The price is first
+    converted to the price of the out-of-the-money option using put-call
+    parity. A safeguarded Newton iteration then starts from the point of
+    inflexion of the price as a function of volatility. Below this point
+    the price is convex and the log of the price is solved instead, so each
+    iteration stays inside a bracket which is narrowed as it proceeds. NaN
+    is returned if the price is outside the no-arbitrage bounds. """
+
+    if option_type_value != OptionTypes.EUROPEAN_CALL.value and \
+            option_type_value != OptionTypes.EUROPEAN_PUT.value:
+        raise FinError("Unknown option type value")
 
-    if option_type_value == OptionTypes.EUROPEAN_CALL.value:
-        intrinsic_value = np.exp(-r*t) * max(fwd - k, 0.0)
-    else:
-        intrinsic_value = np.exp(-r*t) * max(k - fwd, 0.0)
+    if t <= 0.0 or s <= 0.0 or k <= 0.0:
+        return np.nan
 
-    divAdjStockPrice = s * np.exp(-q * t)
-    df = np.exp(-r * t)
+    ss = s * np.exp(-q * t)
+    kk = k * np.exp(-r * t)
 
     # Flip ITM call option to be OTM put and vice-versa using put call parity
-    if intrinsic_value > 0.0:
-
-        if option_type_value == OptionTypes.EUROPEAN_CALL.value:
-            price = price - (divAdjStockPrice - k * df)
-            option_type_value = OptionTypes.EUROPEAN_PUT.value
-        else:
-            price = price + (divAdjStockPrice - k * df)
-            option_type_value = OptionTypes.EUROPEAN_CALL.value
-
-        # Update intrinsic based on new option type
-        if option_type_value == OptionTypes.EUROPEAN_CALL.value:
-            intrinsic_value = np.exp(-r*t) * max(fwd - k, 0.0)
-        else:
-            intrinsic_value = np.exp(-r*t) * max(k - fwd, 0.0)
-
-    timeValue = price - intrinsic_value
-
-    # Add a tolerance in case it is just numerical imprecision
-    if timeValue < 0.0:
-        print("Time value", timeValue)
-        raise FinError("Option Price is below the intrinsic value")
-
-    ###########################################################################
-    # Some approximations which might be used later
-    ###########################################################################
-
     if option_type_value == OptionTypes.EUROPEAN_CALL.value:
-        C = price
+        call_price = price
     else:
-        C = price + (divAdjStockPrice - k * df)
-
-    # Notation in SSRN-id567721.pdf
-    X = k * np.exp(-r*t)
-    S = s*np.exp(-q*t)
-    pi = np.pi
-
-    ###########################################################################
-    # Initial point of inflexion
-    ###########################################################################
-
-    # arg = np.abs(np.log(fwd/k))
-    # sigma0 = np.sqrt(2.0 * arg)
-
-    ###########################################################################
-    # Corrado Miller from Hallerbach equation (7)
-    ###########################################################################
+        call_price = price + (ss - kk)
 
-    cmsigma = 0.0
-    # arg = (C - 0.5*(S-X))**2 - ((S-X)**2)/ pi
+    if ss > kk:
+        otm_price = call_price - (ss - kk)
+        otm_type_value = OptionTypes.EUROPEAN_PUT.value
+        upper_bound = kk
+    else:
+        otm_price = call_price
+        otm_type_value = OptionTypes.EUROPEAN_CALL.value
+        upper_bound = ss
 
-    # if arg < 0.0:
-    #     arg = 0.0
+    if not (otm_price >= 0.0 and otm_price < upper_bound):
+        return np.nan
 
-    # cmsigma = (C-0.5*(S-X) + np.sqrt(arg))
-    # cmsigma = cmsigma * np.sqrt(2.0*pi) / (S+X)
-    # cmsigma = cmsigma / np.sqrt(t)
+    if otm_price == 0.0:
+        return 0.0
 
-    ###########################################################################
-    # Hallerbach SSRN-id567721.pdf equation (22)
-    ###########################################################################
+    sqrtT = np.sqrt(t)
+    x = np.log(ss / kk)
 
-    hsigma = 0.0
-    gamma = 2.0
-    arg = (2*C+X-S)**2 - gamma * (S+X)*(S-X)*(S-X) / pi / S
+    # The price is convex in volatility below the point of inflexion and
+    # concave above it so Newton converges from there in either direction
+    if np.abs(x) > 1e-8:
+        sigma = np.sqrt(2.0 * np.abs(x)) / sqrtT
+    else:
+        sigma = otm_price * np.sqrt(2.0 * np.pi) / ss / sqrtT
 
-    if arg < 0.0:
-        arg = 0.0
+    use_log = otm_price < bs_value(s, t, k, r, q, sigma, otm_type_value)
 
-    hsigma = (2 * C + X - S + np.sqrt(arg))
-    hsigma = hsigma * np.sqrt(2.0*pi) / 2.0 / (S+X)
-    hsigma = hsigma / np.sqrt(t)
+    lower = 0.0
+    upper = -1.0  # no upper bracket yet
+    tol = 1e-12
 
-    sigma0 = hsigma
+    for _ in range(0, 100):
 
-    ###########################################################################
+        value = bs_value(s, t, k, r, q, sigma, otm_type_value)
 
-    arglist = [s, t, k, r, q, price, option_type_value]
-    argsv = np.array(arglist)
+        if value > otm_price:
+            upper = sigma
+        else:
+            lower = sigma
+
+        d1 = x / (sigma * sqrtT) + sigma * sqrtT / 2.0
+        vega = ss * sqrtT * np.exp(-d1 * d1 / 2.0) / np.sqrt(2.0 * np.pi)
+
+        # A step is only taken where the vega is not vanishingly small
+        if vega > 1e-14 * ss:
+            if use_log and value > 0.0:
+                step = np.log(value / otm_price) * value / vega
+            else:
+                step = (value - otm_price) / vega
+            sigma_new = sigma - step
+        else:
+            sigma_new = -1.0
 
-    tol = 1e-6
-    sigma = newton(_f, sigma0, _fvega, argsv, tol=tol)
+        # Bisect if the Newton step leaves the bracket
+        if not (np.isfinite(sigma_new) and sigma_new > lower and
+                (upper < 0.0 or sigma_new < upper)):
+            if upper < 0.0:
+                sigma_new = 2.0 * sigma
+            else:
+                sigma_new = 0.5 * (lower + upper)
 
-    if sigma is None:
-        sigma = bisection(_f, 1e-4, 10.0, argsv, xtol=tol)
-        if sigma is None:
-            method = "Failed"
-        else:
-            method = "Bisection"
-    else:
-        method = "Newton"
+        if np.abs(sigma_new - sigma) < tol * max(sigma, 1.0):
+            return sigma_new
 
-    if 1 == 0:
-        print("S: %7.2f K: %7.3f T:%5.3f V:%10.7f Sig0: %7.5f CM: %7.5f HL: %7.5f NW: %7.5f %10s" % (
-            s, k, t, price, sigma0*100.0, cmsigma*100.0, hsigma*100.0, sigma*100.0, method))
+        sigma = sigma_new
 
     return sigma
 
@@ -475,7 +483,7 @@ def baw_value(s, t, k, r, q, v, phi):
 ###############################################################################
 
 
-@njit(fastmath=True)
+@njit(fastmath=True, cache=True)
 def bjerksund_stensland_value(s, t, k, r, q, v, option_type_value):
     """ Price American Option using the Bjerksund-Stensland
     approximation (1993) for the Black Scholes Model """
@@ -101,7 +101,7 @@ def get_paths_assets(num_assets,
 #                   float64[:],
 #                   float64[:, :], int64),
 #                   cache=True, fastmath=True)
-@njit
+@njit(cache=True)
 def get_assets(num_assets,
                num_paths,
                t,
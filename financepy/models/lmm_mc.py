@@ -4,7 +4,7 @@
 
 from enum import Enum
 import numpy as np
-from numba import njit, float64, int64  # , prange DOES NOT WORK ON GITHUB
+from numba import njit, prange, float64, int64
 
 from ..utils.error import FinError
 from ..utils.math import N
@@ -627,43 +627,35 @@ def lmm_cap_flr_pricer(num_fwds, num_paths, K, fwd0, fwds, taus, isCap):
     if num_paths > max_paths:
         raise FinError("NumPaths > MaxPaths")
 
-    discFactor = np.zeros(num_fwds)
-    capFlrLets = np.zeros(num_fwds-1)
-    capFlrLetValues = np.zeros(num_fwds-1)
+    if isCap != 0 and isCap != 1:
+        raise FinError("isCap should be 0 or 1")
+
+    discFactor0 = 1.0 / (1.0 + fwd0[0] * taus[0])
+    capFlrLets = np.zeros(num_fwds)
+    capFlrLetValues = np.zeros(num_fwds)
     numeraire = np.zeros(num_fwds)
 
     for i_path in range(0, num_paths):
 
-        periodRoll = 1.0
-        libor = fwds[i_path, 0, 0]
-        capFlrLets[0] = max(K - libor, 0.0) * taus[0]
-
         # Now loop over the caplets starting with one that fixes immediately
         # but which may have intrinsic value that cannot be ignored.
         for j in range(0, num_fwds):
 
             libor = fwds[i_path, j, j]
-            if j == 1:
-                if isCap == 0:
-                    capFlrLets[j] = max(K - libor, 0.0) * taus[j]
-                else:
-                    capFlrLets[j] = max(libor - K, 0.0) * taus[j]
 
-                numeraire[0] = 1.0 / discFactor[0]
+            if isCap == 1:
+                capFlrLets[j] = max(libor - K, 0.0) * taus[j]
             else:
-                if isCap == 1:
-                    capFlrLets[j] = max(libor - K, 0.0) * taus[j]
-                elif isCap == 0:
-                    capFlrLets[j] = max(K - libor, 0.0) * taus[j]
-                else:
-                    raise FinError("isCap should be 0 or 1")
+                capFlrLets[j] = max(K - libor, 0.0) * taus[j]
 
-            periodRoll = (1.0 + libor * taus[j])
-            numeraire[j] = numeraire[j - 1] * periodRoll
+            if j == 0:
+                numeraire[0] = 1.0 / discFactor0
+            else:
+                periodRoll = (1.0 + libor * taus[j])
+                numeraire[j] = numeraire[j - 1] * periodRoll
 
         for iFwd in range(0, num_fwds):
-            denom = abs(numeraire[iFwd]) + 1e-12
-            capFlrLetValues[iFwd] += capFlrLets[iFwd] / denom
+            capFlrLetValues[iFwd] += capFlrLets[iFwd] / numeraire[iFwd]
 
     for iFwd in range(0, num_fwds):
         capFlrLetValues[iFwd] /= num_paths
@@ -978,3 +970,708 @@ def lmm_sticky_caplet_pricer(spread, num_periods, num_paths, fwd0, fwds, taus):
     return stickyCapletValues
 
 ###############################################################################
+
+###############################################################################
+# PARALLEL VERSIONS
+###############################################################################
+# The functions below are opt-in parallel versions of the simulation and
+# pricing functions above. They split the paths into fixed blocks of
+# PATH_BLOCK_SIZE paths which are shared out over the threads with prange.
+# Each block of pseudo-random paths has its own random number stream seeded
+# from the seed and the block number, and the blocks are summed in order, so
+# the results do not depend on the number of threads. They do differ from
+# the serial versions which draw all of the paths from a single stream. With
+# Sobol numbers the forwards are the same as those of the serial versions.
+###############################################################################
+
+PATH_BLOCK_SIZE = 64
+
+###############################################################################
+
+
+@njit(int64(int64, int64), cache=True)
+def _block_seed(seed, block):
+    """ Mix the seed and the block number using the SplitMix64 hash to give a
+    seed for the random number stream of a block of paths. """
+
+    z = np.uint64(seed) + np.uint64(block + 1) * np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    # Numpy seeds must be less than 2^32
+    return np.int64(z >> np.uint64(32))
+
+###############################################################################
+
+
+@njit(float64[:, :](int64, int64, int64), cache=True, fastmath=True,
+      parallel=True)
+def _antithetic_normals(num_paths, num_dims, seed):
+    """ Generate a matrix of num_paths x num_dims Gaussian random numbers
+    where the second half of the paths are antithetics of the first half.
+    Each block of paths uses its own random number stream. """
+
+    half_num_paths = int(num_paths/2)
+    num_blocks = (half_num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    g_matrix = np.empty((num_paths, num_dims))
+
+    for i_block in prange(0, num_blocks):
+
+        np.random.seed(_block_seed(seed, i_block))
+
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, half_num_paths)
+
+        for i_path in range(start, end):
+            for j in range(0, num_dims):
+                g = np.random.normal()
+                g_matrix[i_path, j] = g
+                g_matrix[i_path + half_num_paths, j] = -g
+
+    return g_matrix
+
+###############################################################################
+
+
+@njit(float64[:, :](int64, int64), cache=True, fastmath=True, parallel=True)
+def _antithetic_sobol_normals(num_paths, num_dims):
+    """ Generate a matrix of num_paths x num_dims Gaussian random numbers
+    from Sobol numbers where the second half of the paths are antithetics
+    of the first half. """
+
+    half_num_paths = int(num_paths/2)
+    rands = get_uniform_sobol(half_num_paths, num_dims)
+    g_matrix = np.empty((num_paths, num_dims))
+
+    for i_path in prange(0, half_num_paths):
+        for j in range(0, num_dims):
+            g = norminvcdf(rands[i_path, j])
+            g_matrix[i_path, j] = g
+            g_matrix[i_path + half_num_paths, j] = -g
+
+    return g_matrix
+
+###############################################################################
+
+
+@njit(float64[:, :, :](int64, int64, float64[:], float64[:], float64[:, :],
+                       float64[:], int64), cache=True, fastmath=True,
+      parallel=True)
+def lmm_simulate_fwds_nf_parallel(num_fwds, num_paths, fwd0, zetas, correl,
+                                  taus, seed):
+    """ Parallel version of lmm_simulate_fwds_nf. Full N-Factor simulation of
+    the forward Ibors in the spot measure using a Cholesky decomposition of
+    the correlation matrix. The 3D matrix of forward rates by path, time and
+    forward point is returned. """
+
+    # Even number of paths for antithetics
+    num_paths = 2 * int(num_paths/2)
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+
+    fwd = np.empty((num_paths, num_fwds, num_fwds))
+
+    # The correlation and factor matrices for each time are padded to the
+    # same size so they can be shared by the threads
+    corr = np.zeros((num_fwds, num_fwds, num_fwds))
+    factors = np.zeros((num_fwds, num_fwds, num_fwds))
+
+    for ix in range(1, num_fwds):
+        matrix = sub_matrix(correl, ix - 1)
+        chol = cholesky_np(matrix)
+        n = len(matrix)
+        corr[ix, 0:n, 0:n] = matrix
+        factors[ix, 0:n, 0:n] = chol
+
+    g_matrix = _antithetic_normals(num_paths, num_fwds * num_fwds, seed)
+
+    for i_block in prange(0, num_blocks):
+
+        fwdB = np.zeros(num_fwds)
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            # Initial value of forward curve at time 0
+            for iFwd in range(0, num_fwds):
+                fwd[i_path, 0, iFwd] = fwd0[iFwd]
+
+            for j in range(1, num_fwds):  # TIME LOOP
+
+                dt = taus[j]
+                sqrt_dt = np.sqrt(dt)
+
+                for i in range(j, num_fwds):  # FORWARDS LOOP
+
+                    zi = zetas[i]
+
+                    muA = 0.0
+                    for k in range(j, i+1):
+                        rho = corr[j, k-j, i-j]
+                        fk = fwd[i_path, j-1, k]
+                        zk = zetas[k]
+                        tk = taus[k]
+                        muA += zi * fk * tk * zk * rho / (1.0 + fk * tk)
+
+                    w = 0.0
+                    for k in range(0, num_fwds-j):
+                        f = factors[j, i-j, k]
+                        w = w + f * g_matrix[i_path, j * num_fwds + k]
+
+                    fwdB[i] = fwd[i_path, j-1, i] \
+                        * np.exp(muA * dt - 0.5 * (zi**2) * dt
+                                 + zi * w * sqrt_dt)
+
+                    muB = 0.0
+                    for k in range(j, i+1):
+                        rho = corr[j, k-j, i-j]
+                        fk = fwdB[k]
+                        zk = zetas[k]
+                        tk = taus[k]
+                        muB += zi * fk * tk * zk * rho / (1.0 + fk * tk)
+
+                    muAvg = 0.5*(muA + muB)
+                    x = np.exp(muAvg * dt - 0.5 * (zi**2) * dt
+                               + zi * w * sqrt_dt)
+                    fwd[i_path, j, i] = fwd[i_path, j-1, i] * x
+
+    return fwd
+
+###############################################################################
+
+
+@njit(float64[:, :, :](int64, int64, int64, float64[:], float64[:], float64[:],
+                       int64, int64), cache=True, fastmath=True,
+      parallel=True)
+def lmm_simulate_fwds_1f_parallel(num_fwds, num_paths, numeraireIndex, fwd0,
+                                  gammas, taus, use_sobol, seed):
+    """ Parallel version of lmm_simulate_fwds_1f. One factor simulation of
+    the forward Ibors in the spot measure following Hull Page 768. The 3D
+    matrix of forward rates by path, time and forward point is returned. """
+
+    if len(gammas) != num_fwds:
+        raise FinError("Gamma vector does not have right number of forwards")
+
+    if len(fwd0) != num_fwds:
+        raise FinError("The length of fwd0 is not equal to numForwards")
+
+    if len(taus) != num_fwds:
+        raise FinError("The length of Taus is not equal to numForwards")
+
+    # Even number of paths for antithetics
+    num_paths = 2 * int(num_paths/2)
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    fwd = np.empty((num_paths, num_fwds, num_fwds))
+
+    num_times = num_fwds
+
+    if use_sobol == 1:
+        g_matrix = _antithetic_sobol_normals(num_paths, num_times)
+    elif use_sobol == 0:
+        g_matrix = _antithetic_normals(num_paths, num_times, seed)
+    else:
+        raise FinError("Use Sobol must be 0 or 1")
+
+    for i_block in prange(0, num_blocks):
+
+        fwdB = np.zeros(num_fwds)
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            # Initial value of forward curve at time 0
+            for iFwd in range(0, num_fwds):
+                fwd[i_path, 0, iFwd] = fwd0[iFwd]
+
+            for j in range(0, num_fwds-1):  # TIME LOOP
+                dtj = taus[j]
+                sqrt_dtj = np.sqrt(dtj)
+                w = g_matrix[i_path, j]
+
+                for k in range(j, num_fwds):  # FORWARDS LOOP
+                    zkj = gammas[k-j]
+                    muA = 0.0
+
+                    for i in range(j+1, k+1):
+                        fi = fwd[i_path, j, i]
+                        zij = gammas[i-j]
+                        ti = taus[i]
+                        muA += zkj * fi * ti * zij / (1.0 + fi * ti)
+
+                    # predictor corrector
+                    x = np.exp(muA * dtj - 0.5*(zkj**2) * dtj
+                               + zkj * w * sqrt_dtj)
+                    fwdB[k] = fwd[i_path, j, k] * x
+
+                    muB = 0.0
+                    for i in range(j+1, k+1):
+                        fi = fwdB[k]
+                        zij = gammas[i-j]
+                        ti = taus[i]
+                        muB += zkj * fi * ti * zij / (1.0 + fi * ti)
+
+                    muC = 0.5*(muA+muB)
+
+                    x = np.exp(muC*dtj - 0.5 * (zkj**2) * dtj
+                               + zkj * w * sqrt_dtj)
+                    fwd[i_path, j+1, k] = fwd[i_path, j, k] * x
+
+    return fwd
+
+###############################################################################
+
+
+@njit(float64[:, :, :](int64, int64, int64, int64, float64[:], float64[:, :],
+                       float64[:], int64, int64), cache=True, fastmath=True,
+      parallel=True)
+def lmm_simulate_fwds_mf_parallel(num_fwds, numFactors, num_paths,
+                                  numeraireIndex, fwd0, lambdas, taus,
+                                  use_sobol, seed):
+    """ Parallel version of lmm_simulate_fwds_mf. Multi-Factor simulation of
+    the forward Ibors in the spot measure following Hull Page 768. The 3D
+    matrix of forward rates by path, time and forward point is returned. """
+
+    if len(lambdas) != numFactors:
+        raise FinError("Lambda does not have the right number of factors")
+
+    if len(lambdas[0]) != num_fwds:
+        raise FinError("Lambda does not have the right number of forwards")
+
+    # Even number of paths for antithetics
+    num_paths = 2 * int(num_paths/2)
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    fwd = np.empty((num_paths, num_fwds, num_fwds))
+
+    num_times = num_fwds
+
+    # Column j*numFactors + q holds the shock to factor q at time j
+    if use_sobol == 1:
+        g_matrix = _antithetic_sobol_normals(num_paths, num_times * numFactors)
+    elif use_sobol == 0:
+        g_matrix = _antithetic_normals(num_paths, num_times * numFactors, seed)
+    else:
+        raise FinError("Use Sobol must be 0 or 1.")
+
+    for i_block in prange(0, num_blocks):
+
+        fwdB = np.zeros(num_fwds)
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            # Initial value of forward curve at time 0
+            for iFwd in range(0, num_fwds):
+                fwd[i_path, 0, iFwd] = fwd0[iFwd]
+
+            for j in range(0, num_fwds-1):  # TIME LOOP
+                dtj = taus[j]
+                sqrt_dtj = np.sqrt(dtj)
+
+                for k in range(j, num_fwds):  # FORWARDS LOOP
+
+                    muA = 0.0
+                    for i in range(j+1, k+1):
+                        fi = fwd[i_path, j, i]
+                        ti = taus[i]
+                        zz = 0.0
+                        for q in range(0, numFactors):
+                            zz += lambdas[q, i-j] * lambdas[q, k-j]
+                        muA += fi * ti * zz / (1.0 + fi * ti)
+
+                    itoTerm = 0.0
+                    for q in range(0, numFactors):
+                        itoTerm += lambdas[q, k-j] * lambdas[q, k-j]
+
+                    randomTerm = 0.0
+                    for q in range(0, numFactors):
+                        wq = g_matrix[i_path, j * numFactors + q]
+                        randomTerm += lambdas[q, k-j] * wq
+                    randomTerm *= sqrt_dtj
+
+                    x = np.exp(muA * dtj - 0.5 * itoTerm * dtj + randomTerm)
+                    fwdB[k] = fwd[i_path, j, k] * x
+
+                    muB = 0.0
+                    for i in range(j+1, k+1):
+                        fi = fwdB[k]
+                        ti = taus[i]
+                        zz = 0.0
+                        for q in range(0, numFactors):
+                            zz += lambdas[q, i-j] * lambdas[q, k-j]
+                        muB += fi * ti * zz / (1.0 + fi * ti)
+
+                    muC = 0.5 * (muA + muB)
+
+                    x = np.exp(muC * dtj - 0.5 * itoTerm * dtj + randomTerm)
+                    fwd[i_path, j+1, k] = fwd[i_path, j, k] * x
+
+    return fwd
+
+###############################################################################
+
+
+@njit(float64(int64, int64, float64[:], float64[:, :, :], float64[:]),
+      cache=True, fastmath=True, parallel=True)
+def lmm_sim_swaption_vol_parallel(a, b, fwd0, fwds, taus):
+    """ Parallel version of lmm_sim_swaption_vol. Calculates the swap rate
+    volatility using the forwards generated in the simulation. """
+
+    num_paths = len(fwds)
+    numForwards = len(fwds[0])
+
+    if a > numForwards:
+        raise FinError("NumPeriods > numForwards")
+
+    if a >= b:
+        raise FinError("Swap maturity is before expiry date")
+
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    block_sums = np.zeros((num_blocks, 2))
+
+    for i_block in prange(0, num_blocks):
+
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            pv01 = 0.0
+            df = 1.0
+
+            for k in range(a, b):
+                f = fwds[i_path, a, k]
+                tau = taus[k]
+                df = df / (1.0 + tau * f)
+                pv01 = pv01 + tau * df
+
+            fwdSwapRate = (1.0 - df) / pv01
+
+            block_sums[i_block, 0] += fwdSwapRate
+            block_sums[i_block, 1] += fwdSwapRate**2
+
+    fwdSwapRateMean = 0.0
+    fwdSwapRateVar = 0.0
+
+    for i_block in range(0, num_blocks):
+        fwdSwapRateMean += block_sums[i_block, 0]
+        fwdSwapRateVar += block_sums[i_block, 1]
+
+    taua = 0.0
+    for i in range(0, a):
+        taua += taus[i]
+
+    fwdSwapRateMean /= num_paths
+    fwdSwapRateVar = fwdSwapRateVar/num_paths - fwdSwapRateMean**2
+    fwdSwapRateVol = np.sqrt(fwdSwapRateVar/taua)
+    fwdSwapRateVol /= fwdSwapRateMean
+    return fwdSwapRateVol
+
+###############################################################################
+
+
+@njit(float64[:, :](int64, int64, int64, float64[:, :, :]),
+      cache=True, fastmath=True, parallel=True)
+def lmm_fwd_fwd_correlation_parallel(numForwards, num_paths, i_time, fwds):
+    """ Parallel version of lmm_fwd_fwd_correlation. Extract the forward
+    forward correlation matrix at some future time index from the simulated
+    forward rates. Each thread handles a different row of the matrix. """
+
+    size = numForwards - i_time
+    fwdCorr = np.zeros((size, size))
+
+    for iFwd in prange(i_time, numForwards):
+        for jFwd in range(iFwd, numForwards):
+
+            sumfwdi = 0.0
+            sumfwdj = 0.0
+            sumfwdifwdi = 0.0
+            sumfwdifwdj = 0.0
+            sumfwdjfwdj = 0.0
+
+            for p in range(0, num_paths):
+                dfwdi = fwds[p, i_time, iFwd] - fwds[p, i_time-1, iFwd]
+                dfwdj = fwds[p, i_time, jFwd] - fwds[p, i_time-1, jFwd]
+                sumfwdi += dfwdi
+                sumfwdj += dfwdj
+                sumfwdifwdi += dfwdi * dfwdi
+                sumfwdifwdj += dfwdi * dfwdj
+                sumfwdjfwdj += dfwdj * dfwdj
+
+            avgfwdi = sumfwdi / num_paths
+            avgfwdj = sumfwdj / num_paths
+            avgfwdifwdi = sumfwdifwdi / num_paths
+            avgfwdifwdj = sumfwdifwdj / num_paths
+            avgfwdjfwdj = sumfwdjfwdj / num_paths
+
+            covii = avgfwdifwdi - avgfwdi * avgfwdi
+            covjj = avgfwdjfwdj - avgfwdj * avgfwdj
+            covij = avgfwdifwdj - avgfwdi * avgfwdj
+
+            corr = 0.0
+            if abs(covii*covjj) > 1e-20:
+                corr = covij / np.sqrt(covii*covjj)
+
+            fwdCorr[iFwd-i_time, jFwd-i_time] = corr
+            fwdCorr[jFwd-i_time, iFwd-i_time] = corr
+
+    return fwdCorr
+
+###############################################################################
+
+
+@njit(float64[:](int64, int64, float64, float64[:], float64[:, :, :],
+                 float64[:], int64), cache=True, fastmath=True, parallel=True)
+def lmm_cap_flr_pricer_parallel(num_fwds, num_paths, K, fwd0, fwds, taus,
+                                isCap):
+    """ Parallel version of lmm_cap_flr_pricer. Price a strip of cap or
+    floorlets using the simulated forward curve dynamics. """
+
+    max_paths = len(fwds)
+    max_fwds = len(fwds[0])
+
+    if num_fwds > max_fwds:
+        raise FinError("NumForwards > maxForwards")
+
+    if num_paths > max_paths:
+        raise FinError("NumPaths > MaxPaths")
+
+    if isCap != 0 and isCap != 1:
+        raise FinError("isCap should be 0 or 1")
+
+    discFactor0 = 1.0 / (1.0 + fwd0[0] * taus[0])
+
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    block_values = np.zeros((num_blocks, num_fwds))
+
+    for i_block in prange(0, num_blocks):
+
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            numeraire = 1.0 / discFactor0
+
+            for j in range(0, num_fwds):
+
+                libor = fwds[i_path, j, j]
+
+                if isCap == 1:
+                    capFlrLet = max(libor - K, 0.0) * taus[j]
+                else:
+                    capFlrLet = max(K - libor, 0.0) * taus[j]
+
+                if j > 0:
+                    numeraire *= (1.0 + libor * taus[j])
+
+                block_values[i_block, j] += capFlrLet / numeraire
+
+    capFlrLetValues = np.zeros(num_fwds)
+    for i_block in range(0, num_blocks):
+        for iFwd in range(0, num_fwds):
+            capFlrLetValues[iFwd] += block_values[i_block, iFwd]
+
+    for iFwd in range(0, num_fwds):
+        capFlrLetValues[iFwd] /= num_paths
+
+    return capFlrLetValues
+
+###############################################################################
+
+
+@njit(float64(float64, int64, int64, int64, float64[:], float64[:, :, :],
+              float64[:], int64), cache=True, fastmath=True, parallel=True)
+def lmm_swaption_pricer_parallel(strike, a, b, num_paths, fwd0, fwds, taus,
+                                 isPayer):
+    """ Parallel version of lmm_swaption_pricer. Price a European swaption
+    using the simulated forward discount. """
+
+    maxPaths = len(fwds)
+    maxForwards = len(fwds[0])
+
+    if a > maxForwards:
+        raise FinError("NumPeriods > numForwards")
+
+    if a >= b:
+        raise FinError("Swap maturity is before expiry date")
+
+    if num_paths > maxPaths:
+        raise FinError("NumPaths > MaxPaths")
+
+    if isPayer != 0 and isPayer != 1:
+        raise FinError("Unknown payRecSwaption value - must be 0 or 1")
+
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    block_sums = np.zeros(num_blocks)
+
+    for i_block in prange(0, num_blocks):
+
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            numeraire = 1.0
+            for k in range(0, a):
+                numeraire *= (1.0 + taus[k] * fwds[i_path, k, k])
+
+            pv01 = 0.0
+            df = 1.0
+
+            # Value the swap as if we were at time a with forward curve known
+            for k in range(a, b):
+                f = fwds[i_path, a, k]
+                tau = taus[k]
+                df = df / (1.0 + tau * f)
+                pv01 = pv01 + tau * df
+
+            fwdSwapRate = (1.0 - df) / pv01
+
+            if isPayer == 1:
+                payRecSwaption = max(fwdSwapRate - strike, 0.0) * pv01
+            else:
+                payRecSwaption = max(strike - fwdSwapRate, 0.0) * pv01
+
+            block_sums[i_block] += payRecSwaption / (abs(numeraire) + 1e-10)
+
+    sumPayRecSwaption = 0.0
+    for i_block in range(0, num_blocks):
+        sumPayRecSwaption += block_sums[i_block]
+
+    payRecPrice = sumPayRecSwaption / num_paths
+    return payRecPrice
+
+###############################################################################
+
+
+@njit(float64[:, :](int64, int64, int64, int64, float64, float64,
+                    float64[:], float64[:, :, :], float64[:]),
+      cache=True, fastmath=True, parallel=True)
+def _lmm_path_dependent_caplets(payoff_type, num_periods, num_paths,
+                                maxCaplets, K, spread, fwd0, fwds, taus):
+    """ Sum over blocks of paths of the discounted ratchet (payoff_type 0),
+    sticky (1) or flexi (2) caplets. The block sums are returned so that the
+    caller can add them in a fixed order. """
+
+    maxPaths = len(fwds)
+    maxForwards = len(fwds[0][0])
+
+    if num_periods > maxForwards:
+        raise FinError("NumPeriods > numForwards")
+
+    if num_paths > maxPaths:
+        raise FinError("NumPaths > MaxPaths")
+
+    discFactor0 = 1.0 / (1.0 + fwd0[0] * taus[0])
+
+    num_blocks = (num_paths + PATH_BLOCK_SIZE - 1) // PATH_BLOCK_SIZE
+    block_values = np.zeros((num_blocks, maxForwards))
+
+    for i_block in prange(0, num_blocks):
+
+        start = i_block * PATH_BLOCK_SIZE
+        end = min(start + PATH_BLOCK_SIZE, num_paths)
+
+        for i_path in range(start, end):
+
+            libor = fwds[i_path, 0, 0]
+            numeraire = 1.0 / discFactor0
+            strike = libor
+            numCapletsLeft = maxCaplets
+
+            for j in range(1, num_periods):  # TIME LOOP
+
+                prevIbor = libor
+                libor = fwds[i_path, j, j]
+                caplet = 0.0
+
+                if payoff_type == 0:
+                    strike = prevIbor + spread
+                    caplet = max(libor - strike, 0.0) * taus[j]
+                elif payoff_type == 1:
+                    strike = min(prevIbor, strike) + spread
+                    caplet = max(libor - strike, 0.0) * taus[j]
+                elif libor > K and numCapletsLeft > 0:
+                    caplet = (libor - K) * taus[j]
+                    numCapletsLeft -= 1
+
+                numeraire *= (1.0 + libor * taus[j])
+                block_values[i_block, j] += caplet / numeraire
+
+    return block_values
+
+###############################################################################
+
+
+@njit(float64[:](float64[:, :], int64), cache=True, fastmath=True)
+def _sum_block_values(block_values, num_paths):
+    """ Add up the block sums in order and average over the paths. """
+
+    num_blocks, num_values = block_values.shape
+    values = np.zeros(num_values)
+
+    for i_block in range(0, num_blocks):
+        for i in range(0, num_values):
+            values[i] += block_values[i_block, i]
+
+    for i in range(0, num_values):
+        values[i] /= num_paths
+
+    return values
+
+###############################################################################
+
+
+@njit(float64[:](float64, int64, int64, float64[:], float64[:, :, :],
+                 float64[:]), cache=True, fastmath=True)
+def lmm_ratchet_caplet_pricer_parallel(spd, num_periods, num_paths, fwd0,
+                                       fwds, taus):
+    """ Parallel version of lmm_ratchet_caplet_pricer. Price a ratchet using
+    the simulated Ibor rates. """
+
+    block_values = _lmm_path_dependent_caplets(0, num_periods, num_paths, 0,
+                                               0.0, spd, fwd0, fwds, taus)
+
+    return _sum_block_values(block_values, num_paths)
+
+###############################################################################
+
+
+@njit(float64[:](float64, int64, int64, float64[:], float64[:, :, :],
+                 float64[:]), cache=True, fastmath=True)
+def lmm_sticky_caplet_pricer_parallel(spread, num_periods, num_paths, fwd0,
+                                      fwds, taus):
+    """ Parallel version of lmm_sticky_caplet_pricer. Price a sticky cap
+    using the simulated Ibor rates. """
+
+    block_values = _lmm_path_dependent_caplets(1, num_periods, num_paths, 0,
+                                               0.0, spread, fwd0, fwds, taus)
+
+    return _sum_block_values(block_values, num_paths)
+
+###############################################################################
+
+
+@njit(float64(int64, float64, int64, int64, float64[:], float64[:, :, :],
+              float64[:]), cache=True, fastmath=True)
+def lmm_flexi_cap_pricer_parallel(maxCaplets, K, num_periods, num_paths,
+                                  fwd0, fwds, taus):
+    """ Parallel version of lmm_flexi_cap_pricer. Price a flexicap using the
+    simulated Ibor rates. Unlike the serial version, a caplet that is not
+    exercised on a path is worth zero on that path. """
+
+    block_values = _lmm_path_dependent_caplets(2, num_periods, num_paths,
+                                               maxCaplets, K, 0.0, fwd0,
+                                               fwds, taus)
+
+    flexiCapletValues = _sum_block_values(block_values, num_paths)
+
+    flexiCapValue = 0.0
+    for iFwd in range(0, num_periods):
+        flexiCapValue += flexiCapletValues[iFwd]
+
+    return flexiCapValue
+
+###############################################################################
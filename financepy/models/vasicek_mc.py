@@ -61,7 +61,8 @@ def zero_price(r0, a, b, sigma, t):
 ###############################################################################
 
 
-@njit(float64[:](float64, float64, float64, float64, float64, float64, int64))
+@njit(float64[:](float64, float64, float64, float64, float64, float64, int64),
+      cache=True)
 def rate_path_mc(r0, a, b, sigma, t, dt, seed):
 
     np.random.seed(seed)
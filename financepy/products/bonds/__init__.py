@@ -1,13 +1,30 @@
-from .bond import *
-from .bond_zero import *
-from .bond_annuity import *
-from .zero_curve import *
-from .bond_convertible import *
-from .bond_callable import *
-from .bond_frn import *
-from .bond_future import *
-from .bond_market import *
-from .bond_option import *
-from .yield_curve import *
-from .yield_curve_model import *
-from .bond_mortgage import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'bond': ['Bond', 'yields_to_maturity', 'YTMCalcType'],
+    'bond_universe': ['BondUniverse', 'DateArray'],
+    'bond_zero': ['BondZero', 'Calendar', 'gSmall', 'npv'],
+    'bond_annuity': ['BondAnnuity'],
+    'zero_curve': ['BondZeroCurve', 'input_time', 'interpolate',
+                   'table_to_string'],
+    'bond_convertible': ['BondConvertible', 'InterpTypes', 'print_tree',
+                         'test_monotonicity'],
+    'bond_callable': ['BKTree', 'BondEmbeddedOption', 'BondOptionTypes',
+                      'HWTree'],
+    'bond_frn': ['BondFRN', 'DayCount'],
+    'bond_future': ['BondFuture'],
+    'bond_market': ['BondMarkets', 'get_bond_market_conventions'],
+    'bond_option': ['BondModelTypes', 'BondOption', 'DiscountCurve',
+                    'FinExerciseTypes', 'OptionTypes'],
+    'yield_curve': ['BondYieldCurve', 'gDaysInYear', 'scale'],
+    'yield_curve_model': ['CurveFitBSpline', 'CurveFitNelsonSiegel',
+                          'CurveFitNelsonSiegelSvensson', 'CurveFitPolynomial',
+                          'FinCurveFitMethod'],
+    'bond_mortgage': ['annual_frequency', 'BondMortgage', 'BondMortgageTypes',
+                      'BusDayAdjustTypes', 'CalendarTypes',
+                      'check_argument_types', 'Date', 'DateGenRuleTypes',
+                      'DayCountTypes', 'FinError', 'FrequencyTypes',
+                      'JointCalendar', 'label_to_string', 'Schedule']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
@@ -21,6 +21,9 @@
 # GET THE COUPON AND THE ACCRUED INTEREST EQUALS THE COUPON.
 ###############################################################################
 
+import bisect
+import warnings
+
 import numpy as np
 from scipy import optimize
 
@@ -31,13 +34,14 @@ from ...utils.global_vars import gDaysInYear, gSmall
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.schedule import Schedule
 from ...utils.calendar import Calendar
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
 from ...utils.helpers import label_to_string, check_argument_types
 from ...utils.math import npv
 from ...market.curves.discount_curve import DiscountCurve
-from ...market.curves.interpolator import InterpTypes
+from ...market.curves.interpolator import InterpTypes, interpolate
+from ...market.curves.interpolator import _vinterpolate_gradient
 from .zero_curve import BondZeroCurve
 
 # References https://www.dmo.gov.uk/media/15011/yldeqns_v1.pdf
@@ -61,16 +65,165 @@ class YTMCalcType(Enum):
 ###############################################################################
 
 
-def _f(ytm, *args):
-    """ Function used to do root search in price to yield calculation. """
-    bond = args[0]
-    settle_dt = args[1]
-    price = args[2]
-    convention = args[3]
-    px = bond.dirty_price_from_ytm(settle_dt, ytm, convention)
-    obj_fn = px - price
-    return obj_fn
+def _price_from_ytm(ytm, c, f, n, alpha, pay_first_cpn, last_alpha,
+                    convention):
+    """ Calculate the dirty price per unit par of a bond from its yield to
+    maturity and the derivative of the price with respect to the yield. The
+    coupon c, frequency f, number of coupons n after the next coupon, the
+    fraction alpha of a coupon period to the next coupon, the ex-dividend
+    flag and the accrual factor used by CFETS in the final coupon period can
+    be arrays of the same shape as the yield so that the prices of many
+    bonds are calculated together. """
+
+    ytm = np.asarray(ytm, dtype=np.float64)
+    ytm = ytm + 0.000000000012345  # SNEAKY LOW-COST TRICK TO AVOID y=0
+
+    v = 1.0 / (1.0 + ytm / f)
+    dv_dy = -v * v / f
+
+    # Price of the flows from the next coupon to maturity
+    term1 = (c / f) * pay_first_cpn
+    term2 = (c / f) * v
+    term3 = (c / f) * v * v * (1.0 - v ** (n - 1)) / (1.0 - v)
+    term4 = (v ** n)
+    s = term1 + term2 + term3 + term4
+
+    # The derivative of term2 plus term3 is (c/f) * sum of k v^(k-1) for k
+    # from 1 to n. Close to v = 1 the closed form loses precision so the
+    # limit is used instead as Newton only needs an approximate slope.
+    w = 1.0 - v
+    near_one = np.abs(w) < 1e-5
+    w = np.where(near_one, 1.0, w)
+    geometric = (1.0 - (n + 1) * v ** n + n * v ** (n + 1)) / w / w
+    geometric = np.where(near_one, 0.5 * n * (n + 1), geometric)
+    ds_dy = ((c / f) * geometric + n * v ** (n - 1)) * dv_dy
+
+    # Discounting to the settlement date over the fraction alpha of a period
+    va = v ** alpha
+    dva_dy = alpha * v ** (alpha - 1.0) * dv_dy
+
+    vw = 1.0 / (1.0 + alpha * ytm / f)
+    dvw_dy = -alpha * vw * vw / f
+
+    if convention == YTMCalcType.UK_DMO:
+        last = 1.0 + pay_first_cpn * c / f
+        dp = np.where(n == 0, va * last, va * s)
+        ddp = np.where(n == 0, dva_dy * last, dva_dy * s + va * ds_dy)
+    elif convention == YTMCalcType.US_TREASURY:
+        last = 1.0 + c / f
+        dp = np.where(n == 0, va * last, vw * s)
+        ddp = np.where(n == 0, dva_dy * last, dvw_dy * s + vw * ds_dy)
+    elif convention == YTMCalcType.US_STREET:
+        last = 1.0 + c / f
+        dp = np.where(n == 0, vw * last, va * s)
+        ddp = np.where(n == 0, dvw_dy * last, dva_dy * s + va * ds_dy)
+    elif convention == YTMCalcType.CFETS:
+        last = 1.0 + c / f
+        vl = 1.0 / (1.0 + last_alpha * ytm)
+        dp = np.where(n == 0, vl * last, va * s)
+        ddp = np.where(n == 0, -last_alpha * vl * vl * last,
+                       dva_dy * s + va * ds_dy)
+    else:
+        raise FinError("Unknown yield convention")
+
+    return dp[()], ddp[()]
+
+###############################################################################
+
+
+def _solve_ytm(dirty_prices, c, f, n, alpha, pay_first_cpn, last_alpha,
+               convention, tol=1e-10, max_iter=50):
+    """ Solve for the yields to maturity that give dirty prices per unit
+    par using Newton's method with the analytic derivative of the price. All
+    of the prices are solved together. Returns the yields and a boolean
+    array which is False where the solve did not converge. """
+
+    dirty_prices = np.asarray(dirty_prices, dtype=np.float64)
+    ytms = np.full(dirty_prices.shape, 0.05)  # guess initial value of 5%
+    converged = np.zeros(dirty_prices.shape, dtype=bool)
+
+    for _ in range(max_iter):
+
+        price, slope = _price_from_ytm(ytms, c, f, n, alpha, pay_first_cpn,
+                                       last_alpha, convention)
+
+        step = (price - dirty_prices) / slope
+        ytms = ytms - step
+
+        # The yield must stay above -f for the discount factor to be positive
+        ytms = np.maximum(ytms, -0.99 * f)
+
+        converged = np.abs(step) < tol
+        if np.all(converged):
+            break
+
+    return ytms, converged
+
+###############################################################################
+
+
+def _key_rate_curve(settle_dt, key_rate_tenors, rates, freq_type, dc_type):
+    """ Fit a zero curve to par bonds maturing at the key rate tenors whose
+    yields are the key rates and return it with the sensitivity of its
+    discount factors to the key rates. Each row of the sensitivity matrix is
+    a curve pillar after the settlement date and each column is a key rate.
+    This is found by differentiating the exact fit of the bootstrap so that
+    a single curve is built instead of two for each key rate. """
+
+    us_street = YTMCalcType.US_STREET
+    lin_zero_interp = InterpTypes.LINEAR_ZERO_RATES
+
+    # Create set of par bonds to be used in BondZeroCurve
+    # ytm and coupons are equal
+    par_bonds = []
+    clean_prices = []
+
+    for tenor, cpn in zip(key_rate_tenors, rates):
+        mat_dt = settle_dt.add_years(tenor)
+        par_bond = Bond(settle_dt, mat_dt, cpn, freq_type, dc_type)
+        clean_price = par_bond.clean_price_from_ytm(settle_dt, cpn, us_street)
+        par_bonds.append(par_bond)
+        clean_prices.append(clean_price)
+
+    par_crv = BondZeroCurve(settle_dt, par_bonds, clean_prices,
+                            lin_zero_interp)
+
+    method = lin_zero_interp.value
+    num_rates = len(par_bonds)
+
+    # The bootstrap sets the curve price of each par bond equal to the price
+    # from its yield. The sensitivities of both prices to the pillar discount
+    # factors and to the key rate give the change in the pillars.
+    price_df_jac = np.zeros((num_rates, num_rates))
+    price_rate_jac = np.zeros(num_rates)
+
+    for j, par_bond in enumerate(par_bonds):
+
+        par = par_bond._par
+        times, flows = par_bond._discount_flows(settle_dt)
+        grad = _vinterpolate_gradient(times, flows * par, par_crv._times,
+                                      par_crv._values, method)
+
+        price_df_jac[j] = grad[1:]
+
+        # The coupon of the par bond is its key rate
+        cpn_flows = flows.copy()
+        cpn_flows[-1] -= 1.0
+        dfs = interpolate(times, par_crv._times, par_crv._values, method)
+        curve_cpn_delta = par * np.dot(cpn_flows, dfs) / par_bond._cpn
+
+        c, f, n, alpha, pay_first_cpn, last_alpha = \
+            par_bond._ytm_terms(settle_dt, us_street)
 
+        terms = (f, n, alpha, pay_first_cpn, last_alpha, us_street)
+        ytm_delta = _price_from_ytm(rates[j], c, *terms)[1]
+        ytm_cpn_delta = _price_from_ytm(rates[j], 1.0, *terms)[0] - \
+            _price_from_ytm(rates[j], 0.0, *terms)[0]
+
+        price_rate_jac[j] = curve_cpn_delta - par * (ytm_delta + ytm_cpn_delta)
+
+    df_sensitivities = -np.linalg.solve(price_df_jac, np.diag(price_rate_jac))
+    return par_crv, df_sensitivities
 
 ###############################################################################
 
@@ -101,7 +254,7 @@ class Bond:
                  freq_type: FrequencyTypes,
                  dc_type: DayCountTypes,
                  ex_div_days: int = 0,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type=BusDayAdjustTypes.FOLLOWING,
                  dg_type=DateGenRuleTypes.BACKWARD):
         """ Create Bond object by providing the issue date, maturity Date,
@@ -234,9 +387,28 @@ class Bond:
         function is vectorised with respect to the yield input. It implements
         a number of standard conventions for calculating the YTM. """
 
+        terms = self._ytm_terms(settle_dt, convention)
+        dp = _price_from_ytm(ytm, *terms, convention)[0]
+        return dp * self._par
+
+    ###########################################################################
+
+    def _ytm_terms(self,
+                   settle_dt: Date,
+                   convention: YTMCalcType):
+        """ Return the terms of the price yield relationship on a settlement
+        date as a tuple of the coupon, the frequency, the number of coupons
+        after the next coupon, the fraction of a coupon period to the next
+        coupon, a flag which is zero if the bond is ex-dividend and the CFETS
+        accrual factor in the final coupon period. This also calculates the
+        accrued interest per unit face. """
+
         if convention not in YTMCalcType:
             raise FinError("Yield convention unknown." + str(convention))
 
+        if convention == YTMCalcType.ZERO:
+            raise FinError("Zero coupon bonds must use BondZero class.")
+
         # TODO check that no unnecessary calculations are being done
         self.accrued_interest(settle_dt, 1.0)
 
@@ -250,80 +422,29 @@ class Bond:
 
         #######################################################################
 
-        ytm = np.array(ytm)  # VECTORIZED
-        ytm = ytm + 0.000000000012345  # SNEAKY LOW-COST TRICK TO AVOID y=0
-
         f = annual_frequency(self._freq_type)
         c = self._cpn
 
-        if convention == YTMCalcType.ZERO:
-            raise FinError("Zero coupon bonds must use BondZero class.")
-
-        v = 1.0 / (1.0 + ytm / f)
-
         # n is the number of flows after the next coupon
-        n = 0
-        for dt in self._cpn_dts:
-            if dt > settle_dt:
-                n += 1
+        n = len(self._cpn_dts) - bisect.bisect_right(self._cpn_dts, settle_dt)
         n = n - 1
 
         if n < 0:
             raise FinError("No coupons left")
 
-        if convention == YTMCalcType.UK_DMO:
-            if n == 0:
-                dp = (v ** (self._alpha)) * (1.0 + pay_first_cpn * c / f)
-            else:
-                term1 = (c / f) * pay_first_cpn
-                term2 = (c / f) * v
-                term3 = (c / f) * v * v * (1.0 - v ** (n - 1)) / (1.0 - v)
-                term4 = (v ** n)
-                dp = (v ** (self._alpha)) * (term1 + term2 + term3 + term4)
-        #                print(term1, term2, term3, term4, v, self._alpha, dp)
-        elif convention == YTMCalcType.US_TREASURY:
-            if n == 0:
-                dp = (v ** (self._alpha)) * (1.0 + c / f)
-            else:
-                term1 = (c / f) * pay_first_cpn
-                term2 = (c / f) * v
-                term3 = (c / f) * v * v * (1.0 - v ** (n - 1)) / (1.0 - v)
-                term4 = (v ** n)
-                vw = 1.0 / (1.0 + self._alpha * ytm / f)
-                dp = (vw) * (term1 + term2 + term3 + term4)
-        elif convention == YTMCalcType.US_STREET:
-            if n == 0:
-                vw = 1.0 / (1.0 + self._alpha * ytm / f)
-                dp = vw * (1.0 + c / f)
-            else:
-                term1 = (c / f) * pay_first_cpn
-                term2 = (c / f) * v
-                term3 = (c / f) * v * v * (1.0 - v ** (n - 1)) / (1.0 - v)
-                term4 = (v ** n)
-                dp = (v ** (self._alpha)) * (term1 + term2 + term3 + term4)
-        elif convention == YTMCalcType.CFETS:
-            if n == 0:
-                last_year = self._maturity_dt.add_tenor("-12M")
-
-                dc = DayCount(DayCountTypes.ACT_365L)
-
-                alpha = (1 - dc.year_frac(last_year,
-                                          settle_dt,
-                                          self._maturity_dt,
-                                          freq_type=FrequencyTypes.ANNUAL)[0])
-
-                vw = 1.0 / (1.0 + alpha * ytm)
-                dp = vw * (1.0 + c / f)
-            else:
-                term1 = (c / f) * pay_first_cpn
-                term2 = (c / f) * v
-                term3 = (c / f) * v * v * (1.0 - v ** (n - 1)) / (1.0 - v)
-                term4 = (v ** n)
-                dp = (v ** (self._alpha)) * (term1 + term2 + term3 + term4)
-        else:
-            raise FinError("Unknown yield convention")
+        last_alpha = 0.0
 
-        return dp * self._par
+        if convention == YTMCalcType.CFETS and n == 0:
+            last_year = self._maturity_dt.add_tenor("-12M")
+
+            dc = DayCount(DayCountTypes.ACT_365L)
+
+            last_alpha = (1 - dc.year_frac(last_year,
+                                           settle_dt,
+                                           self._maturity_dt,
+                                           freq_type=FrequencyTypes.ANNUAL)[0])
+
+        return c, f, n, self._alpha, pay_first_cpn, last_alpha
 
     ###########################################################################
 
@@ -410,8 +531,9 @@ class Bond:
             The tenors of the key rates, default is None which will generate
             the tenors from 0.25 to 30 years.
         shift : float, optional
-            The shift used to calculate the key rate durations, default is None
-            which will set the shift to 0.0001.
+            Deprecated and ignored. The durations are calculated from the
+            analytical sensitivity of the price to the key rates which is the
+            limit of a small shift.
         rates: list of float, optional
             Corresponding yield curve data in line with key_rate_tenors
             If None, flat yield curve is used
@@ -422,129 +544,47 @@ class Bond:
             A tuple containing the key rate tenors and the key rate durations.
         """
 
+        if shift is not None:
+            warnings.warn("The shift argument of key_rate_durations is "
+                          "deprecated and is ignored as the durations are "
+                          "calculated analytically.",
+                          DeprecationWarning, stacklevel=2)
+
         # check if key_rate_tenors is None
         # if it is None, create an array of key rates from 0.5 to 30 years
 
         if key_rate_tenors is None:
             key_rate_tenors = np.array([0.5, 1, 2, 3, 5, 7, 10, 20, 30])
 
-        # set the shift to a small value if not give
-        if not shift:
-            shift = 0.0001
-
-        lin_zero_interp = InterpTypes.LINEAR_ZERO_RATES
-        us_street = YTMCalcType.US_STREET
-
-        # initialize an empty list for the key rate durations
-        key_rate_durations = []
-
-        # iterate over each key rate (tenor) and calculate key rate duration
-        for ind, _ in enumerate(key_rate_tenors):
-
-            # if rates are not given create an array of rates where each
-            # rate is equal to the ytm value
-            if rates is None:
-                rates = np.ones(len(key_rate_tenors)) * ytm
-
-            # Create set of par bonds to be used in BondZeroCurve
-            # ytm and coupons are equal
-            par_bonds = []
-
-            for tenor, cpn in zip(key_rate_tenors, rates):
-                mat_dt = settle_dt.add_years(tenor)
-
-                par_bond = Bond(settle_dt, mat_dt, cpn,
-                                bond._freq_type, bond._dc_type)
-
-                par_bonds.append(par_bond)
-
-            clean_prices = []
-
-            for par_bond, ytm in zip(par_bonds, rates):
-                clean_price = par_bond.clean_price_from_ytm(settle_dt,
-                                                            ytm,
-                                                            us_street)
-                clean_prices.append(clean_price)
+        # if rates are not given create an array of rates where each
+        # rate is equal to the ytm value
+        if rates is None:
+            rates = np.ones(len(key_rate_tenors)) * ytm
 
-            par_crv = BondZeroCurve(settle_dt,
-                                    par_bonds,
-                                    clean_prices,
-                                    lin_zero_interp)
+        par_crv, df_sensitivities = _key_rate_curve(settle_dt,
+                                                    key_rate_tenors,
+                                                    rates,
+                                                    bond._freq_type,
+                                                    bond._dc_type)
 
-            # calculate the dirty price of the bond using the discount curve
-            p_zero = bond.dirty_price_from_discount_curve(settle_dt,
-                                                          par_crv)
+        # The price and its sensitivity to the curve are found in one pass
+        times, flows = bond._discount_flows(settle_dt)
+        flows = flows * bond._par
+        method = par_crv._interp_type.value
 
-            # shift up by the yield of corresponding par bond
-            rates[ind] += shift
+        df_settle = par_crv.df(settle_dt)
+        dfs = interpolate(times, par_crv._times, par_crv._values, method)
+        p_zero = np.dot(flows, dfs) / df_settle
 
-            par_bonds = []
+        grad = _vinterpolate_gradient(times, flows, par_crv._times,
+                                      par_crv._values, method)
 
-            for tenor, cpn in zip(key_rate_tenors, rates):
-                mat = settle_dt.add_years(tenor)
+        grad = grad[1:] / df_settle
 
-                par_bond = Bond(settle_dt, mat, cpn,
-                                bond._freq_type, bond._dc_type)
+        # The key rate duration is -(dP/dr) / P for each key rate r
+        key_rate_durations = -(grad @ df_sensitivities) / p_zero
 
-                par_bonds.append(par_bond)
-
-            clean_prices = []
-
-            for par_bond, ytm in zip(par_bonds, rates):
-                clean_price = par_bond.clean_price_from_ytm(settle_dt,
-                                                            ytm,
-                                                            us_street)
-                clean_prices.append(clean_price)
-
-            par_crv_up = BondZeroCurve(settle_dt,
-                                       par_bonds,
-                                       clean_prices,
-                                       lin_zero_interp)
-
-            # calculate the full price of the bond
-            # using the discount curve with the key rate shifted up
-            p_up = bond.dirty_price_from_discount_curve(
-                settle_dt, par_crv_up)
-
-            # create a curve again with the key rate shifted down
-            # by twice the shift value.
-            rates[ind] -= shift * 2
-
-            par_bonds = []
-
-            for tenor, cpn in zip(key_rate_tenors, rates):
-                mat = settle_dt.add_years(tenor)
-
-                par_bond = Bond(settle_dt, mat, cpn,
-                                bond._freq_type, bond._dc_type)
-
-                par_bonds.append(par_bond)
-
-            clean_prices = []
-
-            for par_bond, ytm in zip(par_bonds, rates):
-                clean_price = par_bond.clean_price_from_ytm(settle_dt,
-                                                            ytm,
-                                                            us_street)
-                clean_prices.append(clean_price)
-
-            par_crv_down = BondZeroCurve(settle_dt,
-                                         par_bonds,
-                                         clean_prices,
-                                         lin_zero_interp)
-
-            # calculate the full price of the bond using
-            p_down = bond.dirty_price_from_discount_curve(
-                settle_dt, par_crv_down)
-
-            # calculate the key rate duration
-            # using the formula (P_down - P_up) / (2 * shift * P_zero)
-            key_rate_duration = (p_down - p_up) / (2 * shift * p_zero)
-
-            # append the key rate duration to the key_rate_durations list
-            key_rate_durations.append(key_rate_duration)
-
-        return key_rate_tenors, np.array(key_rate_durations)
+        return key_rate_tenors, key_rate_durations
 
     ###########################################################################
 
@@ -646,6 +686,79 @@ class Bond:
 
     ###########################################################################
 
+    def _discount_flows(self,
+                        settle_dt: Date):
+        """ Return the times in years from the settlement date of the flows
+        paid after settlement and their amounts per unit par as used in the
+        price from a discount curve. """
+
+        self.accrued_interest(settle_dt, 1.0)
+
+        pay_first_cpn = 1.0
+        if settle_dt > self._ex_div_dt:
+            pay_first_cpn = 0.0
+
+        flow = self._cpn / self._freq
+
+        times = []
+        flows = []
+
+        # coupons paid on a settlement date are paid to the seller
+        for i, dt in enumerate(self._cpn_dts[1:]):
+            if dt > settle_dt:
+                times.append((dt - settle_dt) / gDaysInYear)
+                if i == 0:
+                    flows.append(flow * pay_first_cpn)
+                else:
+                    flows.append(flow)
+
+        flows[-1] += 1.0
+
+        return np.array(times), np.array(flows)
+
+    ###########################################################################
+
+    def bucketed_delta(self,
+                       settle_dt: Date,
+                       discount_curve: DiscountCurve,
+                       bump_size: float = 0.0001):
+        """ Calculate the change in the dirty price from the discount curve
+        for an increase of bump_size in the continuously compounded zero rate
+        at each pillar of the curve, holding the other pillars fixed. The bond
+        flows are chained with the analytical sensitivities of the curve
+        interpolation so no bumped curves are built. """
+
+        px = self.dirty_price_from_discount_curve(settle_dt, discount_curve)
+
+        pay_first_cpn = 1.0
+        if settle_dt > self._ex_div_dt:
+            pay_first_cpn = 0.0
+
+        dfSettle = discount_curve.df(settle_dt)
+        flow = self._cpn / self._freq * self._par / dfSettle
+
+        # The price is divided by the discount factor to settlement
+        flow_dts = [settle_dt]
+        weights = [-px / dfSettle]
+
+        dt = self._cpn_dts[1]
+        if dt > settle_dt:
+            flow_dts.append(dt)
+            weights.append(flow * pay_first_cpn)
+
+        for dt in self._cpn_dts[2:]:
+            if dt > settle_dt:
+                flow_dts.append(dt)
+                weights.append(flow)
+
+        if len(flow_dts) > 1:
+            weights[-1] += self._par / dfSettle
+
+        grad = discount_curve.df_gradient(flow_dts, weights)
+        return discount_curve.zero_deltas(grad, bump_size)
+
+    ###########################################################################
+
     def current_yield(self, clean_price):
         """ Calculate the current yield of the bond which is the
         coupon divided by the clean price (not the full price)"""
@@ -660,7 +773,8 @@ class Bond:
                           clean_price: float,
                           convention: YTMCalcType = YTMCalcType.US_TREASURY):
         """ Calculate the bond's yield to maturity by solving the price
-        yield relationship using a one-dimensional root solver. """
+        yield relationship using Newton's method with the analytic derivative
+        of the price. An array of clean prices is solved in a single call. """
 
         if type(clean_price) is float or type(clean_price) is np.float64:
             clean_prices = np.array([clean_price])
@@ -670,29 +784,20 @@ class Bond:
             raise FinError("Unknown type for clean_price "
                            + str(type(clean_price)))
 
-        self.accrued_interest(settle_dt, 1.0)
+        terms = self._ytm_terms(settle_dt, convention)
 
         accrued_amount = self._accrued_interest * self._par
-        dirty_prices = (clean_prices + accrued_amount)
-        ytms = []
+        dirty_prices = (clean_prices + accrued_amount) / self._par
 
-        for dirty_price in dirty_prices:
-            argtuple = (self, settle_dt, dirty_price, convention)
-
-            ytm = optimize.newton(_f,
-                                  x0=0.05,  # guess initial value of 5%
-                                  fprime=None,
-                                  args=argtuple,
-                                  tol=1e-8,
-                                  maxiter=50,
-                                  fprime2=None)
+        ytms, converged = _solve_ytm(dirty_prices, *terms, convention)
 
-            ytms.append(ytm)
+        if not np.all(converged):
+            raise FinError("Yield to maturity did not converge")
 
         if len(ytms) == 1:
             return ytms[0]
         else:
-            return np.array(ytms)
+            return ytms
 
     ###########################################################################
 
@@ -1059,3 +1164,34 @@ class Bond:
         print(self)
 
 ###############################################################################
+
+
+def yields_to_maturity(bonds: list,
+                       settle_dt: Date,
+                       clean_prices,
+                       convention: YTMCalcType = YTMCalcType.US_TREASURY):
+    """ Calculate the yields to maturity of a list of bonds from their clean
+    prices on a settlement date. The prices of all of the bonds are solved
+    together using Newton's method with the analytic derivative of the price
+    with respect to the yield. A NaN is returned for any bond whose yield
+    does not converge. """
+
+    clean_prices = np.asarray(clean_prices, dtype=np.float64)
+
+    if clean_prices.shape != (len(bonds),):
+        raise FinError("Need one clean price for each bond")
+
+    num_bonds = len(bonds)
+    terms = np.zeros((6, num_bonds))
+    dirty_prices = np.zeros(num_bonds)
+
+    for i, bond in enumerate(bonds):
+        terms[:, i] = bond._ytm_terms(settle_dt, convention)
+        accrued_amount = bond._accrued_interest * bond._par
+        dirty_prices[i] = (clean_prices[i] + accrued_amount) / bond._par
+
+    ytms, converged = _solve_ytm(dirty_prices, *terms, convention)
+    ytms[~converged] = np.nan
+    return ytms
+
+###############################################################################
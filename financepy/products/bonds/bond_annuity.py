@@ -4,7 +4,7 @@
 
 from ...utils.date import Date
 from ...utils.frequency import annual_frequency, FrequencyTypes
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.schedule import Schedule
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
@@ -27,7 +27,7 @@ class BondAnnuity:
                  maturity_dt: Date,
                  cpn: float,
                  freq_type: FrequencyTypes,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
                  dc_type: DayCountTypes = DayCountTypes.ACT_360):
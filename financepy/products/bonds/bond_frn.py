@@ -9,7 +9,7 @@ from ...utils.error import FinError
 from ...utils.frequency import annual_frequency, FrequencyTypes
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.schedule import Schedule
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
 from ...utils.helpers import label_to_string, check_argument_types
@@ -52,7 +52,7 @@ class BondFRN:
                  quoted_margin: float,  # Fixed spread paid on top of index
                  freq_type: FrequencyTypes,
                  dc_type: DayCountTypes,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND):
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND):
         """ Create FinFloatingRateNote object given its maturity date, its
         quoted margin, coupon frequency, DAY COUNT TYPE. Face is the size of
         the position and par is the notional on which price is quoted. """
@@ -5,7 +5,7 @@
 
 from ...utils.error import FinError
 from ...utils.frequency import annual_frequency, FrequencyTypes
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.schedule import Schedule
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
@@ -36,7 +36,7 @@ class BondMortgage:
                  end_dt: Date,
                  principal: float,
                  freq_type: FrequencyTypes = FrequencyTypes.MONTHLY,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
                  dc_type: DayCountTypes = DayCountTypes.ACT_360):
@@ -7,7 +7,7 @@
 import numpy as np
 
 from ...utils.date import Date
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.helpers import label_to_string, check_argument_types
 from ...market.curves.discount_curve import DiscountCurve
 from .bond import YTMCalcType
@@ -158,7 +158,7 @@ class BondPortfolio:
     def accrued_interest(self,
                          settle_dt: Date,
                          num_ex_dividend_days: int = 0,
-                         cal_type: CalendarTypes = CalendarTypes.WEEKEND):
+                         cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND):
 
         return self._accrued_interest
 
@@ -0,0 +1,711 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+
+from ...utils.error import FinError
+from ...utils.date import Date
+from ...utils.date_array import DateArray
+from ...utils.day_count import DayCount, DayCountTypes
+from ...utils.frequency import FrequencyTypes
+from ...utils.global_vars import gDaysInYear, gSmall
+from ...utils.calendar import Calendar, CalendarTypes
+from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
+from ...utils.schedule import Schedule
+from ...utils.helpers import check_argument_types, label_to_string
+from ...market.curves.discount_curve import DiscountCurve, _curve_dfs
+from ...market.curves.interpolator import interpolate
+from ...market.curves.interpolator import _vinterpolate_jacobian
+
+from .bond import Bond, YTMCalcType, _price_from_ytm, _solve_ytm
+from .bond import _key_rate_curve
+
+###############################################################################
+
+
+class BondUniverse:
+    """ Class for calculating the analytics of a large number of Bonds
+    together. The coupon dates of all of the bonds are packed into a set of
+    contiguous arrays with the dates of each bond found from an array of
+    offsets. The accrual terms of every bond are calculated once for each
+    settlement date and are reused by the price, yield, duration, convexity
+    and spread calculations which are all done with array operations. Each
+    function returns an array with one value per bond which agrees with the
+    corresponding Bond function. """
+
+    def __init__(self,
+                 bonds: list):
+        """ Create a universe from a list of Bonds. The coupon dates are
+        copied from the bonds so later changes to a bond do not affect the
+        universe. """
+
+        check_argument_types(self.__init__, locals())
+
+        if len(bonds) == 0:
+            raise FinError("Universe must contain at least one bond")
+
+        for bond in bonds:
+            if isinstance(bond, Bond) is False:
+                raise FinError("Universe can only contain Bonds")
+
+        self._bonds = bonds
+        self._settle_terms = {}
+        self._asw_flows = {}
+
+        self._pack_flows()
+
+    ###########################################################################
+
+    def _pack_flows(self):
+        """ Copy the coupon dates of all of the bonds into flat arrays. The
+        coupon dates of bond i, starting with its issue date, are those from
+        cpn_offsets[i] to cpn_offsets[i+1]. The flows exclude the issue date
+        and those of bond i are from flow_offsets[i] to flow_offsets[i+1]. """
+
+        bonds = self._bonds
+        num_bonds = len(bonds)
+
+        cpn_counts = np.array([len(bond._cpn_dts) for bond in bonds])
+
+        self._cpn_offsets = np.zeros(num_bonds + 1, dtype=np.int64)
+        self._cpn_offsets[1:] = np.cumsum(cpn_counts)
+
+        self._cpn_serials = np.concatenate(
+            [DateArray(bond._cpn_dts)._excel_dts for bond in bonds])
+
+        flow_counts = cpn_counts - 1
+
+        self._flow_offsets = np.zeros(num_bonds + 1, dtype=np.int64)
+        self._flow_offsets[1:] = np.cumsum(flow_counts)
+
+        self._flow_bonds = np.repeat(np.arange(num_bonds), flow_counts)
+
+        is_issue = np.zeros(len(self._cpn_serials), dtype=bool)
+        is_issue[self._cpn_offsets[:-1]] = True
+        self._flow_serials = self._cpn_serials[~is_issue]
+
+        # Bond only applies the ex-dividend flag to its first coupon date
+        self._is_first_cpn = np.zeros(len(self._flow_serials), dtype=bool)
+        self._is_first_cpn[self._flow_offsets[:-1]] = True
+
+        self._is_maturity = np.zeros(len(self._flow_serials), dtype=bool)
+        self._is_maturity[self._flow_offsets[1:] - 1] = True
+
+        self._cpns = np.array([bond._cpn for bond in bonds])
+        self._freqs = np.array([bond._freq for bond in bonds],
+                               dtype=np.float64)
+        self._pars = np.array([bond._par for bond in bonds])
+
+        self._maturity_serials = np.array(
+            [bond._maturity_dt._excel_dt for bond in bonds])
+
+        self._flow_cpns = (self._cpns / self._freqs)[self._flow_bonds]
+
+    ###########################################################################
+
+    def _sum_by_bond(self, flow_values):
+        """ Sum an array of values for each flow into one value per bond. """
+        return np.add.reduceat(flow_values, self._flow_offsets[:-1])
+
+    ###########################################################################
+
+    def _settle(self,
+                settle_dt: Date):
+        """ Return the accrual terms of all of the bonds on a settlement date
+        as a tuple of the previous and next coupon dates, the accrued
+        interest per unit face, the fraction of a coupon period to the next
+        coupon, a flag which is zero if the bond is ex-dividend, the number of
+        coupons after the next coupon and a mask of the flows paid after
+        settlement. These are calculated once for each settlement date. """
+
+        settle_serial = settle_dt._excel_dt
+
+        if settle_serial in self._settle_terms:
+            return self._settle_terms[settle_serial]
+
+        if np.any(self._maturity_serials <= settle_serial):
+            raise FinError("Bond settles after it matures.")
+
+        bonds = self._bonds
+        num_bonds = len(bonds)
+
+        # Coupons paid on a settlement date are paid to the seller
+        num_paid = np.add.reduceat(
+            (self._cpn_serials <= settle_serial).astype(np.int64),
+            self._cpn_offsets[:-1])
+
+        cpn_counts = np.diff(self._cpn_offsets)
+        num_left = cpn_counts - num_paid
+
+        ncd_idx = self._cpn_offsets[:-1] + np.maximum(num_paid, 1)
+        pcd_serials = self._cpn_serials[ncd_idx - 1]
+        ncd_serials = self._cpn_serials[ncd_idx]
+
+        acc_factors = np.zeros(num_bonds)
+        ex_div_serials = np.zeros(num_bonds, dtype=np.int64)
+
+        # The bonds are grouped by their conventions to use vectorised dates
+        groups = {}
+        for i, bond in enumerate(bonds):
+            key = (bond._dc_type, bond._freq_type)
+            groups.setdefault(key, []).append(i)
+
+        for (dc_type, freq_type), idx in groups.items():
+            idx = np.array(idx)
+            dc = DayCount(dc_type)
+            acc_factors[idx] = dc.year_frac(DateArray(pcd_serials[idx]),
+                                            settle_dt,
+                                            DateArray(ncd_serials[idx]),
+                                            freq_type)[0]
+
+        groups = {}
+        for i, bond in enumerate(bonds):
+            key = (bond._cal_type, bond._ex_div_days)
+            groups.setdefault(key, []).append(i)
+
+        for (cal_type, ex_div_days), idx in groups.items():
+            idx = np.array(idx)
+            cal = Calendar(cal_type)
+            ex_div_dts = cal.add_business_days(DateArray(ncd_serials[idx]),
+                                               -ex_div_days)
+            ex_div_serials[idx] = ex_div_dts._excel_dts
+
+        alphas = 1.0 - acc_factors * self._freqs
+
+        ex_div = settle_serial > ex_div_serials
+        pay_first_cpns = np.where(ex_div, 0.0, 1.0)
+
+        accrued = np.where(ex_div, acc_factors - 1.0 / self._freqs,
+                           acc_factors) * self._cpns
+
+        alive = self._flow_serials > settle_serial
+
+        terms = (pcd_serials, ncd_serials, accrued, alphas, pay_first_cpns,
+                 num_left - 1, alive)
+
+        self._settle_terms[settle_serial] = terms
+        return terms
+
+    ###########################################################################
+
+    def _ytm_terms(self,
+                   settle_dt: Date,
+                   convention: YTMCalcType):
+        """ Return the terms of the price yield relationship of all of the
+        bonds as arrays in the order used by Bond._ytm_terms. """
+
+        if convention not in YTMCalcType:
+            raise FinError("Yield convention unknown." + str(convention))
+
+        if convention == YTMCalcType.ZERO:
+            raise FinError("Zero coupon bonds must use BondZero class.")
+
+        _, _, _, alphas, pay_first_cpns, n, _ = self._settle(settle_dt)
+
+        last_alphas = np.zeros(len(self._bonds))
+
+        last = n == 0
+        if convention == YTMCalcType.CFETS and np.any(last):
+            maturity_dts = DateArray(self._maturity_serials[last])
+            last_year_dts = maturity_dts.add_tenor("-12M")
+            dc = DayCount(DayCountTypes.ACT_365L)
+            last_alphas[last] = 1.0 - dc.year_frac(
+                last_year_dts, settle_dt, maturity_dts,
+                freq_type=FrequencyTypes.ANNUAL)[0]
+
+        return self._cpns, self._freqs, n, alphas, pay_first_cpns, last_alphas
+
+    ###########################################################################
+
+    def _bond_values(self, values):
+        """ Check an array of prices, yields or spreads with one value for
+        each bond. """
+
+        values = np.asarray(values, dtype=np.float64)
+
+        if values.shape != (len(self._bonds),):
+            raise FinError("Need one value for each bond")
+
+        return values
+
+    ###########################################################################
+
+    def accrued_interest(self,
+                         settle_dt: Date,
+                         face: float = 100.0):
+        """ Calculate the accrued interest of each bond on a settlement date
+        for a face amount. """
+
+        accrued = self._settle(settle_dt)[2]
+        return accrued * face
+
+    ###########################################################################
+
+    def dirty_price_from_ytm(self,
+                             settle_dt: Date,
+                             ytms: (list, np.ndarray),
+                             convention: YTMCalcType = YTMCalcType.UK_DMO):
+        """ Calculate the dirty price of each bond from its yield to
+        maturity. """
+
+        ytms = self._bond_values(ytms)
+        terms = self._ytm_terms(settle_dt, convention)
+        dp = _price_from_ytm(ytms, *terms, convention)[0]
+        return dp * self._pars
+
+    ###########################################################################
+
+    def clean_price_from_ytm(self,
+                             settle_dt: Date,
+                             ytms: (list, np.ndarray),
+                             convention: YTMCalcType = YTMCalcType.UK_DMO):
+        """ Calculate the clean price of each bond from its yield to
+        maturity. """
+
+        dp = self.dirty_price_from_ytm(settle_dt, ytms, convention)
+        accrued = self._settle(settle_dt)[2] * self._pars
+        return dp - accrued
+
+    ###########################################################################
+
+    def yield_to_maturity(self,
+                          settle_dt: Date,
+                          clean_prices: (list, np.ndarray),
+                          convention: YTMCalcType = YTMCalcType.US_TREASURY):
+        """ Calculate the yield to maturity of each bond from its clean price
+        by solving for all of the bonds together using Newton's method. A NaN
+        is returned for any bond whose yield does not converge. """
+
+        clean_prices = self._bond_values(clean_prices)
+        terms = self._ytm_terms(settle_dt, convention)
+        accrued = self._settle(settle_dt)[2] * self._pars
+        dirty_prices = (clean_prices + accrued) / self._pars
+
+        ytms, converged = _solve_ytm(dirty_prices, *terms, convention)
+        ytms[~converged] = np.nan
+        return ytms
+
+    ###########################################################################
+
+    def dollar_duration(self,
+                        settle_dt: Date,
+                        ytms: (list, np.ndarray),
+                        convention: YTMCalcType = YTMCalcType.UK_DMO):
+        """ Calculate the risk or dP/dy of each bond by bumping its yield. This
+        is also known as the DV01 in Bloomberg. """
+
+        ytms = self._bond_values(ytms)
+        dy = 0.0001  # 1 basis point
+        p0 = self.dirty_price_from_ytm(settle_dt, ytms - dy, convention)
+        p2 = self.dirty_price_from_ytm(settle_dt, ytms + dy, convention)
+        durn = -(p2 - p0) / dy / 2.0
+        return durn
+
+    ###########################################################################
+
+    def macauley_duration(self,
+                          settle_dt: Date,
+                          ytms: (list, np.ndarray),
+                          convention: YTMCalcType = YTMCalcType.UK_DMO):
+        """ Calculate the Macauley duration of each bond from its yield to
+        maturity. """
+
+        ytms = self._bond_values(ytms)
+        dd = self.dollar_duration(settle_dt, ytms, convention)
+        fp = self.dirty_price_from_ytm(settle_dt, ytms, convention)
+        md = dd * (1.0 + ytms / self._freqs) / fp
+        return md
+
+    ###########################################################################
+
+    def modified_duration(self,
+                          settle_dt: Date,
+                          ytms: (list, np.ndarray),
+                          convention: YTMCalcType = YTMCalcType.UK_DMO):
+        """ Calculate the modified duration of each bond from its yield to
+        maturity. """
+
+        dd = self.dollar_duration(settle_dt, ytms, convention)
+        fp = self.dirty_price_from_ytm(settle_dt, ytms, convention)
+        md = dd / fp
+        return md
+
+    ###########################################################################
+
+    def convexity_from_ytm(self,
+                           settle_dt: Date,
+                           ytms: (list, np.ndarray),
+                           convention: YTMCalcType = YTMCalcType.UK_DMO):
+        """ Calculate the convexity of each bond from its yield to maturity.
+        """
+
+        ytms = self._bond_values(ytms)
+        dy = 0.0001  # 1 basis point
+        p0 = self.dirty_price_from_ytm(settle_dt, ytms - dy, convention)
+        p1 = self.dirty_price_from_ytm(settle_dt, ytms, convention)
+        p2 = self.dirty_price_from_ytm(settle_dt, ytms + dy, convention)
+        conv = ((p2 + p0) - 2.0 * p1) / dy / dy / p1 / self._pars
+        return conv
+
+    ###########################################################################
+
+    def dirty_price_from_discount_curve(self,
+                                        settle_dt: Date,
+                                        discount_curve: DiscountCurve):
+        """ Calculate the price of each bond using a discount curve to PV the
+        bond cash flows to the settlement date. The discount factors of all
+        of the flows are found with one call to the curve. """
+
+        if settle_dt < discount_curve._value_dt:
+            raise FinError("Bond settles before Discount curve date")
+
+        _, _, _, _, pay_first_cpns, _, alive = self._settle(settle_dt)
+
+        dfs = np.zeros(len(self._flow_serials))
+        dfs[alive] = _curve_dfs(discount_curve, self._flow_serials[alive])[0]
+        df_settle = discount_curve.df(settle_dt)
+
+        flows = np.where(self._is_first_cpn,
+                         pay_first_cpns[self._flow_bonds], 1.0)
+        flows = flows * self._flow_cpns + self._is_maturity
+
+        px = self._sum_by_bond(flows * dfs) / df_settle
+        return px * self._pars
+
+    ###########################################################################
+
+    def clean_price_from_discount_curve(self,
+                                        settle_dt: Date,
+                                        discount_curve: DiscountCurve):
+        """ Calculate the clean price of each bond using a discount curve to
+        PV the bond cash flows to the settlement date. """
+
+        dirty_prices = self.dirty_price_from_discount_curve(settle_dt,
+                                                            discount_curve)
+
+        accrued = self._settle(settle_dt)[2] * self._pars
+        return dirty_prices - accrued
+
+    ###########################################################################
+
+    def key_rate_durations(self,
+                           settle_dt: Date,
+                           ytms: (list, np.ndarray),
+                           key_rate_tenors: (list, np.ndarray) = None,
+                           rates: (list, np.ndarray) = None,
+                           ytm_tol: float = 0.0):
+        """ Calculate the key rate durations of each bond as in
+        Bond.key_rate_durations. A zero curve is fitted to par bonds at the
+        key rate tenors once for each set of bond conventions and the
+        durations of all of the bonds that share it are found from their
+        cash flows and the analytical sensitivity of the curve to the key
+        rates. If no rates are given then each bond uses a flat curve at its
+        own yield, so a curve is fitted for each distinct yield and there is
+        little saving over calling Bond.key_rate_durations. Setting ytm_tol
+        rounds the yields to a multiple of it so that bonds with nearby
+        yields share a curve, which moves the flat rate of each bond by up
+        to half of ytm_tol. Returns the tenors and a matrix of durations with
+        a row for each bond and a column for each key rate. """
+
+        ytms = self._bond_values(ytms)
+
+        if ytm_tol < 0.0:
+            raise FinError("Yield tolerance must not be negative")
+
+        if rates is None and ytm_tol > 0.0:
+            ytms = np.round(ytms / ytm_tol) * ytm_tol
+
+        if key_rate_tenors is None:
+            key_rate_tenors = np.array([0.5, 1, 2, 3, 5, 7, 10, 20, 30])
+
+        num_bonds = len(self._bonds)
+        num_rates = len(key_rate_tenors)
+
+        _, _, _, _, pay_first_cpns, _, alive = self._settle(settle_dt)
+
+        flows = np.where(self._is_first_cpn,
+                         pay_first_cpns[self._flow_bonds], 1.0)
+        flows = (flows * self._flow_cpns + self._is_maturity) * \
+            self._pars[self._flow_bonds]
+
+        times = (self._flow_serials - settle_dt._excel_dt) / gDaysInYear
+
+        # The par bonds take the conventions of the bond
+        groups = {}
+        for i, bond in enumerate(self._bonds):
+            if rates is None:
+                group_rates = (ytms[i],) * num_rates
+            else:
+                group_rates = tuple(rates)
+
+            key = (bond._freq_type, bond._dc_type, group_rates)
+            groups.setdefault(key, []).append(i)
+
+        durations = np.zeros((num_bonds, num_rates))
+
+        for (freq_type, dc_type, group_rates), idx in groups.items():
+
+            idx = np.array(idx)
+            par_crv, df_sensitivities = _key_rate_curve(settle_dt,
+                                                        key_rate_tenors,
+                                                        np.array(group_rates),
+                                                        freq_type,
+                                                        dc_type)
+
+            in_group = np.zeros(num_bonds, dtype=bool)
+            in_group[idx] = True
+            group_flows = alive & in_group[self._flow_bonds]
+
+            # The flows of each bond are contiguous so they are summed by
+            # bond from the offsets of its first flow
+            counts = np.bincount(self._flow_bonds[group_flows],
+                                 minlength=num_bonds)[idx]
+            offsets = np.zeros(len(idx), dtype=np.int64)
+            offsets[1:] = np.cumsum(counts)[:-1]
+
+            method = par_crv._interp_type.value
+            group_times = times[group_flows]
+            amounts = flows[group_flows]
+
+            dfs = interpolate(group_times, par_crv._times, par_crv._values,
+                              method)
+            jac = _vinterpolate_jacobian(group_times, par_crv._times,
+                                         par_crv._values, method)
+
+            df_settle = par_crv.df(settle_dt)
+            prices = np.add.reduceat(amounts * dfs, offsets) / df_settle
+            grads = np.add.reduceat(amounts[:, np.newaxis] * jac[:, 1:],
+                                    offsets, axis=0) / df_settle
+
+            durations[idx] = -(grads @ df_sensitivities) / \
+                prices[:, np.newaxis]
+
+        return key_rate_tenors, durations
+
+    ###########################################################################
+
+    def _asw_float_flows(self,
+                         settle_dt: Date,
+                         float_dc_type: DayCountTypes,
+                         float_freq_type: FrequencyTypes,
+                         float_cal_type: CalendarTypes,
+                         float_bd_type: BusDayAdjustTypes,
+                         float_dg_type: DateGenRuleTypes):
+        """ Return the payment dates, accrual factors and bond indices of the
+        floating leg flows of the asset swap of each bond. The floating leg
+        runs from the settlement date to the maturity of the bond with its
+        first period accruing from the previous coupon date as in Bond. Each
+        schedule is generated once per maturity date. """
+
+        key = (settle_dt._excel_dt, float_dc_type, float_freq_type,
+               float_cal_type, float_bd_type, float_dg_type)
+
+        if key in self._asw_flows:
+            return self._asw_flows[key]
+
+        pcd_serials = self._settle(settle_dt)[0]
+
+        maturity_dts = {}
+        for bond in self._bonds:
+            maturity_dts[bond._maturity_dt._excel_dt] = bond._maturity_dt
+
+        schedules = {}
+        for maturity_serial, maturity_dt in maturity_dts.items():
+            schedule = Schedule(settle_dt,
+                                maturity_dt,
+                                float_freq_type,
+                                float_cal_type,
+                                float_bd_type,
+                                float_dg_type)
+
+            dts = schedule._adjusted_dts[1:]
+            schedules[maturity_serial] = DateArray(dts)._excel_dts
+
+        end_serials = []
+        start_serials = []
+        for i, maturity_serial in enumerate(self._maturity_serials):
+            serials = schedules[maturity_serial]
+            end_serials.append(serials)
+            start_serials.append(np.concatenate(([pcd_serials[i]],
+                                                 serials[:-1])))
+
+        counts = [len(serials) for serials in end_serials]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+
+        end_serials = np.concatenate(end_serials)
+        start_serials = np.concatenate(start_serials)
+
+        day_count = DayCount(float_dc_type)
+        year_fracs = day_count.year_frac(DateArray(start_serials),
+                                         DateArray(end_serials))[0]
+
+        flows = (end_serials, np.asarray(year_fracs, dtype=np.float64),
+                 offsets)
+
+        self._asw_flows[key] = flows
+        return flows
+
+    ###########################################################################
+
+    def asset_swap_spread(
+            self,
+            settle_dt: Date,
+            clean_prices: (list, np.ndarray),
+            discount_curve: DiscountCurve,
+            swapFloatDayCountConventionType=DayCountTypes.ACT_360,
+            swapFloatFrequencyType=FrequencyTypes.SEMI_ANNUAL,
+            swapFloatCalendarType=CalendarTypes.WEEKEND,
+            swapFloatBusDayAdjustRuleType=BusDayAdjustTypes.FOLLOWING,
+            swapFloatDateGenRuleType=DateGenRuleTypes.BACKWARD):
+        """ Calculate the par asset swap spread of each bond. The discount
+        curve is an Ibor curve that is passed in. """
+
+        clean_prices = self._bond_values(clean_prices)
+        _, _, accrued, _, _, _, alive = self._settle(settle_dt)
+        bond_prices = clean_prices + accrued * self._pars
+
+        # Calculate the price of each bond discounted on the Ibor curve
+        float_serials, year_fracs, offsets = \
+            self._asw_float_flows(settle_dt,
+                                  swapFloatDayCountConventionType,
+                                  swapFloatFrequencyType,
+                                  swapFloatCalendarType,
+                                  swapFloatBusDayAdjustRuleType,
+                                  swapFloatDateGenRuleType)
+
+        dfs_alive, float_dfs = _curve_dfs(discount_curve,
+                                          self._flow_serials[alive],
+                                          float_serials)
+
+        dfs = np.zeros(len(self._flow_serials))
+        dfs[alive] = dfs_alive
+        flows = self._flow_cpns + self._is_maturity
+        pv_ibor = self._sum_by_bond(flows * dfs)
+
+        # Calculate the PV01 of the floating leg of each asset swap
+        pv01 = np.add.reduceat(year_fracs * float_dfs, offsets[:-1])
+
+        asw = (pv_ibor - bond_prices / self._pars) / pv01
+        return asw
+
+    ###########################################################################
+
+    def _oas_terms(self,
+                   settle_dt: Date,
+                   discount_curve: DiscountCurve):
+        """ Return the times of the flows paid after settlement, one plus the
+        Ibor implied zero rate per period to each of them and the flow
+        amounts. These do not depend on the OAS. """
+
+        _, _, _, _, _, _, alive = self._settle(settle_dt)
+
+        serials = self._flow_serials[alive]
+        t = (serials - settle_dt._excel_dt) / gDaysInYear
+        t = np.maximum(t, gSmall)
+
+        f = self._freqs[self._flow_bonds[alive]]
+        df, = _curve_dfs(discount_curve, serials)
+
+        # determine the Ibor implied zero rate
+        r = f * (np.power(df, -1.0 / t / f) - 1.0)
+
+        flows = self._flow_cpns[alive] + self._is_maturity[alive]
+        return alive, t, f, 1.0 + r / f, flows
+
+    ###########################################################################
+
+    def _price_from_oas(self,
+                        oas_terms,
+                        oass: np.ndarray):
+        """ Return the price of each bond per unit par from its OAS and the
+        derivative of the price with respect to the OAS. """
+
+        alive, t, f, growth, flows = oas_terms
+
+        flow_oass = oass[self._flow_bonds[alive]]
+
+        # determine the OAS adjusted discount factor
+        df_adjusted = np.power(growth + flow_oass / f, -t * f)
+        ddf_adjusted = -t * df_adjusted / (growth + flow_oass / f)
+
+        pvs = np.zeros(len(self._flow_serials))
+        dpvs = np.zeros(len(self._flow_serials))
+        pvs[alive] = flows * df_adjusted
+        dpvs[alive] = flows * ddf_adjusted
+
+        return self._sum_by_bond(pvs), self._sum_by_bond(dpvs)
+
+    ###########################################################################
+
+    def dirty_price_from_oas(self,
+                             settle_dt: Date,
+                             discount_curve: DiscountCurve,
+                             oass: (list, np.ndarray)):
+        """ Calculate the full price of each bond from its OAS given the bond
+        settlement date and a discount curve. """
+
+        oass = self._bond_values(oass)
+        oas_terms = self._oas_terms(settle_dt, discount_curve)
+        pv = self._price_from_oas(oas_terms, oass)[0]
+        return pv * self._pars
+
+    ###########################################################################
+
+    def option_adjusted_spread(self,
+                               settle_dt: Date,
+                               clean_prices: (list, np.ndarray),
+                               discount_curve: DiscountCurve,
+                               tol: float = 1e-10,
+                               max_iter: int = 50):
+        """ Calculate the OAS of each bond from its clean price relative to a
+        discount curve. All of the bonds are solved together using Newton's
+        method with the analytic derivative of the price with respect to the
+        OAS. A NaN is returned for any bond whose OAS does not converge. """
+
+        clean_prices = self._bond_values(clean_prices)
+        accrued = self._settle(settle_dt)[2]
+        dirty_prices = clean_prices / self._pars + accrued
+
+        oas_terms = self._oas_terms(settle_dt, discount_curve)
+        oass = np.full(len(self._bonds), 0.01)  # initial value of 1%
+        converged = np.zeros(len(self._bonds), dtype=bool)
+
+        for _ in range(max_iter):
+
+            price, slope = self._price_from_oas(oas_terms, oass)
+            step = (price - dirty_prices) / slope
+            oass = oass - step
+
+            # The spread must keep every periodic growth factor positive
+            oass = np.maximum(oass, -0.99 * self._freqs)
+
+            converged = np.abs(step) < tol
+            if np.all(converged):
+                break
+
+        oass[~converged] = np.nan
+        return oass
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._bonds)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM BONDS", len(self._bonds))
+        s += label_to_string("NUM FLOWS", len(self._flow_serials))
+        s += label_to_string("NUM SETTLE DATES", len(self._settle_terms))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """ Simple print function for backward compatibility. """
+        print(self)
+
+###############################################################################
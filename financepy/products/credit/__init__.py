@@ -1,7 +1,25 @@
-from .cds import *
-from .cds_curve import *
-from .cds_basket import *
-from .cds_index_option import *
-from .cds_index_portfolio import *
-from .cds_option import *
-from .cds_tranche import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'cds': ['Calendar', 'CDS', 'get_curve_cache', 'glob_num_steps_per_year',
+            'standard_recovery_rate', 'useFlatHazardRateIntegral'],
+    'cds_curve': ['annual_frequency', 'CDSCurve', 'DateArray', 'input_time',
+                  'InterpTypes', 'table_to_string'],
+    'cds_basket': ['CDSBasket', 'default_times_gc', 'homog_basket_loss_dbn',
+                   'StudentTCopula'],
+    'cds_book': ['bump_size', 'CDSBook'],
+    'cds_index_option': ['CDSIndexOption', 'DayCount', 'INVROOT2PI',
+                         'RPV01_INDEX'],
+    'cds_index_portfolio': ['CDSIndexPortfolio', 'label_to_string'],
+    'cds_option': ['CDSOption', 'fvol', 'N'],
+    'cds_tranche': ['BusDayAdjustTypes', 'CalendarTypes', 'CDSTranche',
+                    'check_argument_types', 'Date', 'DateGenRuleTypes',
+                    'DayCountTypes', 'FinError', 'FinLossDistributionBuilder',
+                    'FrequencyTypes', 'gDaysInYear', 'JointCalendar',
+                    'ONE_MILLION', 'times_from_dates', 'tr_surv_prob_lhp',
+                    'tranch_surv_prob_gaussian',
+                    'tranche_surv_prob_adj_binomial',
+                    'tranche_surv_prob_recursion']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
@@ -10,7 +10,7 @@ from copy import deepcopy
 
 from ...utils.date import Date
 from ...utils.error import FinError
-from ...utils.calendar import Calendar, CalendarTypes
+from ...utils.calendar import Calendar, CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import annual_frequency, FrequencyTypes
@@ -18,6 +18,8 @@ from ...utils.global_vars import gDaysInYear
 from ...utils.math import ONE_MILLION
 from ...utils.helpers import label_to_string, table_to_string
 from ...market.curves.interpolator import InterpTypes, _uinterpolate
+from ...market.curves.interpolator import _add_uinterpolate_gradient
+from ...market.curves.curve_cache import get_curve_cache
 
 from ...utils.helpers import check_argument_types
 
@@ -26,10 +28,42 @@ standard_recovery_rate = 0.40
 glob_num_steps_per_year = 25
 
 ###############################################################################
-# TODO: Perform protection leg pv analytically using fact that hazard rate and
-#       interest rates are flat between their combined node points. Right now I
-#       do not find the protection leg PV calculations to be a bottleneck,
-#       especially given the speedup benefits of using NUMBA.
+
+
+@njit(float64(float64, float64[:], float64[:]), fastmath=True, cache=True)
+def _flat_fwd_interpolate(t, times, values):
+    """ Interpolate a curve with flat forward rates between its pillars as
+    _uinterpolate does. Times before the first pillar, such as the effective
+    time of a contract which started before the curve date, are extrapolated
+    using the first segment as in the protection leg integrator. """
+
+    if t < times[0] and times.size > 1:
+        rt1 = -log(values[0])
+        rt2 = -log(values[1])
+        dt = times[1] - times[0]
+        rtvalue = ((times[1] - t) * rt1 + (t - times[0]) * rt2) / dt
+        return exp(-rtvalue)
+
+    return _uinterpolate(t, times, values, InterpTypes.FLAT_FWD_RATES.value)
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _add_flat_fwd_gradient(t, weight, times, values, grad):
+    """ Add the sensitivity of weight times the value interpolated by
+    _flat_fwd_interpolate at time t to the pillar values into grad. """
+
+    if t < times[0] and times.size > 1:
+        w = (t - times[0]) / (times[1] - times[0])
+        y = _flat_fwd_interpolate(t, times, values)
+        grad[0] += weight * y * (1.0 - w) / values[0]
+        grad[1] += weight * y * w / values[1]
+        return
+
+    _add_uinterpolate_gradient(t, weight, times, values,
+                               InterpTypes.FLAT_FWD_RATES.value, grad)
+
 ###############################################################################
 
 
@@ -48,8 +82,6 @@ def _risky_pv01_numba(teff,
     """ Fast calculation of the risky PV01 of a CDS using NUMBA.
     The output is a numpy array of the full and clean risky PV01."""
 
-    method = InterpTypes.FLAT_FWD_RATES.value
-
     if 1 == 0:
         print("===================")
         print("Teff", teff)
@@ -69,9 +101,9 @@ def _risky_pv01_numba(teff,
 
     # The first cpn is a special case which needs to be handled carefully
     # taking into account what cpn has already accrued and what has not
-    qeff = _uinterpolate(teff, npSurvTimes, npSurvValues, method)
-    q1 = _uinterpolate(tncd, npSurvTimes, npSurvValues, method)
-    z1 = _uinterpolate(tncd, npIborTimes, npIborValues, method)
+    qeff = _flat_fwd_interpolate(teff, npSurvTimes, npSurvValues)
+    q1 = _flat_fwd_interpolate(tncd, npSurvTimes, npSurvValues)
+    z1 = _flat_fwd_interpolate(tncd, npIborTimes, npIborValues)
 
     # this is the part of the cpn accrued from previous cpn date to now
     # accrual_factorPCDToNow = day_count.year_frac(pcd,teff)
@@ -94,8 +126,8 @@ def _risky_pv01_numba(teff,
 
         t2 = paymentTimes[it]
 
-        q2 = _uinterpolate(t2, npSurvTimes, npSurvValues, method)
-        z2 = _uinterpolate(t2, npIborTimes, npIborValues, method)
+        q2 = _flat_fwd_interpolate(t2, npSurvTimes, npSurvValues)
+        z2 = _flat_fwd_interpolate(t2, npIborTimes, npIborValues)
 
         accrual_factor = year_fracs[it]
 
@@ -131,64 +163,299 @@ def _risky_pv01_numba(teff,
 ###############################################################################
 
 
+@njit(fastmath=True, cache=True)
+def _flat_fwd_log_values(t, times, values):
+    """ Log of the values of a curve with flat forward rates between its
+    pillars at a vector of increasing times. The curve segment is found by
+    walking forward through the pillars so the cost is linear in the number
+    of times and pillars. Times after the last pillar are extrapolated with
+    the forward rate of the last segment as in _uinterpolate. """
+
+    num_points = len(times)
+    log_values = np.log(values)
+    out = np.empty(len(t))
+
+    j = 1
+    for m in range(0, len(t)):
+
+        while j < num_points - 1 and times[j] < t[m]:
+            j = j + 1
+
+        w = (t[m] - times[j - 1]) / (times[j] - times[j - 1])
+        out[m] = (1.0 - w) * log_values[j - 1] + w * log_values[j]
+
+    return out
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _protection_leg_times(teff, t_mat, npIborTimes, npSurvTimes):
+    """ Merge the pillar times of the Ibor and issuer curves that fall between
+    the effective date and the maturity date with these two dates. Between
+    consecutive times both the short rate and the hazard rate are constant. """
+
+    t = np.empty(len(npIborTimes) + len(npSurvTimes) + 2)
+    t[0] = teff
+    num_times = 1
+
+    i = 0
+    j = 0
+    while i < len(npIborTimes) or j < len(npSurvTimes):
+
+        if j == len(npSurvTimes) or \
+                (i < len(npIborTimes) and npIborTimes[i] < npSurvTimes[j]):
+            tt = npIborTimes[i]
+            i = i + 1
+        else:
+            tt = npSurvTimes[j]
+            j = j + 1
+
+        if tt > t[num_times - 1] and tt < t_mat:
+            t[num_times] = tt
+            num_times = num_times + 1
+
+    t[num_times] = t_mat
+    return t[0:num_times + 1]
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _flat_rate_integral(a, dt):
+    """ The integral of exp(-a s) for s from 0 to dt and its derivative with
+    respect to a. A series is used when a * dt is small. """
+
+    x = a * dt
+
+    if abs(x) < 1e-4:
+        f = dt * (1.0 - x / 2.0 + x * x / 6.0)
+        df = dt * dt * (-0.5 + x / 3.0 - x * x / 8.0)
+    else:
+        e = exp(-x)
+        f = (1.0 - e) / a
+        df = (dt * e - f) / a
+
+    return f, df
+
+###############################################################################
+
+
 @njit(float64(float64, float64, float64[:], float64[:], float64[:], float64[:],
-              float64, int64, int64), fastmath=True, cache=True)
+              float64), fastmath=True, cache=True)
 def _protection_leg_pv_numba(teff,
                              t_mat,
                              npIborTimes,
                              npIborValues,
                              npSurvTimes,
                              npSurvValues,
-                             contract_recovery_rate,
-                             num_steps_per_year,
-                             protMethod):
-    """ Fast calculation of the CDS protection leg PV using NUMBA to speed up
-    the numerical integration over time. """
+                             contract_recovery_rate):
+    """ Fast calculation of the CDS protection leg PV using NUMBA. As in the
+    ISDA standard model, the pillar times of both curves are merged with the
+    effective and maturity dates. Both curves have flat forward rates so the
+    short rate r and hazard rate h are constant between consecutive times and
+    the integral of h * Q(s) * Z(s) over each interval is found exactly. """
 
-    method = InterpTypes.FLAT_FWD_RATES.value
-    dt = 1.0 / num_steps_per_year
-    num_steps = int((t_mat-teff) * num_steps_per_year + 0.50)
-    dt = (t_mat - teff) / num_steps
-
-    t = teff
-    z1 = _uinterpolate(t, npIborTimes, npIborValues, method)
-    q1 = _uinterpolate(t, npSurvTimes, npSurvValues, method)
+    t = _protection_leg_times(teff, t_mat, npIborTimes, npSurvTimes)
+    log_z = _flat_fwd_log_values(t, npIborTimes, npIborValues)
+    log_q = _flat_fwd_log_values(t, npSurvTimes, npSurvValues)
 
     prot_pv = 0.0
-    small = 1e-8
-
-    if useFlatHazardRateIntegral:
-
-        for _ in range(0, num_steps):
-            t = t + dt
-            z2 = _uinterpolate(t, npIborTimes, npIborValues, method)
-            q2 = _uinterpolate(t, npSurvTimes, npSurvValues, method)
-            # This needs to be updated to handle small h+r
-            h12 = -log(q2 / q1) / dt
-            r12 = -log(z2 / z1) / dt
-            expTerm = exp(-(r12 + h12) * dt)
-            dprot_pv = h12 * (1.0 - expTerm) * q1 * z1 / \
-                (abs(h12 + r12) + small)
-            prot_pv += dprot_pv
-            q1 = q2
-            z1 = z2
 
-    else:
+    for it in range(1, len(t)):
 
-        for _ in range(0, num_steps):
-            t += dt
-            z2 = _uinterpolate(t, npIborTimes, npIborValues, method)
-            q2 = _uinterpolate(t, npSurvTimes, npSurvValues, method)
-            dq = q1 - q2
-            dprot_pv = 0.5 * (z1 + z2) * dq
-            prot_pv += dprot_pv
-            q1 = q2
-            z1 = z2
+        dt = t[it] - t[it - 1]
+        h12 = (log_q[it - 1] - log_q[it]) / dt
+        r12 = (log_z[it - 1] - log_z[it]) / dt
+        f, _ = _flat_rate_integral(h12 + r12, dt)
+        prot_pv += h12 * f * exp(log_q[it - 1] + log_z[it - 1])
 
     prot_pv = prot_pv * (1.0 - contract_recovery_rate)
     return prot_pv
 
 ###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _risky_pv01_gradient_numba(teff,
+                               accrual_factorPCDToNow,
+                               paymentTimes,
+                               year_fracs,
+                               npIborTimes,
+                               npIborValues,
+                               npSurvTimes,
+                               npSurvValues):
+    """ Sensitivity of the full risky PV01 calculated in _risky_pv01_numba to
+    the Ibor curve discount factors and the issuer curve survival
+    probabilities at their pillar times. This is done by differentiating each
+    term of the calculation in turn and chaining it with the sensitivity of
+    the interpolation to the pillar values. """
+
+    grad_z = np.zeros(len(npIborTimes))
+    grad_q = np.zeros(len(npSurvTimes))
+
+    tncd = paymentTimes[0]
+
+    qeff = _flat_fwd_interpolate(teff, npSurvTimes, npSurvValues)
+    q1 = _flat_fwd_interpolate(tncd, npSurvTimes, npSurvValues)
+    z1 = _flat_fwd_interpolate(tncd, npIborTimes, npIborValues)
+
+    # Accrued paid at default on the first period
+    c = accrual_factorPCDToNow + \
+        0.5 * (year_fracs[1] - accrual_factorPCDToNow)
+
+    dz1 = q1 * year_fracs[1] + (qeff - q1) * c
+
+    _add_flat_fwd_gradient(teff, z1 * c, npSurvTimes, npSurvValues, grad_q)
+    _add_flat_fwd_gradient(tncd, z1 * year_fracs[1] - z1 * c,
+                           npSurvTimes, npSurvValues, grad_q)
+
+    t1 = tncd
+
+    for it in range(1, len(paymentTimes)):
+
+        t2 = paymentTimes[it]
+
+        q2 = _flat_fwd_interpolate(t2, npSurvTimes, npSurvValues)
+        z2 = _flat_fwd_interpolate(t2, npIborTimes, npIborValues)
+
+        accrual_factor = year_fracs[it]
+
+        dq1 = 0.0
+        dq2 = z2 * accrual_factor
+        dz2 = q2 * accrual_factor
+
+        if useFlatHazardRateIntegral:
+            tau = accrual_factor
+            h12 = -log(q2 / q1) / tau
+            r12 = -log(z2 / z1) / tau
+            alpha = h12 + r12
+            e = exp(-alpha * tau)
+            expTerm = 1.0 - e - alpha * tau * e
+            den = abs(alpha * alpha + 1e-20)
+            dd_dh = q1 * z1 * expTerm / den
+            dd_dalpha = q1 * z1 * h12 * (alpha * tau * tau * e * den -
+                                         expTerm * 2.0 * alpha) / den / den
+            dd_dh += dd_dalpha
+            dq1 += z1 * h12 * expTerm / den + dd_dh / (tau * q1)
+            dq2 -= dd_dh / (tau * q2)
+            dz1 += q1 * h12 * expTerm / den + dd_dalpha / (tau * z1)
+            dz2 -= dd_dalpha / (tau * z2)
+        else:
+            dq1 += 0.50 * z2 * accrual_factor
+            dq2 -= 0.50 * z2 * accrual_factor
+            dz2 += 0.50 * (q1 - q2) * accrual_factor
+
+        _add_flat_fwd_gradient(t1, dq1, npSurvTimes, npSurvValues, grad_q)
+        _add_flat_fwd_gradient(t2, dq2, npSurvTimes, npSurvValues, grad_q)
+        _add_flat_fwd_gradient(t2, dz2, npIborTimes, npIborValues, grad_z)
+
+        q1 = q2
+        t1 = t2
+
+    _add_flat_fwd_gradient(tncd, dz1, npIborTimes, npIborValues, grad_z)
+
+    return grad_z, grad_q
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _protection_leg_gradient_numba(teff,
+                                   t_mat,
+                                   npIborTimes,
+                                   npIborValues,
+                                   npSurvTimes,
+                                   npSurvValues,
+                                   contract_recovery_rate):
+    """ Sensitivity of the protection leg PV calculated in
+    _protection_leg_pv_numba to the Ibor curve discount factors and the issuer
+    curve survival probabilities at their pillar times. The exact integral
+    over each interval is differentiated and chained with the sensitivity of
+    the interpolation to the pillar values. """
+
+    grad_z = np.zeros(len(npIborTimes))
+    grad_q = np.zeros(len(npSurvTimes))
+
+    t = _protection_leg_times(teff, t_mat, npIborTimes, npSurvTimes)
+    log_z = _flat_fwd_log_values(t, npIborTimes, npIborValues)
+    log_q = _flat_fwd_log_values(t, npSurvTimes, npSurvValues)
+
+    for it in range(1, len(t)):
+
+        dt = t[it] - t[it - 1]
+        q1 = exp(log_q[it - 1])
+        q2 = exp(log_q[it])
+        z1 = exp(log_z[it - 1])
+        z2 = exp(log_z[it])
+
+        h12 = (log_q[it - 1] - log_q[it]) / dt
+        r12 = (log_z[it - 1] - log_z[it]) / dt
+        f, df = _flat_rate_integral(h12 + r12, dt)
+
+        dprot_pv = h12 * f * q1 * z1
+        dd_dr = h12 * df * q1 * z1
+        dd_dh = f * q1 * z1 + dd_dr
+
+        dq1 = dprot_pv / q1 + dd_dh / (dt * q1)
+        dq2 = -dd_dh / (dt * q2)
+        dz1 = dprot_pv / z1 + dd_dr / (dt * z1)
+        dz2 = -dd_dr / (dt * z2)
+
+        _add_flat_fwd_gradient(t[it - 1], dq1, npSurvTimes, npSurvValues,
+                               grad_q)
+        _add_flat_fwd_gradient(t[it], dq2, npSurvTimes, npSurvValues, grad_q)
+        _add_flat_fwd_gradient(t[it - 1], dz1, npIborTimes, npIborValues,
+                               grad_z)
+        _add_flat_fwd_gradient(t[it], dz2, npIborTimes, npIborValues, grad_z)
+
+    grad_z = grad_z * (1.0 - contract_recovery_rate)
+    grad_q = grad_q * (1.0 - contract_recovery_rate)
+    return grad_z, grad_q
+
+###############################################################################
+
+
+def _pack_legs(cds_contracts, value_dt):
+    """ Set up the legs of a list of CDS contracts on a valuation date for the
+    compiled valuation code. The payment times and accrual factors of all of
+    the contracts are packed into flat arrays, with those of contract i from
+    offsets[i] to offsets[i+1]. Returns the effective times, maturity times,
+    accrued factors to the effective date, payment times and their offsets,
+    accrual factors and their offsets and the coupons of the contracts. """
+
+    num_contracts = len(cds_contracts)
+
+    teffs = np.zeros(num_contracts)
+    t_mats = np.zeros(num_contracts)
+    accrual_factorsPCDToNow = np.zeros(num_contracts)
+    coupons = np.zeros(num_contracts)
+    payment_offsets = np.zeros(num_contracts + 1, dtype=np.int64)
+    year_frac_offsets = np.zeros(num_contracts + 1, dtype=np.int64)
+    payment_times = []
+    year_fracs = []
+
+    for i, cds in enumerate(cds_contracts):
+
+        (teff, accrual_factorPCDToNow,
+         paymentTimes, accrual_factors) = cds._risky_pv01_inputs(value_dt)
+
+        teffs[i] = teff
+        t_mats[i] = (cds._maturity_dt - value_dt) / gDaysInYear
+        accrual_factorsPCDToNow[i] = accrual_factorPCDToNow
+        coupons[i] = cds._running_cpn
+        payment_times.append(paymentTimes)
+        year_fracs.append(accrual_factors)
+        payment_offsets[i + 1] = payment_offsets[i] + len(paymentTimes)
+        year_frac_offsets[i + 1] = year_frac_offsets[i] + len(accrual_factors)
+
+    return (teffs, t_mats, accrual_factorsPCDToNow,
+            np.concatenate(payment_times).astype(np.float64),
+            payment_offsets,
+            np.concatenate(year_fracs).astype(np.float64),
+            year_frac_offsets, coupons)
+
+###############################################################################
 ###############################################################################
 ###############################################################################
 
@@ -205,7 +472,7 @@ class CDS:
                  long_protection: bool = True,
                  freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  dc_type: DayCountTypes = DayCountTypes.ACT_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create a CDS from the step-in date, maturity date and cpn """
@@ -408,12 +675,16 @@ class CDS:
 
         bump = 0.0001  # 1 basis point
 
-        # we create a deep copy to avoid state issues
-        bumpedIssuerCurve = deepcopy(issuer_curve)
+        # we create a deep copy to avoid state issues. The discount curve is
+        # not bumped and so it is shared rather than copied
+        libor_curve = issuer_curve._libor_curve
+        bumpedIssuerCurve = deepcopy(issuer_curve,
+                                     {id(libor_curve): libor_curve})
+
         for cds in bumpedIssuerCurve._cds_contracts:
             cds._running_cpn += bump
 
-        bumpedIssuerCurve._build_curve()
+        bumpedIssuerCurve = get_curve_cache().build(bumpedIssuerCurve)
 
         v1 = self.value(value_dt,
                         bumpedIssuerCurve,
@@ -445,19 +716,19 @@ class CDS:
                         num_steps_per_year)
 
         # we create a deep copy to avoid state issues
-        new_issuer_curve = deepcopy(issuer_curve)
+        new_libor_curve = deepcopy(issuer_curve._libor_curve)
 
         bump = 0.0001  # 1 basis point
 
-        for depo in new_issuer_curve._libor_curve._usedDeposits:
+        for depo in new_libor_curve._usedDeposits:
 
             depo._deposit_rate += bump
 
-        for fra in new_issuer_curve._libor_curve._usedFRAs:
+        for fra in new_libor_curve._usedFRAs:
 
-            fra._fraRate += bump
+            fra._fra_rate += bump
 
-        for swap in new_issuer_curve._libor_curve._usedSwaps:
+        for swap in new_libor_curve._usedSwaps:
 
             cpn = swap._fixed_leg._cpn
             swap._fixed_leg._cpn = cpn + bump
@@ -471,8 +742,13 @@ class CDS:
                 old_pmt = swap._fixed_leg._payments[i]
                 swap._fixed_leg._payments[i] = old_pmt * (cpn + bump) / cpn
 
-        new_issuer_curve._libor_curve._build_curve()
-        new_issuer_curve._build_curve()
+        # The bumped curves are only built once if a curve cache is set
+        curve_cache = get_curve_cache()
+        new_libor_curve = curve_cache.build(new_libor_curve)
+        new_issuer_curve = deepcopy(issuer_curve,
+                                    {id(issuer_curve._libor_curve):
+                                     new_libor_curve})
+        new_issuer_curve = curve_cache.build(new_issuer_curve)
 
         v1 = self.value(value_dt,
                         new_issuer_curve,
@@ -486,6 +762,67 @@ class CDS:
 
     ###########################################################################
 
+    def bucketed_delta(self,
+                       value_dt: Date,
+                       issuer_curve,
+                       contract_recovery_rate,
+                       num_steps_per_year=glob_num_steps_per_year,
+                       bump_size: float = 0.0001):
+        """ Calculate the change in the dirty value of the CDS for an
+        increase of bump_size in the continuously compounded zero rate at each
+        pillar of the Ibor curve, and for the same increase in the hazard rate
+        at each pillar of the issuer curve, holding all other pillars fixed.
+        Both are returned in a dictionary. The legs are differentiated in a
+        single pass over their time grids and chained with the analytical
+        sensitivities of the curve interpolation, so no curves are rebuilt.
+        Unlike the interest_dv01 the issuer curve is not rebuilt after the
+        Ibor curve is perturbed. """
+
+        libor_curve = issuer_curve._libor_curve
+
+        (teff, accrual_factorPCDToNow,
+         paymentTimes, year_fracs) = self._risky_pv01_inputs(value_dt)
+
+        rpv01_grad_z, rpv01_grad_q = \
+            _risky_pv01_gradient_numba(teff,
+                                       accrual_factorPCDToNow,
+                                       paymentTimes,
+                                       year_fracs,
+                                       libor_curve._times,
+                                       libor_curve._dfs,
+                                       issuer_curve._times,
+                                       issuer_curve._values)
+
+        t_mat = (self._maturity_dt - value_dt) / gDaysInYear
+
+        prot_grad_z, prot_grad_q = \
+            _protection_leg_gradient_numba(teff,
+                                           t_mat,
+                                           libor_curve._times,
+                                           libor_curve._dfs,
+                                           issuer_curve._times,
+                                           issuer_curve._values,
+                                           contract_recovery_rate)
+
+        if self._long_protection:
+            longProt = +1
+        else:
+            longProt = -1
+
+        scale = longProt * self._notional
+        grad_z = scale * (prot_grad_z - self._running_cpn * rpv01_grad_z)
+        grad_q = scale * (prot_grad_q - self._running_cpn * rpv01_grad_q)
+
+        ibor_delta = -bump_size * libor_curve._times * libor_curve._dfs * \
+            grad_z
+
+        credit_delta = -bump_size * issuer_curve._times * \
+            issuer_curve._values * grad_q
+
+        return {'ibor_delta': ibor_delta, 'credit_delta': credit_delta}
+
+    ###########################################################################
+
     def cash_settlement_amount(self,
                                value_dt,
                                settle_dt,
@@ -576,7 +913,9 @@ class CDS:
                           num_steps_per_year=glob_num_steps_per_year,
                           protMethod=0):
         """ Calculates the protection leg PV of the CDS by calling into the
-        fast NUMBA code that has been defined above. """
+        fast NUMBA code that has been defined above. The integral is exact
+        so num_steps_per_year and protMethod are no longer used and are only
+        kept so that existing calls do not break. """
 
         teff = (self._step_in_dt - value_dt) / gDaysInYear
         t_mat = (self._maturity_dt - value_dt) / gDaysInYear
@@ -589,22 +928,16 @@ class CDS:
                                      libor_curve._dfs,
                                      issuer_curve._times,
                                      issuer_curve._values,
-                                     contract_recovery_rate,
-                                     num_steps_per_year,
-                                     protMethod)
+                                     contract_recovery_rate)
 
         return v * self._notional
 
     ###########################################################################
 
-    def risky_pv01(self,
-                   value_dt,
-                   issuer_curve,
-                   pv01_method=0):
-        """ The risky_pv01 is the present value of a risky one dollar paid on
-        the premium leg of a CDS contract. """
-
-        libor_curve = issuer_curve._libor_curve
+    def _risky_pv01_inputs(self,
+                           value_dt):
+        """ Times and accrual factors of the premium leg as used by the
+        risky PV01 calculation. """
 
         paymentTimes = []
         for date in self._payment_dts:
@@ -624,10 +957,27 @@ class CDS:
         year_fracs = self._accrual_factors
         teff = (eff - value_dt) / gDaysInYear
 
+        return (teff, accrual_factorPCDToNow, np.array(paymentTimes),
+                np.array(year_fracs))
+
+    ###########################################################################
+
+    def risky_pv01(self,
+                   value_dt,
+                   issuer_curve,
+                   pv01_method=0):
+        """ The risky_pv01 is the present value of a risky one dollar paid on
+        the premium leg of a CDS contract. """
+
+        libor_curve = issuer_curve._libor_curve
+
+        (teff, accrual_factorPCDToNow,
+         paymentTimes, year_fracs) = self._risky_pv01_inputs(value_dt)
+
         valueRPV01 = _risky_pv01_numba(teff,
                                        accrual_factorPCDToNow,
-                                       np.array(paymentTimes),
-                                       np.array(year_fracs),
+                                       paymentTimes,
+                                       year_fracs,
                                        libor_curve._times,
                                        libor_curve._dfs,
                                        issuer_curve._times,
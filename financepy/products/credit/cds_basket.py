@@ -10,11 +10,11 @@ import numpy as np
 from ...utils.error import FinError
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 from ...utils.global_vars import gDaysInYear
 from ...utils.math import ONE_MILLION
-from ...utils.helpers import check_argument_types
+from ...utils.helpers import check_argument_types, times_from_dates
 from ...utils.date import Date
 from ...utils.helpers import label_to_string
 
@@ -22,8 +22,6 @@ from ...models.gauss_copula_onefactor import homog_basket_loss_dbn
 from ...models.gauss_copula import default_times_gc
 from ...models.student_t_copula import StudentTCopula
 
-from ...market.curves.interpolator import interpolate, InterpTypes
-
 from ...products.credit.cds_curve import CDSCurve
 from ...products.credit.cds import CDS
 
@@ -44,7 +42,7 @@ class CDSBasket:
                  long_protection: bool = True,
                  freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  dc_type: DayCountTypes = DayCountTypes.ACT_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
 
@@ -259,7 +257,6 @@ class CDSBasket:
         payment_dts = self._cds_contract._payment_dts
         num_times = len(payment_dts)
 
-        issuer_surv_probs = np.zeros(num_credits)
         recovery_rates = np.zeros(num_credits)
         basket_times = np.zeros(num_times)
         basket_surv_curve = np.zeros(num_times)
@@ -267,16 +264,19 @@ class CDSBasket:
         basket_times[0] = 0.0
         basket_surv_curve[0] = 1.0
 
-        for i_time in range(0, num_times):
+        # Survival probabilities of all of the credits to each payment date
+        payment_times = times_from_dates(payment_dts, value_dt)
+        surv_probs = np.zeros((num_times, num_credits))
 
-            t = (payment_dts[i_time] - value_dt) / gDaysInYear
+        for i_credit in range(0, num_credits):
+            issuer_curve = issuer_curves[i_credit]
+            recovery_rates[i_credit] = issuer_curve._recovery_rate
+            surv_probs[:, i_credit] = issuer_curve.survival_prob(payment_times)
 
-            for i_credit in range(0, num_credits):
-                issuer_curve = issuer_curves[i_credit]
-                recovery_rates[i_credit] = issuer_curve._recovery_rate
-                issuer_surv_probs[i_credit] = interpolate(
-                    t, issuer_curve._times, issuer_curve._values,
-                    InterpTypes.FLAT_FWD_RATES.value)
+        for i_time in range(0, num_times):
+
+            t = payment_times[i_time]
+            issuer_surv_probs = surv_probs[i_time]
 
             lossDbn = homog_basket_loss_dbn(issuer_surv_probs,
                                             recovery_rates,
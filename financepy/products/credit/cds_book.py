@@ -0,0 +1,400 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+from numba import njit
+
+from ...utils.error import FinError
+from ...utils.date import Date
+from ...utils.helpers import check_argument_types, label_to_string
+
+from .cds import CDS, _pack_legs, standard_recovery_rate
+from .cds import _risky_pv01_numba, _protection_leg_pv_numba
+
+bump_size = 0.0001  # 1 basis point
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _value_book_numba(teffs,
+                      t_mats,
+                      accrual_factorsPCDToNow,
+                      payment_times,
+                      payment_offsets,
+                      year_fracs,
+                      year_frac_offsets,
+                      trade_curves,
+                      surv_times,
+                      surv_values,
+                      surv_offsets,
+                      ibor_times,
+                      ibor_values,
+                      ibor_offsets,
+                      recovery_rates):
+    """ Calculate the full and clean risky PV01 and the protection leg PV per
+    unit notional of a book of CDS trades. The legs of the trades and the
+    issuer and Ibor curves are packed into flat arrays with offsets and
+    trade_curves gives the index of the curve of each trade. """
+
+    num_trades = len(teffs)
+
+    full_rpv01s = np.zeros(num_trades)
+    clean_rpv01s = np.zeros(num_trades)
+    prot_pvs = np.zeros(num_trades)
+
+    for i in range(0, num_trades):
+
+        c = trade_curves[i]
+
+        npSurvTimes = surv_times[surv_offsets[c]:surv_offsets[c + 1]]
+        npSurvValues = surv_values[surv_offsets[c]:surv_offsets[c + 1]]
+        npIborTimes = ibor_times[ibor_offsets[c]:ibor_offsets[c + 1]]
+        npIborValues = ibor_values[ibor_offsets[c]:ibor_offsets[c + 1]]
+
+        rpv01 = _risky_pv01_numba(teffs[i],
+                                  accrual_factorsPCDToNow[i],
+                                  payment_times[payment_offsets[i]:
+                                                payment_offsets[i + 1]],
+                                  year_fracs[year_frac_offsets[i]:
+                                             year_frac_offsets[i + 1]],
+                                  npIborTimes,
+                                  npIborValues,
+                                  npSurvTimes,
+                                  npSurvValues,
+                                  0)
+
+        full_rpv01s[i] = rpv01[0]
+        clean_rpv01s[i] = rpv01[1]
+
+        prot_pvs[i] = _protection_leg_pv_numba(teffs[i],
+                                               t_mats[i],
+                                               npIborTimes,
+                                               npIborValues,
+                                               npSurvTimes,
+                                               npSurvValues,
+                                               recovery_rates[i])
+
+    return full_rpv01s, clean_rpv01s, prot_pvs
+
+###############################################################################
+
+
+def _pack_curves(curves):
+    """ Pack the pillar times and values of a list of curves into flat arrays
+    with the pillars of curve i found from offsets[i] to offsets[i+1]. """
+
+    counts = [len(times) for times, _ in curves]
+    offsets = np.zeros(len(curves) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    times = np.concatenate([t for t, _ in curves]).astype(np.float64)
+    values = np.concatenate([v for _, v in curves]).astype(np.float64)
+    return times, values, offsets
+
+###############################################################################
+
+
+class CDSBook:
+    """ Class for valuing a book of CDS trades on many issuers together. Each
+    trade is assigned to an issuer and the issuer curves are supplied in a
+    dictionary keyed by issuer. The legs of all of the trades are set up once
+    for each valuation date and every trade is then valued in a single
+    compiled pass. For the credit DV01s each bumped issuer curve is built
+    once and reused by all of the trades on that issuer. Each function
+    returns an array with one value per trade which agrees with the
+    corresponding CDS function. """
+
+    def __init__(self,
+                 cds_contracts: list,
+                 issuers: list):
+        """ Create a book from a list of CDS contracts and a list of the same
+        length that gives the issuer of each contract. An issuer can be any
+        hashable key such as a name or a ticker. """
+
+        check_argument_types(self.__init__, locals())
+
+        if len(cds_contracts) == 0:
+            raise FinError("Book must contain at least one CDS")
+
+        if len(cds_contracts) != len(issuers):
+            raise FinError("Need one issuer for each CDS")
+
+        for cds in cds_contracts:
+            if isinstance(cds, CDS) is False:
+                raise FinError("Book can only contain CDS contracts")
+
+        self._cds_contracts = cds_contracts
+        self._issuers = issuers
+
+        # The issuers in order of first appearance and the index of the
+        # issuer of each trade
+        self._issuer_names = list(dict.fromkeys(issuers))
+        index = {name: i for i, name in enumerate(self._issuer_names)}
+        self._trade_issuers = np.array([index[name] for name in issuers],
+                                       dtype=np.int64)
+
+        self._notionals = np.array([cds._notional for cds in cds_contracts],
+                                   dtype=np.float64)
+        self._coupons = np.array([cds._running_cpn for cds in cds_contracts])
+        self._signs = np.array([1.0 if cds._long_protection else -1.0
+                                for cds in cds_contracts])
+
+        self._legs = {}
+
+    ###########################################################################
+
+    def _trade_legs(self,
+                    value_dt: Date):
+        """ Return the packed legs of all of the trades on a valuation date.
+        These are calculated once for each valuation date. """
+
+        value_serial = value_dt._excel_dt
+
+        if value_serial not in self._legs:
+            self._legs[value_serial] = _pack_legs(self._cds_contracts,
+                                                  value_dt)
+
+        return self._legs[value_serial]
+
+    ###########################################################################
+
+    def _issuer_curves(self,
+                       issuer_curves: dict):
+        """ Return the issuer curves in the order of the issuers of the
+        book. """
+
+        curves = []
+        for name in self._issuer_names:
+            if name not in issuer_curves:
+                raise FinError("No issuer curve for " + str(name))
+            curves.append(issuer_curves[name])
+
+        return curves
+
+    ###########################################################################
+
+    def _value_legs(self,
+                    value_dt: Date,
+                    curves: list,
+                    surv_values: np.ndarray,
+                    contract_recovery_rate):
+        """ Return the full and clean risky PV01s and the protection leg PVs
+        per unit notional of all of the trades. The survival probabilities of
+        the issuer curves are packed into surv_values so that bumped values
+        can be passed in. """
+
+        (teffs, t_mats, accrual_factorsPCDToNow, payment_times,
+         payment_offsets, year_fracs, year_frac_offsets, _) = \
+            self._trade_legs(value_dt)
+
+        surv_times, _, surv_offsets = \
+            _pack_curves([(c._times, c._values) for c in curves])
+
+        ibor_times, ibor_values, ibor_offsets = \
+            _pack_curves([(c._libor_curve._times, c._libor_curve._dfs)
+                          for c in curves])
+
+        recovery_rates = np.broadcast_to(
+            np.asarray(contract_recovery_rate, dtype=np.float64),
+            len(self._cds_contracts)).copy()
+
+        return _value_book_numba(teffs,
+                                 t_mats,
+                                 accrual_factorsPCDToNow,
+                                 payment_times,
+                                 payment_offsets,
+                                 year_fracs,
+                                 year_frac_offsets,
+                                 self._trade_issuers,
+                                 surv_times,
+                                 surv_values,
+                                 surv_offsets,
+                                 ibor_times,
+                                 ibor_values,
+                                 ibor_offsets,
+                                 recovery_rates)
+
+    ###########################################################################
+
+    def _dirty_pvs(self,
+                   full_rpv01s: np.ndarray,
+                   prot_pvs: np.ndarray):
+        """ Dirty values of the trades from their legs per unit notional. """
+
+        return self._signs * self._notionals * \
+            (prot_pvs - self._coupons * full_rpv01s)
+
+    ###########################################################################
+
+    def value(self,
+              value_dt: Date,
+              issuer_curves: dict,
+              contract_recovery_rate=standard_recovery_rate):
+        """ Value all of the trades in the book given a dictionary of issuer
+        curves keyed by issuer. The contract recovery rate can be a single
+        value or one per trade. Returns a dictionary of arrays holding the
+        dirty and clean values, the dirty and clean risky PV01s, the
+        protection leg PVs and the par spreads of the trades. """
+
+        curves = self._issuer_curves(issuer_curves)
+        surv_values = np.concatenate([c._values for c in curves])
+
+        full_rpv01s, clean_rpv01s, prot_pvs = \
+            self._value_legs(value_dt, curves, surv_values,
+                             contract_recovery_rate)
+
+        dirty_pvs = self._dirty_pvs(full_rpv01s, prot_pvs)
+        clean_pvs = self._signs * self._notionals * \
+            (prot_pvs - self._coupons * clean_rpv01s)
+
+        return {'dirty_pv': dirty_pvs,
+                'clean_pv': clean_pvs,
+                'dirty_rpv01': full_rpv01s,
+                'clean_rpv01': clean_rpv01s,
+                'protection_pv': prot_pvs * self._notionals,
+                'par_spread': prot_pvs / clean_rpv01s}
+
+    ###########################################################################
+
+    def _bumped_values(self,
+                       curves: list,
+                       curve_legs: list,
+                       bump_index: int = None):
+        """ Rebuild each issuer curve with the spreads of its CDS contracts
+        bumped by one basis point, or with only the contract at bump_index
+        bumped, and return the packed survival probabilities. The packed legs
+        of the curve contracts are passed in so they are only set up once.
+        Issuer curves with no contract at bump_index are left unchanged. """
+
+        values = []
+
+        for curve, legs in zip(curves, curve_legs):
+
+            if bump_index is not None and \
+                    bump_index >= len(curve._cds_contracts):
+                values.append(curve._values)
+                continue
+
+            coupons = legs[-1].copy()
+
+            if bump_index is None:
+                coupons += bump_size
+            else:
+                coupons[bump_index] += bump_size
+
+            _, bumped_values = curve._bootstrap(legs, coupons)
+            values.append(bumped_values)
+
+        return np.concatenate(values)
+
+    ###########################################################################
+
+    def _curve_legs(self,
+                    curves: list):
+        """ Return the packed legs of the CDS contracts of each issuer curve
+        on the curve valuation date. """
+
+        curve_legs = []
+
+        for curve in curves:
+
+            if len(curve._cds_contracts) == 0:
+                raise FinError("Issuer curve has no CDS contracts to bump")
+
+            curve_legs.append(_pack_legs(curve._cds_contracts,
+                                         curve._value_dt))
+
+        return curve_legs
+
+    ###########################################################################
+
+    def credit_dv01(self,
+                    value_dt: Date,
+                    issuer_curves: dict,
+                    contract_recovery_rate=standard_recovery_rate):
+        """ Calculate the change in the dirty value of each trade for a one
+        basis point increase in the spreads of all of the CDS contracts used
+        to build its issuer curve. Each bumped issuer curve is built once. """
+
+        curves = self._issuer_curves(issuer_curves)
+        surv_values = np.concatenate([c._values for c in curves])
+
+        full_rpv01s, _, prot_pvs = \
+            self._value_legs(value_dt, curves, surv_values,
+                             contract_recovery_rate)
+
+        v0 = self._dirty_pvs(full_rpv01s, prot_pvs)
+
+        bumped_values = self._bumped_values(curves, self._curve_legs(curves))
+
+        full_rpv01s, _, prot_pvs = \
+            self._value_legs(value_dt, curves, bumped_values,
+                             contract_recovery_rate)
+
+        v1 = self._dirty_pvs(full_rpv01s, prot_pvs)
+
+        return v1 - v0
+
+    ###########################################################################
+
+    def bucketed_credit_dv01(self,
+                             value_dt: Date,
+                             issuer_curves: dict,
+                             contract_recovery_rate=standard_recovery_rate):
+        """ Calculate the change in the dirty value of each trade for a one
+        basis point increase in the spread of each of the CDS contracts used
+        to build its issuer curve in turn. Returns a matrix with a row for
+        each trade and a column for each curve contract in order of maturity.
+        If curves have different numbers of contracts, the columns past the
+        end of a shorter curve are zero. Each bumped issuer curve is built
+        once and reused by all of the trades on that issuer. """
+
+        curves = self._issuer_curves(issuer_curves)
+        surv_values = np.concatenate([c._values for c in curves])
+
+        full_rpv01s, _, prot_pvs = \
+            self._value_legs(value_dt, curves, surv_values,
+                             contract_recovery_rate)
+
+        v0 = self._dirty_pvs(full_rpv01s, prot_pvs)
+
+        curve_legs = self._curve_legs(curves)
+
+        num_buckets = max(len(c._cds_contracts) for c in curves)
+        dv01s = np.zeros((len(self._cds_contracts), num_buckets))
+
+        for j in range(0, num_buckets):
+
+            bumped_values = self._bumped_values(curves, curve_legs, j)
+
+            full_rpv01s, _, prot_pvs = \
+                self._value_legs(value_dt, curves, bumped_values,
+                                 contract_recovery_rate)
+
+            dv01s[:, j] = self._dirty_pvs(full_rpv01s, prot_pvs) - v0
+
+        return dv01s
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._cds_contracts)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM TRADES", len(self._cds_contracts))
+        s += label_to_string("NUM ISSUERS", len(self._issuer_names))
+        s += label_to_string("NUM VALUE DATES", len(self._legs))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """ Simple print function for backward compatibility. """
+        print(self)
+
+###############################################################################
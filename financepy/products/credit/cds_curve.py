@@ -3,37 +3,158 @@
 ##############################################################################
 
 import numpy as np
-import scipy.optimize as optimize
+from numba import njit, float64
 
 from ...utils.date import Date
+from ...utils.date_array import DateArray
 from ...utils.error import FinError
 from ...utils.global_vars import gDaysInYear
 from ...market.curves.interpolator import _uinterpolate, InterpTypes
-from ...utils.helpers import input_time, table_to_string
+from ...market.curves.interpolator import _segment_coeffs
+from ...market.curves.interpolator import _vinterpolate_segments
+from ...utils.helpers import input_time, table_to_string, times_from_dates
 from ...utils.day_count import DayCount
 from ...utils.frequency import annual_frequency, FrequencyTypes
 from ...utils.helpers import check_argument_types, _func_name
 from ...utils.helpers import label_to_string
+from ...products.credit.cds import _risky_pv01_numba
+from ...products.credit.cds import _risky_pv01_gradient_numba
+from ...products.credit.cds import _protection_leg_pv_numba
+from ...products.credit.cds import _protection_leg_gradient_numba
+from ...products.credit.cds import _pack_legs
 
 
 ###############################################################################
 
 
-def f(q, *args):
-    """ Function that returns zero when the survival probability that gives a
-    zero value of the CDS has been determined. """
+@njit(fastmath=True, cache=True)
+def _build_curve_numba(t_mats,
+                       teffs,
+                       accrual_factorsPCDToNow,
+                       payment_times,
+                       payment_offsets,
+                       year_fracs,
+                       year_frac_offsets,
+                       coupons,
+                       npIborTimes,
+                       npIborValues,
+                       recovery_rate,
+                       tol,
+                       max_iter):
+    """ Bootstrap the survival probabilities at the maturities of a set of
+    CDS contracts so that each has a zero clean value. The payment times and
+    accrual factors of the contracts are packed into flat arrays with an
+    offset for each contract. For each pillar a Newton iteration is used in
+    which the derivative of the clean value with respect to the survival
+    probability at the pillar comes from the analytical leg gradients. """
+
+    num_times = len(t_mats)
+
+    times = np.zeros(num_times + 1)
+    values = np.ones(num_times + 1)
+    times[1:] = t_mats
+
+    for i in range(0, num_times):
+
+        teff = teffs[i]
+        accrual_factorPCDToNow = accrual_factorsPCDToNow[i]
+        paymentTimes = payment_times[payment_offsets[i]:
+                                     payment_offsets[i + 1]]
+        accrual_factors = year_fracs[year_frac_offsets[i]:
+                                     year_frac_offsets[i + 1]]
+        cpn = coupons[i]
+
+        npSurvTimes = times[0:i + 2]
+        npSurvValues = values[0:i + 2]
+
+        # Start from the hazard rate implied by the credit triangle
+        h = cpn / (1.0 - recovery_rate)
+        npSurvValues[i + 1] = npSurvValues[i] * \
+            np.exp(-h * (times[i + 1] - times[i]))
+
+        converged = False
+
+        for _ in range(0, max_iter):
+
+            clean_rpv01 = _risky_pv01_numba(teff,
+                                            accrual_factorPCDToNow,
+                                            paymentTimes,
+                                            accrual_factors,
+                                            npIborTimes,
+                                            npIborValues,
+                                            npSurvTimes,
+                                            npSurvValues,
+                                            0)[1]
+
+            prot_pv = _protection_leg_pv_numba(teff,
+                                               t_mats[i],
+                                               npIborTimes,
+                                               npIborValues,
+                                               npSurvTimes,
+                                               npSurvValues,
+                                               recovery_rate)
+
+            # The clean and full risky PV01 have the same gradient
+            _, rpv01_grad_q = \
+                _risky_pv01_gradient_numba(teff,
+                                           accrual_factorPCDToNow,
+                                           paymentTimes,
+                                           accrual_factors,
+                                           npIborTimes,
+                                           npIborValues,
+                                           npSurvTimes,
+                                           npSurvValues)
+
+            _, prot_grad_q = \
+                _protection_leg_gradient_numba(teff,
+                                               t_mats[i],
+                                               npIborTimes,
+                                               npIborValues,
+                                               npSurvTimes,
+                                               npSurvValues,
+                                               recovery_rate)
+
+            obj_fn = prot_pv - cpn * clean_rpv01
+            deriv = prot_grad_q[i + 1] - cpn * rpv01_grad_q[i + 1]
+
+            q = npSurvValues[i + 1]
+            q_new = q - obj_fn / deriv
+
+            # Keep the survival probability positive
+            if q_new <= 0.0:
+                q_new = 0.5 * q
+
+            npSurvValues[i + 1] = q_new
+
+            if abs(q_new - q) < tol:
+                converged = True
+                break
+
+        if converged is False:
+            raise FinError("CDS curve bootstrap did not converge.")
+
+    return times, values
 
-    curve = args[0]
-    value_dt = args[1]
-    cds = args[2]
-    recovery_rate = args[3]
+###############################################################################
+
+
+@njit(float64[:](float64[:], float64[:], float64[:, :]),
+      fastmath=True, cache=True, nogil=True)
+def _fwd_hazard_rates_numba(t, times, coeffs):
+    """ Instantaneous forward hazard rates at a vector of times given the
+    segment coefficients of the log survival probabilities calculated by
+    _segment_coeffs. At a pillar the rate of the segment to its left is used
+    and times before the first pillar use the first segment. """
 
-    num_points = len(curve._times)
-    curve._values[num_points - 1] = q
-    # This is important - we calibrate a curve that makes the clean PV of the
-    # CDS equal to zero and so we select the second element of the value tuple
-    obj_fn = cds.value(value_dt, curve, recovery_rate)['clean_pv']
-    return obj_fn
+    segments = np.searchsorted(times, t)
+    fwd_hazard_rates = np.empty(t.size)
+
+    for k in range(0, t.size):
+        i = max(segments[k], 1)
+        s = t[k] - coeffs[i, 0]
+        fwd_hazard_rates[k] = -(coeffs[i, 2] + 2.0 * s * coeffs[i, 3])
+
+    return fwd_hazard_rates
 
 ###############################################################################
 
@@ -70,6 +191,7 @@ class CDSCurve:
 
         self._times = []
         self._values = []
+        self._segments = None
 
         if len(self._cds_contracts) > 0:
             self._build_curve()
@@ -96,37 +218,99 @@ class CDSCurve:
 
 ###############################################################################
 
-    def survival_prob(self, dt):
-        """ Extract the survival probability to date dt. This function
-        supports vectorisation. """
+    def _input_times(self, dt):
+        """ Convert dt to a time in years from the curve value date. A Date or
+        a float gives a float. A list or DateArray of dates or a list or array
+        of times gives a numpy array of times. """
 
         if isinstance(dt, Date):
-            t = (dt - self._value_dt) / gDaysInYear
+            return (dt - self._value_dt) / gDaysInYear
+        elif isinstance(dt, DateArray):
+            return times_from_dates(dt, self._value_dt)
         elif isinstance(dt, list):
-            t = np.array(dt)
+            if len(dt) > 0 and isinstance(dt[0], Date):
+                return times_from_dates(dt, self._value_dt)
+            return np.array(dt, dtype=np.float64)
+        elif isinstance(dt, np.ndarray):
+            return np.ascontiguousarray(dt, dtype=np.float64)
+        elif isinstance(dt, (float, int, np.floating, np.integer)):
+            return float(dt)
         else:
-            t = dt
+            raise FinError("Unknown time type")
+
+###############################################################################
+
+    def _curve_segments(self):
+        """ Return the pillar times and survival probabilities and the
+        coefficients of the log survival probability on each segment between
+        the pillars. These are cached and only recalculated if the pillars
+        have changed, as some of the credit products set them directly. """
+
+        times = np.asarray(self._times, dtype=np.float64)
+        values = np.asarray(self._values, dtype=np.float64)
+
+        if self._segments is not None:
+            cached_times, cached_values, coeffs = self._segments
+            if np.array_equal(cached_times, times) and \
+                    np.array_equal(cached_values, values):
+                return self._segments
+
+        coeffs = _segment_coeffs(times, values, self._interp_method.value)
+        self._segments = (times.copy(), values.copy(), coeffs)
+        return self._segments
+
+###############################################################################
+
+    def survival_prob(self, dt):
+        """ Extract the survival probability to date dt. This function
+        supports vectorisation. A list or DateArray of dates or a list or
+        array of times is valued in a single compiled call. """
+
+        t = self._input_times(dt)
 
         if np.any(t < 0.0):
             raise FinError("Survival Date before curve anchor date")
 
-        if isinstance(t, np.ndarray):
-            n = len(t)
-            qs = np.zeros(n)
-            for i in range(0, n):
-                qs[i] = _uinterpolate(t[i],
-                                      self._times,
-                                      self._values,
-                                      self._interp_method.value)
-            return qs
-        elif isinstance(t, float):
+        if isinstance(t, float):
             q = _uinterpolate(t,
-                              self._times,
-                              self._values,
+                              np.asarray(self._times, dtype=np.float64),
+                              np.asarray(self._values, dtype=np.float64),
                               self._interp_method.value)
             return q
-        else:
-            raise FinError("Unknown time type")
+
+        times, values, coeffs = self._curve_segments()
+        qs = _vinterpolate_segments(t, times, values, coeffs,
+                                    self._interp_method.value)
+        return qs
+
+###############################################################################
+
+    def hazard_rate(self, dt):
+        """ Extract the average continuously compounded hazard rate from the
+        curve value date to date dt. This function supports vectorisation. """
+
+        t = np.maximum(self._input_times(dt), 1e-8)
+        q = self.survival_prob(t)
+        return -np.log(q) / t
+
+###############################################################################
+
+    def fwd_hazard_rate(self, dt):
+        """ Extract the instantaneous forward hazard rate at date dt. This is
+        calculated analytically from the interpolation scheme so there is no
+        numerical differentiation. This function supports vectorisation. """
+
+        t = self._input_times(dt)
+
+        if np.any(t < 0.0):
+            raise FinError("Hazard Date before curve anchor date")
+
+        times, _, coeffs = self._curve_segments()
+
+        if isinstance(t, float):
+            return _fwd_hazard_rates_numba(np.array([t]), times, coeffs)[0]
+
+        return _fwd_hazard_rates_numba(t, times, coeffs)
 
 ###############################################################################
 
@@ -134,56 +318,57 @@ class CDSCurve:
         """ Extract the discount factor from the underlying Ibor curve. This
         function supports vectorisation. """
 
-        if isinstance(dt, Date):
-            t = (dt - self._value_dt) / gDaysInYear
-        elif isinstance(dt, list):
-            t = np.array(dt)
-        else:
-            t = dt
-
+        t = self._input_times(dt)
         return self._libor_curve._df(t)
 
 ###############################################################################
 
     def _build_curve(self):
-        """ Construct the CDS survival curve from a set of CDS contracts """
+        """ Construct the CDS survival curve from a set of CDS contracts. The
+        payment times and accrual factors of each contract are computed once
+        and all of the pillars are then solved in a single compiled call. """
 
         self._validate(self._cds_contracts)
-        num_times = len(self._cds_contracts)
-
-        # we size the vectors to include time zero
-        self._times = np.array([0.0])
-        self._values = np.array([1.0])
 
-        for i in range(0, num_times):
+        legs = _pack_legs(self._cds_contracts, self._value_dt)
+        self._times, self._values = self._bootstrap(legs, legs[-1])
 
-            maturity_dt = self._cds_contracts[i]._maturity_dt
-
-            argtuple = (self,
-                        self._value_dt,
-                        self._cds_contracts[i],
-                        self._recovery_rate)
-
-            t_mat = (maturity_dt - self._value_dt) / gDaysInYear
-            q = self._values[i]
-
-            self._times = np.append(self._times, t_mat)
-            self._values = np.append(self._values, q)
+###############################################################################
 
-            optimize.newton(f, x0=q, fprime=None, args=argtuple,
-                            tol=1e-7, maxiter=50, fprime2=None)
+    def _bootstrap(self, legs, coupons):
+        """ Solve for the pillar times and survival probabilities given the
+        packed legs of the CDS contracts from _pack_legs and their coupons.
+        The coupons can differ from those of the contracts, which allows
+        curves with bumped spreads to be built without setting up the legs
+        again. """
+
+        (teffs, t_mats, accrual_factorsPCDToNow, payment_times,
+         payment_offsets, year_fracs, year_frac_offsets, _) = legs
+
+        return _build_curve_numba(t_mats,
+                                  teffs,
+                                  accrual_factorsPCDToNow,
+                                  payment_times,
+                                  payment_offsets,
+                                  year_fracs,
+                                  year_frac_offsets,
+                                  coupons,
+                                  self._libor_curve._times,
+                                  self._libor_curve._dfs,
+                                  self._recovery_rate,
+                                  1e-10,
+                                  50)
 
 ###############################################################################
 
     def fwd(self, dt):
-        """ Calculate the instantaneous forward rate at the forward date dt
-        using the numerical derivative. """
+        """ Calculate the instantaneous forward rate of the risky discount
+        factor at the forward date dt. This is the forward rate of the Ibor
+        curve plus the forward hazard rate. This function supports
+        vectorisation. """
 
-        t = input_time(dt, self)
-        epsilon = 1e-8
-        df1 = self.df(t) * self.survival_prob(t)
-        df2 = self.df(t+epsilon) * self.survival_prob(t+epsilon)
-        fwd = np.log(df1/df2)/dt
+        t = np.maximum(self._input_times(dt), 1e-8)
+        fwd = self._libor_curve._fwd(t) + self.fwd_hazard_rate(t)
         return fwd
 
 ###############################################################################
@@ -2,16 +2,18 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
+import numpy as np
+from numba import njit, prange
 
-from math import pow
-
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes
 from ...utils.error import FinError
-from ...products.credit.cds import CDS
-from ...products.credit.cds_curve import CDSCurve
+from ...products.credit.cds import CDS, _pack_legs
+from ...products.credit.cds import _risky_pv01_numba, _protection_leg_pv_numba
+from ...products.credit.cds_curve import CDSCurve, _build_curve_numba
+from ...products.credit.cds_book import _pack_curves
 from ...utils.helpers import check_argument_types
 from ...utils.helpers import label_to_string
 
@@ -22,6 +24,311 @@ from ...utils.helpers import label_to_string
 ###########################################################################
 
 
+@njit(fastmath=True, cache=True, parallel=True)
+def _index_legs_numba(teff,
+                      t_mat,
+                      accrual_factorPCDToNow,
+                      payment_times,
+                      year_fracs,
+                      npIborTimes,
+                      npIborValues,
+                      surv_times,
+                      surv_values,
+                      surv_offsets,
+                      index_recovery_rate):
+    """ Average clean risky PV01 and protection leg PV of an index CDS over
+    all of the credits. The survival curves of the credits are packed into
+    flat arrays with those of credit i from offsets[i] to offsets[i+1]. The
+    credits are valued in parallel and then summed in order so the result
+    does not depend on the number of threads. """
+
+    num_credits = len(surv_offsets) - 1
+    rpv01s = np.zeros(num_credits)
+    prot_pvs = np.zeros(num_credits)
+
+    for i_credit in prange(0, num_credits):
+
+        npSurvTimes = surv_times[surv_offsets[i_credit]:
+                                 surv_offsets[i_credit + 1]]
+        npSurvValues = surv_values[surv_offsets[i_credit]:
+                                   surv_offsets[i_credit + 1]]
+
+        rpv01s[i_credit] = _risky_pv01_numba(teff,
+                                             accrual_factorPCDToNow,
+                                             payment_times,
+                                             year_fracs,
+                                             npIborTimes,
+                                             npIborValues,
+                                             npSurvTimes,
+                                             npSurvValues,
+                                             0)[1]
+
+        prot_pvs[i_credit] = _protection_leg_pv_numba(teff,
+                                                      t_mat,
+                                                      npIborTimes,
+                                                      npIborValues,
+                                                      npSurvTimes,
+                                                      npSurvValues,
+                                                      index_recovery_rate)
+
+    sum_rpv01 = 0.0
+    sum_prot = 0.0
+    for i_credit in range(0, num_credits):
+        sum_rpv01 += rpv01s[i_credit]
+        sum_prot += prot_pvs[i_credit]
+
+    return sum_rpv01 / num_credits, sum_prot / num_credits
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _next_scaling(x, f, x_prev, f_prev):
+    """ Next guess of the scaling factor x which makes the ratio of the index
+    premium plus upfront to the index protection equal to one, where f is
+    this ratio minus one. The first step multiplies x by the ratio, which is
+    the fixed point update. As the ratio is a smooth function of x, later
+    steps use the secant method, falling back to the fixed point update if
+    the secant step is not usable. """
+
+    x_next = x * (1.0 + f)
+
+    if f_prev != 0.0 and f != f_prev:
+        x_secant = x - f * (x - x_prev) / (f - f_prev)
+        if x_secant > 0.0:
+            x_next = x_secant
+
+    return x_next
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _hazard_rate_adjust_numba(index_legs,
+                              index_cpns,
+                              index_upfronts,
+                              npIborTimes,
+                              npIborValues,
+                              surv_times,
+                              surv_values,
+                              surv_offsets,
+                              index_recovery_rate,
+                              tolerance,
+                              max_iterations):
+    """ Scale the log survival probabilities of all of the credits between
+    pillars i and i+1 by the same factor so that the index CDS to the i-th
+    index maturity reprices. The maturities are solved in order and the
+    survival probabilities are adjusted in place. """
+
+    (teffs, t_mats, accrual_factorsPCDToNow, payment_times, payment_offsets,
+     year_fracs, year_frac_offsets, _) = index_legs
+
+    num_credits = len(surv_offsets) - 1
+    log_q12s = np.zeros(num_credits)
+
+    for i_maturity in range(0, len(index_cpns)):
+
+        paymentTimes = payment_times[payment_offsets[i_maturity]:
+                                     payment_offsets[i_maturity + 1]]
+        accrual_factors = year_fracs[year_frac_offsets[i_maturity]:
+                                     year_frac_offsets[i_maturity + 1]]
+
+        for i_credit in range(0, num_credits):
+            i = surv_offsets[i_credit] + i_maturity
+            log_q12s[i_credit] = np.log(surv_values[i + 1] / surv_values[i])
+
+        x = 1.0
+        x_prev = 0.0
+        f_prev = 0.0
+        num_iterations = 0
+
+        while True:
+
+            num_iterations += 1
+
+            if num_iterations > max_iterations:
+                raise FinError("Max Iterations exceeded")
+
+            for i_credit in range(0, num_credits):
+                i = surv_offsets[i_credit] + i_maturity
+                surv_values[i + 1] = surv_values[i] * \
+                    np.exp(x * log_q12s[i_credit])
+
+            sum_rpv01, sum_prot = \
+                _index_legs_numba(teffs[i_maturity],
+                                  t_mats[i_maturity],
+                                  accrual_factorsPCDToNow[i_maturity],
+                                  paymentTimes,
+                                  accrual_factors,
+                                  npIborTimes,
+                                  npIborValues,
+                                  surv_times,
+                                  surv_values,
+                                  surv_offsets,
+                                  index_recovery_rate)
+
+            sum_prem = sum_rpv01 * index_cpns[i_maturity]
+            f = (index_upfronts[i_maturity] + sum_prem) / sum_prot - 1.0
+
+            if abs(f) <= tolerance:
+                break
+
+            x_next = _next_scaling(x, f, x_prev, f_prev)
+            x_prev = x
+            f_prev = f
+            x = x_next
+
+    return surv_values
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True, parallel=True)
+def _build_curves_numba(curve_legs,
+                        coupons,
+                        npIborTimes,
+                        npIborValues,
+                        recovery_rates,
+                        surv_values,
+                        surv_offsets,
+                        num_pillars):
+    """ Bootstrap the survival curves of all of the credits in parallel from
+    CDS contracts with the same legs and a row of coupons for each credit.
+    Only the first num_pillars contracts are used as the bootstrap of these
+    does not depend on the later ones. The survival probabilities are
+    written into the start of the curves in surv_values. """
+
+    (teffs, t_mats, accrual_factorsPCDToNow, payment_times, payment_offsets,
+     year_fracs, year_frac_offsets, _) = curve_legs
+
+    n = num_pillars
+
+    for i_credit in prange(0, len(recovery_rates)):
+
+        _, values = _build_curve_numba(t_mats[0:n],
+                                       teffs[0:n],
+                                       accrual_factorsPCDToNow[0:n],
+                                       payment_times,
+                                       payment_offsets[0:n + 1],
+                                       year_fracs,
+                                       year_frac_offsets[0:n + 1],
+                                       coupons[i_credit, 0:n],
+                                       npIborTimes,
+                                       npIborValues,
+                                       recovery_rates[i_credit],
+                                       1e-10,
+                                       50)
+
+        start = surv_offsets[i_credit]
+        surv_values[start:start + n + 1] = values
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _spread_adjust_numba(curve_legs,
+                         cds_spreads,
+                         recovery_rates,
+                         index_legs,
+                         index_cpns,
+                         index_upfronts,
+                         npIborTimes,
+                         npIborValues,
+                         surv_times,
+                         surv_offsets,
+                         index_recovery_rate,
+                         tolerance,
+                         max_iterations):
+    """ Find the multiplier of the spreads of all of the credits at the i-th
+    CDS maturity so that the index CDS to the i-th index maturity reprices
+    when the issuer curves are bootstrapped from the adjusted spreads. The
+    maturities are solved in order. Returns the spread multipliers and the
+    packed survival probabilities of the adjusted curves. """
+
+    num_cds_mat_points = cds_spreads.shape[1]
+
+    (teffs, t_mats, accrual_factorsPCDToNow, payment_times, payment_offsets,
+     year_fracs, year_frac_offsets, _) = index_legs
+
+    cds_spread_multipliers = np.ones(num_cds_mat_points)
+    coupons = cds_spreads.copy()
+    surv_values = np.ones(len(surv_times))
+
+    for i_maturity in range(0, len(index_cpns)):
+
+        paymentTimes = payment_times[payment_offsets[i_maturity]:
+                                     payment_offsets[i_maturity + 1]]
+        accrual_factors = year_fracs[year_frac_offsets[i_maturity]:
+                                     year_frac_offsets[i_maturity + 1]]
+
+        # The index legs only see the survival curve up to the first CDS
+        # maturity after the index maturity so later pillars are not built
+        num_pillars = min(np.searchsorted(curve_legs[1], t_mats[i_maturity])
+                          + 1, num_cds_mat_points)
+
+        x = 1.0
+        x_prev = 0.0
+        f_prev = 0.0
+        num_iterations = 0
+
+        while True:
+
+            num_iterations += 1
+
+            if num_iterations > max_iterations:
+                raise FinError("Max Iterations exceeded")
+
+            coupons[:, i_maturity] = cds_spreads[:, i_maturity] * x
+
+            _build_curves_numba(curve_legs,
+                                coupons,
+                                npIborTimes,
+                                npIborValues,
+                                recovery_rates,
+                                surv_values,
+                                surv_offsets,
+                                num_pillars)
+
+            sum_rpv01, sum_prot = \
+                _index_legs_numba(teffs[i_maturity],
+                                  t_mats[i_maturity],
+                                  accrual_factorsPCDToNow[i_maturity],
+                                  paymentTimes,
+                                  accrual_factors,
+                                  npIborTimes,
+                                  npIborValues,
+                                  surv_times,
+                                  surv_values,
+                                  surv_offsets,
+                                  index_recovery_rate)
+
+            sum_prem = sum_rpv01 * index_cpns[i_maturity]
+            f = (index_upfronts[i_maturity] + sum_prem) / sum_prot - 1.0
+
+            if abs(f) <= tolerance:
+                break
+
+            x_next = _next_scaling(x, f, x_prev, f_prev)
+            x_prev = x
+            f_prev = f
+            x = x_next
+
+        cds_spread_multipliers[i_maturity] = x
+
+    _build_curves_numba(curve_legs,
+                        coupons,
+                        npIborTimes,
+                        npIborValues,
+                        recovery_rates,
+                        surv_values,
+                        surv_offsets,
+                        num_cds_mat_points)
+
+    return cds_spread_multipliers, surv_values
+
+###############################################################################
+
+
 class CDSIndexPortfolio:
     """ This class manages the calculations associated with an equally weighted
     portfolio of CDS contracts with the same maturity date. """
@@ -29,7 +336,7 @@ class CDSIndexPortfolio:
     def __init__(self,
                  freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  day_count_type: DayCountTypes = DayCountTypes.ACT_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create Fincds_indexPortfolio object. Note that all of the inputs
@@ -245,9 +552,11 @@ class CDSIndexPortfolio:
                                 index_recovery_rate,
                                 tolerance=1e-6):
         """ Adjust individual CDS discount to reprice CDS index prices.
-        This approach uses an iterative scheme but is slow as it has to use a
-        CDS curve bootstrap required when each trial spread adjustment is made
-        """
+        The spreads of all of the issuers at each CDS maturity are scaled by
+        a common multiplier which is found by a secant search. The legs of the
+        CDS contracts are set up once and each trial adjustment bootstraps all
+        of the issuer curves in a single compiled call that runs in parallel
+        over the issuers. """
 
         num_credits = len(issuer_curves)
 
@@ -272,11 +581,17 @@ class CDSIndexPortfolio:
                 raise FinError(
                     "All issuer discount must be from same cds maturities")
 
-        cds_spread_multipliers = [1.0] * num_cds_mat_points
+        if num_index_maturity_points > num_cds_mat_points:
+            raise FinError(
+                "Need a CDS maturity for each index maturity")
 
-        #        spreadDifference = [0.0] * num_cds_mat_points
+        cds_spreads = np.array([[cds._running_cpn
+                                 for cds in issuer_curve._cds_contracts]
+                                for issuer_curve in issuer_curves])
 
-        adjusted_cds_spreads = [0.0] * num_cds_mat_points
+        recovery_rates = np.array([issuer_curve._recovery_rate
+                                   for issuer_curve in issuer_curves],
+                                  dtype=np.float64)
 
         #######################################################################
         # Set up CDS contracts used to build curve
@@ -293,65 +608,39 @@ class CDSIndexPortfolio:
 
             curve_cds_contracts.append(cds_contract)
 
-        #######################################################################
-        # We calibrate the individual CDS discount to fit each index maturity
-        #######################################################################
-
-        for i_maturity in range(0, num_index_maturity_points):
-
-            alpha = 0.0
-            num_iterations = 0
-
-            while abs(alpha - 1.0) > tolerance:
-
-                num_iterations += 1
-
-                if num_iterations > 20:
-                    raise FinError("Num iterations > 20.")
-
-                sum_rpv01 = 0.0
-                sum_prot = 0.0
-
-                # This is for the specific index maturity date
-                index_maturity_dt = index_maturity_dts[i_maturity]
-                cds_index = CDS(value_dt, index_maturity_dt, 0.0, 1.0)
+        curve_legs = _pack_legs(curve_cds_contracts, value_dt)
 
-                for i_credit in range(0, num_credits):
+        index_contracts = [CDS(value_dt, index_maturity_dt, 0.0, 1.0)
+                           for index_maturity_dt in index_maturity_dts]
 
-                    cds_contracts = issuer_curves[i_credit]._cds_contracts
-                    recovery_rate = issuer_curves[i_credit]._recovery_rate
-                    adjusted_cds_contracts = []
+        index_legs = _pack_legs(index_contracts, value_dt)
 
-                    for j in range(0, num_cds_mat_points):
-                        cds_spread = cds_contracts[j]._running_cpn
-                        adjusted_cds_spreads[j] = cds_spread * cds_spread_multipliers[j]
-                        curve_cds_contracts[j]._running_cpn = adjusted_cds_spreads[j]
+        curve_times = np.zeros(num_cds_mat_points + 1)
+        curve_times[1:] = curve_legs[1]
 
-                    adjusted_issuer_curve = CDSCurve(value_dt,
-                                                     curve_cds_contracts,
-                                                     libor_curve,
-                                                     recovery_rate)
+        # All of the adjusted curves have the same pillars
+        surv_times = np.tile(curve_times, num_credits)
+        surv_offsets = np.arange(0, num_credits + 1,
+                                 dtype=np.int64) * (num_cds_mat_points + 1)
 
-                    index_protection_pv = cds_index.protection_leg_pv(value_dt,
-                                                                    adjusted_issuer_curve,
-                                                                    index_recovery_rate)
-
-                    clean_rpv01 = cds_index.risky_pv01(value_dt,
-                                                      adjusted_issuer_curve)['clean_rpv01']
-
-                    sum_rpv01 += clean_rpv01
-                    sum_prot += index_protection_pv
-
-                sum_rpv01 /= num_credits
-                sum_prot /= num_credits
-
-                sum_prem = sum_rpv01 * index_cpns[i_maturity]
-
-                numerator = index_upfronts[i_maturity] + sum_prem
-                denominator = sum_prot
+        #######################################################################
+        # We calibrate the individual CDS discount to fit each index maturity
+        #######################################################################
 
-                alpha = numerator / denominator
-                cds_spread_multipliers[i_maturity] *= alpha
+        cds_spread_multipliers, surv_values = \
+            _spread_adjust_numba(curve_legs,
+                                 cds_spreads,
+                                 recovery_rates,
+                                 index_legs,
+                                 np.array(index_cpns, dtype=np.float64),
+                                 np.array(index_upfronts, dtype=np.float64),
+                                 libor_curve._times,
+                                 libor_curve._dfs,
+                                 surv_times,
+                                 surv_offsets,
+                                 index_recovery_rate,
+                                 tolerance,
+                                 20)
 
         # use spread multipliers to build and store adjusted discount
         adjusted_issuer_curves = []
@@ -361,25 +650,29 @@ class CDSIndexPortfolio:
             recovery_rate = issuer_curves[i_credit]._recovery_rate
 
             adjusted_cds_contracts = []
-            adjusted_spreads = []
 
             for j in range(0, num_cds_mat_points):
 
-                unadjusted_spread = issuer_curves[i_credit]._cds_contracts[j]._running_cpn
-
-                adjusted_spread = unadjusted_spread * cds_spread_multipliers[j]
+                adjusted_spread = cds_spreads[i_credit, j] * \
+                    cds_spread_multipliers[j]
 
                 adjusted_cds_contract = CDS(value_dt,
                                             cds_maturity_dts[j],
                                             adjusted_spread)
 
                 adjusted_cds_contracts.append(adjusted_cds_contract)
-                adjusted_spreads.append(adjusted_spread)
 
-                adjusted_issuer_curve = CDSCurve(value_dt,
-                                                 adjusted_cds_contracts,
-                                                 libor_curve,
-                                                 recovery_rate)
+            # The curve has already been bootstrapped from these contracts
+            adjusted_issuer_curve = CDSCurve(value_dt,
+                                             [],
+                                             libor_curve,
+                                             recovery_rate)
+
+            adjusted_issuer_curve._cds_contracts = adjusted_cds_contracts
+            adjusted_issuer_curve._times = curve_times.copy()
+            adjusted_issuer_curve._values = \
+                surv_values[surv_offsets[i_credit]:
+                            surv_offsets[i_credit + 1]].copy()
 
             adjusted_issuer_curves.append(adjusted_issuer_curve)
 
@@ -398,15 +691,11 @@ class CDSIndexPortfolio:
                                      max_iterations=200):
         """ Adjust individual CDS discount to reprice CDS index prices.
         This approach adjusts the hazard rates and so avoids the slowish
-        CDS curve bootstrap required when a spread adjustment is made."""
-
-        if 1 == 0:
-            print("=========================================")
-            print(value_dt)
-            print(index_cpns)
-            print(index_up_fronts)
-            print(index_maturity_dts)
-            print(index_recovery_rate)
+        CDS curve bootstrap required when a spread adjustment is made. The
+        log survival probabilities of all of the issuers between the pillars
+        before and at each index maturity are scaled by a common factor which
+        is found by a secant search in a single compiled call. The issuers
+        are valued in parallel. """
 
         num_credits = len(issuer_curves)
 
@@ -416,88 +705,50 @@ class CDSIndexPortfolio:
         libor_curve = issuer_curves[0]._libor_curve
         num_index_maturity_points = len(index_cpns)
 
-        #        hazardRateMultipliers = [1.0] * numIndexMaturityPoints
+        for issuer_curve in issuer_curves:
+            if len(issuer_curve._times) < num_index_maturity_points + 1:
+                raise FinError(
+                    "Issuer curves need a pillar for each index maturity")
+
+        surv_times, surv_values, surv_offsets = \
+            _pack_curves([(issuer_curve._times, issuer_curve._values)
+                          for issuer_curve in issuer_curves])
+
+        index_contracts = [CDS(value_dt, index_maturity_dt, 0.0, 1.0)
+                           for index_maturity_dt in index_maturity_dts]
+
+        index_legs = _pack_legs(index_contracts, value_dt)
+
+        # We solve for each maturity point
+        surv_values = \
+            _hazard_rate_adjust_numba(index_legs,
+                                      np.array(index_cpns, dtype=np.float64),
+                                      np.array(index_up_fronts,
+                                               dtype=np.float64),
+                                      libor_curve._times,
+                                      libor_curve._dfs,
+                                      surv_times,
+                                      surv_values,
+                                      surv_offsets,
+                                      index_recovery_rate,
+                                      tolerance,
+                                      max_iterations)
 
         adjusted_issuer_curves = []
 
         # making a copy of the issuer discount
-        for issuer_curve in issuer_curves:
+        for i_credit in range(0, num_credits):
             adjusted_issuer_curve = CDSCurve(value_dt,
                                              [],
                                              libor_curve,
                                              index_recovery_rate)
 
-            adjusted_issuer_curve._times = issuer_curve._times.copy()
-            adjusted_issuer_curve._values = issuer_curve._values.copy()
+            start = surv_offsets[i_credit]
+            end = surv_offsets[i_credit + 1]
+            adjusted_issuer_curve._times = surv_times[start:end].copy()
+            adjusted_issuer_curve._values = surv_values[start:end].copy()
             adjusted_issuer_curves.append(adjusted_issuer_curve)
 
-        # We solve for each maturity point
-        for i_maturity in range(0, num_index_maturity_points):
-
-            alpha = 1.0
-            ratio = 1.0 + 2.0 * tolerance
-            num_iterations = 0
-
-            while abs(ratio - 1.0) > tolerance:
-
-                num_iterations += 1
-
-                if num_iterations > max_iterations:
-                    raise FinError("Max Iterations exceeded")
-
-                sum_rpv01 = 0.0
-                sumProt = 0.0
-
-                for i_credit in range(0, num_credits):
-                    q1 = adjusted_issuer_curves[i_credit]._values[i_maturity]
-                    q2 = adjusted_issuer_curves[i_credit]._values[i_maturity + 1]
-                    q12 = q2 / q1
-
-                    q12NEW = pow(q12, ratio)
-                    q2NEW = q1 * q12NEW
-
-                    adjusted_issuer_curves[i_credit]._values[i_maturity + 1] = q2NEW
-
-                    #                    if i_maturity == 0 and index_cpns[0] == 0.006:
-                    #                        print(i_credit, q1, q2NEW)
-
-                    index_maturity_dt = index_maturity_dts[i_maturity]
-
-                    # the CDS spreads we extract here
-                    # should be to the index maturity dates
-                    cds_index = CDS(value_dt,
-                                    index_maturity_dt,
-                                    0,
-                                    1.0)
-
-                    indexProtPV = cds_index.protection_leg_pv(value_dt,
-                                                              adjusted_issuer_curves[i_credit],
-                                                              index_recovery_rate)
-
-                    rpv01Ret = cds_index.risky_pv01(value_dt,
-                                                    adjusted_issuer_curves[i_credit])
-
-                    cleanRPV01 = rpv01Ret['clean_rpv01']
-
-                    sum_rpv01 += cleanRPV01
-                    sumProt += indexProtPV
-
-                sum_rpv01 /= num_credits
-                sumProt /= num_credits
-
-                spd = sumProt / sum_rpv01
-
-                sumPrem = sum_rpv01 * index_cpns[i_maturity]
-
-                numerator = index_up_fronts[i_maturity] + sumPrem
-                denominator = sumProt
-
-                ratio = numerator / denominator
-                alpha *= ratio
-
-        #                print("Maturity:", i_maturity, "Num:", numerator, "Den:", denominator, "Ratio:", ratio, "Alpha:", alpha)
-        #           print("")
-
         return adjusted_issuer_curves
 
     ###########################################################################
@@ -14,7 +14,7 @@ from ...models.gauss_copula_lhp import tr_surv_prob_lhp
 
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 
 from ...products.credit.cds import CDS
@@ -22,10 +22,9 @@ from ...products.credit.cds_curve import CDSCurve
 
 from ...utils.global_vars import gDaysInYear
 from ...utils.math import ONE_MILLION
-from ...market.curves.interpolator import InterpTypes, interpolate
 from ...utils.error import FinError
 
-from ...utils.helpers import check_argument_types
+from ...utils.helpers import check_argument_types, times_from_dates
 from ...utils.date import Date
 
 ###############################################################################
@@ -55,7 +54,7 @@ class CDSTranche:
                  long_protection: bool = True,
                  freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  dc_type: DayCountTypes = DayCountTypes.ACT_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
 
@@ -140,7 +139,15 @@ class CDSTranche:
         for bb in range(0, num_credits):
             beta_vector2[bb] = beta_2
 
-        q_vector = np.zeros(num_credits)
+        # Survival probabilities of all of the credits to each payment date
+        payment_times = times_from_dates(payment_dts, value_dt)
+        q_matrix = np.zeros((num_payments, num_credits))
+
+        for j in range(0, num_credits):
+            issuer_curve = issuer_curves[j]
+            recovery_rates[j] = issuer_curve._recovery_rate
+            q_matrix[:, j] = issuer_curve.survival_prob(payment_times)
+
         qt1 = np.zeros(num_times)  # include 1.0
         qt2 = np.zeros(num_times)  # include 1.0
 
@@ -154,16 +161,8 @@ class CDSTranche:
 
         for i in range(1, num_times):
 
-            t = (payment_dts[i-1] - value_dt) / gDaysInYear
-
-            for j in range(0, num_credits):
-
-                issuer_curve = issuer_curves[j]
-                vTimes = issuer_curve._times
-                qRow = issuer_curve._values
-                recovery_rates[j] = issuer_curve._recovery_rate
-                q_vector[j] = interpolate(
-                    t, vTimes, qRow, InterpTypes.FLAT_FWD_RATES.value)
+            t = payment_times[i - 1]
+            q_vector = q_matrix[i - 1]
 
             if model == FinLossDistributionBuilder.RECURSION:
 
@@ -1,22 +1,45 @@
-from .equity_asian_option import *
-from .equity_american_option import *
-from .equity_barrier_option import *
-from .equity_basket_option import *
-from .equity_binomial_tree import *
-from .equity_chooser_option import *
-from .equity_cliquet_option import *
-from .equity_compound_option import *
-from .equity_digital_option import *
-from .equity_fixed_lookback_option import *
-from .equity_float_lookback_option import *
-from .equity_model_types import *
-from .equity_option import *
-from .equity_rainbow_option import *
-from .equity_vanilla_option import *
-from .equity_variance_swap import *
-from .equity_one_touch_option import *
-from .equity_forward import *
-from .equity_swap_leg import *
-from .equity_swap import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'equity_asian_option': ['AsianOptionValuationMethods', 'covar',
+                            'EquityAsianOption', 'errorStr'],
+    'equity_american_option': ['EquityAmericanOption'],
+    'equity_barrier_option': ['EquityBarrierOption', 'EquityBarrierTypes',
+                              'FinProcessSimulator', 'value_bs'],
+    'equity_basket_option': ['EquityBasketOption'],
+    'equity_binomial_tree': ['EquityBinomialTree', 'EquityTreeExerciseTypes',
+                             'EquityTreePayoffTypes', 'heaviside'],
+    'equity_chooser_option': ['EquityChooserOption', 'N'],
+    'equity_cliquet_option': ['EquityCliquetOption'],
+    'equity_compound_option': ['EquityCompoundOption', 'phi2'],
+    'equity_digital_option': ['EquityDigitalOption', 'FinDigitalOptionTypes'],
+    'equity_fixed_lookback_option': ['EquityFixedLookbackOption'],
+    'equity_float_lookback_option': ['EquityFloatLookbackOption', 'gSmall'],
+    'equity_model_types': ['EquityModel', 'EquityModelHeston'],
+    'equity_option': ['bump', 'EquityOption', 'EquityOptionModelTypes'],
+    'equity_rainbow_option': ['EquityRainbowOption',
+                              'EquityRainbowOptionTypes', 'FinGBMProcess', 'M',
+                              'payoff_value', 'value_mc_fast'],
+    'equity_vanilla_option': ['bs_delta', 'bs_gamma', 'bs_greeks',
+                              'bs_implied_volatility', 'bs_intrinsic',
+                              'bs_rho', 'bs_theta', 'bs_value', 'bs_vanna',
+                              'bs_vega', 'EquityVanillaOption', 'Model',
+                              'times_from_dates'],
+    'equity_variance_swap': ['BlackScholes', 'EquityVarianceSwap',
+                             'ONE_MILLION', 'OptionTypes'],
+    'equity_one_touch_option': ['EquityOneTouchOption', 'get_paths', 'n_vect',
+                                'TouchOptionTypes'],
+    'equity_forward': ['EquityForward', 'FinLongShort', 'gDaysInYear'],
+    'equity_swap_leg': ['DayCount', 'DiscountCurveFlat', 'EquitySwapLeg',
+                        'format_table', 'label_to_string', 'Schedule'],
+    'equity_swap': ['annual_frequency', 'BusDayAdjustTypes', 'Calendar',
+                    'CalendarTypes', 'check_argument_types', 'Date',
+                    'DateGenRuleTypes', 'DayCountTypes', 'DiscountCurve',
+                    'EquitySwap', 'FinError', 'FrequencyTypes',
+                    'JointCalendar', 'ReturnTypes', 'SwapFloatLeg',
+                    'SwapTypes']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
 
 # dividend_curve = FinDiscountCurveFlat(value_dt, dividend_yield)
@@ -14,7 +14,7 @@ from ...utils.helpers import label_to_string, check_argument_types
 from ...utils.date import Date
 from ...utils.day_count import DayCountTypes
 from ...utils.calendar import BusDayAdjustTypes
-from ...utils.calendar import CalendarTypes,  DateGenRuleTypes
+from ...utils.calendar import CalendarTypes,  DateGenRuleTypes, JointCalendar
 from ...utils.schedule import Schedule
 from ...products.equity.equity_option import EquityOption
 from ...market.curves.discount_curve_flat import DiscountCurve
@@ -40,7 +40,7 @@ class EquityCliquetOption(EquityOption):
                  option_type: OptionTypes,
                  freq_type: FrequencyTypes,
                  day_count_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create the EquityCliquetOption by passing in the start date
@@ -11,6 +11,7 @@ from ...utils.global_vars import gDaysInYear
 from ...utils.error import FinError
 from ...utils.global_types import OptionTypes
 from ...utils.helpers import check_argument_types, label_to_string
+from ...utils.helpers import times_from_dates
 from ...market.curves.discount_curve import DiscountCurve
 
 from ...models.model import Model
@@ -24,6 +25,7 @@ from ...models.black_scholes_analytic import bs_vanna
 from ...models.black_scholes_analytic import bs_theta
 from ...models.black_scholes_analytic import bs_implied_volatility
 from ...models.black_scholes_analytic import bs_intrinsic
+from ...models.black_scholes_analytic import bs_greeks
 
 from ...models.black_scholes_mc import _value_mc_nonumba_nonumpy
 from ...models.black_scholes_mc import _value_mc_numpy_numba
@@ -112,11 +114,7 @@ class EquityVanillaOption():
         if isinstance(self._expiry_dt, Date):
             t_exp = (self._expiry_dt - value_dt) / gDaysInYear
         elif isinstance(self._expiry_dt, list):
-            t_exp = []
-            for expDate in self._expiry_dt:
-                t = (expDate - value_dt) / gDaysInYear
-            t_exp.append(t)
-            t_exp = np.array(t_exp)
+            t_exp = times_from_dates(self._expiry_dt, value_dt)
         else:
             t_exp = value_dt
 
@@ -169,11 +167,7 @@ class EquityVanillaOption():
         if isinstance(self._expiry_dt, Date):
             t_exp = (self._expiry_dt - value_dt) / gDaysInYear
         elif isinstance(self._expiry_dt, list):
-            t_exp = []
-            for expDate in self._expiry_dt:
-                t = (expDate - value_dt) / gDaysInYear
-            t_exp.append(t)
-            t_exp = np.array(t_exp)
+            t_exp = times_from_dates(self._expiry_dt, value_dt)
         else:
             t_exp = value_dt
 
@@ -461,6 +455,78 @@ class EquityVanillaOption():
 
         return vanna
 
+###############################################################################
+
+    def greeks(self,
+               value_dt: Date,
+               stock_price: (float, np.ndarray),
+               discount_curve: DiscountCurve,
+               dividend_curve: DiscountCurve,
+               model: Model):
+        """ Calculate the value, delta, gamma, vega, theta, rho and vanna of
+        a chain of European vanilla options in one call. The expiry dates,
+        strikes and option types of the option, the stock price and the model
+        volatility can be arrays and are broadcast against each other so a
+        full strike by expiry grid can be valued by passing the strikes as a
+        column. Discount factors are found once for all of the expiry dates
+        and the d1 and d2 terms are shared across all of the outputs, which
+        are returned in a dictionary and agree with the value, delta, gamma,
+        vega, theta, rho and vanna functions. """
+
+        if isinstance(value_dt, Date) is False:
+            raise FinError("Valuation date is not a Date")
+
+        if isinstance(model, BlackScholes) is False:
+            raise FinError("Unknown Model Type")
+
+        if isinstance(self._expiry_dt, list):
+            t_exp = times_from_dates(self._expiry_dt, value_dt)
+        else:
+            t_exp = (self._expiry_dt - value_dt) / gDaysInYear
+
+        if np.any(np.asarray(stock_price) <= 0.0):
+            raise FinError("Stock price must be greater than zero.")
+
+        if np.any(t_exp < 0.0):
+            raise FinError("Time to expiry must be positive.")
+
+        t_exp = np.maximum(t_exp, 1e-10)
+
+        df = discount_curve.df(self._expiry_dt)
+        r = -np.log(df)/t_exp
+
+        dq = dividend_curve.df(self._expiry_dt)
+        q = -np.log(dq)/t_exp
+
+        s0, t_exp, k, r, q, v, option_type_value = \
+            np.broadcast_arrays(np.asarray(stock_price, dtype=np.float64),
+                                np.asarray(t_exp, dtype=np.float64),
+                                np.asarray(self._strike_price,
+                                           dtype=np.float64),
+                                np.asarray(r, dtype=np.float64),
+                                np.asarray(q, dtype=np.float64),
+                                np.asarray(model._volatility,
+                                           dtype=np.float64),
+                                np.asarray(self._option_type_value,
+                                           dtype=np.int64))
+
+        shape = s0.shape
+
+        greeks = bs_greeks(s0.ravel(), t_exp.ravel(), k.ravel(), r.ravel(),
+                           q.ravel(), v.ravel(), option_type_value.ravel())
+
+        names = ['value', 'delta', 'gamma', 'vega', 'theta', 'rho', 'vanna']
+
+        results = {}
+        for name, greek in zip(names, greeks):
+            greek = greek.reshape(shape)
+            if greek.ndim == 0:
+                greek = greek[()]
+            results[name] = greek
+
+        results['value'] = results['value'] * self._num_options
+        return results
+
 ###############################################################################
 
     def implied_volatility(self,
@@ -468,15 +534,24 @@ class EquityVanillaOption():
                            stock_price: (float, list, np.ndarray),
                            discount_curve: DiscountCurve,
                            dividend_curve: DiscountCurve,
-                           price):
+                           price: (float, list, np.ndarray)):
         """ Calculate the Black-Scholes implied volatility of a European
-        vanilla option. """
+        vanilla option. The stock price and option price can be arrays, as
+        can the expiry dates, strikes and option types of the option, and all
+        of the volatilities are found in a single call to a compiled solver.
+        A NaN is returned for any price outside the no-arbitrage bounds or
+        any expiry less than one day away. """
 
-        t_exp = (self._expiry_dt - value_dt) / gDaysInYear
+        if isinstance(self._expiry_dt, list):
+            t_exp = np.array([(expiry_dt - value_dt) / gDaysInYear
+                              for expiry_dt in self._expiry_dt])
+        else:
+            t_exp = (self._expiry_dt - value_dt) / gDaysInYear
 
-        if t_exp < 1.0 / 365.0:
-            print("Expiry time is too close to zero.")
-            return -999
+        # These are solved with a one day expiry so the rates stay finite
+        # and are then set to NaN
+        too_short = np.asarray(t_exp) < 1.0 / 365.0
+        t_exp = np.maximum(t_exp, 1.0 / 365.0)
 
         df = discount_curve.df(self._expiry_dt)
         r = -np.log(df)/t_exp
@@ -487,9 +562,14 @@ class EquityVanillaOption():
         k = self._strike_price
         s0 = stock_price
 
-        sigma = bs_implied_volatility(s0, t_exp, k, r, q, price,
+        sigma = bs_implied_volatility(s0, t_exp, k, r, q, np.asarray(price),
                                       self._option_type_value)
 
+        if np.any(too_short):
+            sigma = np.where(too_short, np.nan, sigma)
+            if sigma.ndim == 0:
+                sigma = sigma[()]
+
         return sigma
 
 ###############################################################################
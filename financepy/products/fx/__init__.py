@@ -1,12 +1,30 @@
-from .fx_barrier_option import *
-from .fx_digital_option import *
-from .fx_double_digital_option import *
-from .fx_fixed_lookback_option import *
-from .fx_float_lookback_option import *
-from .fx_forward import *
-from .fx_mkt_conventions import *
-from .fx_option import *
-from .fx_rainbow_option import *
-from .fx_vanilla_option import *
-from .fx_variance_swap import *
-from .fx_one_touch_option import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'fx_barrier_option': ['FinFXBarrierTypes', 'FinProcessSimulator',
+                          'FXBarrierOption'],
+    'fx_digital_option': ['FXDigitalOption'],
+    'fx_double_digital_option': ['FXDoubleDigitalOption'],
+    'fx_fixed_lookback_option': ['FXFixedLookbackOption'],
+    'fx_float_lookback_option': ['FXFloatLookbackOption'],
+    'fx_forward': ['FXForward'],
+    'fx_mkt_conventions': ['ccyNames', 'ccyQuotes', 'deltaConvention',
+                           'FinFXATMMethod', 'FinFXDeltaMethod', 'FinFXRate',
+                           'prem_currency'],
+    'fx_option': ['bump', 'FXOption'],
+    'fx_rainbow_option': ['EquityOption', 'FinGBMProcess', 'FXRainbowOption',
+                          'FXRainbowOptionTypes', 'M', 'payoff_value',
+                          'value_mc_fast'],
+    'fx_vanilla_option': ['bs_delta', 'bs_implied_volatility', 'bs_value',
+                          'crr_tree_val_avg', 'f', 'fast_delta', 'fvega',
+                          'FXVanillaOption', 'gSmall', 'N', 'nprime', 'SABR',
+                          'vol_function_sabr'],
+    'fx_variance_swap': ['BlackScholes', 'FinFXVarianceSwap', 'ONE_MILLION',
+                         'OptionTypes'],
+    'fx_one_touch_option': ['check_argument_types', 'Date', 'DiscountCurve',
+                            'FinError', 'FXOneTouchOption', 'gDaysInYear',
+                            'get_paths', 'label_to_string', 'n_vect',
+                            'TouchOptionTypes']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
@@ -22,6 +22,7 @@ from ...models.sabr import SABR
 from ...models.black_scholes import BlackScholes
 
 from ...models.black_scholes_analytic import bs_value, bs_delta
+from ...models.black_scholes_analytic import bs_implied_volatility
 
 from ...utils.helpers import check_argument_types, label_to_string
 
@@ -691,8 +692,29 @@ class FXVanillaOption():
                            dividend_curve,
                            price):
         """ This function determines the implied volatility of an FX option
-        given a price and the other option details. It uses a one-dimensional
-        Newton root search algorith to determine the implied volatility. """
+        given a price and the other option details. European options use a
+        compiled Black-Scholes solver so the spot rate and price can be arrays
+        and a NaN is returned for prices outside the no-arbitrage bounds.
+        American options use a one-dimensional Newton root search algorithm
+        on the tree value. """
+
+        if self._option_type == OptionTypes.EUROPEAN_CALL or \
+                self._option_type == OptionTypes.EUROPEAN_PUT:
+
+            # The rates and times are those used in the value function
+            spot_dt = value_dt.add_weekdays(self._spot_days)
+            tdel = (self._delivery_dt - spot_dt) / gDaysInYear
+            tdel = np.maximum(tdel, 1e-10)
+            t_exp = (self._expiry_dt - value_dt) / gDaysInYear
+
+            r_d = -np.log(discount_curve._df(tdel)) / tdel
+            r_f = -np.log(dividend_curve._df(tdel)) / tdel
+
+            sigma = bs_implied_volatility(stock_price, t_exp,
+                                          self._strike_fx_rate, r_d, r_f,
+                                          np.asarray(price),
+                                          self._option_type.value)
+            return sigma
 
         argtuple = (self, value_dt, stock_price,
                     discount_curve, dividend_curve, price)
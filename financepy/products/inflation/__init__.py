@@ -1 +1,10 @@
-from .FinInflationBond import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'FinInflationBond': ['annual_frequency', 'Bond', 'CalendarTypes',
+                         'check_argument_types', 'Date', 'DayCountTypes',
+                         'FinError', 'FinInflationBond', 'FrequencyTypes',
+                         'JointCalendar', 'label_to_string', 'YTMCalcType']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
@@ -1,15 +1,33 @@
-from .bermudan_swaption import *
-from .callable_swap import *
-from .ibor_cap_floor import *
-from .ibor_deposit import *
-from .ibor_fra import *
-from .ibor_future import *
-from .ibor_conventions import *
-from .ibor_swap import *
-from .ibor_swaption import *
-from .ois_curve import *
-from .ois import *
-from .ibor_single_curve import *
-from .dual_curve import *
-from .swap_fixed_leg import *
-from .swap_float_leg import *
+# The modules are imported on first use of one of their names
+from ...utils.lazy_import import lazy_import
+
+_submodules = {
+    'bermudan_swaption': ['IborBermudanSwaption'],
+    'callable_swap': [],
+    'ibor_cap_floor': ['Bachelier', 'FinCapFloorTypes', 'IborCapFloor',
+                       'IborCapFloorModelTypes'],
+    'ibor_deposit': ['IborDeposit'],
+    'ibor_fra': ['IborFRA'],
+    'ibor_future': ['IborFuture'],
+    'ibor_conventions': ['IborConventions'],
+    'ibor_swap': ['annual_frequency', 'gSmall', 'IborSwap'],
+    'ibor_swap_portfolio': ['IborSwapPortfolio'],
+    'ibor_swaption': ['BDTTree', 'BKTree', 'Black', 'BlackShifted',
+                      'FinExerciseTypes', 'HWTree', 'IborSwaption',
+                      'OptionTypes', 'SABR', 'SABRShifted'],
+    'ois_curve': ['OISCurve'],
+    'ois': ['FinCompoundingTypes', 'OIS'],
+    'ibor_single_curve': ['DIRECT_PILLAR', 'IborSingleCurve', 'SOLVED_PILLAR'],
+    'dual_curve': ['CurveBuildTypes', 'IborDualCurve', 'Interpolator',
+                   'swaptol'],
+    'global_curve_solver': ['gDaysInYear', 'GlobalCurveSolver', 'InterpTypes',
+                            'solvetol', 'times_from_dates'],
+    'swap_fixed_leg': ['SwapFixedLeg'],
+    'swap_float_leg': ['BusDayAdjustTypes', 'Calendar', 'CalendarTypes',
+                       'check_argument_types', 'Date', 'DateArray',
+                       'DateGenRuleTypes', 'DayCount', 'DayCountTypes',
+                       'DiscountCurve', 'FinError', 'format_table',
+                       'FrequencyTypes', 'JointCalendar', 'label_to_string',
+                       'ONE_MILLION', 'Schedule', 'SwapFloatLeg', 'SwapTypes']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
@@ -11,11 +11,13 @@ from ...utils.date import Date
 from ...utils.helpers import label_to_string
 from ...utils.helpers import check_argument_types, _func_name
 from ...utils.global_vars import gDaysInYear
+from ...utils.global_types import CurveBuildTypes
 from ...market.curves.interpolator import InterpTypes, Interpolator
 from ...market.curves.discount_curve import DiscountCurve
 from ...products.rates.ibor_deposit import IborDeposit
 from ...products.rates.ibor_fra import IborFRA
 from ...products.rates.ibor_swap import IborSwap
+from ...products.rates.global_curve_solver import _set_pillars, _solve_curves
 
 swaptol = 1e-10
 
@@ -78,13 +80,15 @@ class IborDualCurve(DiscountCurve):
                  ibor_fras: list,
                  ibor_swaps: list,
                  interp_type: InterpTypes = InterpTypes.FLAT_FWD_RATES,
-                 check_refit: bool = False):  # Set to True to test it works
+                 check_refit: bool = False,  # Set to True to test it works
+                 build_type: CurveBuildTypes = CurveBuildTypes.BOOTSTRAP):
         """ Create an instance of a Ibor curve given a valuation date and
         a set of ibor deposits, ibor FRAs and ibor_swaps. Some of these may
         be left None and the algorithm will just use what is provided. An
         interpolation method has also to be provided. The default is to use a
         linear interpolation for swap rates on coupon dates and to then assume
-        flat forwards between these coupon dates.
+        flat forwards between these coupon dates. The pillars can be solved
+        for one at a time or all together using the build type.
 
         The curve will assign a discount factor of 1.0 to the valuation date.
         """
@@ -96,6 +100,7 @@ class IborDualCurve(DiscountCurve):
         self._validate_inputs(ibor_deposits, ibor_fras, ibor_swaps)
         self._interp_type = interp_type
         self._check_refit = check_refit
+        self._build_type = build_type
         self._build_curve()
 
 ###############################################################################
@@ -103,7 +108,10 @@ class IborDualCurve(DiscountCurve):
     def _build_curve(self):
         """ Build curve based on interpolation. """
 
-        self._build_curve_using_1d_solver()
+        if self._build_type == CurveBuildTypes.GLOBAL_SOLVE:
+            self._build_curve_using_global_solver()
+        else:
+            self._build_curve_using_1d_solver()
 
 ###############################################################################
 
@@ -354,6 +362,35 @@ class IborDualCurve(DiscountCurve):
         if self._check_refit is True:
             self._check_refits(1e-10, swaptol, 1e-5)
 
+###############################################################################
+
+    def _build_curve_using_global_solver(self):
+        """ Construct the index curve by solving for the discount factors at
+        all of the pillars at the same time with the discount curve held
+        fixed. The pillars are the same as those of the bootstrap. The
+        Jacobian of the instrument values with respect to the pillar discount
+        factors is kept in self._jacobian. """
+
+        pillar_dts = [depo._maturity_dt for depo in self._usedDeposits]
+        pillar_dts += [fra._maturity_dt for fra in self._usedFRAs]
+        pillar_dts += [swap._fixed_leg._payment_dts[-1]
+                       for swap in self._usedSwaps]
+
+        # Deposits are valued on the index curve and the rest are discounted
+        instruments = [(depo, 0, 0) for depo in self._usedDeposits]
+        instruments += [(fra, 0, 1) for fra in self._usedFRAs]
+        instruments += [(swap, 0, 1) for swap in self._usedSwaps]
+
+        self._interpolator = Interpolator(self._interp_type)
+        _set_pillars(self, self._value_dt, pillar_dts)
+
+        self._jacobian, _ = _solve_curves(self._value_dt,
+                                          [self, self._discount_curve], 1,
+                                          instruments)
+
+        if self._check_refit is True:
+            self._check_refits(1e-10, swaptol, 1e-5)
+
 ###############################################################################
 
     # def _build_curve_linear_swap_rate_interpolation(self):
@@ -549,6 +586,7 @@ class IborDualCurve(DiscountCurve):
         num_points = len(self._times)
 
         s += label_to_string("INTERP TYPE", self._interp_type)
+        s += label_to_string("BUILD TYPE", self._build_type)
         s += label_to_string("GRID TIMES", "GRID DFS")
 
         for i in range(0, num_points):
@@ -0,0 +1,597 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+
+from ...utils.error import FinError
+from ...utils.date import Date
+from ...utils.day_count import DayCount, DayCountTypes
+from ...utils.helpers import label_to_string, times_from_dates
+from ...utils.helpers import check_argument_types, _func_name
+from ...utils.global_vars import gDaysInYear
+from ...utils.global_types import SwapTypes
+from ...market.curves.interpolator import InterpTypes
+from ...market.curves.discount_curve import DiscountCurve
+from ...products.rates.ibor_deposit import IborDeposit
+from ...products.rates.ibor_fra import IborFRA
+from ...products.rates.ibor_swap import IborSwap
+from ...products.rates.ois import OIS
+
+solvetol = 1e-12
+
+###############################################################################
+
+
+def _pillar_dt(instrument):
+    """ Return the date of the pillar that is set by a calibration instrument.
+    For a swap I use the last payment date in case a date has been adjusted
+    forward over a holiday. """
+
+    if isinstance(instrument, (IborDeposit, IborFRA)):
+        return instrument._maturity_dt
+    elif isinstance(instrument, (IborSwap, OIS)):
+        return instrument._fixed_leg._payment_dts[-1]
+
+    raise FinError("Instrument must be an IborDeposit, IborFRA, IborSwap or "
+                   "OIS")
+
+###############################################################################
+
+
+def _instrument_flows(instrument, value_dt, index_id, discount_id,
+                      index_dc_type):
+    """ Return the value of a calibration instrument per unit notional as a
+    sum of linear terms w * df(t) and of ratio terms w * df(p) * df(s) / df(e)
+    where each date is looked up on either the index or the discount curve.
+    A deposit has its face value subtracted so that all of the values are
+    zero at the solution. The derivative of the value with respect to the
+    quoted rate is returned in the same form. """
+
+    flows = []
+    ratios = []
+    quote_flows = []
+    quote_ratios = []
+
+    if isinstance(instrument, IborDeposit):
+
+        if instrument._start_dt < value_dt:
+            raise FinError("Deposit starts before valuation date.")
+
+        dc = DayCount(instrument._dc_type)
+        acc_factor = dc.year_frac(instrument._start_dt,
+                                  instrument._maturity_dt)[0]
+        w = 1.0 / instrument._maturity_df()
+
+        dts = [instrument._maturity_dt, value_dt, instrument._start_dt]
+        ratios.append((w, [index_id] * 3, dts))
+        flows.append((index_id, value_dt, -1.0))
+        quote_ratios.append((acc_factor, [index_id] * 3, dts))
+
+    elif isinstance(instrument, IborFRA):
+
+        if instrument._start_dt < value_dt:
+            raise FinError("FRA starts before valuation date.")
+
+        dc = DayCount(instrument._dc_type)
+        acc_factor = dc.year_frac(instrument._start_dt,
+                                  instrument._maturity_dt)[0]
+
+        sign = 1.0
+        if instrument._pay_fixed_rate is True:
+            sign = -1.0
+
+        if index_id == discount_id:
+            flows.append((index_id, instrument._start_dt, sign))
+        else:
+            ratios.append((sign, [discount_id, index_id, index_id],
+                           [instrument._maturity_dt, instrument._start_dt,
+                            instrument._maturity_dt]))
+
+        flows.append((discount_id, instrument._maturity_dt,
+                      -sign * (1.0 + acc_factor * instrument._fra_rate)))
+        quote_flows.append((discount_id, instrument._maturity_dt,
+                            -sign * acc_factor))
+
+    elif isinstance(instrument, (IborSwap, OIS)):
+
+        if instrument._effective_dt < value_dt:
+            raise FinError("Swap starts before valuation date.")
+
+        fixed_leg = instrument._fixed_leg
+        notional = fixed_leg._notional
+
+        sign = 1.0
+        if fixed_leg._leg_type == SwapTypes.PAY:
+            sign = -1.0
+
+        for pmnt_dt, pmnt, year_frac in zip(fixed_leg._payment_dts,
+                                            fixed_leg._payments,
+                                            fixed_leg._year_fracs):
+            if pmnt_dt > value_dt:
+                flows.append((discount_id, pmnt_dt, sign * pmnt / notional))
+                quote_flows.append((discount_id, pmnt_dt, sign * year_frac))
+
+        if fixed_leg._payment_dts[-1] > value_dt:
+            flows.append((discount_id, fixed_leg._payment_dts[-1],
+                          sign * fixed_leg._principal))
+
+        float_leg = instrument._float_leg
+        index_day_counter = DayCount(index_dc_type)
+        num_payments = len(float_leg._payment_dts)
+
+        notionals = float_leg._notional_array
+        if not len(notionals):
+            notionals = [float_leg._notional] * num_payments
+
+        sign = 1.0
+        if float_leg._leg_type == SwapTypes.PAY:
+            sign = -1.0
+
+        for i_pmnt in range(0, num_payments):
+
+            pmnt_dt = float_leg._payment_dts[i_pmnt]
+
+            if pmnt_dt > value_dt:
+
+                start_dt = float_leg._startAccruedDates[i_pmnt]
+                end_dt = float_leg._endAccruedDates[i_pmnt]
+                index_alpha = index_day_counter.year_frac(start_dt, end_dt)[0]
+
+                c = sign * float_leg._year_fracs[i_pmnt] * notionals[i_pmnt]
+                c /= notional
+
+                flows.append((discount_id, pmnt_dt,
+                              c * (float_leg._spread - 1.0 / index_alpha)))
+
+                # On a single curve a coupon paid at the end of its accrual
+                # period is linear in the discount factors
+                if index_id == discount_id and pmnt_dt == end_dt:
+                    flows.append((index_id, start_dt, c / index_alpha))
+                else:
+                    ratios.append((c / index_alpha,
+                                   [discount_id, index_id, index_id],
+                                   [pmnt_dt, start_dt, end_dt]))
+
+        if float_leg._payment_dts[-1] > value_dt:
+            flows.append((discount_id, float_leg._payment_dts[-1],
+                          sign * float_leg._principal * notionals[-1]
+                          / notional))
+
+    else:
+        raise FinError("Instrument must be an IborDeposit, IborFRA, IborSwap "
+                       "or OIS")
+
+    return flows, ratios, quote_flows, quote_ratios
+
+###############################################################################
+
+
+class _Terms():
+    """ Holds the linear and ratio terms of a set of instrument values with
+    each term pointing to an entry in a shared list of curve lookups. """
+
+    def __init__(self, num_instruments):
+
+        self._num_instruments = num_instruments
+        self._lin_inst = []
+        self._lin_lookup = []
+        self._lin_weights = []
+        self._ratio_inst = []
+        self._ratio_lookup = []
+        self._ratio_weights = []
+
+    ###########################################################################
+
+    def add(self, i, flows, ratios, lookup):
+        """ Add the terms of instrument i. The lookup function returns the
+        index of a (curve, date) pair in the list of curve lookups. """
+
+        for curve_id, dt, w in flows:
+            self._lin_inst.append(i)
+            self._lin_lookup.append(lookup(curve_id, dt))
+            self._lin_weights.append(w)
+
+        for w, curve_ids, dts in ratios:
+            self._ratio_inst.append(i)
+            self._ratio_lookup.append([lookup(curve_ids[k], dts[k])
+                                       for k in range(0, 3)])
+            self._ratio_weights.append(w)
+
+    ###########################################################################
+
+    def finalise(self, num_lookups):
+        """ Convert the terms to arrays. The linear terms have constant
+        derivatives and so these are held as a matrix. """
+
+        self._lin_inst = np.array(self._lin_inst, dtype=np.int64)
+        self._lin_lookup = np.array(self._lin_lookup, dtype=np.int64)
+        self._lin_weights = np.array(self._lin_weights, dtype=np.float64)
+        self._ratio_inst = np.array(self._ratio_inst, dtype=np.int64)
+        self._ratio_lookup = np.array(self._ratio_lookup,
+                                      dtype=np.int64).reshape(-1, 3)
+        self._ratio_weights = np.array(self._ratio_weights, dtype=np.float64)
+
+        self._lin_coeffs = np.zeros((self._num_instruments, num_lookups))
+        np.add.at(self._lin_coeffs, (self._lin_inst, self._lin_lookup),
+                  self._lin_weights)
+
+    ###########################################################################
+
+    def values(self, dfs):
+        """ Return the instrument values given the discount factors of the
+        curve lookups and the matrix of their derivatives with respect to
+        these discount factors. """
+
+        n = self._num_instruments
+
+        values = np.bincount(self._lin_inst,
+                             self._lin_weights * dfs[self._lin_lookup],
+                             minlength=n)
+        coeffs = self._lin_coeffs.copy()
+
+        if len(self._ratio_weights) > 0:
+
+            w = self._ratio_weights
+            p = self._ratio_lookup[:, 0]
+            s = self._ratio_lookup[:, 1]
+            e = self._ratio_lookup[:, 2]
+            df_pay = dfs[p]
+            df_ratio = dfs[s] / dfs[e]
+
+            values += np.bincount(self._ratio_inst, w * df_pay * df_ratio,
+                                  minlength=n)
+
+            np.add.at(coeffs, (self._ratio_inst, p), w * df_ratio)
+            np.add.at(coeffs, (self._ratio_inst, s), w * df_pay / dfs[e])
+            np.add.at(coeffs, (self._ratio_inst, e),
+                      -w * df_pay * df_ratio / dfs[e])
+
+        return values, coeffs
+
+###############################################################################
+
+
+def _set_pillars(curve, value_dt, pillar_dts):
+    """ Set the pillar times of a curve that is to be solved for and give it
+    a starting guess of a flat curve. """
+
+    times = [0.0]
+    for dt in pillar_dts:
+        t = (dt - value_dt) / gDaysInYear
+        if t <= times[-1]:
+            raise FinError("Pillar dates must be after the valuation date "
+                           "and increasing. Two instruments may have the "
+                           "same pillar date.")
+        times.append(t)
+
+    curve._times = np.array(times)
+    curve._dfs = np.exp(-0.02 * curve._times)
+    curve._interpolator.fit(curve._times, curve._dfs)
+
+###############################################################################
+
+
+def _solve_curves(value_dt, curves, num_solved, instruments,
+                  tol=solvetol, max_iter=50):
+    """ Solve for the pillar discount factors of the first num_solved curves
+    at the same time so that every calibration instrument has zero value.
+    The instruments are given as tuples of (instrument, index curve number,
+    discount curve number). The solved curves must have their pillar times
+    and a starting guess set. The other curves are held fixed. This uses
+    Newton's method with an analytic Jacobian which is the product of the
+    derivatives of the instrument values with respect to the discount
+    factors they look up and of these with respect to the pillars. Returns
+    the Jacobian of the instrument values per unit notional with respect to
+    the pillar discount factors at the solution and the derivatives of the
+    instrument values with respect to their quoted rates. """
+
+    num_instruments = len(instruments)
+
+    pillar_offsets = [0]
+    for curve in curves[0:num_solved]:
+        pillar_offsets.append(pillar_offsets[-1] + len(curve._times) - 1)
+
+    num_pillars = pillar_offsets[-1]
+
+    if num_pillars != num_instruments:
+        raise FinError("The number of pillars " + str(num_pillars) +
+                       " is not the number of instruments " +
+                       str(num_instruments))
+
+    # Each (curve, date) pair is only looked up once per iteration
+    lookup_index = {}
+    lookup_curves = []
+    lookup_dts = []
+
+    def lookup(curve_id, dt):
+        key = (curve_id, dt._excel_dt)
+        if key not in lookup_index:
+            lookup_index[key] = len(lookup_dts)
+            lookup_curves.append(curve_id)
+            lookup_dts.append(dt)
+        return lookup_index[key]
+
+    terms = _Terms(num_instruments)
+    quote_terms = _Terms(num_instruments)
+
+    for i, (instrument, index_id, discount_id) in enumerate(instruments):
+        index_dc_type = curves[index_id]._dc_type
+        flows, ratios, quote_flows, quote_ratios = \
+            _instrument_flows(instrument, value_dt, index_id, discount_id,
+                              index_dc_type)
+        terms.add(i, flows, ratios, lookup)
+        quote_terms.add(i, quote_flows, quote_ratios, lookup)
+
+    num_lookups = len(lookup_dts)
+    terms.finalise(num_lookups)
+    quote_terms.finalise(num_lookups)
+
+    lookup_curves = np.array(lookup_curves, dtype=np.int64)
+    lookup_times = times_from_dates(lookup_dts, value_dt,
+                                    DayCountTypes.ACT_ACT_ISDA)
+    lookup_times = np.atleast_1d(lookup_times)
+
+    curve_lookups = [np.nonzero(lookup_curves == c)[0]
+                     for c in range(0, len(curves))]
+
+    lookup_dfs = np.ones(num_lookups)
+
+    # The fixed curves are only looked up once
+    for c in range(num_solved, len(curves)):
+        idx = curve_lookups[c]
+        if len(idx) > 0:
+            lookup_dfs[idx] = curves[c].df([lookup_dts[k] for k in idx])
+
+    for _ in range(0, max_iter):
+
+        lookup_jac = np.zeros((num_lookups, num_pillars))
+
+        for c in range(0, num_solved):
+            idx = curve_lookups[c]
+            if len(idx) > 0:
+                curve = curves[c]
+                lookup_dfs[idx] = curve._df(lookup_times[idx])
+                lookup_jac[idx, pillar_offsets[c]:pillar_offsets[c+1]] = \
+                    curve._df_jacobian(lookup_times[idx])[:, 1:]
+
+        values, coeffs = terms.values(lookup_dfs)
+        jac = coeffs @ lookup_jac
+
+        if np.max(np.abs(values)) < tol:
+            quote_values, _ = quote_terms.values(lookup_dfs)
+            return jac, quote_values
+
+        try:
+            dx = np.linalg.solve(jac, values)
+        except np.linalg.LinAlgError:
+            raise FinError("The instruments do not determine the pillars.")
+
+        x = np.concatenate([curve._dfs[1:] for curve in curves[0:num_solved]])
+
+        # Shorten the step if it would make a discount factor negative
+        step = 1.0
+        while np.any(x - step * dx <= 0.0):
+            step = step / 2.0
+            if step < 1e-8:
+                raise FinError("Global curve solve failed.")
+
+        x = x - step * dx
+
+        for c in range(0, num_solved):
+            curve = curves[c]
+            curve._dfs = np.concatenate(
+                ([curve._dfs[0]], x[pillar_offsets[c]:pillar_offsets[c+1]]))
+            curve._interpolator.fit(curve._times, curve._dfs)
+
+    raise FinError("Global curve solve failed to converge.")
+
+###############################################################################
+
+
+class GlobalCurveSolver():
+    """ Builds one or more discount curves at the same time so that they
+    refit a set of calibration instruments. Each instrument sets a pillar at
+    its maturity on the curve which is solved for. The discount factors at
+    all of the pillars are found together using Newton's method with an
+    analytic Jacobian. Unlike a bootstrap this refits every instrument when
+    the interpolation is not local, such as the cubic spline and PCHIP
+    schemes, and it can solve curves which depend on each other such as an
+    OIS curve and an Ibor curve with swaps discounted on the OIS curve.
+
+    The instruments can be Ibor deposits, FRAs, Ibor swaps and OIS. Futures
+    enter as the FRA given by their to_fra function. The Jacobian of the
+    instrument values with respect to the pillar discount factors is kept
+    and is used to convert a sensitivity to the pillar discount factors into
+    a sensitivity to the market quotes. """
+
+    def __init__(self,
+                 value_dt: Date,
+                 instruments: list,
+                 interp_type: (InterpTypes, dict) = InterpTypes.FLAT_FWD_RATES,
+                 tol: float = solvetol,
+                 max_iter: int = 50):
+        """ Create the curves given a valuation date and a list of calibration
+        instruments. Each instrument is given as a tuple of the instrument,
+        its index curve and its discount curve. A curve is either the name
+        of a curve to be solved for or a DiscountCurve which is held fixed.
+        The discount curve may be None if it is the index curve. A pillar is
+        placed on the index curve if it is solved for and otherwise on the
+        discount curve. The interpolation scheme can be one for all of the
+        curves or a dictionary keyed by the curve name. """
+
+        check_argument_types(getattr(self, _func_name(), None), locals())
+
+        self._value_dt = value_dt
+        self._instruments = []
+        self._curve_names = []
+        fixed_curves = []
+
+        for entry in instruments:
+
+            if len(entry) != 3:
+                raise FinError("Each instrument must be given as a tuple of "
+                               "(instrument, index curve, discount curve)")
+
+            instrument, index_curve, discount_curve = entry
+
+            if discount_curve is None:
+                discount_curve = index_curve
+
+            for curve in (index_curve, discount_curve):
+                if isinstance(curve, str):
+                    if curve not in self._curve_names:
+                        self._curve_names.append(curve)
+                elif isinstance(curve, DiscountCurve):
+                    if curve not in fixed_curves:
+                        fixed_curves.append(curve)
+                else:
+                    raise FinError("Curve must be a name or a DiscountCurve")
+
+            self._instruments.append((instrument, index_curve,
+                                      discount_curve))
+
+        if len(self._curve_names) == 0:
+            raise FinError("There are no curves to solve for.")
+
+        # The pillar dates of each solved curve in increasing order
+        pillar_dts = {name: [] for name in self._curve_names}
+
+        for instrument, index_curve, discount_curve in self._instruments:
+            if isinstance(index_curve, str):
+                pillar_dts[index_curve].append(_pillar_dt(instrument))
+            elif isinstance(discount_curve, str):
+                pillar_dts[discount_curve].append(_pillar_dt(instrument))
+            else:
+                raise FinError("An instrument has no curve to solve for.")
+
+        self._curves = {}
+
+        for name in self._curve_names:
+
+            if len(pillar_dts[name]) == 0:
+                raise FinError("Curve " + name + " has no pillars.")
+
+            if isinstance(interp_type, dict):
+                if name not in interp_type:
+                    raise FinError("No interpolation type for curve " + name)
+                curve_interp_type = interp_type[name]
+            else:
+                curve_interp_type = interp_type
+
+            dts = sorted(pillar_dts[name])
+            curve = DiscountCurve(value_dt, dts, np.ones(len(dts)),
+                                  curve_interp_type)
+
+            # The Ibor index uses the floating leg basis of the first swap
+            for instrument, index_curve, _ in self._instruments:
+                if index_curve == name and \
+                        isinstance(instrument, (IborSwap, OIS)):
+                    curve._dc_type = instrument._float_leg._dc_type
+                    break
+
+            _set_pillars(curve, value_dt, dts)
+            self._curves[name] = curve
+
+        self._pillar_dts = pillar_dts
+
+        curves = [self._curves[name] for name in self._curve_names]
+        curves += fixed_curves
+
+        def curve_id(curve):
+            if isinstance(curve, str):
+                return self._curve_names.index(curve)
+            return len(self._curve_names) + fixed_curves.index(curve)
+
+        solver_instruments = [(instrument, curve_id(index_curve),
+                               curve_id(discount_curve))
+                              for instrument, index_curve, discount_curve
+                              in self._instruments]
+
+        self._jacobian, self._quote_sensitivities = \
+            _solve_curves(value_dt, curves, len(self._curve_names),
+                          solver_instruments, tol, max_iter)
+
+    ###########################################################################
+
+    def curve(self,
+              name: str):
+        """ Return the solved curve with the name given. """
+
+        if name not in self._curves:
+            raise FinError("No curve named " + name)
+
+        return self._curves[name]
+
+    ###########################################################################
+
+    def jacobian(self):
+        """ Return the matrix of sensitivities of the instrument values per
+        unit notional (rows in the order given) to the pillar discount factors
+        (columns). The columns hold the pillars of each curve in the order
+        in which the curves were first named with the pillars in increasing
+        maturity. """
+
+        return self._jacobian.copy()
+
+    ###########################################################################
+
+    def quote_deltas(self,
+                     df_gradients: dict,
+                     bump_size: float = 0.0001):
+        """ Convert the sensitivity of a trade to the pillar discount factors
+        of the curves into the change in its value for an increase of
+        bump_size in each market quote with the curves solved again. This is
+        the par rate delta to first order. The gradients are given in a
+        dictionary keyed by curve name as returned by df_gradient, including
+        the entry for time zero. A curve that is left out has no effect. """
+
+        gradient = np.zeros(len(self._jacobian))
+        offset = 0
+
+        for name in self._curve_names:
+
+            num_pillars = len(self._curves[name]._times) - 1
+
+            if name in df_gradients:
+                df_gradient = np.asarray(df_gradients[name],
+                                         dtype=np.float64)
+                if len(df_gradient) != num_pillars + 1:
+                    raise FinError("Gradient is not the same length as "
+                                   "curve " + name)
+                gradient[offset:offset + num_pillars] = df_gradient[1:]
+
+            offset += num_pillars
+
+        # The pillars move so that the instrument values stay at zero
+        instrument_deltas = np.linalg.solve(self._jacobian.T, gradient)
+
+        return -bump_size * self._quote_sensitivities * instrument_deltas
+
+    ###########################################################################
+
+    def __repr__(self):
+        """ Print out the details of the solved curves. """
+
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUATION DATE", self._value_dt)
+        s += label_to_string("NUM INSTRUMENTS", len(self._instruments))
+
+        for name in self._curve_names:
+            curve = self._curves[name]
+            s += label_to_string("CURVE", name)
+            s += label_to_string("INTERP TYPE", curve._interp_type)
+            s += label_to_string("GRID TIMES", "GRID DFS")
+            for i in range(0, len(curve._times)):
+                s += label_to_string("% 10.6f" % curve._times[i],
+                                     "%12.10f" % curve._dfs[i])
+
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """ Simple print function for backward compatibility. """
+        print(self)
+
+###############################################################################
@@ -14,7 +14,7 @@ THIS IS STILL IN PROTOPTYPE MODE. DO NOT USE. """
 
 import numpy as np
 
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
 from ...utils.day_count import DayCountTypes
@@ -30,6 +30,10 @@ from ...models.lmm_mc import lmm_simulate_fwds_mf
 from ...models.lmm_mc import lmm_simulate_fwds_nf
 from ...models.lmm_mc import ModelLMMModelTypes
 from ...models.lmm_mc import lmm_cap_flr_pricer
+from ...models.lmm_mc import lmm_simulate_fwds_1f_parallel
+from ...models.lmm_mc import lmm_simulate_fwds_mf_parallel
+from ...models.lmm_mc import lmm_simulate_fwds_nf_parallel
+from ...models.lmm_mc import lmm_cap_flr_pricer_parallel
 
 from ...utils.global_vars import gDaysInYear
 from ...utils.math import ONE_MILLION
@@ -50,7 +54,7 @@ class IborLMMProducts():
                  maturity_dt: Date,
                  float_freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  float_dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create a European-style swaption by defining the exercise date of
@@ -94,6 +98,7 @@ class IborLMMProducts():
         self._accrual_factors = np.array(self._accrual_factors)
         self._num_fwds = len(self._accrual_factors)
         self._fwds = None
+        self._parallel = False
 
 #        print("Num FORWARDS", self._num_fwds)
 
@@ -105,9 +110,12 @@ class IborLMMProducts():
                     num_paths: int = 1000,
                     numeraireIndex: int = 0,
                     use_sobol: bool = True,
-                    seed: int = 42):
+                    seed: int = 42,
+                    parallel: bool = False):
         """ Run the one-factor simulation of the evolution of the forward
-        Ibors to generate and store all of the Ibor forward rate paths. """
+        Ibors to generate and store all of the Ibor forward rate paths. If
+        parallel is True the paths are simulated and priced over all of the
+        available threads. """
 
         if num_paths < 2 or num_paths > 1000000:
             raise FinError("NumPaths must be between 2 and 1 million")
@@ -118,6 +126,7 @@ class IborLMMProducts():
         self._num_paths = num_paths
         self._numeraire_index = numeraireIndex
         self._use_sobol = use_sobol
+        self._parallel = parallel
 
         num_grid_points = len(self._grid_dates)
 
@@ -139,14 +148,18 @@ class IborLMMProducts():
             dt = self._grid_dates[ix]
             gammas[ix] = vol_curve.caplet_vol(dt)
 
-        self._fwds = lmm_simulate_fwds_1f(self._num_fwds,
-                                          num_paths,
-                                          numeraireIndex,
-                                          self._fwd_curve,
-                                          gammas,
-                                          self._accrual_factors,
-                                          use_sobol,
-                                          seed)
+        simulate_fwds = lmm_simulate_fwds_1f
+        if parallel:
+            simulate_fwds = lmm_simulate_fwds_1f_parallel
+
+        self._fwds = simulate_fwds(self._num_fwds,
+                                   num_paths,
+                                   numeraireIndex,
+                                   self._fwd_curve,
+                                   gammas,
+                                   self._accrual_factors,
+                                   use_sobol,
+                                   seed)
 
 ###############################################################################
 
@@ -157,12 +170,14 @@ class IborLMMProducts():
                     num_paths: int = 10000,
                     numeraireIndex: int = 0,
                     use_sobol: bool = True,
-                    seed: int = 42):
+                    seed: int = 42,
+                    parallel: bool = False):
         """ Run the simulation to generate and store all of the Ibor forward
         rate paths. This is a multi-factorial version so the user must input
         a numpy array consisting of a column for each factor and the number of
         rows must equal the number of grid times on the underlying simulation
-        grid. CHECK THIS. """
+        grid. CHECK THIS. If parallel is True the paths are simulated over all
+        of the available threads. """
 
 #        check_argument_types(self.__init__, locals())
 
@@ -185,6 +200,7 @@ class IborLMMProducts():
         self._num_paths = num_paths
         self._numeraire_index = numeraireIndex
         self._use_sobol = use_sobol
+        self._parallel = parallel
 
         self._num_fwds = len(self._grid_dates) - 1
         self._fwd_curve = []
@@ -198,15 +214,19 @@ class IborLMMProducts():
 
         self._fwd_curve = np.array(self._fwd_curve)
 
-        self._fwds = lmm_simulate_fwds_mf(self._num_fwds,
-                                          numFactors,
-                                          num_paths,
-                                          numeraireIndex,
-                                          self._fwd_curve,
-                                          lambdas,
-                                          self._accrual_factors,
-                                          use_sobol,
-                                          seed)
+        simulate_fwds = lmm_simulate_fwds_mf
+        if parallel:
+            simulate_fwds = lmm_simulate_fwds_mf_parallel
+
+        self._fwds = simulate_fwds(self._num_fwds,
+                                   numFactors,
+                                   num_paths,
+                                   numeraireIndex,
+                                   self._fwd_curve,
+                                   lambdas,
+                                   self._accrual_factors,
+                                   use_sobol,
+                                   seed)
 
 ###############################################################################
 
@@ -218,10 +238,12 @@ class IborLMMProducts():
                     num_paths: int = 1000,
                     numeraire_index: int = 0,
                     use_sobol: bool = True,
-                    seed: int = 42):
+                    seed: int = 42,
+                    parallel: bool = False):
         """ Run the simulation to generate and store all of the Ibor forward
         rate paths using a full factor reduction of the fwd-fwd correlation
-        matrix using Cholesky decomposition."""
+        matrix using Cholesky decomposition. If parallel is True the paths
+        are simulated over all of the available threads. """
 
         check_argument_types(self.__init__, locals())
 
@@ -240,6 +262,7 @@ class IborLMMProducts():
         self._modelType = model_type
         self._numeraire_index = numeraire_index
         self._use_sobol = use_sobol
+        self._parallel = parallel
 
         num_grid_points = len(self._grid_times)
 
@@ -262,13 +285,17 @@ class IborLMMProducts():
             zetas[ix] = vol_curve.caplet_vol(dt)
 
         # This function does not use Sobol - TODO
-        self._fwds = lmm_simulate_fwds_nf(self._num_fwds,
-                                          num_paths,
-                                          self._fwd_curve,
-                                          zetas,
-                                          corr_matrix,
-                                          self._accrual_factors,
-                                          seed)
+        simulate_fwds = lmm_simulate_fwds_nf
+        if parallel:
+            simulate_fwds = lmm_simulate_fwds_nf_parallel
+
+        self._fwds = simulate_fwds(self._num_fwds,
+                                   num_paths,
+                                   self._fwd_curve,
+                                   zetas,
+                                   corr_matrix,
+                                   self._accrual_factors,
+                                   seed)
 
 ###############################################################################
 
@@ -283,7 +310,7 @@ class IborLMMProducts():
                        notional: float = ONE_MILLION,
                        float_freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                        float_dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
-                       cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                       cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                        bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                        dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Value a swaption in the LMM model using simulated paths of the
@@ -365,7 +392,7 @@ class IborLMMProducts():
                         freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                         dc_type: DayCountTypes = DayCountTypes.ACT_360,
                         notional: float = ONE_MILLION,
-                        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Value a cap or floor in the LMM. """
@@ -398,8 +425,12 @@ class IborLMMProducts():
         fwds = self._fwds
         taus = self._accrual_factors
 
-        v = lmm_cap_flr_pricer(num_fwds, num_paths, K,
-                               fwd0, fwds, taus, is_cap)
+        cap_flr_pricer = lmm_cap_flr_pricer
+        if self._parallel:
+            cap_flr_pricer = lmm_cap_flr_pricer_parallel
+
+        v = cap_flr_pricer(num_fwds, num_paths, K,
+                           fwd0, fwds, taus, is_cap)
 
         # Sum the cap/floorlets to get cap/floor value
         v_capFloor = 0.0
@@ -3,6 +3,7 @@
 ##############################################################################
 
 import numpy as np
+from numba import njit
 from scipy import optimize
 
 from scipy.interpolate import CubicSpline
@@ -12,17 +13,26 @@ import copy
 
 from ...utils.error import FinError
 from ...utils.date import Date
-from ...utils.helpers import label_to_string
+from ...utils.day_count import DayCount, DayCountTypes
+from ...utils.helpers import label_to_string, times_from_dates
 from ...utils.helpers import check_argument_types, _func_name
 from ...utils.global_vars import gDaysInYear
+from ...utils.global_types import SwapTypes, CurveBuildTypes
 from ...market.curves.interpolator import InterpTypes, Interpolator
+from ...market.curves.interpolator import _uinterpolate
+from ...market.curves.interpolator import _uinterpolate_weights
 from ...market.curves.discount_curve import DiscountCurve
 from ...products.rates.ibor_deposit import IborDeposit
 from ...products.rates.ibor_fra import IborFRA
 from ...products.rates.ibor_swap import IborSwap
+from ...products.rates.global_curve_solver import _set_pillars, _solve_curves
 
 swaptol = 1e-10
 
+# How the discount factor at each pillar of the bootstrap is found
+DIRECT_PILLAR = 0  # A multiple of the discount factor at a start date
+SOLVED_PILLAR = 1  # The root of the value of the pillar instrument
+
 ##############################################################################
 # TODO: CHANGE times to df_times
 ##############################################################################
@@ -64,6 +74,262 @@ def _g(df, *args):
 ###############################################################################
 
 
+def _fra_flows(fra):
+    """ Return the value of a FRA per unit notional on a single curve as a
+    sum of discount factors. The Libor forward times the accrual factor is
+    df(start) / df(end) - 1 so this is linear in the discount factors. """
+
+    dc = DayCount(fra._dc_type)
+    acc_factor = dc.year_frac(fra._start_dt, fra._maturity_dt)[0]
+
+    sign = 1.0
+    if fra._pay_fixed_rate is True:
+        sign = -1.0
+
+    flow_dts = [fra._start_dt, fra._maturity_dt]
+    flow_weights = [sign, -sign * (1.0 + acc_factor * fra._fra_rate)]
+
+    return flow_dts, flow_weights, [], []
+
+###############################################################################
+
+
+def _swap_flows(swap, value_dt, index_dc_type):
+    """ Return the value of a swap per unit of fixed leg notional on a single
+    curve. This is a sum of weighted discount factors plus a sum of weighted
+    terms df(payment) * df(start) / df(end) for floating coupons which are not
+    paid on their accrual end date. The dates are returned as lists with the
+    weights so that they only have to be generated once. """
+
+    flow_dts = []
+    flow_weights = []
+    ratio_dts = []
+    ratio_weights = []
+
+    fixed_leg = swap._fixed_leg
+    notional = fixed_leg._notional
+
+    sign = 1.0
+    if fixed_leg._leg_type == SwapTypes.PAY:
+        sign = -1.0
+
+    for pmnt_dt, pmnt in zip(fixed_leg._payment_dts, fixed_leg._payments):
+        if pmnt_dt > value_dt:
+            flow_dts.append(pmnt_dt)
+            flow_weights.append(sign * pmnt / notional)
+
+    if fixed_leg._payment_dts[-1] > value_dt:
+        flow_dts.append(fixed_leg._payment_dts[-1])
+        flow_weights.append(sign * fixed_leg._principal)
+
+    float_leg = swap._float_leg
+    index_day_counter = DayCount(index_dc_type)
+    num_payments = len(float_leg._payment_dts)
+
+    notionals = float_leg._notional_array
+    if not len(notionals):
+        notionals = [float_leg._notional] * num_payments
+
+    sign = 1.0
+    if float_leg._leg_type == SwapTypes.PAY:
+        sign = -1.0
+
+    for i_pmnt in range(0, num_payments):
+
+        pmnt_dt = float_leg._payment_dts[i_pmnt]
+
+        if pmnt_dt > value_dt:
+
+            start_dt = float_leg._startAccruedDates[i_pmnt]
+            end_dt = float_leg._endAccruedDates[i_pmnt]
+            index_alpha = index_day_counter.year_frac(start_dt, end_dt)[0]
+
+            c = sign * float_leg._year_fracs[i_pmnt] * notionals[i_pmnt]
+            c /= notional
+
+            flow_dts.append(pmnt_dt)
+            flow_weights.append(c * (float_leg._spread - 1.0 / index_alpha))
+
+            if pmnt_dt == end_dt:
+                flow_dts.append(start_dt)
+                flow_weights.append(c / index_alpha)
+            else:
+                ratio_dts += [pmnt_dt, start_dt, end_dt]
+                ratio_weights.append(c / index_alpha)
+
+    if float_leg._payment_dts[-1] > value_dt:
+        flow_dts.append(float_leg._payment_dts[-1])
+        flow_weights.append(sign * float_leg._principal * notionals[-1]
+                            / notional)
+
+    return flow_dts, flow_weights, ratio_dts, ratio_weights
+
+###############################################################################
+
+
+def _flows_value(df, *args):
+    """ Root search objective function for the bootstrap of the spline
+    schemes. The flows are valued on the curve refitted with the discount
+    factor at the last pillar set to df. """
+
+    curve = args[0]
+    n = args[1]
+    flow_times = args[2]
+    flow_weights = args[3]
+    ratio_times = args[4]
+    ratio_weights = args[5]
+
+    curve._dfs[n] = df
+    curve._interpolator.fit(curve._times, curve._dfs)
+
+    v = np.dot(flow_weights, curve._df(flow_times))
+
+    if len(ratio_weights) > 0:
+        ratio_dfs = curve._df(ratio_times).reshape(-1, 3)
+        v += np.dot(ratio_weights,
+                    ratio_dfs[:, 0] * ratio_dfs[:, 1] / ratio_dfs[:, 2])
+
+    return v
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def _df_and_slope(t, times, dfs, n, method):
+    """ Return the interpolated discount factor at time t and its derivative
+    with respect to the discount factor at the last knot n. """
+
+    df = _uinterpolate(t, times, dfs, method)
+    j0, d0, d1, d2 = _uinterpolate_weights(t, times, dfs, method)
+
+    if j0 == n:
+        return df, d0
+    elif j0 + 1 == n:
+        return df, d1
+    elif j0 + 2 == n:
+        return df, d2
+
+    return df, 0.0
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def _solve_pillar(times, dfs, n, flow_times, flow_weights, ratio_times,
+                  ratio_weights, method, tol, max_iter):
+    """ Solve for the discount factor at knot n which gives the instrument a
+    value of zero using Newton's method with an analytic derivative. The
+    interpolation schemes are local so only the discount factors at times
+    after knot n-1 depend on it. The rest are calculated once. """
+
+    knot_times = times[0:n+1]
+    knot_dfs = dfs[0:n+1]
+    t_prev = times[n-1]
+
+    num_flows = flow_times.size
+    num_ratios = ratio_weights.size
+
+    flow_dfs = np.zeros(num_flows)
+    for k in range(0, num_flows):
+        if flow_times[k] <= t_prev:
+            flow_dfs[k] = _uinterpolate(flow_times[k], knot_times, knot_dfs,
+                                        method)
+
+    ratio_dfs = np.zeros(3 * num_ratios)
+    for k in range(0, 3 * num_ratios):
+        if ratio_times[k] <= t_prev:
+            ratio_dfs[k] = _uinterpolate(ratio_times[k], knot_times,
+                                         knot_dfs, method)
+
+    ratio_slopes = np.zeros(3)
+    x = dfs[n-1]
+
+    for _ in range(0, max_iter):
+
+        dfs[n] = x
+        v = 0.0
+        dv = 0.0
+
+        for k in range(0, num_flows):
+            if flow_times[k] <= t_prev:
+                v += flow_weights[k] * flow_dfs[k]
+            else:
+                df, slope = _df_and_slope(flow_times[k], knot_times,
+                                          knot_dfs, n, method)
+                v += flow_weights[k] * df
+                dv += flow_weights[k] * slope
+
+        for k in range(0, num_ratios):
+
+            for m in range(0, 3):
+                j = 3 * k + m
+                ratio_slopes[m] = 0.0
+                if ratio_times[j] > t_prev:
+                    ratio_dfs[j], ratio_slopes[m] = \
+                        _df_and_slope(ratio_times[j], knot_times, knot_dfs, n,
+                                      method)
+
+            df_pay = ratio_dfs[3 * k]
+            df_start = ratio_dfs[3 * k + 1]
+            df_end = ratio_dfs[3 * k + 2]
+            w = ratio_weights[k]
+
+            v += w * df_pay * df_start / df_end
+            dv += w * ((ratio_slopes[0] * df_start
+                        + df_pay * ratio_slopes[1]) / df_end
+                       - df_pay * df_start * ratio_slopes[2] / df_end**2)
+
+        if dv == 0.0:
+            raise FinError("Instrument value does not depend on its pillar.")
+
+        dx = v / dv
+        x = x - dx
+
+        if abs(dx) < tol:
+            dfs[n] = x
+            return x
+
+    raise FinError("Bootstrap failed to converge.")
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def _bootstrap_pillars(pillar_times, pillar_types, flow_offsets, flow_times,
+                       flow_weights, ratio_offsets, ratio_times, ratio_weights,
+                       method, tol, max_iter):
+    """ Bootstrap the discount factors at the pillar times in turn starting
+    from a discount factor of one at time zero. Each pillar is either a
+    multiple of the discount factor at an earlier time or is solved for. The
+    flows of pillar i are in the range given by its offsets. """
+
+    num_pillars = pillar_times.size
+    times = np.zeros(num_pillars + 1)
+    dfs = np.ones(num_pillars + 1)
+
+    for i in range(0, num_pillars):
+
+        n = i + 1
+        times[n] = pillar_times[i]
+        f0 = flow_offsets[i]
+        f1 = flow_offsets[i + 1]
+        r0 = ratio_offsets[i]
+        r1 = ratio_offsets[i + 1]
+
+        if pillar_types[i] == DIRECT_PILLAR:
+            df_start = _uinterpolate(flow_times[f0], times[0:n], dfs[0:n],
+                                     method)
+            dfs[n] = flow_weights[f0] * df_start
+        else:
+            _solve_pillar(times, dfs, n, flow_times[f0:f1],
+                          flow_weights[f0:f1], ratio_times[3*r0:3*r1],
+                          ratio_weights[r0:r1], method, tol, max_iter)
+
+    return times, dfs
+
+###############################################################################
+
+
 def _cost_function(dfs, *args):
     """ Root search objective function for swaps """
 
@@ -137,7 +403,12 @@ class IborSingleCurve(DiscountCurve):
     dates. This approach is non-linear and so requires a solver. Consequently
     it is slower. Its advantage is that we can switch interpolation schemes
     to provide a smoother or other functional curve shape which may have a more
-    economically justifiable shape. However the root search makes it slower."""
+    economically justifiable shape. However the root search makes it slower.
+
+    The second approach can also solve for all of the discount factors at the
+    same time rather than one pillar at a time. This refits every instrument
+    when the interpolation scheme is not local, such as the cubic spline and
+    PCHIP schemes, for which a bootstrap does not."""
 
 ###############################################################################
 
@@ -147,13 +418,15 @@ class IborSingleCurve(DiscountCurve):
                  ibor_fras: list,
                  ibor_swaps: list,
                  interp_type: InterpTypes = InterpTypes.FLAT_FWD_RATES,
-                 check_refit: bool = False):  # Set to True to test it works
+                 check_refit: bool = False,  # Set to True to test it works
+                 build_type: CurveBuildTypes = CurveBuildTypes.BOOTSTRAP):
         """ Create an instance of a FinIbor curve given a valuation date and
         a set of ibor deposits, ibor FRAs and ibor_swaps. Some of these may
         be left None and the algorithm will just use what is provided. An
         interpolation method has also to be provided. The default is to use a
         linear interpolation for swap rates on coupon dates and to then assume
-        flat forwards between these coupon dates.
+        flat forwards between these coupon dates. The pillars can be solved
+        for one at a time or all together using the build type.
 
         The curve will assign a discount factor of 1.0 to the valuation date.
         If no instrument is starting on the valuation date, the curve is then
@@ -166,6 +439,7 @@ class IborSingleCurve(DiscountCurve):
         self._validate_inputs(ibor_deposits, ibor_fras, ibor_swaps)
         self._interp_type = interp_type
         self._check_refit = check_refit
+        self._build_type = build_type
         self._interpolator = None
         self._build_curve()
 
@@ -174,7 +448,10 @@ class IborSingleCurve(DiscountCurve):
     def _build_curve(self):
         """ Build curve based on interpolation. """
 
-        self._build_curve_using_1d_solver()
+        if self._build_type == CurveBuildTypes.GLOBAL_SOLVE:
+            self._build_curve_using_global_solver()
+        else:
+            self._build_curve_using_1d_solver()
 
 ###############################################################################
 
@@ -364,26 +641,92 @@ class IborSingleCurve(DiscountCurve):
         """ Construct the discount curve using a bootstrap approach. This is
         the non-linear slower method that allows the user to choose a number
         of interpolation approaches between the swap rates and other rates. It
-        involves the use of a solver. """
+        involves the use of a solver. The flows of each instrument are only
+        generated once. For the local interpolation schemes each pillar is
+        solved in compiled code using Newton's method with an analytic
+        derivative. The spline schemes refit the whole curve at each step and
+        so use a secant search. """
+
+        (pillar_times, pillar_types, flow_offsets, flow_times, flow_weights,
+         ratio_offsets, ratio_times, ratio_weights) = self._pillar_flows()
 
         self._interpolator = Interpolator(self._interp_type)
-        self._times = np.array([])
-        self._dfs = np.array([])
+
+        if self._interp_type in (InterpTypes.FLAT_FWD_RATES,
+                                 InterpTypes.LINEAR_ZERO_RATES,
+                                 InterpTypes.LINEAR_FWD_RATES):
+
+            self._times, self._dfs = \
+                _bootstrap_pillars(pillar_times, pillar_types, flow_offsets,
+                                   flow_times, flow_weights, ratio_offsets,
+                                   ratio_times, ratio_weights,
+                                   self._interp_type.value, swaptol, 50)
+
+            self._interpolator.fit(self._times, self._dfs)
+
+            if self._check_refit is True:
+                self._check_refits(1e-10, swaptol, 1e-5)
+
+            return
+
+        num_pillars = len(pillar_times)
+        times = np.zeros(num_pillars + 1)
+        dfs = np.ones(num_pillars + 1)
 
         # time zero is now.
-        t_mat = 0.0
-        df_mat = 1.0
-        self._times = np.append(self._times, 0.0)
-        self._dfs = np.append(self._dfs, df_mat)
+        self._times = times[0:1]
+        self._dfs = dfs[0:1]
         self._interpolator.fit(self._times, self._dfs)
 
+        for i in range(0, num_pillars):
+
+            n = i + 1
+            times[n] = pillar_times[i]
+            f0, f1 = flow_offsets[i], flow_offsets[i + 1]
+            r0, r1 = ratio_offsets[i], ratio_offsets[i + 1]
+
+            if pillar_types[i] == DIRECT_PILLAR:
+                df_start = self._df(flow_times[f0])
+                dfs[n] = flow_weights[f0] * df_start
+                self._times = times[0:n+1]
+                self._dfs = dfs[0:n+1]
+            else:
+                dfs[n] = dfs[n-1]
+                self._times = times[0:n+1]
+                self._dfs = dfs[0:n+1]
+                argtuple = (self, n, flow_times[f0:f1], flow_weights[f0:f1],
+                            ratio_times[3*r0:3*r1], ratio_weights[r0:r1])
+                dfs[n] = optimize.newton(_flows_value, x0=dfs[n-1],
+                                         fprime=None, args=argtuple,
+                                         tol=swaptol, maxiter=50,
+                                         fprime2=None)
+
+            self._interpolator.fit(self._times, self._dfs)
+
+        if self._check_refit is True:
+            self._check_refits(1e-10, swaptol, 1e-5)
+
+###############################################################################
+
+    def _pillar_flows(self):
+        """ Return the pillar times of the bootstrap with the type of each
+        pillar and the flows of the instrument that sets it. The flows of all
+        of the instruments are held in flat arrays with offsets for the start
+        of each instrument. The flow dates are converted to times in a single
+        step using the day count used by the df function. """
+
+        pillar_times = []
+        pillar_types = []
+        pillar_flows = []
+
+        t_mat = 0.0
+
         for depo in self._usedDeposits:
-            dfSettle = self.df(depo._start_dt)
-            df_mat = depo._maturity_df() * dfSettle
             t_mat = (depo._maturity_dt - self._value_dt) / gDaysInYear
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
-            self._interpolator.fit(self._times, self._dfs)
+            pillar_times.append(t_mat)
+            pillar_types.append(DIRECT_PILLAR)
+            pillar_flows.append(([depo._start_dt], [depo._maturity_df()],
+                                 [], []))
 
         oldt_mat = t_mat
 
@@ -391,36 +734,77 @@ class IborSingleCurve(DiscountCurve):
 
             t_set = (fra._start_dt - self._value_dt) / gDaysInYear
             t_mat = (fra._maturity_dt - self._value_dt) / gDaysInYear
+            pillar_times.append(t_mat)
 
             # if both dates are after the previous FRA/FUT then need to
             # solve for 2 discount factors simultaneously using root search
 
             if t_set < oldt_mat and t_mat > oldt_mat:
-                df_mat = fra.maturity_df(self)
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
+                dc = DayCount(fra._dc_type)
+                acc_factor = dc.year_frac(fra._start_dt, fra._maturity_dt)[0]
+                df_ratio = 1.0 / (1.0 + acc_factor * fra._fra_rate)
+                pillar_types.append(DIRECT_PILLAR)
+                pillar_flows.append(([fra._start_dt], [df_ratio], [], []))
             else:
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
-                argtuple = (self, self._value_dt, fra)
-                df_mat = optimize.newton(_g, x0=df_mat, fprime=None,
-                                         args=argtuple, tol=swaptol,
-                                         maxiter=50, fprime2=None)
+                pillar_types.append(SOLVED_PILLAR)
+                pillar_flows.append(_fra_flows(fra))
 
         for swap in self._usedSwaps:
             # I use the lastPaymentDate in case a date has been adjusted fwd
             # over a holiday as the maturity date is usually not adjusted CHECK
             maturity_dt = swap._fixed_leg._payment_dts[-1]
             t_mat = (maturity_dt - self._value_dt) / gDaysInYear
+            pillar_times.append(t_mat)
+            pillar_types.append(SOLVED_PILLAR)
+            pillar_flows.append(_swap_flows(swap, self._value_dt,
+                                            self._dc_type))
+
+        num_pillars = len(pillar_times)
+        flow_offsets = np.zeros(num_pillars + 1, dtype=np.int64)
+        ratio_offsets = np.zeros(num_pillars + 1, dtype=np.int64)
+        flow_dts = []
+        flow_weights = []
+        ratio_dts = []
+        ratio_weights = []
+
+        for i in range(0, num_pillars):
+            flow_dts += pillar_flows[i][0]
+            flow_weights += pillar_flows[i][1]
+            ratio_dts += pillar_flows[i][2]
+            ratio_weights += pillar_flows[i][3]
+            flow_offsets[i + 1] = len(flow_weights)
+            ratio_offsets[i + 1] = len(ratio_weights)
+
+        times = times_from_dates(flow_dts + ratio_dts, self._value_dt,
+                                 DayCountTypes.ACT_ACT_ISDA)
+        num_flows = len(flow_dts)
+
+        return (np.array(pillar_times), np.array(pillar_types, dtype=np.int64),
+                flow_offsets, times[0:num_flows],
+                np.array(flow_weights, dtype=np.float64), ratio_offsets,
+                np.ascontiguousarray(times[num_flows:]),
+                np.array(ratio_weights, dtype=np.float64))
 
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
+###############################################################################
+
+    def _build_curve_using_global_solver(self):
+        """ Construct the discount curve by solving for the discount factors
+        at all of the pillars at the same time. The pillars are the same as
+        those of the bootstrap. The Jacobian of the instrument values with
+        respect to the pillar discount factors is kept in self._jacobian. """
 
-            argtuple = (self, self._value_dt, swap)
+        instruments = self._usedDeposits + self._usedFRAs + self._usedSwaps
+        pillar_dts = [depo._maturity_dt for depo in self._usedDeposits]
+        pillar_dts += [fra._maturity_dt for fra in self._usedFRAs]
+        pillar_dts += [swap._fixed_leg._payment_dts[-1]
+                       for swap in self._usedSwaps]
+
+        self._interpolator = Interpolator(self._interp_type)
+        _set_pillars(self, self._value_dt, pillar_dts)
 
-            df_mat = optimize.newton(_f, x0=df_mat, fprime=None, args=argtuple,
-                                     tol=swaptol, maxiter=50, fprime2=None,
-                                     full_output=False)
+        self._jacobian, _ = _solve_curves(self._value_dt, [self], 1,
+                                          [(inst, 0, 0) for inst in
+                                           instruments])
 
         if self._check_refit is True:
             self._check_refits(1e-10, swaptol, 1e-5)
@@ -663,6 +1047,7 @@ class IborSingleCurve(DiscountCurve):
         num_points = len(self._times)
 
         s += label_to_string("INTERP TYPE", self._interp_type)
+        s += label_to_string("BUILD TYPE", self._build_type)
 
         s += label_to_string("GRID TIMES", "GRID DFS")
         for i in range(0, num_points):
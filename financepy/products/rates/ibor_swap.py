@@ -9,7 +9,7 @@ from ...utils.date import Date
 from ...utils.global_vars import gSmall
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes, annual_frequency
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, DateGenRuleTypes, JointCalendar
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.helpers import check_argument_types, label_to_string
 from ...utils.math import ONE_MILLION
@@ -48,7 +48,7 @@ class IborSwap:
                  float_spread: float = 0.0,
                  float_freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  float_dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create an interest rate swap contract giving the contract start
@@ -136,6 +136,43 @@ class IborSwap:
 
     ###########################################################################
 
+    def bucketed_delta(self,
+                       value_dt: Date,
+                       discount_curve: DiscountCurve,
+                       index_curve: DiscountCurve = None,
+                       firstFixingRate=None,
+                       bump_size: float = 0.0001):
+        """ Calculate the change in the swap value for an increase of
+        bump_size in the continuously compounded zero rate at each pillar of
+        the curve, holding the other pillars fixed. The leg cash flows are
+        chained with the analytical sensitivities of the curve interpolation
+        so no bumped curves are built. If a separate index curve is supplied
+        then a tuple of the discount curve and index curve deltas is returned.
+        """
+
+        single_curve = index_curve is None or index_curve is discount_curve
+
+        if index_curve is None:
+            index_curve = discount_curve
+
+        fixed_grad = self._fixed_leg.df_gradient(value_dt, discount_curve)
+
+        float_grad, index_grad = self._float_leg.df_gradient(value_dt,
+                                                             discount_curve,
+                                                             index_curve,
+                                                             firstFixingRate)
+
+        discount_grad = fixed_grad + float_grad
+
+        if single_curve:
+            return discount_curve.zero_deltas(discount_grad + index_grad,
+                                              bump_size)
+
+        return (discount_curve.zero_deltas(discount_grad, bump_size),
+                index_curve.zero_deltas(index_grad, bump_size))
+
+    ###########################################################################
+
     def pv01(self, value_dt, discount_curve):
         """ Calculate the value of 1 basis point coupon on the fixed leg. """
 
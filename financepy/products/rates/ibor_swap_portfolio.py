@@ -0,0 +1,365 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+
+from ...utils.error import FinError
+from ...utils.date import Date
+from ...utils.date_array import DateArray
+from ...utils.day_count import DayCount
+from ...utils.helpers import check_argument_types, label_to_string
+from ...utils.global_types import SwapTypes
+from ...market.curves.discount_curve import DiscountCurve, _curve_dfs
+
+from .ibor_swap import IborSwap
+
+###############################################################################
+
+
+def _leg_sign(leg):
+    """ Return +1 for a leg that is received and -1 for one that is paid. """
+
+    if leg._leg_type == SwapTypes.PAY:
+        return -1.0
+
+    return 1.0
+
+###############################################################################
+
+
+class IborSwapPortfolio:
+    """ Class for valuing a portfolio of IborSwaps together. The cash flows of
+    the fixed and floating legs of all of the trades are packed into a set of
+    contiguous arrays with the flows of each trade found from an array of
+    offsets. A valuation then finds the discount factors and forward rates of
+    every flow with one call to each curve and sums the flow PVs by trade.
+    The results agree with valuing each IborSwap on its own. """
+
+    def __init__(self,
+                 swaps: list):
+        """ Create a portfolio from a list of IborSwaps. The cash flows are
+        copied from the swaps so later changes to a swap do not affect the
+        portfolio. """
+
+        check_argument_types(self.__init__, locals())
+
+        if len(swaps) == 0:
+            raise FinError("Portfolio must contain at least one swap")
+
+        for swap in swaps:
+            if isinstance(swap, IborSwap) is False:
+                raise FinError("Portfolio can only contain IborSwaps")
+
+        self._swaps = swaps
+        self._index_alphas = {}
+
+        self._pack_flows()
+
+    ###########################################################################
+
+    def _pack_flows(self):
+        """ Copy the leg cash flows of all of the trades into flat arrays. The
+        flows of trade i are those from offsets[i] to offsets[i+1]. """
+
+        num_trades = len(self._swaps)
+
+        fixed_legs = [swap._fixed_leg for swap in self._swaps]
+        float_legs = [swap._float_leg for swap in self._swaps]
+
+        fixed_counts = np.array([len(leg._payment_dts) for leg in fixed_legs])
+        float_counts = np.array([len(leg._payment_dts) for leg in float_legs])
+
+        self._fixed_offsets = np.zeros(num_trades + 1, dtype=np.int64)
+        self._fixed_offsets[1:] = np.cumsum(fixed_counts)
+        self._float_offsets = np.zeros(num_trades + 1, dtype=np.int64)
+        self._float_offsets[1:] = np.cumsum(float_counts)
+
+        self._fixed_trades = np.repeat(np.arange(num_trades), fixed_counts)
+        self._float_trades = np.repeat(np.arange(num_trades), float_counts)
+
+        self._fixed_pay_serials = np.concatenate(
+            [leg._payment_dt_array._excel_dts for leg in fixed_legs])
+        self._fixed_payments = np.concatenate(
+            [np.asarray(leg._payments, dtype=np.float64)
+             for leg in fixed_legs])
+        self._fixed_year_fracs = np.concatenate(
+            [np.asarray(leg._year_fracs, dtype=np.float64)
+             for leg in fixed_legs])
+
+        self._float_pay_serials = np.concatenate(
+            [leg._payment_dt_array._excel_dts for leg in float_legs])
+        self._float_start_serials = np.concatenate(
+            [leg._start_accrued_dt_array._excel_dts for leg in float_legs])
+        self._float_end_serials = np.concatenate(
+            [leg._end_accrued_dt_array._excel_dts for leg in float_legs])
+        self._float_year_fracs = np.concatenate(
+            [leg._year_frac_array for leg in float_legs])
+
+        float_notionals = []
+        for leg in float_legs:
+            if len(leg._notional_array):
+                float_notionals.append(np.asarray(leg._notional_array,
+                                                  dtype=np.float64))
+            else:
+                float_notionals.append(np.full(len(leg._payment_dts),
+                                               float(leg._notional)))
+
+        self._float_notionals = np.concatenate(float_notionals)
+
+        self._float_spreads = np.repeat(
+            [leg._spread for leg in float_legs], float_counts)
+
+        self._fixed_signs = np.array([_leg_sign(leg) for leg in fixed_legs])
+        self._float_signs = np.array([_leg_sign(leg) for leg in float_legs])
+
+        self._notionals = np.array([leg._notional for leg in fixed_legs],
+                                   dtype=np.float64)
+
+        self._effective_serials = np.array(
+            [swap._effective_dt._excel_dt for swap in self._swaps])
+        self._maturity_serials = np.array(
+            [swap._maturity_dt._excel_dt for swap in self._swaps])
+
+    ###########################################################################
+
+    def _index_year_fracs(self, index_curve):
+        """ Return the accrual factors of the floating rates using the day
+        count of the index curve. They are calculated once per day count. """
+
+        dc_type = index_curve._dc_type
+
+        if dc_type not in self._index_alphas:
+            day_counter = DayCount(dc_type)
+            start_dts = DateArray(self._float_start_serials)
+            end_dts = DateArray(self._float_end_serials)
+            alphas = day_counter.year_frac(start_dts, end_dts)[0]
+            self._index_alphas[dc_type] = np.asarray(alphas, dtype=np.float64)
+
+        return self._index_alphas[dc_type]
+
+    ###########################################################################
+
+    def _first_fixings(self, first_fixings):
+        """ Check the first fixings and return them as an array with a NaN
+        for each trade that does not have one. """
+
+        num_trades = len(self._swaps)
+
+        if first_fixings is None:
+            return np.full(num_trades, np.nan)
+
+        first_fixings = np.asarray(first_fixings, dtype=np.float64)
+
+        if first_fixings.shape != (num_trades,):
+            raise FinError("Need one first fixing per swap, NaN if none.")
+
+        return first_fixings
+
+    ###########################################################################
+
+    def _value_legs(self,
+                    value_dt: Date,
+                    discount_curve: DiscountCurve,
+                    index_curve: DiscountCurve,
+                    first_fixings):
+        """ Return the fixed leg PV, the floating leg PV and the annuity of
+        each trade. The leg PVs have the sign of the leg. """
+
+        value_serial = value_dt._excel_dt
+
+        # Payments on or before the valuation date have been made
+        fixed_alive = self._fixed_pay_serials > value_serial
+        float_alive = self._float_pay_serials > value_serial
+
+        # The first floating payment of each trade may have a fixing
+        alive_flows = np.nonzero(float_alive)[0]
+        alive_trades = self._float_trades[alive_flows]
+        is_first = np.ones(len(alive_flows), dtype=bool)
+        is_first[1:] = alive_trades[1:] != alive_trades[:-1]
+        first_flows = alive_flows[is_first]
+
+        first_fixings = self._first_fixings(first_fixings)
+        first_rates = first_fixings[self._float_trades[first_flows]]
+        has_fixing = ~np.isnan(first_rates)
+        fixed_flows = first_flows[has_fixing]
+
+        float_rates = np.zeros(len(self._float_pay_serials))
+        float_rates[fixed_flows] = first_rates[has_fixing]
+
+        forward = float_alive.copy()
+        forward[fixed_flows] = False
+
+        if index_curve is None:
+            index_curve = discount_curve
+
+        df_start, df_end = _curve_dfs(index_curve,
+                                      self._float_start_serials[forward],
+                                      self._float_end_serials[forward])
+
+        index_alphas = self._index_year_fracs(index_curve)[forward]
+        float_rates[forward] = (df_start / df_end - 1.0) / index_alphas
+
+        fixed_pay_dfs, float_pay_dfs = \
+            _curve_dfs(discount_curve,
+                       self._fixed_pay_serials[fixed_alive],
+                       self._float_pay_serials[float_alive])
+
+        df_value = discount_curve.df(value_dt)
+
+        fixed_dfs = np.zeros(len(self._fixed_pay_serials))
+        fixed_dfs[fixed_alive] = fixed_pay_dfs / df_value
+
+        float_dfs = np.zeros(len(self._float_pay_serials))
+        float_dfs[float_alive] = float_pay_dfs / df_value
+
+        fixed_flow_pvs = self._fixed_payments * fixed_dfs
+        annuity_flows = self._fixed_year_fracs * fixed_dfs
+
+        float_flow_pvs = (float_rates + self._float_spreads) * \
+            self._float_year_fracs * self._float_notionals * float_dfs
+
+        fixed_pvs = np.add.reduceat(fixed_flow_pvs, self._fixed_offsets[:-1])
+        annuities = np.add.reduceat(annuity_flows, self._fixed_offsets[:-1])
+        float_pvs = np.add.reduceat(float_flow_pvs, self._float_offsets[:-1])
+
+        return fixed_pvs * self._fixed_signs, \
+            float_pvs * self._float_signs, annuities
+
+    ###########################################################################
+
+    def _single_curve_float_pvs(self,
+                                value_dt: Date,
+                                discount_curve: DiscountCurve):
+        """ Return the unsigned value of the floating leg of each live trade
+        per unit notional as the difference between the discount factors at
+        its start and its maturity. This is used by the swap rate when there
+        is no index curve, as in IborSwap. """
+
+        value_serial = value_dt._excel_dt
+        live = self._maturity_serials > value_serial
+        forward_start = live & (self._effective_serials > value_serial)
+
+        float_pvs = np.full(len(self._swaps), np.nan)
+
+        df0 = np.full(len(self._swaps), discount_curve.df(value_dt))
+        df_start, df_end = _curve_dfs(discount_curve,
+                                      self._effective_serials[forward_start],
+                                      self._maturity_serials[live])
+
+        df0[forward_start] = df_start
+        float_pvs[live] = df0[live] - df_end
+        return float_pvs
+
+    ###########################################################################
+
+    def value(self,
+              value_dt: Date,
+              discount_curve: DiscountCurve,
+              index_curve: DiscountCurve = None,
+              first_fixings: (list, np.ndarray) = None):
+        """ Value each swap on a valuation date using a discount curve and an
+        index curve for the floating rates. If no index curve is given then
+        the discount curve is used. Seasoned trades need the fixing of their
+        current floating period which is given as an array with one value for
+        each trade, using NaN for trades that do not need one. Returns an
+        array of the trade values. """
+
+        fixed_pvs, float_pvs, _ = self._value_legs(value_dt,
+                                                   discount_curve,
+                                                   index_curve,
+                                                   first_fixings)
+
+        return fixed_pvs + float_pvs
+
+    ###########################################################################
+
+    def pv01(self,
+             value_dt: Date,
+             discount_curve: DiscountCurve):
+        """ Calculate the value of 1 basis point coupon on the fixed leg of
+        each swap per unit notional. This is always positive. """
+
+        value_serial = value_dt._excel_dt
+        fixed_alive = self._fixed_pay_serials > value_serial
+
+        fixed_pay_dfs, = _curve_dfs(discount_curve,
+                                    self._fixed_pay_serials[fixed_alive])
+
+        fixed_dfs = np.zeros(len(self._fixed_pay_serials))
+        fixed_dfs[fixed_alive] = fixed_pay_dfs / discount_curve.df(value_dt)
+
+        return np.add.reduceat(self._fixed_year_fracs * fixed_dfs,
+                               self._fixed_offsets[:-1])
+
+    ###########################################################################
+
+    def swap_rate(self,
+                  value_dt: Date,
+                  discount_curve: DiscountCurve,
+                  index_curve: DiscountCurve = None,
+                  first_fixings: (list, np.ndarray) = None):
+        """ Calculate the fixed coupon that makes each swap worth zero. If no
+        index curve is given then the floating leg is valued from the discount
+        factors at the swap start and maturity as in IborSwap.swap_rate.
+        Otherwise it is the value of the floating leg when received divided
+        by the PV01. The rate is NaN for swaps with no fixed payments left.
+        """
+
+        return self.valuation(value_dt, discount_curve, index_curve,
+                              first_fixings)[2]
+
+    ###########################################################################
+
+    def valuation(self,
+                  value_dt: Date,
+                  discount_curve: DiscountCurve,
+                  index_curve: DiscountCurve = None,
+                  first_fixings: (list, np.ndarray) = None):
+        """ Calculate the value, the PV01 and the swap rate of each swap in a
+        single pass over the cash flows. Returns a tuple of the three arrays.
+        The PV01 is per unit notional and the swap rate is NaN for swaps with
+        no fixed payments left. """
+
+        fixed_pvs, float_pvs, pv01s = self._value_legs(value_dt,
+                                                       discount_curve,
+                                                       index_curve,
+                                                       first_fixings)
+
+        values = fixed_pvs + float_pvs
+
+        if index_curve is None:
+            par_float_pvs = self._single_curve_float_pvs(value_dt,
+                                                         discount_curve)
+        else:
+            # The floating leg is valued as if it is received
+            par_float_pvs = float_pvs * self._float_signs / self._notionals
+
+        swap_rates = np.full(len(self._swaps), np.nan)
+        live = pv01s > 0.0
+        swap_rates[live] = par_float_pvs[live] / pv01s[live]
+
+        return values, pv01s, swap_rates
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._swaps)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM SWAPS", len(self._swaps))
+        s += label_to_string("NUM FIXED FLOWS", len(self._fixed_pay_serials))
+        s += label_to_string("NUM FLOAT FLOWS", len(self._float_pay_serials))
+        s += label_to_string("TOTAL NOTIONAL", np.sum(self._notionals))
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """ Simple print function for backward compatibility. """
+        print(self)
+
+###############################################################################
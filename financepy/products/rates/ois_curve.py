@@ -11,11 +11,13 @@ from ...utils.date import Date
 from ...utils.helpers import label_to_string
 from ...utils.helpers import check_argument_types, _func_name
 from ...utils.global_vars import gDaysInYear
+from ...utils.global_types import CurveBuildTypes
 from ...market.curves.interpolator import InterpTypes, Interpolator
 from ...market.curves.discount_curve import DiscountCurve
 
 from ...products.rates.ibor_deposit import IborDeposit
 from ...products.rates.ois import OIS
+from ...products.rates.global_curve_solver import _set_pillars, _solve_curves
 
 swaptol = 1e-10
 
@@ -107,13 +109,15 @@ class OISCurve(DiscountCurve):
                  ois_fras: list,
                  ois_swaps: list,
                  interp_type: InterpTypes = InterpTypes.FLAT_FWD_RATES,
-                 check_refit: bool = False):  # Set to True to test it works
+                 check_refit: bool = False,  # Set to True to test it works
+                 build_type: CurveBuildTypes = CurveBuildTypes.BOOTSTRAP):
         """ Create an instance of an overnight index rate swap curve given a
         valuation date and a set of OIS rates. Some of these may
         be left None and the algorithm will just use what is provided. An
         interpolation method has also to be provided. The default is to use a
         linear interpolation for swap rates on coupon dates and to then assume
-        flat forwards between these coupon dates.
+        flat forwards between these coupon dates. The pillars can be solved
+        for one at a time or all together using the build type.
 
         The curve will assign a discount factor of 1.0 to the valuation date.
         """
@@ -124,6 +128,7 @@ class OISCurve(DiscountCurve):
         self._validate_inputs(ois_deposits, ois_fras, ois_swaps)
         self._interp_type = interp_type
         self._check_refit = check_refit
+        self._build_type = build_type
         self._interpolator = None
         self._build_curve()
 
@@ -132,7 +137,10 @@ class OISCurve(DiscountCurve):
     def _build_curve(self):
         """ Build curve based on interpolation. """
 
-        self._build_curve_using_1d_solver()
+        if self._build_type == CurveBuildTypes.GLOBAL_SOLVE:
+            self._build_curve_using_global_solver()
+        else:
+            self._build_curve_using_1d_solver()
 
 ###############################################################################
 
@@ -375,6 +383,30 @@ class OISCurve(DiscountCurve):
         if self._check_refit is True:
             self._check_refits(1e-10, swaptol, 1e-5)
 
+###############################################################################
+
+    def _build_curve_using_global_solver(self):
+        """ Construct the discount curve by solving for the discount factors
+        at all of the pillars at the same time. The pillars are the same as
+        those of the bootstrap. The Jacobian of the instrument values with
+        respect to the pillar discount factors is kept in self._jacobian. """
+
+        instruments = self._usedDeposits + self._usedFRAs + self._usedSwaps
+        pillar_dts = [depo._maturity_dt for depo in self._usedDeposits]
+        pillar_dts += [fra._maturity_dt for fra in self._usedFRAs]
+        pillar_dts += [swap._fixed_leg._payment_dts[-1]
+                       for swap in self._usedSwaps]
+
+        self._interpolator = Interpolator(self._interp_type)
+        _set_pillars(self, self._value_dt, pillar_dts)
+
+        self._jacobian, _ = _solve_curves(self._value_dt, [self], 1,
+                                          [(inst, 0, 0) for inst in
+                                           instruments])
+
+        if self._check_refit is True:
+            self._check_refits(1e-10, swaptol, 1e-5)
+
 ###############################################################################
 
     def _build_curve_linear_swap_rate_interpolation(self):
@@ -620,6 +652,7 @@ class OISCurve(DiscountCurve):
         num_points = len(self._times)
 
         s += label_to_string("INTERP TYPE", self._interp_type)
+        s += label_to_string("BUILD TYPE", self._build_type)
 
         s += label_to_string("GRID TIMES", "GRID DFS")
         for i in range(0, num_points):
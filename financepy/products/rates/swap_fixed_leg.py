@@ -2,12 +2,15 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
+import numpy as np
+
 from ...utils.error import FinError
 from ...utils.date import Date
+from ...utils.date_array import DateArray
 from ...utils.math import ONE_MILLION
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes,  DateGenRuleTypes
+from ...utils.calendar import CalendarTypes,  DateGenRuleTypes, JointCalendar
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.schedule import Schedule
 from ...utils.helpers import format_table, label_to_string, check_argument_types
@@ -17,6 +20,19 @@ from ...market.curves.discount_curve import DiscountCurve
 ##########################################################################
 
 
+def _leg_dfs(curve, dts: DateArray):
+    """ Return the discount factors of a curve at the dates of a DateArray.
+    Curves derived from DiscountCurve take all of the dates in one call and
+    any other curve is called date by date. """
+
+    if isinstance(curve, DiscountCurve):
+        return np.asarray(curve.df(dts), dtype=np.float64)
+
+    return np.array([curve.df(dt) for dt in dts.to_dates()])
+
+##########################################################################
+
+
 class SwapFixedLeg:
     """ Class for managing the fixed leg of a swap. A fixed leg is a leg with
     a sequence of flows calculated according to an ISDA schedule and with a
@@ -32,7 +48,7 @@ class SwapFixedLeg:
                  notional: float = ONE_MILLION,
                  principal: float = 0.0,
                  payment_lag: int = 0,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
                  end_of_month: bool = False):
@@ -78,6 +94,9 @@ class SwapFixedLeg:
         self._accrued_days = []
         self._rates = []
 
+        self._paymentDfs = []
+        self._principal_pv = 0.0
+
         self.generate_payments()
 
 ###############################################################################
@@ -142,54 +161,81 @@ class SwapFixedLeg:
 
             prev_dt = next_dt
 
+        # The payment dates are also held as a vector for valuation
+        self._payment_dt_array = DateArray(self._payment_dts)
+
 ###############################################################################
 
     def value(self,
               value_dt: Date,
               discount_curve: DiscountCurve):
+        """ Value the fixed leg payments using the discount curve. The
+        discount factors of all of the future payments are found in a single
+        call to the curve and the leg value is their dot product with the
+        payments. The PV of each payment is only calculated when printed. """
 
-        self._paymentDfs = []
-        self._payment_pvs = []
-        self._cumulativePVs = []
+        alive = self._payment_dt_array > value_dt
 
-        notional = self._notional
-        dfValue = discount_curve.df(value_dt)
-        leg_pv = 0.0
-        numPayments = len(self._payment_dts)
+        # The payments are read each time as they can be changed in place
+        payments = np.asarray(self._payments, dtype=np.float64)
 
-        dfPmnt = 0.0
+        dfs = np.zeros(len(payments))
+        principal_pv = 0.0
 
-        for iPmnt in range(0, numPayments):
+        if np.any(alive):
 
-            pmntDate = self._payment_dts[iPmnt]
-            pmntAmount = self._payments[iPmnt]
+            dfValue = discount_curve.df(value_dt)
+            dfs[alive] = _leg_dfs(discount_curve,
+                                  self._payment_dt_array[alive]) / dfValue
 
-            if pmntDate > value_dt:
+            if alive[-1]:
+                principal_pv = self._principal * dfs[-1] * self._notional
 
-                dfPmnt = discount_curve.df(pmntDate) / dfValue
-                pmntPV = pmntAmount * dfPmnt
-                leg_pv += pmntPV
+        leg_pv = float(np.dot(payments, dfs)) + principal_pv
 
-                self._paymentDfs.append(dfPmnt)
-                self._payment_pvs.append(pmntAmount*dfPmnt)
-                self._cumulativePVs.append(leg_pv)
+        self._paymentDfs = dfs
+        self._principal_pv = principal_pv
 
-            else:
+        if self._leg_type == SwapTypes.PAY:
+            leg_pv = leg_pv * (-1.0)
+
+        return leg_pv
 
-                self._paymentDfs.append(0.0)
-                self._payment_pvs.append(0.0)
-                self._cumulativePVs.append(0.0)
+##########################################################################
 
-        if pmntDate > value_dt:
-            payment_pv = self._principal * dfPmnt * notional
-            self._payment_pvs[-1] += payment_pv
-            leg_pv += payment_pv
-            self._cumulativePVs[-1] = leg_pv
+    def df_gradient(self,
+                    value_dt: Date,
+                    discount_curve: DiscountCurve):
+        """ Return the sensitivity of the leg value to each of the pillar
+        discount factors of the discount curve. The payments are chained with
+        the sensitivities of the curve interpolation in a single pass. """
+
+        leg_pv = self.value(value_dt, discount_curve)
 
         if self._leg_type == SwapTypes.PAY:
             leg_pv = leg_pv * (-1.0)
 
-        return leg_pv
+        dfValue = discount_curve.df(value_dt)
+        alive = self._payment_dt_array > value_dt
+
+        # The value is divided by the discount factor to the value date
+        grad = discount_curve.df_gradient(value_dt, -leg_pv / dfValue)
+
+        if np.any(alive):
+
+            weights = np.asarray(self._payments, dtype=np.float64)[alive]
+            weights = weights / dfValue
+
+            if alive[-1]:
+                weights[-1] += self._principal * self._notional / dfValue
+
+            grad = grad + discount_curve.df_gradient(
+                self._payment_dt_array[alive], weights)
+
+        if self._leg_type == SwapTypes.PAY:
+            grad = grad * (-1.0)
+
+        return grad
 
 ##########################################################################
 
@@ -229,6 +275,17 @@ class SwapFixedLeg:
         print("\nPAYMENTS SCHEDULE:")
         print(table)
 
+###############################################################################
+
+    def _payment_pvs(self):
+        """ Return the PV of each payment and their cumulative PV using the
+        discount factors of the last valuation. The principal is included in
+        the last payment. """
+
+        payment_pvs = np.asarray(self._payments) * self._paymentDfs
+        payment_pvs[-1] += self._principal_pv
+        return payment_pvs, np.cumsum(payment_pvs)
+
 ###############################################################################
 
     def print_valuation(self):
@@ -242,10 +299,12 @@ class SwapFixedLeg:
         print("FREQUENCY:", str(self._freq_type))
         print("DAY COUNT:", str(self._dc_type))
 
-        if len(self._payments) == 0:
+        if len(self._paymentDfs) == 0:
             print("Payments not calculated.")
             return
 
+        payment_pvs, cumulative_pvs = self._payment_pvs()
+
         header = ["PAY_NUM", "PAY_dt", "NOTIONAL",
                   "RATE", "PMNT", "DF", "PV", "CUM_PV"]
 
@@ -259,8 +318,8 @@ class SwapFixedLeg:
                 round(self._rates[i_flow] * 100.0, 4),
                 round(self._payments[i_flow], 2),
                 round(self._paymentDfs[i_flow], 4),
-                round(self._payment_pvs[i_flow], 2),
-                round(self._cumulativePVs[i_flow], 2),
+                round(payment_pvs[i_flow], 2),
+                round(cumulative_pvs[i_flow], 2),
             ])
 
         table = format_table(header, rows)
@@ -2,17 +2,21 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
+import numpy as np
+
 from ...utils.error import FinError
 from ...utils.date import Date
+from ...utils.date_array import DateArray
 from ...utils.math import ONE_MILLION
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes,  DateGenRuleTypes
+from ...utils.calendar import CalendarTypes,  DateGenRuleTypes, JointCalendar
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.schedule import Schedule
 from ...utils.helpers import format_table, label_to_string, check_argument_types
 from ...utils.global_types import SwapTypes
 from ...market.curves.discount_curve import DiscountCurve
+from .swap_fixed_leg import _leg_dfs
 
 ##########################################################################
 
@@ -32,7 +36,7 @@ class SwapFloatLeg:
                  notional: float = ONE_MILLION,
                  principal: float = 0.0,
                  payment_lag: int = 0,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
                  end_of_month: bool = False):
@@ -78,6 +82,10 @@ class SwapFloatLeg:
         self._year_fracs = []
         self._accrued_days = []
 
+        self._rates = []
+        self._paymentDfs = []
+        self._principal_pv = 0.0
+
         self.generate_payment_dts()
 
 ###############################################################################
@@ -132,6 +140,12 @@ class SwapFloatLeg:
 
             prev_dt = next_dt
 
+        # The dates and accrual factors are also held as vectors for valuation
+        self._payment_dt_array = DateArray(self._payment_dts)
+        self._start_accrued_dt_array = DateArray(self._startAccruedDates)
+        self._end_accrued_dt_array = DateArray(self._endAccruedDates)
+        self._year_frac_array = np.array(self._year_fracs)
+
 ###############################################################################
 
     def value(self,
@@ -150,77 +164,131 @@ class SwapFloatLeg:
         if index_curve is None:
             index_curve = discount_curve
 
-        self._rates = []
-        self._payments = []
-        self._paymentDfs = []
-        self._paymentPVs = []
-        self._cumulativePVs = []
-
-        dfValue = discount_curve.df(value_dt)
-        leg_pv = 0.0
         numPayments = len(self._payment_dts)
-        firstPayment = False
 
         if not len(self._notional_array):
             self._notional_array = [self._notional] * numPayments
 
-        index_basis = index_curve._dc_type
-        index_day_counter = DayCount(index_basis)
+        notionals = np.asarray(self._notional_array, dtype=np.float64)
+        alive = self._payment_dt_array > value_dt
 
-        for iPmnt in range(0, numPayments):
+        rates = np.zeros(numPayments)
+        payments = np.zeros(numPayments)
+        dfs = np.zeros(numPayments)
+        principal_pv = 0.0
 
-            pmntDate = self._payment_dts[iPmnt]
+        # The first future payment uses the fixing if one is given
+        fixings = np.nonzero(alive)[0]
+        if firstFixingRate is not None and len(fixings) > 0:
+            rates[fixings[0]] = firstFixingRate
+            fixings = fixings[1:]
 
-            if pmntDate > value_dt:
+        if len(fixings) > 0:
 
-                startAccruedDt = self._startAccruedDates[iPmnt]
-                endAccruedDt = self._endAccruedDates[iPmnt]
-                pay_alpha = self._year_fracs[iPmnt]
+            # The forward rates of the other payments are found together
+            start_dts = self._start_accrued_dt_array[fixings]
+            end_dts = self._end_accrued_dt_array[fixings]
 
-                (index_alpha, num, _) = index_day_counter.year_frac(startAccruedDt,
-                                                                    endAccruedDt)
+            index_day_counter = DayCount(index_curve._dc_type)
+            index_alphas = index_day_counter.year_frac(start_dts, end_dts)[0]
 
-                if firstPayment is False and firstFixingRate is not None:
+            df_start = _leg_dfs(index_curve, start_dts)
+            dfEnd = _leg_dfs(index_curve, end_dts)
+            rates[fixings] = (df_start / dfEnd - 1.0) / index_alphas
 
-                    fwd_rate = firstFixingRate
-                    firstPayment = True
+        if np.any(alive):
 
-                else:
+            payments[alive] = (rates[alive] + self._spread) * \
+                self._year_frac_array[alive] * notionals[alive]
 
-                    df_start = index_curve.df(startAccruedDt)
-                    dfEnd = index_curve.df(endAccruedDt)
-                    fwd_rate = (df_start / dfEnd - 1.0) / index_alpha
+            dfValue = discount_curve.df(value_dt)
+            dfs[alive] = _leg_dfs(discount_curve,
+                                  self._payment_dt_array[alive]) / dfValue
 
-                pmntAmount = (fwd_rate + self._spread) * pay_alpha * self._notional_array[iPmnt]
+            if alive[-1]:
+                principal_pv = self._principal * dfs[-1] * notionals[-1]
 
-                dfPmnt = discount_curve.df(pmntDate) / dfValue
-                pmntPV = pmntAmount * dfPmnt
-                leg_pv += pmntPV
+        leg_pv = float(np.dot(payments, dfs)) + principal_pv
 
-                self._rates.append(fwd_rate)
-                self._payments.append(pmntAmount)
-                self._paymentDfs.append(dfPmnt)
-                self._paymentPVs.append(pmntPV)
-                self._cumulativePVs.append(leg_pv)
+        self._rates = rates
+        self._payments = payments
+        self._paymentDfs = dfs
+        self._principal_pv = principal_pv
 
-            else:
+        if self._leg_type == SwapTypes.PAY:
+            leg_pv = leg_pv * (-1.0)
+
+        return leg_pv
+
+##########################################################################
 
-                self._rates.append(0.0)
-                self._payments.append(0.0)
-                self._paymentDfs.append(0.0)
-                self._paymentPVs.append(0.0)
-                self._cumulativePVs.append(leg_pv)
+    def df_gradient(self,
+                    value_dt: Date,
+                    discount_curve: DiscountCurve,
+                    index_curve: DiscountCurve = None,
+                    firstFixingRate: float = None):
+        """ Return the sensitivity of the leg value to each of the pillar
+        discount factors of the discount curve and to those of the index curve
+        as a tuple. The payments and the forward rates are chained with the
+        sensitivities of the curve interpolation in a single pass. If the
+        same curve is used for both, its sensitivity is the sum of the two. """
 
-        if pmntDate > value_dt:
-            paymentPV = self._principal * dfPmnt * self._notional_array[-1]
-            self._paymentPVs[-1] += paymentPV
-            leg_pv += paymentPV
-            self._cumulativePVs[-1] = leg_pv
+        if index_curve is None:
+            index_curve = discount_curve
+
+        leg_pv = self.value(value_dt, discount_curve, index_curve,
+                            firstFixingRate)
 
         if self._leg_type == SwapTypes.PAY:
             leg_pv = leg_pv * (-1.0)
 
-        return leg_pv
+        dfValue = discount_curve.df(value_dt)
+        notionals = np.asarray(self._notional_array, dtype=np.float64)
+        alive = self._payment_dt_array > value_dt
+
+        # The value is divided by the discount factor to the value date
+        discount_grad = discount_curve.df_gradient(value_dt, -leg_pv / dfValue)
+        index_grad = np.zeros(len(index_curve._dfs))
+
+        if np.any(alive):
+
+            flow_weights = self._payments[alive] / dfValue
+
+            if alive[-1]:
+                flow_weights[-1] += self._principal * notionals[-1] / dfValue
+
+            discount_grad = discount_grad + discount_curve.df_gradient(
+                self._payment_dt_array[alive], flow_weights)
+
+        # A payment with a fixing does not depend on the index curve
+        fixings = np.nonzero(alive)[0]
+        if firstFixingRate is not None:
+            fixings = fixings[1:]
+
+        if len(fixings) > 0:
+
+            start_dts = self._start_accrued_dt_array[fixings]
+            end_dts = self._end_accrued_dt_array[fixings]
+
+            index_day_counter = DayCount(index_curve._dc_type)
+            index_alphas = index_day_counter.year_frac(start_dts, end_dts)[0]
+
+            df_start = index_curve.df(start_dts)
+            dfEnd = index_curve.df(end_dts)
+
+            # Sensitivity of the PV to the forward rate
+            c = self._year_frac_array[fixings] * notionals[fixings] * \
+                self._paymentDfs[fixings] / index_alphas
+
+            index_grad = index_grad + \
+                index_curve.df_gradient(start_dts, c / dfEnd) + \
+                index_curve.df_gradient(end_dts, -c * df_start / dfEnd / dfEnd)
+
+        if self._leg_type == SwapTypes.PAY:
+            discount_grad = discount_grad * (-1.0)
+            index_grad = index_grad * (-1.0)
+
+        return discount_grad, index_grad
 
 ##########################################################################
 
@@ -257,6 +325,17 @@ class SwapFloatLeg:
         print("\nPAYMENTS SCHEDULE:")
         print(table)
 
+###############################################################################
+
+    def _payment_pvs(self):
+        """ Return the PV of each payment and their cumulative PV using the
+        payments and discount factors of the last valuation. The principal is
+        included in the last payment. """
+
+        payment_pvs = self._payments * self._paymentDfs
+        payment_pvs[-1] += self._principal_pv
+        return payment_pvs, np.cumsum(payment_pvs)
+
 ###############################################################################
 
     def print_valuation(self):
@@ -274,6 +353,8 @@ class SwapFloatLeg:
             print("Payments not calculated.")
             return
 
+        payment_pvs, cumulative_pvs = self._payment_pvs()
+
         header = [ "PAY_NUM", "PAY_dt",  "NOTIONAL",
                   "IBOR", "PMNT", "DF", "PV", "CUM_PV"]
 
@@ -287,8 +368,8 @@ class SwapFloatLeg:
                 round(self._rates[i_flow] * 100.0, 4),
                 round(self._payments[i_flow], 2),
                 round(self._paymentDfs[i_flow], 4),
-                round(self._paymentPVs[i_flow], 2),
-                round(self._cumulativePVs[i_flow], 2),
+                round(payment_pvs[i_flow], 2),
+                round(cumulative_pvs[i_flow], 2),
             ])
 
         table = format_table(header, rows)
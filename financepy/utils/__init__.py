@@ -1,15 +1,51 @@
-from .calendar import *
-from .currency import *
-from .date import *
-from .day_count import *
-from .frequency import *
-from .global_vars import *
-from .global_types import *
-from .helpers import *
-from .math import *
-from .stats import *
-from .schedule import *
-from .error import *
-from .currency import *
-from .amount import *
-from .distribution import *
+# The modules are imported on first use of one of their names
+from .lazy_import import lazy_import
+
+_submodules = {
+    'calendar': ['BusDayAdjustTypes', 'BusinessDayIndex', 'Calendar',
+                 'CalendarTypes', 'DateGenRuleTypes', 'easterMondayDay',
+                 'g_business_day_indices', 'JointCalendar',
+                 'JointCalendarRuleTypes'],
+    'currency': ['CurrencyTypes'],
+    'date': ['calculate_list', 'daily_working_day_schedule', 'Date',
+             'date_from_index', 'date_index', 'date_range', 'datediff',
+             'DateFormatTypes', 'days_in_month', 'from_datetime',
+             'g_date_counter_list', 'g_date_type_format', 'g_end_year',
+             'g_start_year', 'long_day_names', 'longMonthNames',
+             'month_days_leap_year', 'month_days_not_leap_year', 'parse_dt',
+             'set_date_format', 'short_day_names', 'short_month_names',
+             'test_type', 'vectorisation_helper', 'weekday'],
+    'date_array': ['DateArray', 'EXCEL_FAKE_FEB29', 'excel_serials',
+                   'EXCEL_UNIX_EPOCH', 'is_leap_year_array'],
+    'day_count': ['DayCount', 'DayCountTypes', 'is_last_day_of_feb'],
+    'frequency': ['annual_frequency', 'FrequencyTypes'],
+    'global_vars': ['gDaysInYear', 'gNotebookMode', 'gSmall'],
+    'global_types': ['ArgumentCheckTypes', 'CurveBuildTypes',
+                     'EquityBarrierTypes', 'FinCapFloorTypes',
+                     'FinExerciseTypes', 'FinLongShort', 'FinSolverTypes',
+                     'OptionTypes', 'ReturnTypes', 'SwapTypes',
+                     'TouchOptionTypes'],
+    'helpers': ['accrued_tree', 'beta_vector_to_corr_matrix',
+                'check_argument_types', 'check_date',
+                'check_vector_differences', 'dotproduct', 'dump',
+                'format_table', 'get_argument_check_type', 'grid_index',
+                'input_time', 'label_to_string', 'listdiff',
+                'normalise_weights', 'print_tree', 'pv01_times',
+                'set_argument_check_type', 'table_to_string',
+                'times_from_dates', 'to_usable_type',
+                'uniform_to_default_time'],
+    'math': ['accrued_interpolator', 'band_matrix_multiplication', 'cholesky',
+             'corr_matrix_generator', 'covar', 'frange', 'heaviside',
+             'INVROOT2PI', 'is_leap_year', 'M', 'maxaxis', 'maximum',
+             'minaxis', 'N', 'n_prime_vect', 'n_vect', 'normcdf_integrate',
+             'normcdf_slow', 'norminvcdf', 'normpdf', 'nprime', 'npv',
+             'ONE_BILLION', 'ONE_MILLION', 'pair_gcd', 'phi2', 'phi3', 'PI',
+             'scale', 'solve_tridiagonal_matrix', 'TEN_MILLION',
+             'test_monotonicity', 'test_range', 'transpose_tridiagonal_matrix'],
+    'stats': ['correlation', 'mean', 'moment', 'stderr', 'stdev', 'var'],
+    'schedule': ['Schedule'],
+    'error': ['FinError', 'func_name', 'ipython', 'suppress_traceback'],
+    'amount': ['Amount'],
+    'distribution': ['FinDistribution']}
+
+__getattr__, __dir__ = lazy_import(globals(), _submodules)
@@ -3,13 +3,11 @@
 ###############################################################################
 
 
-###############################################################################
-# TODO: Do some timings and tidy up logic in adjustment function
-###############################################################################
-
-import datetime
+import numpy as np
 from enum import Enum
-from .date import Date
+from .date import Date, days_in_month
+from .date_array import DateArray, excel_serials
+from .date_array import _dmy_from_excel, _excel_from_dmy
 from .error import FinError
 
 # from numba import njit, jit, int64, boolean
@@ -76,6 +74,207 @@ class DateGenRuleTypes(Enum):
     FORWARD = 1
     BACKWARD = 2
 
+
+class JointCalendarRuleTypes(Enum):
+    JOIN_HOLIDAYS = 1  # A holiday in any calendar is a holiday
+    JOIN_BUSINESS_DAYS = 2  # A business day in any calendar is a business day
+
+###############################################################################
+
+
+def _date_from_serial(serial: int):
+    """ Convert an integer Excel serial number into a Date. """
+    d, m, y = _dmy_from_excel(np.array([serial], dtype=np.int64))
+    return Date(int(d[0]), int(m[0]), int(y[0]))
+
+###############################################################################
+
+
+def _year_start_serial(y: int):
+    """ Excel serial number of the 1st January of year y. """
+    one = np.ones(1, dtype=np.int64)
+    return int(_excel_from_dmy(one, one, np.array([y], dtype=np.int64))[0])
+
+###############################################################################
+
+
+class BusinessDayIndex:
+    """ Precomputed holiday and business day bitmaps over a contiguous range
+    of whole years, indexed by Excel serial number. It also holds the
+    cumulative number of business days and the sorted business day serials
+    so that business day tests, adjustments, additions and counts are all
+    array lookups. The range of years is extended on demand. """
+
+    def __init__(self,
+                 holiday_fn):
+        """ Create an index given a function that returns an array of holiday
+        flags for every serial number from the start of year y1 to the end of
+        year y2 when called as holiday_fn(y1, y2). """
+
+        self._holiday_fn = holiday_fn
+        self._start_year = None
+        self._end_year = None
+        self._start_serial = 0
+        self._end_serial = -1
+        self._holidays = np.zeros(0, dtype=np.bool_)
+        self._bus_days = np.zeros(0, dtype=np.bool_)
+        self._cum_bus_days = np.zeros(0, dtype=np.int64)
+        self._bus_day_serials = np.zeros(0, dtype=np.int64)
+
+    ###########################################################################
+
+    def ensure(self,
+               serial_lo: int,
+               serial_hi: int):
+        """ Extend the index so that it covers both serial numbers. Whole
+        years are added with one year of margin on either side. """
+
+        if serial_lo >= self._start_serial and serial_hi <= self._end_serial:
+            return
+
+        serial_lo = max(int(serial_lo), 1)
+        y_lo = int(_dmy_from_excel(np.array([serial_lo]))[2][0]) - 1
+        y_hi = int(_dmy_from_excel(np.array([int(serial_hi)]))[2][0]) + 1
+        y_lo = max(y_lo, 1900)
+
+        if self._start_year is None:
+            holidays = [self._holiday_fn(y_lo, y_hi)]
+        else:
+            holidays = [self._holidays]
+            if y_lo < self._start_year:
+                holidays.insert(0, self._holiday_fn(y_lo,
+                                                    self._start_year - 1))
+            else:
+                y_lo = self._start_year
+
+            if y_hi > self._end_year:
+                holidays.append(self._holiday_fn(self._end_year + 1, y_hi))
+            else:
+                y_hi = self._end_year
+
+        self._start_year = y_lo
+        self._end_year = y_hi
+        self._start_serial = _year_start_serial(y_lo)
+        self._end_serial = _year_start_serial(y_hi + 1) - 1
+        self._holidays = np.concatenate(holidays)
+
+        serials = np.arange(self._start_serial, self._end_serial + 1)
+        is_weekend = (serials + 5) % 7 >= Date.SAT
+        self._bus_days = ~is_weekend & ~self._holidays
+        self._cum_bus_days = np.cumsum(self._bus_days)
+        self._bus_day_serials = serials[self._bus_days]
+
+    ###########################################################################
+
+    def holiday_flags(self,
+                      y1: int,
+                      y2: int):
+        """ Holiday flags for every day from the start of year y1 to the end
+        of year y2. This is used to combine the indices of calendars. """
+
+        start_serial = _year_start_serial(y1)
+        end_serial = _year_start_serial(y2 + 1) - 1
+        self.ensure(start_serial, end_serial)
+        return self._holidays[start_serial - self._start_serial:
+                              end_serial - self._start_serial + 1]
+
+    ###########################################################################
+
+    def _index(self,
+               serials: np.ndarray):
+        """ Array positions of the serials, extending the index if needed. """
+        if isinstance(serials, np.ndarray):
+            self.ensure(np.min(serials), np.max(serials))
+        else:
+            self.ensure(serials, serials)
+        return serials - self._start_serial
+
+    ###########################################################################
+
+    def is_holiday(self,
+                   serials: np.ndarray):
+        """ Holiday flags for an array of serial numbers. """
+        idx = self._index(serials)
+        return self._holidays[idx]
+
+    ###########################################################################
+
+    def is_business_day(self,
+                        serials: np.ndarray):
+        """ Business day flags for an array of serial numbers. """
+        idx = self._index(serials)
+        return self._bus_days[idx]
+
+    ###########################################################################
+
+    def following(self,
+                  serials: np.ndarray):
+        """ The first business day on or after each serial number. """
+        self.ensure(np.min(serials), np.max(serials) + 31)
+        idx = serials - self._start_serial
+        k = self._cum_bus_days[idx] - self._bus_days[idx]
+        return self._bus_day_serials[k]
+
+    ###########################################################################
+
+    def preceding(self,
+                  serials: np.ndarray):
+        """ The last business day on or before each serial number. """
+        self.ensure(np.min(serials) - 31, np.max(serials))
+        idx = serials - self._start_serial
+        k = self._cum_bus_days[idx] - 1
+        return self._bus_day_serials[k]
+
+    ###########################################################################
+
+    def add_business_days(self,
+                          serials: np.ndarray,
+                          num_days: int):
+        """ The serial number num_days business days after each serial. A
+        negative number of days moves backwards in time. """
+
+        if num_days == 0:
+            return serials.copy()
+
+        # There are at least two business days in any week of a calendar
+        margin = 4 * abs(num_days) + 31
+
+        if num_days > 0:
+            self.ensure(np.min(serials), np.max(serials) + margin)
+            idx = serials - self._start_serial
+            k = self._cum_bus_days[idx] - 1 + num_days
+        else:
+            self.ensure(np.min(serials) - margin, np.max(serials))
+            idx = serials - self._start_serial
+            k = self._cum_bus_days[idx] - self._bus_days[idx] + num_days
+
+        return self._bus_day_serials[k]
+
+    ###########################################################################
+
+    def num_business_days(self,
+                          start_serials: np.ndarray,
+                          end_serials: np.ndarray):
+        """ The number of business days after each start serial up to and
+        including each end serial. If the end serial is before the start
+        serial this is minus the number of business days from the end serial
+        up to but excluding the start serial. In both cases it inverts the
+        function add_business_days when the end is a business day. """
+
+        self.ensure(min(np.min(start_serials), np.min(end_serials)),
+                    max(np.max(start_serials), np.max(end_serials)))
+        idx_start = start_serials - self._start_serial
+        idx_end = end_serials - self._start_serial
+        forward = self._cum_bus_days[idx_end] - self._cum_bus_days[idx_start]
+        backward = forward + self._bus_days[idx_start] - \
+            self._bus_days[idx_end]
+        return np.where(end_serials >= start_serials, forward, backward)
+
+###############################################################################
+
+# Business day indices are shared by all calendars of the same type
+g_business_day_indices = {}
+
 ###############################################################################
 
 
@@ -88,7 +287,15 @@ class Calendar:
 
     def __init__(self,
                  cal_type: CalendarTypes):
-        """ Create a calendar based on a specified calendar type. """
+        """ Create a calendar based on a specified calendar type. The holiday
+        rules of each calendar type are only evaluated once per year and then
+        cached in a business day index shared by all calendars of that type.
+        A JointCalendar can be passed in place of a calendar type. """
+
+        if isinstance(cal_type, JointCalendar):
+            self._cal_type = cal_type
+            self._bd_index = cal_type._bd_index
+            return
 
         if cal_type not in CalendarTypes:
             raise FinError(
@@ -97,13 +304,20 @@ class Calendar:
 
         self._cal_type = cal_type
 
+        if cal_type not in g_business_day_indices:
+            g_business_day_indices[cal_type] = BusinessDayIndex(
+                self._holiday_flags)
+
+        self._bd_index = g_business_day_indices[cal_type]
+
     ###########################################################################
 
     def adjust(self,
-               dt: Date,
+               dt: (Date, DateArray),
                bd_type: BusDayAdjustTypes):
         """ Adjust a payment date if it falls on a holiday according to the
-        specified business day convention. """
+        specified business day convention. If a DateArray is passed then all
+        of the dates are adjusted at once and a DateArray is returned. """
 
         if type(bd_type) != BusDayAdjustTypes:
             raise FinError("Invalid type passed. Need Finbd_type")
@@ -115,130 +329,172 @@ class Calendar:
         if bd_type == BusDayAdjustTypes.NONE:
             return dt
 
-        elif bd_type == BusDayAdjustTypes.FOLLOWING:
-
-            # step forward until we find a business day
-            while self.is_business_day(dt) is False:
-                dt = dt.add_days(1)
+        if isinstance(dt, DateArray):
+            if len(dt) == 0:
+                return dt
+            serials = self._adjust_serials(dt._excel_dts.astype(np.int64),
+                                           bd_type)
+            return DateArray(serials)
 
+        # Most dates are business days and are returned unchanged
+        if self.is_business_day(dt) is True:
             return dt
 
-        elif bd_type == BusDayAdjustTypes.MODIFIED_FOLLOWING:
+        serials = self._adjust_serials(np.array([int(dt._excel_dt)]),
+                                       bd_type)
+        return _date_from_serial(serials[0])
+
+    ###########################################################################
 
-            d_start = dt.d()
-            m_start = dt.m()
-            y_start = dt.y()
+    def _adjust_serials(self,
+                        serials: np.ndarray,
+                        bd_type: BusDayAdjustTypes):
+        """ Adjust an array of Excel serial numbers using the business day
+        index of the calendar. """
 
-            # step forward until we find a business day
-            while self.is_business_day(dt) is False:
-                dt = dt.add_days(1)
+        if bd_type == BusDayAdjustTypes.FOLLOWING:
+
+            return self._bd_index.following(serials)
+
+        elif bd_type == BusDayAdjustTypes.MODIFIED_FOLLOWING:
+
+            adjusted = self._bd_index.following(serials)
 
             # if the business day is in a different month look back
-            # for previous first business day one day at a time
-            # TODO: I could speed this up by starting it at initial date
-            if dt._m != m_start:
-                dt = Date(d_start, m_start, y_start)
-                while self.is_business_day(dt) is False:
-                    dt = dt.add_days(-1)
+            # for the previous business day instead
+            new_month = _dmy_from_excel(adjusted)[1] != \
+                _dmy_from_excel(serials)[1]
 
-            return dt
+            if np.any(new_month):
+                preceding = self._bd_index.preceding(serials)
+                adjusted = np.where(new_month, preceding, adjusted)
 
-        elif bd_type == BusDayAdjustTypes.PRECEDING:
+            return adjusted
 
-            # if the business day is in the next month look back
-            # for previous first business day one day at a time
-            while self.is_business_day(dt) is False:
-                dt = dt.add_days(-1)
+        elif bd_type == BusDayAdjustTypes.PRECEDING:
 
-            return dt
+            return self._bd_index.preceding(serials)
 
         elif bd_type == BusDayAdjustTypes.MODIFIED_PRECEDING:
 
-            d_start = dt.d()
-            m_start = dt.m()
-            y_start = dt.y()
-
-            # step backward until we find a business day
-            while self.is_business_day(dt) is False:
-                dt = dt.add_days(-1)
+            adjusted = self._bd_index.preceding(serials)
 
             # if the business day is in a different month look forward
-            # for previous first business day one day at a time
-            # I could speed this up by starting it at initial date
-            if dt._m != m_start:
-                dt = Date(d_start, m_start, y_start)
-                while self.is_business_day(dt) is False:
-                    dt = dt.add_days(+1)
+            # for the next business day instead
+            new_month = _dmy_from_excel(adjusted)[1] != \
+                _dmy_from_excel(serials)[1]
 
-            return dt
+            if np.any(new_month):
+                following = self._bd_index.following(serials)
+                adjusted = np.where(new_month, following, adjusted)
+
+            return adjusted
 
         else:
 
             raise FinError("Unknown adjustment convention" +
                            str(bd_type))
 
-        return dt
-
 ###############################################################################
 
     def add_business_days(self,
-                          start_dt: Date,
+                          start_dt: (Date, DateArray),
                           numDays: int):
         """ Returns a new date that is numDays business days after Date.
-        All holidays in the chosen calendar are assumed not business days. """
-
-        # TODO: REMOVE DATETIME DEPENDENCE HERE ???
+        All holidays in the chosen calendar are assumed not business days.
+        If a DateArray is passed then a DateArray is returned. """
 
         if isinstance(numDays, int) is False:
             raise FinError("Num days must be an integer")
 
-        dt = datetime.date(start_dt._y, start_dt._m, start_dt._d)
-        d = dt.day
-        m = dt.month
-        y = dt.year
-        newDt = Date(d, m, y)
-
-        s = +1
-        if numDays < 0:
-            numDays = -1 * numDays
-            s = -1
+        if isinstance(start_dt, DateArray):
+            serials = start_dt._excel_dts.astype(np.int64)
+            return DateArray(self._bd_index.add_business_days(serials,
+                                                              numDays))
 
-        while numDays > 0:
-            dt = dt + s * datetime.timedelta(days=1)
-            d = dt.day
-            m = dt.month
-            y = dt.year
-            newDt = Date(d, m, y)
+        serials = np.array([int(start_dt._excel_dt)])
+        serials = self._bd_index.add_business_days(serials, numDays)
+        return _date_from_serial(serials[0])
 
-            if self.is_business_day(newDt) is True:
-                numDays -= 1
+###############################################################################
 
-        return newDt
+    def num_business_days(self,
+                          start_dt: (Date, DateArray),
+                          end_dt: (Date, DateArray)):
+        """ Returns the number of business days after start_dt up to and
+        including end_dt so that add_business_days(start_dt, n) = end_dt when
+        end_dt is a business day. The count is negative if end_dt is before
+        start_dt and then counts business days from end_dt up to but not
+        including start_dt. If either date is a DateArray an array of counts
+        is returned. """
+
+        start_serials = np.floor(excel_serials(start_dt)).astype(np.int64)
+        end_serials = np.floor(excel_serials(end_dt)).astype(np.int64)
+        num_days = self._bd_index.num_business_days(start_serials,
+                                                    end_serials)
+
+        if isinstance(start_dt, DateArray) or isinstance(end_dt, DateArray):
+            return num_days
+        else:
+            return int(num_days[0])
 
 ###############################################################################
 
     def is_business_day(self,
-                        dt: Date):
+                        dt: (Date, DateArray)):
         """ Determines if a date is a business day according to the specified
-        calendar. If it is it returns True, otherwise False. """
+        calendar. If it is it returns True, otherwise False. For a DateArray
+        a boolean array is returned. """
 
         # For all calendars so far, SAT and SUN are not business days
         # If this ever changes I will need to add a filter here.
-        if dt.is_weekend():
-            return False
+        if isinstance(dt, DateArray):
+            return self._bd_index.is_business_day(
+                dt._excel_dts.astype(np.int64))
 
-        if self.is_holiday(dt) is True:
-            return False
-        else:
-            return True
+        return bool(self._bd_index.is_business_day(int(dt._excel_dt)))
 
 ###############################################################################
 
     def is_holiday(self,
-                   dt: Date):
+                   dt: (Date, DateArray)):
         """ Determines if a date is a Holiday according to the specified
         calendar. Weekends are not holidays unless the holiday falls on a
-        weekend date. """
+        weekend date. For a DateArray a boolean array is returned. """
+
+        if isinstance(dt, DateArray):
+            return self._bd_index.is_holiday(dt._excel_dts.astype(np.int64))
+
+        return bool(self._bd_index.is_holiday(int(dt._excel_dt)))
+
+###############################################################################
+
+    def _holiday_flags(self,
+                       y1: int,
+                       y2: int):
+        """ Evaluate the holiday rules for every day from the start of year y1
+        to the end of year y2 and return an array of flags indexed by Excel
+        serial number relative to the 1st January of year y1. """
+
+        start_serial = _year_start_serial(y1)
+        end_serial = _year_start_serial(y2 + 1)
+        flags = np.zeros(end_serial - start_serial, dtype=np.bool_)
+
+        for y in range(y1, y2 + 1):
+            for m in range(1, 13):
+                for d in range(1, days_in_month(m, y) + 1):
+                    dt = Date(d, m, y)
+                    idx = int(dt._excel_dt) - start_serial
+                    flags[idx] = self._is_holiday_rule(dt)
+
+        return flags
+
+###############################################################################
+
+    def _is_holiday_rule(self,
+                         dt: Date):
+        """ Applies the holiday rules of the calendar to a single date. This
+        is only called when building the business day index. """
 
         start_dt = Date(1, 1, dt.y())
         self._day_in_year = dt.excel_dt() - start_dt.excel_dt() + 1
@@ -1103,3 +1359,82 @@ class Calendar:
         return s
 
 ###############################################################################
+
+
+class JointCalendar(Calendar):
+    """ A calendar which combines several calendar types as is needed for
+    trades that settle in more than one financial centre. With the rule
+    JOIN_HOLIDAYS a date is a holiday if it is a holiday in any of the
+    calendars. With JOIN_BUSINESS_DAYS a date is a business day if it is one
+    in any of the calendars. The combined holiday bitmaps are cached so that
+    a joint calendar costs no more to use than a single one. A JointCalendar
+    can be passed wherever a calendar type is accepted. """
+
+    def __init__(self,
+                 cal_types: list,
+                 rule_type: JointCalendarRuleTypes =
+                 JointCalendarRuleTypes.JOIN_HOLIDAYS):
+        """ Create a joint calendar from a list of calendar types and a rule
+        for combining them.
+
+        Example Input:
+        cal = JointCalendar([CalendarTypes.TARGET,
+                             CalendarTypes.UNITED_KINGDOM])
+        """
+
+        if len(cal_types) == 0:
+            raise FinError("Joint calendar needs at least one calendar type")
+
+        for cal_type in cal_types:
+            if isinstance(cal_type, CalendarTypes) is False:
+                raise FinError("Need to pass FinCalendarType and not " +
+                               str(cal_type))
+
+        if isinstance(rule_type, JointCalendarRuleTypes) is False:
+            raise FinError("Need to pass JointCalendarRuleTypes and not " +
+                           str(rule_type))
+
+        self._cal_types = list(cal_types)
+        self._rule_type = rule_type
+        self._cal_type = self
+
+        self.name = "+".join(cal_type.name for cal_type in cal_types)
+
+        if rule_type == JointCalendarRuleTypes.JOIN_BUSINESS_DAYS:
+            self.name = "|".join(cal_type.name for cal_type in cal_types)
+
+        key = (tuple(cal_types), rule_type)
+
+        if key not in g_business_day_indices:
+            g_business_day_indices[key] = BusinessDayIndex(
+                self._joint_holiday_flags)
+
+        self._bd_index = g_business_day_indices[key]
+
+###############################################################################
+
+    def _joint_holiday_flags(self,
+                             y1: int,
+                             y2: int):
+        """ Combine the cached holiday flags of the individual calendars. """
+
+        flags = [Calendar(cal_type)._bd_index.holiday_flags(y1, y2)
+                 for cal_type in self._cal_types]
+
+        if self._rule_type == JointCalendarRuleTypes.JOIN_HOLIDAYS:
+            return np.logical_or.reduce(flags)
+        else:
+            return np.logical_and.reduce(flags)
+
+###############################################################################
+
+    def __str__(self):
+        return self.name
+
+###############################################################################
+
+    def __repr__(self):
+        s = type(self).__name__ + "(" + self.name + ")"
+        return s
+
+###############################################################################
@@ -196,6 +196,9 @@ def weekday(day_count):
 
 def vectorisation_helper(func):
     def wrapper(self_, other):
+        if getattr(other, "_is_date_array", False):
+            # Let the DateArray reflected operator vectorise the operation
+            return NotImplemented
         if isinstance(other, Iterable):
             # Store the type of other, then cast the output to be the same type
             output_type = type(other)
@@ -0,0 +1,499 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+from numba import njit, int64
+
+from .error import FinError
+from .date import Date
+
+###############################################################################
+# Excel serial numbers count days from 1 Jan 1900 = 1 and include the fake
+# 29 Feb 1900 (serial 60) inherited from LOTUS 1-2-3. From 1 Mar 1900 the
+# serial is simply the number of days since 30 Dec 1899. Serial 25569 is the
+# 1 Jan 1970 which is day zero of the civil calendar algorithm used below.
+###############################################################################
+
+EXCEL_UNIX_EPOCH = 25569
+EXCEL_FAKE_FEB29 = 60
+
+###############################################################################
+
+
+@njit(int64(int64, int64, int64), fastmath=True, cache=True)
+def _days_from_civil(y, m, d):
+    """ Number of days since 1 Jan 1970 of the proleptic Gregorian date with
+    year y, month m and day d. See H. Hinnant's chrono-compatible algorithms.
+    """
+    if m <= 2:
+        y -= 1
+    era = y // 400
+    yoe = y - era * 400
+    mp = (m + 9) % 12
+    doy = (153 * mp + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _excel_from_dmy(d, m, y):
+    """ Vectorised conversion of day, month and year arrays to Excel serial
+    numbers in agreement with the Date class. """
+
+    n = len(d)
+    serials = np.empty(n, dtype=np.int64)
+
+    for i in range(0, n):
+        s = _days_from_civil(y[i], m[i], d[i]) + EXCEL_UNIX_EPOCH
+        # Dates before 1 Mar 1900 do not see the fake 29 Feb 1900
+        if s <= EXCEL_FAKE_FEB29:
+            s -= 1
+        serials[i] = s
+
+    return serials
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _dmy_from_excel(serials):
+    """ Vectorised conversion of integer Excel serial numbers to day, month
+    and year arrays. """
+
+    n = len(serials)
+    dd = np.empty(n, dtype=np.int64)
+    mm = np.empty(n, dtype=np.int64)
+    yy = np.empty(n, dtype=np.int64)
+
+    for i in range(0, n):
+
+        s = serials[i]
+
+        if s == EXCEL_FAKE_FEB29:
+            dd[i] = 29
+            mm[i] = 2
+            yy[i] = 1900
+            continue
+
+        if s < EXCEL_FAKE_FEB29:
+            s += 1
+
+        z = s - EXCEL_UNIX_EPOCH + 719468
+        era = z // 146097
+        doe = z - era * 146097
+        yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+        doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+        mp = (5 * doy + 2) // 153
+        d = doy - (153 * mp + 2) // 5 + 1
+
+        if mp < 10:
+            m = mp + 3
+        else:
+            m = mp - 9
+
+        y = yoe + era * 400
+        if m <= 2:
+            y += 1
+
+        dd[i] = d
+        mm[i] = m
+        yy[i] = y
+
+    return dd, mm, yy
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _days_in_month(m, y):
+    """ Vectorised number of days in month m of year y. """
+
+    month_days = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+    n = len(m)
+    out = np.empty(n, dtype=np.int64)
+
+    for i in range(0, n):
+        yi = y[i]
+        leap_year = ((yi % 4 == 0) and (yi % 100 != 0) or (yi % 400 == 0))
+        out[i] = month_days[m[i] - 1]
+        if leap_year and m[i] == 2:
+            out[i] = 29
+
+    return out
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _add_months(d, m, y, num_months):
+    """ Vectorised month addition which clips the day of the month to the
+    last day of the new month, exactly as in Date.add_months. """
+
+    n = len(d)
+    new_d = np.empty(n, dtype=np.int64)
+    new_m = np.empty(n, dtype=np.int64)
+    new_y = np.empty(n, dtype=np.int64)
+
+    for i in range(0, n):
+        months = (m[i] - 1) + num_months[i]
+        new_y[i] = y[i] + months // 12
+        new_m[i] = months % 12 + 1
+
+    last_day = _days_in_month(new_m, new_y)
+
+    for i in range(0, n):
+        new_d[i] = min(d[i], last_day[i])
+
+    return new_d, new_m, new_y
+
+###############################################################################
+
+
+def is_leap_year_array(y: np.ndarray):
+    """ Vectorised test of whether each year in y is a leap year. """
+    return ((y % 4 == 0) & (y % 100 != 0)) | (y % 400 == 0)
+
+###############################################################################
+
+
+def excel_serials(dts):
+    """ Return the Excel serial numbers of a Date, a DateArray, a list of
+    Dates or an array of serial numbers as a float64 Numpy array. The Date
+    serial includes any intraday time as a day fraction. """
+
+    if isinstance(dts, DateArray):
+        return dts._excel_dts.astype(np.float64)
+    elif isinstance(dts, Date):
+        return np.array([dts._excel_dt], dtype=np.float64)
+    elif isinstance(dts, np.ndarray):
+        return dts.astype(np.float64)
+    elif isinstance(dts, (list, tuple)):
+        return np.array([dt._excel_dt for dt in dts], dtype=np.float64)
+    else:
+        raise FinError("Unknown date type " + str(type(dts)))
+
+###############################################################################
+
+
+class DateArray():
+    """ A vector of dates stored as a Numpy array of integer Excel serial
+    numbers. All date arithmetic is vectorised so that schedules and curves
+    can operate on many dates without creating one Date object per date.
+    Indexing a DateArray with an integer returns a Date, and comparisons or
+    subtractions with a Date or another DateArray return Numpy arrays. """
+
+    # Flag used by Date to defer binary operators to this class
+    _is_date_array = True
+
+    # Comparisons return arrays so a DateArray cannot be hashed
+    __hash__ = None
+
+    ###########################################################################
+
+    def __init__(self,
+                 dts):
+        """ Create a DateArray from a list of Dates, another DateArray or
+        a Numpy array of integer Excel serial numbers.
+
+        Example Input:
+        dts = DateArray([Date(1, 1, 2018), Date(1, 7, 2018)])
+        """
+
+        if isinstance(dts, DateArray):
+            serials = dts._excel_dts.copy()
+        elif isinstance(dts, Date):
+            serials = np.array([int(dts._excel_dt)], dtype=np.int32)
+        elif isinstance(dts, (list, tuple)):
+            serials = np.array([int(dt._excel_dt) for dt in dts],
+                               dtype=np.int32)
+        elif isinstance(dts, np.ndarray):
+            if dts.ndim != 1:
+                raise FinError("DateArray requires a one-dimensional array")
+            if np.any(dts != np.floor(dts)):
+                raise FinError("Excel serial numbers must be whole days")
+            serials = dts.astype(np.int32)
+        else:
+            raise FinError("Cannot create DateArray from " + str(type(dts)))
+
+        if len(serials) > 0 and np.min(serials) < 1:
+            raise FinError("Dates cannot be before 1 Jan 1900")
+
+        self._excel_dts = serials
+
+    ###########################################################################
+
+    @classmethod
+    def from_dmy(cls,
+                 d: np.ndarray,
+                 m: np.ndarray,
+                 y: np.ndarray):
+        """ Create a DateArray from arrays of days, months and years. Invalid
+        days of the month raise an error as they do in the Date class.
+
+        Example Input:
+        dts = DateArray.from_dmy([1, 1], [1, 7], [2018, 2018])
+        """
+
+        d = np.atleast_1d(np.asarray(d, dtype=np.int64))
+        m = np.atleast_1d(np.asarray(m, dtype=np.int64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.int64))
+        d, m, y = [np.array(x) for x in np.broadcast_arrays(d, m, y)]
+
+        if np.any(y < 1900):
+            raise FinError("Year cannot be before 1900")
+
+        if np.any(m < 1) or np.any(m > 12):
+            raise FinError("Month must be 1-12")
+
+        if np.any(d < 1) or np.any(d > _days_in_month(m, y)):
+            raise FinError("DateArray: Day not valid.")
+
+        serials = _excel_from_dmy(d, m, y)
+        return cls(serials)
+
+    ###########################################################################
+
+    def _new(self, serials):
+        """ Wrap an array of serials without re-validating them. """
+        dts = DateArray.__new__(DateArray)
+        dts._excel_dts = serials.astype(np.int32)
+        return dts
+
+    ###########################################################################
+
+    def _dmy(self):
+        return _dmy_from_excel(self._excel_dts.astype(np.int64))
+
+    def d(self):
+        ''' Get days of month as an integer array '''
+        return self._dmy()[0]
+
+    def m(self):
+        ''' Get months of year as an integer array '''
+        return self._dmy()[1]
+
+    def y(self):
+        ''' Get years as an integer array '''
+        return self._dmy()[2]
+
+    def excel_dt(self):
+        ''' Get the dates as an array of integer Excel serial numbers '''
+        return self._excel_dts
+
+    def weekday(self):
+        ''' Get days of week as an integer array with MON = 0 '''
+        return (self._excel_dts + 5) % 7
+
+    ###########################################################################
+
+    def to_dates(self):
+        """ Convert the DateArray to a list of Date objects. """
+        dd, mm, yy = self._dmy()
+        return [Date(int(dd[i]), int(mm[i]), int(yy[i]))
+                for i in range(0, len(dd))]
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._excel_dts)
+
+    def __iter__(self):
+        return iter(self.to_dates())
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            d, m, y = _dmy_from_excel(
+                np.array([self._excel_dts[key]], dtype=np.int64))
+            return Date(int(d[0]), int(m[0]), int(y[0]))
+        return self._new(self._excel_dts[key])
+
+    ###########################################################################
+
+    def _other_serials(self, other):
+        """ Excel serials of the other operand of a binary operation. """
+        if isinstance(other, DateArray):
+            return other._excel_dts
+        elif isinstance(other, Date):
+            return other._excel_dt
+        elif isinstance(other, (list, tuple)):
+            return excel_serials(other)
+        return None
+
+    def __sub__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts - np.asarray(serials, dtype=np.float64)
+
+    def __rsub__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return np.asarray(serials, dtype=np.float64) - self._excel_dts
+
+    def __gt__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts > serials
+
+    def __lt__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts < serials
+
+    def __ge__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts >= serials
+
+    def __le__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts <= serials
+
+    def __eq__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts == serials
+
+    def __ne__(self, other):
+        serials = self._other_serials(other)
+        if serials is None:
+            return NotImplemented
+        return self._excel_dts != serials
+
+    ###########################################################################
+
+    def is_weekend(self):
+        """ Returns a boolean array which is True for weekend dates. """
+        return self.weekday() >= Date.SAT
+
+    ###########################################################################
+
+    def is_eom(self):
+        """ Returns a boolean array which is True for month end dates. """
+        dd, mm, yy = self._dmy()
+        return dd == _days_in_month(mm, yy)
+
+    ###########################################################################
+
+    def eom(self):
+        """ Returns the last date of the month of each date. """
+        dd, mm, yy = self._dmy()
+        return self._new(_excel_from_dmy(_days_in_month(mm, yy), mm, yy))
+
+    ###########################################################################
+
+    def add_days(self,
+                 num_days: (int, np.ndarray) = 1):
+        """ Returns a new DateArray with each date moved forward by num_days
+        which may be negative and may be a scalar or an array of days. """
+
+        num_days = np.asarray(num_days)
+
+        if np.any(num_days != np.floor(num_days)):
+            raise FinError("Must only pass integers or float integers.")
+
+        serials = self._excel_dts + num_days.astype(np.int64)
+
+        if len(serials) > 0 and np.min(serials) < 1:
+            raise FinError("Dates cannot be before 1 Jan 1900")
+
+        return self._new(serials)
+
+    ###########################################################################
+
+    def add_months(self,
+                   num_months: (int, np.ndarray)):
+        """ Returns a new DateArray with each date moved forward by a number
+        of months which may be a scalar or an array. As in Date.add_months the
+        day of the month is clipped to the end of the new month. """
+
+        num_months = np.asarray(num_months)
+
+        if np.any(num_months != np.floor(num_months)):
+            raise FinError("Must only pass integers or float integers.")
+
+        dd, mm, yy = self._dmy()
+        dd, mm, yy, num_months = [np.array(x) for x in np.broadcast_arrays(
+            dd, mm, yy, num_months.astype(np.int64))]
+        dd, mm, yy = _add_months(dd, mm, yy, num_months)
+
+        if len(yy) > 0 and np.min(yy) < 1900:
+            raise FinError("Year cannot be before 1900")
+
+        return self._new(_excel_from_dmy(dd, mm, yy))
+
+    ###########################################################################
+
+    def add_years(self,
+                  num_years: (int, np.ndarray)):
+        """ Returns a new DateArray with each date moved forward by a whole
+        number of years. """
+
+        return self.add_months(np.asarray(num_years) * 12)
+
+    ###########################################################################
+
+    def add_tenor(self,
+                  tenor: str):
+        """ Return the dates following each date by a period given by the
+        tenor which is a string consisting of a number and a letter, the
+        letter being d, w, m , y for day, week, month or year. The results
+        agree with Date.add_tenor applied to each date. The dates are NOT
+        weekend or holiday calendar adjusted. """
+
+        if isinstance(tenor, str) is False:
+            raise FinError("Tenor must be a string e.g. '5Y'")
+
+        tenor_str = tenor.upper()
+
+        if tenor_str == "ON" or tenor_str == "TN":
+            return self.add_days(1)
+        elif tenor_str[-1] == "D":
+            return self.add_days(int(tenor_str[0:-1]))
+        elif tenor_str[-1] == "W":
+            return self.add_days(7 * int(tenor_str[0:-1]))
+        elif tenor_str[-1] == "M":
+            return self.add_months(int(tenor_str[0:-1]))
+        elif tenor_str[-1] == "Y":
+
+            num_years = int(tenor_str[0:-1])
+            new_dts = self.add_months(12 * num_years)
+
+            # Date.add_tenor steps one year at a time so a 29 Feb start date
+            # is clipped to 28 Feb after the first step and stays there
+            if num_years != 0:
+                dd, mm, _ = self._dmy()
+                feb29 = (dd == 29) & (mm == 2)
+                if np.any(feb29):
+                    serials = new_dts._excel_dts.copy()
+                    serials[feb29] -= (new_dts.d()[feb29] == 29).astype(np.int32)
+                    new_dts = self._new(serials)
+
+            return new_dts
+        else:
+            raise FinError("Unknown tenor type in " + tenor)
+
+    ###########################################################################
+
+    def __repr__(self):
+        """ Returns a formatted string of the dates. """
+        return "DateArray([" + ", ".join(str(dt) for dt in self) + "])"
+
+    ###########################################################################
+
+    def _print(self):
+        """ prints formatted string of the dates. """
+        print(self)
+
+###############################################################################
@@ -5,10 +5,13 @@
 from .date import Date
 from .date import datediff
 from .date import is_leap_year
+from .date_array import DateArray, excel_serials, is_leap_year_array
+from .date_array import _dmy_from_excel, _excel_from_dmy
 from .error import FinError
 from .frequency import FrequencyTypes, annual_frequency
 from .global_vars import gDaysInYear
 
+import numpy as np
 from enum import Enum
 
 # A useful source for these definitions can be found at
@@ -106,8 +109,15 @@ class DayCount:
         https://en.wikipedia.org/wiki/Day_count_convention
         and
         http://data.cbonds.info/files/cbondscalc/Calculator.pdf
+
+        If either dt1 or dt2 is a DateArray then the calculation is vectorised
+        and the year fraction, numerator and denominator are Numpy arrays.
         """
 
+        if isinstance(dt1, DateArray) or isinstance(dt2, DateArray):
+            return self._year_frac_array(dt1, dt2, dt3, freq_type,
+                                         isTerminationDate)
+
         d1 = dt1.d()
         m1 = dt1.m()
         y1 = dt1.y()
@@ -289,6 +299,141 @@ class DayCount:
             raise FinError(str(self._type) +
                            " is not one of DayCountTypes")
 
+###############################################################################
+
+    def _year_frac_array(self,
+                         dt1: (Date, DateArray),
+                         dt2: (Date, DateArray),
+                         dt3: (Date, DateArray) = None,
+                         freq_type: FrequencyTypes = FrequencyTypes.ANNUAL,
+                         isTerminationDate: bool = False):
+        """ Vectorised version of year_frac in which the dates may be a
+        mixture of Dates and DateArrays. The results agree date by date with
+        year_frac and are returned as Numpy arrays. """
+
+        x1 = excel_serials(dt1)
+        x2 = excel_serials(dt2)
+        x1, x2 = np.broadcast_arrays(x1, x2)
+
+        d1, m1, y1 = _dmy_from_excel(np.floor(x1).astype(np.int64))
+        d2, m2, y2 = _dmy_from_excel(np.floor(x2).astype(np.int64))
+
+        if self._type in [DayCountTypes.THIRTY_360_BOND,
+                          DayCountTypes.THIRTY_E_360,
+                          DayCountTypes.THIRTY_E_360_ISDA,
+                          DayCountTypes.THIRTY_E_PLUS_360]:
+
+            if self._type == DayCountTypes.THIRTY_360_BOND:
+                d1 = np.where(d1 == 31, 30, d1)
+                d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+            elif self._type == DayCountTypes.THIRTY_E_360:
+                d1 = np.where(d1 == 31, 30, d1)
+                d2 = np.where(d2 == 31, 30, d2)
+            elif self._type == DayCountTypes.THIRTY_E_360_ISDA:
+                last_day_of_feb1 = (m1 == 2) & \
+                    (d1 == np.where(is_leap_year_array(y1), 29, 28))
+                last_day_of_feb2 = (m2 == 2) & \
+                    (d2 == np.where(is_leap_year_array(y2), 29, 28))
+                d1 = np.where((d1 == 31) | last_day_of_feb1, 30, d1)
+                d2 = np.where(d2 == 31, 30, d2)
+                if isTerminationDate is False:
+                    d2 = np.where(last_day_of_feb2, 30, d2)
+            else:
+                d1 = np.where(d1 == 31, 30, d1)
+                m2 = np.where(d2 == 31, m2 + 1, m2)
+                d2 = np.where(d2 == 31, 1, d2)
+
+            num = 360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)
+            den = np.full(num.shape, 360)
+            acc_factor = num / den
+            return acc_factor, num, den
+
+        elif self._type in [DayCountTypes.ACT_ACT_ISDA, DayCountTypes.ZERO]:
+
+            denom1 = np.where(is_leap_year_array(y1), 366, 365)
+            denom2 = np.where(is_leap_year_array(y2), 366, 365)
+
+            ones = np.ones(len(y1), dtype=np.int64)
+            jan1_next = _excel_from_dmy(ones, ones, y1 + 1)
+            jan1_y2 = _excel_from_dmy(ones, ones, y2)
+
+            day_years_1 = np.trunc(jan1_next - x1)
+            day_years_2 = np.trunc(x2 - jan1_y2)
+            year_diff = y2 - y1 - 1.0
+
+            same_year = (y1 == y2)
+            num = np.where(same_year, x2 - x1, day_years_1 + day_years_2)
+            den = np.where(same_year, denom1, denom1 + denom2)
+            acc_factor = np.where(same_year,
+                                  (x2 - x1) / denom1,
+                                  day_years_1 / denom1 +
+                                  day_years_2 / denom2 + year_diff)
+            return acc_factor, num, den
+
+        elif self._type == DayCountTypes.ACT_ACT_ICMA:
+
+            freq = annual_frequency(freq_type)
+
+            if dt3 is None or freq is None:
+                raise FinError("ACT_ACT_ICMA requires three dates and a freq")
+
+            x3 = excel_serials(dt3)
+            num = x2 - x1
+            den = freq * (x3 - x1)
+            acc_factor = num / den
+            return acc_factor, num, den
+
+        elif self._type in [DayCountTypes.ACT_365F,
+                            DayCountTypes.ACT_360,
+                            DayCountTypes.SIMPLE]:
+
+            if self._type == DayCountTypes.ACT_365F:
+                denom = 365
+            elif self._type == DayCountTypes.ACT_360:
+                denom = 360
+            else:
+                denom = gDaysInYear
+
+            num = x2 - x1
+            den = np.full(num.shape, denom)
+            acc_factor = num / den
+            return acc_factor, num, den
+
+        elif self._type == DayCountTypes.ACT_365L:
+
+            frequency = annual_frequency(freq_type)
+
+            if dt3 is None:
+                y3 = y2
+            else:
+                x3 = np.broadcast_to(excel_serials(dt3), x1.shape)
+                y3 = _dmy_from_excel(np.floor(x3).astype(np.int64))[2]
+
+            num = x2 - x1
+
+            if frequency == 1:
+
+                if dt3 is None:
+                    raise FinError("ACT_365L annual requires three dates")
+
+                ones = np.ones(len(y1), dtype=np.int64)
+                feb29_y1 = _excel_from_dmy(29 * ones, 2 * ones, y1)
+                feb29_y3 = _excel_from_dmy(29 * ones, 2 * ones, y3)
+                feb29 = np.where(is_leap_year_array(y1), feb29_y1,
+                                 np.where(is_leap_year_array(y3),
+                                          feb29_y3, 1))
+                den = np.where((feb29 > x1) & (feb29 <= x3), 366, 365)
+            else:
+                den = np.where(is_leap_year_array(y3), 366, 365)
+
+            acc_factor = num / den
+            return acc_factor, num, den
+
+        else:
+
+            raise FinError(str(self._type) +
+                           " is not one of DayCountTypes")
+
 ###############################################################################
 
     def __repr__(self):
@@ -9,15 +9,18 @@
 import traceback
 import sys
 
-# iPython dependency is only loaded if required.
+# iPython dependency is only loaded if required. If we are running inside
+# iPython then it has already been imported so we avoid the cost of importing
+# it otherwise.
 
 ipython = None
 
-try:
-    from IPython import get_ipython
-    ipython = get_ipython()
-except Exception:
-    pass
+if 'IPython' in sys.modules:
+    try:
+        from IPython import get_ipython
+        ipython = get_ipython()
+    except Exception:
+        pass
 
 
 def _hide_traceback(exc_tuple=None, filename=None, tb_offset=None,
@@ -78,6 +78,21 @@ class FinSolverTypes(Enum):
     NELDER_MEAD = 1
     NELDER_MEAD_NUMBA = 2
 
+###############################################################################
+
+
+class CurveBuildTypes(Enum):
+    BOOTSTRAP = 1     # solve for the pillars one at a time in order
+    GLOBAL_SOLVE = 2  # solve for all of the pillars at the same time
+
+###############################################################################
+
+
+class ArgumentCheckTypes(Enum):
+    STRICT = 1       # check the argument types on every call
+    FIRST_CALL = 2   # check each function only on its first call
+    OFF = 3          # no argument type checking
+
 
 ###############################################################################
 
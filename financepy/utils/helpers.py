@@ -9,7 +9,9 @@ from typing import Union
 from prettytable import PrettyTable
 
 from .date import Date
+from .date_array import DateArray
 from .global_vars import gDaysInYear, gSmall
+from .global_types import ArgumentCheckTypes
 from .error import FinError
 from .day_count import DayCountTypes, DayCount
 
@@ -78,13 +80,16 @@ def pv01_times(t: float,
 ###############################################################################
 
 
-def times_from_dates(dt: (Date, list),
+def times_from_dates(dt: (Date, list, DateArray),
                      value_dt: Date,
                      day_count_type: DayCountTypes = None):
     """ If a single date is passed in then return the year from valuation date
     but if a whole vector of dates is passed in then convert to a vector of
     times from the valuation date. The output is always a numpy vector of times
-    which has only one element if the input is only one date. """
+    which has only one element if the input is only one date. A list of dates
+    or a DateArray is converted in a single vectorised step. A DateArray only
+    holds whole days so a list with dates that have a time of day is converted
+    one date at a time. """
 
     if isinstance(value_dt, Date) is False:
         raise FinError("Valuation date is not a Date")
@@ -104,17 +109,31 @@ def times_from_dates(dt: (Date, list),
 
         return times[0]
 
-    elif isinstance(dt, list) and isinstance(dt[0], Date):
-        num_dates = len(dt)
-        times = []
-        for i in range(0, num_dates):
-            if dc_counter is None:
-                t = (dt[i] - value_dt) / gDaysInYear
-            else:
-                t = dc_counter.year_frac(value_dt, dt[i])[0]
-            times.append(t)
+    elif isinstance(dt, (list, DateArray)):
+
+        if isinstance(dt, list):
+            if isinstance(dt[0], Date) is False:
+                raise FinError("Discount factor must take dates.")
+
+            if any(d._excel_dt != int(d._excel_dt) for d in dt):
+                times = []
+                for d in dt:
+                    if dc_counter is None:
+                        t = (d - value_dt) / gDaysInYear
+                    else:
+                        t = dc_counter.year_frac(value_dt, d)[0]
+                    times.append(t)
 
-        return np.array(times)
+                return np.array(times)
+
+            dt = DateArray(dt)
+
+        if dc_counter is None:
+            times = (dt - value_dt) / gDaysInYear
+        else:
+            times = dc_counter.year_frac(value_dt, dt)[0]
+
+        return np.asarray(times, dtype=np.float64)
 
     elif isinstance(dt, np.ndarray):
         raise FinError("You passed an ndarray instead of dates.")
@@ -494,15 +513,78 @@ def accrued_tree(grid_times: np.ndarray,
 ###############################################################################
 
 
+_argument_check_type = ArgumentCheckTypes.STRICT
+_argument_checkers = {}
+_checked_funcs = set()
+
+
+def set_argument_check_type(check_type: ArgumentCheckTypes):
+    """ Set how check_argument_types validates function arguments. STRICT
+    checks every call, FIRST_CALL checks each function once and OFF skips
+    all checks. Batch runs which build many products and curves can avoid
+    the cost of the checks by switching to FIRST_CALL or OFF. """
+
+    global _argument_check_type
+
+    if not isinstance(check_type, ArgumentCheckTypes):
+        raise FinError("Unknown argument check type " + str(check_type))
+
+    _argument_check_type = check_type
+    _checked_funcs.clear()
+
+###############################################################################
+
+
+def get_argument_check_type():
+    """ Return the current argument check type. """
+    return _argument_check_type
+
+###############################################################################
+
+
+def _argument_checker(func):
+    """ Return a cached tuple of (argument name, usable types) pairs built
+    from the annotations of the function so that the conversion of the
+    annotations is only done once per function. """
+
+    # Bound methods are created on each attribute access so key on the
+    # underlying function
+    key = getattr(func, '__func__', func)
+    checker = _argument_checkers.get(key)
+
+    if checker is None:
+        checker = tuple((value_name, to_usable_type(annotation_type))
+                        for value_name, annotation_type
+                        in func.__annotations__.items()
+                        if value_name != 'return')
+        _argument_checkers[key] = checker
+
+    return key, checker
+
+###############################################################################
+
+
 def check_argument_types(func, values):
     """ Check that all values passed into a function are of the same type
     as the function annotations. If a value has not been annotated, it
-    will not be checked. """
-    for value_name, annotation_type in func.__annotations__.items():
+    will not be checked. How often the check is done is controlled by
+    set_argument_check_type. """
+
+    if _argument_check_type is ArgumentCheckTypes.OFF:
+        return
+
+    key, checker = _argument_checker(func)
 
-        if value_name in values:
-            value = values[value_name]
-            usable_type = to_usable_type(annotation_type)
+    if _argument_check_type is ArgumentCheckTypes.FIRST_CALL:
+        if key in _checked_funcs:
+            return
+
+    for value_name, usable_type in checker:
+
+        if value_name not in values:
+            continue
+
+        value = values[value_name]
 
         if (not isinstance(value, usable_type)):
 
@@ -514,4 +596,7 @@ def check_argument_types(func, values):
             print("It is none of these so FAILS. Please amend.")
             raise FinError("Argument Type Error")
 
+    if _argument_check_type is ArgumentCheckTypes.FIRST_CALL:
+        _checked_funcs.add(key)
+
 ###############################################################################
@@ -0,0 +1,260 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+# Numba compiles a kernel the first time it is needed in a process. Kernels
+# with declared signatures are compiled when their module is imported and
+# the rest on their first call. With cache=True the compiled code is written
+# to disk and loaded by later processes. The warmup function here imports
+# every module so that all kernels with declared signatures are compiled into
+# the cache, and makes one representative call into the modules whose kernels
+# have no declared signatures, such as the rate trees. The cache can then be
+# shipped with a deployment. Point the NUMBA_CACHE_DIR environment variable
+# at the same directory at run time.
+
+import os
+import sys
+import time
+import pkgutil
+import importlib
+
+import numpy as np
+import numba
+from numba.core import event
+from numba.core.dispatcher import Dispatcher
+
+###############################################################################
+
+
+def _library_modules():
+    """ Return the names of all of the modules of the library. """
+
+    import financepy
+
+    module_names = []
+    for module_info in pkgutil.walk_packages(financepy.__path__,
+                                             financepy.__name__ + '.'):
+        if module_info.name.endswith('__main__'):
+            continue
+        module_names.append(module_info.name)
+
+    return module_names
+
+###############################################################################
+
+
+def _module_kernels(module):
+    """ Return the Numba dispatchers defined in a module. """
+
+    kernels = []
+    for kernel in vars(module).values():
+        if isinstance(kernel, Dispatcher):
+            if kernel.py_func.__module__ == module.__name__:
+                kernels.append(kernel)
+
+    return kernels
+
+###############################################################################
+
+
+def _is_cached(kernel):
+    """ Return True if the kernel was decorated with cache=True. """
+    return kernel.stats.cache_path is not None
+
+###############################################################################
+
+
+def _warm_rate_tree(model):
+    """ Build a small tree and value a bond option, a Bermudan swaption and
+    a callable bond on it. The argument types are those passed by the bond
+    and swaption products so that the compiled kernels are reused by them. """
+
+    from ..utils.global_types import FinExerciseTypes
+
+    df_times = np.array([0.0, 1.0, 2.0, 3.0, 5.0])
+    df_values = np.exp(-0.03 * df_times)
+    cpn_times = np.array([1.0, 2.0, 3.0])
+    cpn_flows = np.array([0.05, 0.05, 0.05])
+
+    model.build_tree(3.0, df_times, df_values)
+
+    model.bond_option(1.0, 100.0, 100.0, cpn_times, cpn_flows,
+                      FinExerciseTypes.AMERICAN)
+
+    model.bermudan_swaption(1.0, 3.0, 1.0, 1.0, cpn_times, cpn_flows,
+                            FinExerciseTypes.BERMUDAN)
+
+    model.callable_puttable_bond_tree(cpn_times, cpn_flows,
+                                      np.array([2.0]), np.array([100.0]),
+                                      np.array([2.0]), np.array([98.0]),
+                                      100.0)
+
+###############################################################################
+
+
+def _warm_hw_tree():
+    from ..models.hw_tree import HWTree, p_fast
+    _warm_rate_tree(HWTree(0.01, 0.05, 10))
+
+    # The Jamshidian pricer calls this bond price kernel from Python
+    p_fast(1.0, 2.0, 0.03, 0.01, 0.97, 0.969, 0.94, 0.01, 0.05)
+
+###############################################################################
+
+
+def _warm_bk_tree():
+    from ..models.bk_tree import BKTree
+    _warm_rate_tree(BKTree(0.20, 0.05, 10))
+
+###############################################################################
+
+
+def _warm_gauss_copula_lhp():
+    """ Call each of the large homogeneous portfolio kernels once. """
+
+    from ..models import gauss_copula_lhp as lhp
+
+    survival_probs = np.array([0.95, 0.97, 0.99])
+    recovery_rates = np.array([0.40, 0.40, 0.40])
+
+    lhp.tr_surv_prob_lhp(0.0, 0.03, 3, survival_probs, recovery_rates, 0.5)
+    lhp.portfolio_cdf_lhp(0.03, 3, survival_probs, recovery_rates, 0.5, 50)
+    lhp.exp_min_lk(0.03, 0.05, 0.40, 1.0, 0.5)
+    lhp.lhp_density(0.03, 0.05, 0.40, 0.5)
+    lhp.lhp_analytical_density_base_corr(0.03, 0.05, 0.40, 0.5, 0.1)
+    lhp.lhp_analytical_density(0.03, 0.05, 0.40, 0.5)
+    lhp.prob_l_greater_than_k(0.03, 0.05, 0.40, 0.5)
+
+###############################################################################
+
+# Modules whose kernels have no declared signatures are warmed up by calling
+# them with representative arguments
+
+_WARMUP_CALLS = {'financepy.models.hw_tree': _warm_hw_tree,
+                 'financepy.models.bk_tree': _warm_bk_tree,
+                 'financepy.models.gauss_copula_lhp': _warm_gauss_copula_lhp}
+
+###############################################################################
+
+
+def _compile_times(buffer):
+    """ Sum the compile time of each kernel from the Numba compile events. """
+
+    start_times = {}
+    compile_times = {}
+
+    for timestamp, ev in buffer:
+        kernel = ev.data['dispatcher']
+        if ev.is_start:
+            start_times[kernel] = timestamp
+        elif kernel in start_times:
+            dt = timestamp - start_times.pop(kernel)
+            compile_times[kernel] = compile_times.get(kernel, 0.0) + dt
+
+    return compile_times
+
+###############################################################################
+
+
+def set_jit_cache_dir(cache_dir: str):
+    """ Set the directory in which Numba caches the compiled kernels. This
+    has the same effect as setting the NUMBA_CACHE_DIR environment variable
+    before Python starts. Cached kernels of modules which have already been
+    imported are pointed at the new directory. """
+
+    cache_dir = os.path.abspath(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    os.environ['NUMBA_CACHE_DIR'] = cache_dir
+    numba.config.CACHE_DIR = cache_dir
+
+    for module_name in list(sys.modules):
+        if module_name.startswith('financepy.'):
+            module = sys.modules[module_name]
+            if module is None:
+                continue
+            for kernel in _module_kernels(module):
+                if _is_cached(kernel):
+                    kernel.enable_caching()
+
+###############################################################################
+
+
+def warmup(cache_dir: str = None,
+           modules: list = None,
+           verbose: bool = True):
+    """ Import the modules of the library so that every Numba kernel with a
+    declared signature is compiled and written to the Numba cache. The
+    kernels of the tree and LHP modules are compiled by one representative
+    call each. The cache directory can be given, otherwise the Numba default
+    is used. A list of module names can be given to limit the warm up.
+    Returns a list of (module, kernel, status, compile seconds) for each
+    kernel and prints it as a table if verbose. Kernels which have still not
+    been compiled are only compiled on their first call and are reported as
+    LAZY. """
+
+    if cache_dir is not None:
+        set_jit_cache_dir(cache_dir)
+
+    if modules is None:
+        modules = _library_modules()
+
+    preloaded = set(sys.modules)
+    imported_modules = []
+    results = []
+    total_start = time.perf_counter()
+
+    # A module can import others so the compile times are only collected
+    # once all of the modules have been imported and warmed up
+    with event.install_recorder("numba:compile") as recorder:
+        for module_name in modules:
+            try:
+                imported_modules.append(importlib.import_module(module_name))
+            except Exception as e:
+                results.append((module_name, "", "IMPORT FAILED: " + str(e),
+                                0.0))
+
+        if cache_dir is not None:
+            # These were compiled before the cache directory was set
+            for module in imported_modules:
+                if module.__name__ in preloaded:
+                    for kernel in _module_kernels(module):
+                        if _is_cached(kernel) and kernel.signatures:
+                            kernel.recompile()
+
+        for module in imported_modules:
+            if module.__name__ in _WARMUP_CALLS:
+                _WARMUP_CALLS[module.__name__]()
+
+    compile_times = _compile_times(recorder.buffer)
+
+    for module in imported_modules:
+        for kernel in _module_kernels(module):
+
+            compile_time = compile_times.get(kernel, 0.0)
+
+            if not kernel.signatures:
+                status = "LAZY"
+            elif compile_time > 0.0:
+                status = "COMPILED"
+            else:
+                status = "LOADED"
+
+            if not _is_cached(kernel):
+                status += " (NOT CACHED)"
+
+            results.append((module.__name__, kernel.py_func.__name__, status,
+                            round(compile_time, 3)))
+
+    total_time = time.perf_counter() - total_start
+
+    if verbose:
+        from .helpers import format_table
+        header = ["MODULE", "KERNEL", "STATUS", "COMPILE SECS"]
+        print(format_table(header, results))
+        print("Numba cache directory:", numba.config.CACHE_DIR or "default")
+        print("Warm up took %.3f seconds" % total_time)
+
+    return results
+
+###############################################################################
@@ -0,0 +1,58 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+# Lazy loading of the modules of a package using module level __getattr__
+# (PEP 562). A package __init__ which used to do "from .x import *" for each
+# of its modules can instead call lazy_import with a table of the names of
+# each module so that a module is only imported the first time one of its
+# names is used. The tables are checked against the modules by the tests.
+
+import importlib
+
+###############################################################################
+
+
+def lazy_import(package_globals, submodules):
+    """ Return the __getattr__ and __dir__ functions for a package so that
+    the names of its submodules are imported on first use. The submodules
+    are given as a dictionary from the name of each submodule to the list of
+    the public names that are found in it. This behaves as if "from
+    .submodule import *" had been done for each submodule. """
+
+    package_name = package_globals['__name__']
+    name_map = {}
+
+    for submodule, names in submodules.items():
+        for name in names:
+            name_map[name] = submodule
+
+    def __getattr__(name):
+
+        if name in submodules:
+            return importlib.import_module('.' + name, package_name)
+
+        if name == '__all__':
+            # This is only needed by "from package import *" which uses all
+            # of the names so each of them will be imported
+            value = sorted(name_map)
+        else:
+            submodule = name_map.get(name)
+
+            if submodule is None:
+                raise AttributeError("module " + package_name +
+                                     " has no attribute " + name)
+
+            module = importlib.import_module('.' + submodule, package_name)
+            value = getattr(module, name)
+
+        # Cache the value so this function is only called once per name
+        package_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(package_globals) | set(name_map))
+
+    return __getattr__, __dir__
+
+###############################################################################
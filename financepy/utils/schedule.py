@@ -3,9 +3,12 @@
 ##############################################################################
 
 
+import numpy as np
+
 from .error import FinError
 from .date import Date
-from .calendar import (Calendar, CalendarTypes)
+from .date_array import DateArray
+from .calendar import (Calendar, CalendarTypes, JointCalendar)
 from .calendar import (BusDayAdjustTypes, DateGenRuleTypes)
 from .frequency import (annual_frequency, FrequencyTypes)
 from .helpers import label_to_string
@@ -29,7 +32,7 @@ class Schedule:
                  # This is UNADJUSTED (set flag to adjust it)
                  termination_dt: Date,
                  freq_type: FrequencyTypes = FrequencyTypes.ANNUAL,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
                  adjust_termination_dt: bool = True,  # Default is to adjust
@@ -127,6 +130,17 @@ class Schedule:
 
     ###########################################################################
 
+    def schedule_dt_array(self):
+        """ Returns the schedule of Dates as a DateArray so that year fractions
+        and discount factors can be computed for all dates in one call. """
+
+        if self._adjusted_dts is None:
+            self._generate()
+
+        return DateArray(self._adjusted_dts)
+
+    ###########################################################################
+
     def _generate(self):
         """ Generate schedule of dates according to specified date generation
         rules and also adjust these dates for holidays according to the
@@ -136,65 +150,52 @@ class Schedule:
         frequency = annual_frequency(self._freq_type)
         num_months = int(12 / frequency)
 
-        unadjusted_schedule_dts = []
         self._adjusted_dts = []
 
-        if self._dg_type == DateGenRuleTypes.BACKWARD:
-
-            next_dt = self._termination_dt
-            flow_num = 0
+        # Upper bound on the number of periods needed to step from one end of
+        # the schedule past the other end. All candidate dates are generated
+        # in one vectorised call rather than one Date at a time.
+        num_months_span = 12 * (self._termination_dt.y() -
+                                self._effective_dt.y()) + \
+            (self._termination_dt.m() - self._effective_dt.m())
+        max_flows = num_months_span // num_months + 2
+        steps = np.arange(1, max_flows + 1) * num_months
 
-            while next_dt > self._effective_dt:
-
-                unadjusted_schedule_dts.append(next_dt)
-                tot_num_months = num_months * (1 + flow_num)
-                next_dt = self._termination_dt.add_months(-tot_num_months)
+        if self._dg_type == DateGenRuleTypes.BACKWARD:
 
-                if self._end_of_month is True:
-                    next_dt = next_dt.eom()
+            candidate_dts = DateArray(self._termination_dt).add_months(-steps)
 
-                flow_num += 1
+            if self._end_of_month is True:
+                candidate_dts = candidate_dts.eom()
 
-            # Add on the Previous Coupon Date
-            unadjusted_schedule_dts.append(next_dt)
-            flow_num += 1
+            # Keep dates after the effective date plus the previous coupon date
+            num_after = int(np.argmax(candidate_dts <= self._effective_dt))
 
             # reverse order and holiday adjust dates
             # the first date is not adjusted as this was provided
-            dt = unadjusted_schedule_dts[flow_num - 1]
-            self._adjusted_dts.append(dt)
+            self._adjusted_dts.append(candidate_dts[num_after])
 
             # We adjust all flows after the effective date and before the
             # termination date to fall on business days according to their cal
-            for i in range(1, flow_num - 1):
-                dt = calendar.adjust(unadjusted_schedule_dts[flow_num - i - 1],
-                                     self._bd_type)
-
-                self._adjusted_dts.append(dt)
+            flow_dts = calendar.adjust(candidate_dts[0:num_after][::-1],
+                                       self._bd_type)
+            self._adjusted_dts += flow_dts.to_dates()
 
             self._adjusted_dts.append(self._termination_dt)
 
         elif self._dg_type == DateGenRuleTypes.FORWARD:
 
             # This needs checking
-            next_dt = self._effective_dt
-            flow_num = 0
-
-            unadjusted_schedule_dts.append(next_dt)
-            flow_num = 1
+            candidate_dts = DateArray(self._effective_dt).add_months(steps)
+            num_before = int(np.argmax(candidate_dts >= self._termination_dt))
 
-            while next_dt < self._termination_dt:
-                unadjusted_schedule_dts.append(next_dt)
-                tot_num_months = num_months * (flow_num)
-                next_dt = self._effective_dt.add_months(tot_num_months)
-                flow_num = flow_num + 1
+            unadjusted_schedule_dts = [self._effective_dt]
+            unadjusted_schedule_dts += candidate_dts[0:num_before].to_dates()
 
             # The effective date is not adjusted as it is given
-            for i in range(1, flow_num):
-                dt = calendar.adjust(unadjusted_schedule_dts[i],
-                                     self._bd_type)
-
-                self._adjusted_dts.append(dt)
+            flow_dts = calendar.adjust(DateArray(unadjusted_schedule_dts),
+                                       self._bd_type)
+            self._adjusted_dts += flow_dts.to_dates()
 
             self._adjusted_dts.append(self._termination_dt)
 
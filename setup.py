@@ -49,6 +49,7 @@ setuptools.setup(
     package_data={'': ['*.npz'], },
     include_package_date=True,
     packages=setuptools.find_packages(),
+    entry_points={'console_scripts': ['financepy=financepy.__main__:main']},
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Programming Language :: Python :: 3',
@@ -0,0 +1,65 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+# Measures how long a new Python process takes to import parts of the
+# library. Each statement is run in a fresh interpreter so nothing is already
+# imported and the best time of several runs is reported. The Numba cache
+# should be warm, for example by running the script once beforehand, so that
+# compile time is not counted. Run it on two commits to compare them:
+#
+#   python tests/benchmark_import_time.py [num_runs]
+
+import os
+import sys
+import subprocess
+
+statements = [
+    "import financepy",
+    "from financepy.utils.date import Date",
+    "from financepy.utils.date import Date\n"
+    "from financepy.market.curves.discount_curve_flat import "
+    "DiscountCurveFlat",
+    "from financepy.products.rates import IborSwap",
+    "from financepy.products.equity import EquityVanillaOption"]
+
+###############################################################################
+
+
+def import_time(statement, num_runs):
+    """ Return the best time in seconds to run the statement in a new
+    process over a number of runs. """
+
+    code = ("import time\n"
+            "start = time.perf_counter()\n" +
+            statement + "\n"
+            "print(time.perf_counter() - start)\n")
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root_dir + os.pathsep + env.get("PYTHONPATH", "")
+
+    best = None
+    for _ in range(0, num_runs):
+        output = subprocess.run([sys.executable, "-c", code], env=env,
+                                capture_output=True, text=True, check=True)
+        t = float(output.stdout.strip().splitlines()[-1])
+        if best is None or t < best:
+            best = t
+
+    return best
+
+###############################################################################
+
+
+if __name__ == "__main__":
+
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for statement in statements:
+        # Compile anything that is not yet in the Numba cache
+        import_time(statement, 1)
+
+    for statement in statements:
+        t = import_time(statement, num_runs)
+        print("%8.3fs  %s" % (t, statement.replace("\n", "; ")))
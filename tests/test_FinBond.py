@@ -4,15 +4,19 @@
 
 import pandas as pd
 import numpy as np
+import pytest
 
 from financepy.utils.math import ONE_MILLION
 from financepy.utils.date import Date
 from financepy.utils.day_count import DayCountTypes
 from financepy.utils.frequency import FrequencyTypes
 from financepy.products.bonds.bond import YTMCalcType, Bond
+from financepy.products.bonds.bond import yields_to_maturity
 from financepy.products.bonds.bond_zero import BondZero
 from financepy.products.bonds.bond_market import BondMarkets
 from financepy.products.bonds.bond_market import get_bond_market_conventions
+from financepy.market.curves.discount_curve import DiscountCurve
+from financepy.market.curves.interpolator import InterpTypes
 
 import os
 import sys
@@ -363,4 +367,81 @@ def test_key_rate_durations_bloomberg_example():
     for i in range(len(key_rate_durations)):
         assert round(key_rate_durations[i], 3) == bbg_key_rate_durations[i]
 
+    # The shift is deprecated and has no effect on the durations
+    with pytest.warns(DeprecationWarning):
+        _, shifted_durations = \
+            bond.key_rate_durations(settle_dt,
+                                    ytm,
+                                    key_rate_tenors=my_tenors,
+                                    shift=0.0001,
+                                    rates=my_rates)
+
+    assert np.max(np.abs(shifted_durations - key_rate_durations)) < 1e-15
+
+###############################################################################
+
+
+def test_bucketed_delta():
+
+    settle_dt = Date(15, 5, 2023)
+    bond = Bond(Date(15, 11, 2020), Date(15, 11, 2032), 0.04,
+                FrequencyTypes.SEMI_ANNUAL, DayCountTypes.ACT_ACT_ICMA)
+
+    times = np.linspace(0.5, 15.0, 30)
+    pillar_dts = settle_dt.add_years(times)
+    dfs = np.exp(-0.035 * times)
+
+    for interp_type in [InterpTypes.FLAT_FWD_RATES,
+                        InterpTypes.LINEAR_ZERO_RATES,
+                        InterpTypes.NATCUBIC_ZERO_RATES]:
+
+        curve = DiscountCurve(settle_dt, pillar_dts, dfs, interp_type)
+        deltas = bond.bucketed_delta(settle_dt, curve)
+        px = bond.dirty_price_from_discount_curve(settle_dt, curve)
+
+        # The deltas line up with the curve times which start at zero
+        for j in range(1, len(curve._times), 4):
+            bumped_dfs = dfs.copy()
+            bumped_dfs[j - 1] *= np.exp(-0.0001 * curve._times[j])
+            bumped_curve = DiscountCurve(settle_dt, pillar_dts, bumped_dfs,
+                                         interp_type)
+            bumped_px = bond.dirty_price_from_discount_curve(settle_dt,
+                                                             bumped_curve)
+            assert abs(deltas[j] - (bumped_px - px)) < 1e-6
+
+###############################################################################
+
+
+def test_yields_to_maturity():
+
+    settle_dt = Date(21, 7, 2026)
+
+    bonds = []
+    for maturity_dt, coupon, freq_type in \
+        [(Date(15, 11, 2026), 0.0500, FrequencyTypes.SEMI_ANNUAL),
+         (Date(7, 12, 2026), 0.0400, FrequencyTypes.ANNUAL),
+         (Date(15, 5, 2027), 0.0275, FrequencyTypes.SEMI_ANNUAL),
+         (Date(15, 8, 2036), 0.0325, FrequencyTypes.SEMI_ANNUAL),
+         (Date(1, 3, 2045), 0.0010, FrequencyTypes.QUARTERLY)]:
+        bond = Bond(Date(15, 5, 2017), maturity_dt, coupon, freq_type,
+                    DayCountTypes.ACT_ACT_ICMA)
+        bonds.append(bond)
+
+    clean_prices = np.array([80.0, 95.0, 100.0, 103.0, 120.0])
+
+    for convention in [YTMCalcType.UK_DMO, YTMCalcType.US_STREET,
+                       YTMCalcType.US_TREASURY, YTMCalcType.CFETS]:
+
+        ytms = yields_to_maturity(bonds, settle_dt, clean_prices, convention)
+
+        for i, bond in enumerate(bonds):
+
+            # Each yield reprices the bond and agrees with a bond by bond solve
+            px = bond.clean_price_from_ytm(settle_dt, ytms[i], convention)
+            assert abs(px - clean_prices[i]) < 1e-8
+
+            bond_ytms = bond.yield_to_maturity(settle_dt, clean_prices,
+                                               convention)
+            assert abs(bond_ytms[i] - ytms[i]) < 1e-12
+
 ###############################################################################
@@ -0,0 +1,166 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+
+from financepy.utils.date import Date
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.utils.calendar import CalendarTypes
+from financepy.market.curves.discount_curve import DiscountCurve
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.products.bonds.bond import Bond, YTMCalcType
+from financepy.products.bonds.bond_universe import BondUniverse
+from financepy.products.bonds.zero_curve import BondZeroCurve
+
+
+settle_dt = Date(21, 7, 2026)
+
+
+def build_bonds():
+
+    bonds = []
+    for maturity_dt, coupon, freq_type, dc_type, ex_div_days in \
+        [(Date(15, 11, 2026), 0.0500, FrequencyTypes.SEMI_ANNUAL,
+          DayCountTypes.ACT_ACT_ICMA, 0),
+         (Date(7, 12, 2026), 0.0400, FrequencyTypes.ANNUAL,
+          DayCountTypes.ACT_ACT_ICMA, 0),
+         (Date(24, 7, 2027), 0.0275, FrequencyTypes.SEMI_ANNUAL,
+          DayCountTypes.ACT_ACT_ICMA, 7),
+         (Date(15, 8, 2036), 0.0325, FrequencyTypes.SEMI_ANNUAL,
+          DayCountTypes.THIRTY_360_BOND, 0),
+         (Date(1, 3, 2045), 0.0010, FrequencyTypes.QUARTERLY,
+          DayCountTypes.ACT_365F, 0),
+         (Date(15, 8, 2036), 0.0600, FrequencyTypes.ANNUAL,
+          DayCountTypes.ACT_ACT_ISDA, 0)]:
+
+        bond = Bond(Date(15, 5, 2017), maturity_dt, coupon, freq_type,
+                    dc_type, ex_div_days, CalendarTypes.UNITED_KINGDOM)
+        bonds.append(bond)
+
+    return bonds
+
+
+def build_curve():
+    dts = [settle_dt.add_years(t) for t in [1, 2, 5, 10, 20, 30]]
+    dfs = np.exp(-np.array([0.030, 0.032, 0.035, 0.038, 0.040, 0.041]) *
+                 np.array([1, 2, 5, 10, 20, 30]))
+    return DiscountCurve(settle_dt, dts, dfs, InterpTypes.FLAT_FWD_RATES)
+
+
+def test_universe_matches_bonds():
+    bonds = build_bonds()
+    universe = BondUniverse(bonds)
+    curve = build_curve()
+
+    clean_prices = np.array([100.5, 99.0, 98.0, 95.0, 70.0, 115.0])
+
+    accrued = universe.accrued_interest(settle_dt)
+    dirty_prices = universe.dirty_price_from_discount_curve(settle_dt, curve)
+    asws = universe.asset_swap_spread(settle_dt, clean_prices, curve)
+    oass = universe.option_adjusted_spread(settle_dt, clean_prices, curve)
+
+    for i, bond in enumerate(bonds):
+        assert abs(accrued[i] - bond.accrued_interest(settle_dt)) < 1e-12
+
+        px = bond.dirty_price_from_discount_curve(settle_dt, curve)
+        assert abs(dirty_prices[i] - px) < 1e-10
+
+        asw = bond.asset_swap_spread(settle_dt, clean_prices[i], curve)
+        assert abs(asws[i] - asw) < 1e-12
+
+        oas = bond.option_adjusted_spread(settle_dt, clean_prices[i], curve)
+        assert abs(oass[i] - oas) < 1e-8
+
+    for convention in [YTMCalcType.UK_DMO, YTMCalcType.US_STREET,
+                       YTMCalcType.US_TREASURY, YTMCalcType.CFETS]:
+
+        ytms = universe.yield_to_maturity(settle_dt, clean_prices,
+                                          convention)
+        durations = universe.modified_duration(settle_dt, ytms, convention)
+        convexities = universe.convexity_from_ytm(settle_dt, ytms, convention)
+
+        for i, bond in enumerate(bonds):
+            ytm = bond.yield_to_maturity(settle_dt, clean_prices[i],
+                                         convention)
+            assert abs(ytms[i] - ytm) < 1e-12
+
+            duration = bond.modified_duration(settle_dt, ytm, convention)
+            assert abs(durations[i] - duration) < 1e-8
+
+            convexity = bond.convexity_from_ytm(settle_dt, ytm, convention)
+            assert abs(convexities[i] - convexity) < 1e-8
+
+
+def test_universe_reuses_settlement_terms():
+    bonds = build_bonds()
+    universe = BondUniverse(bonds)
+    curve = build_curve()
+
+    clean_prices = universe.clean_price_from_discount_curve(settle_dt, curve)
+    oass = universe.option_adjusted_spread(settle_dt, clean_prices, curve)
+    assert np.max(np.abs(oass)) < 1e-8
+
+    ytms = universe.yield_to_maturity(settle_dt, clean_prices)
+    prices = universe.clean_price_from_ytm(settle_dt, ytms,
+                                           YTMCalcType.US_TREASURY)
+    assert np.max(np.abs(prices - clean_prices)) < 1e-8
+    assert len(universe._settle_terms) == 1
+
+    next_dt = settle_dt.add_days(1)
+    universe.accrued_interest(next_dt)
+    assert len(universe._settle_terms) == 2
+
+
+def test_universe_key_rate_durations():
+    bonds = build_bonds()
+    universe = BondUniverse(bonds)
+
+    clean_prices = np.array([100.5, 99.0, 98.0, 95.0, 70.0, 115.0])
+    ytms = universe.yield_to_maturity(settle_dt, clean_prices)
+
+    tenors = np.array([0.5, 1, 2, 5, 10, 30])
+    rates = np.array([0.030, 0.031, 0.033, 0.035, 0.038, 0.041])
+
+    _, durations = universe.key_rate_durations(settle_dt, ytms, tenors,
+                                               rates)
+    _, flat_durations = universe.key_rate_durations(settle_dt, ytms)
+
+    for i, bond in enumerate(bonds):
+        krds = bond.key_rate_durations(settle_dt, ytms[i], tenors,
+                                       rates=rates)[1]
+        assert np.max(np.abs(durations[i] - krds)) < 1e-10
+
+        krds = bond.key_rate_durations(settle_dt, ytms[i])[1]
+        assert np.max(np.abs(flat_durations[i] - krds)) < 1e-10
+
+    # Bonds with yields within the tolerance share a flat curve
+    ytm_tol = 0.0025
+    _, shared_durations = universe.key_rate_durations(settle_dt, ytms,
+                                                      ytm_tol=ytm_tol)
+
+    for i, bond in enumerate(bonds):
+        ytm = round(ytms[i] / ytm_tol) * ytm_tol
+        krds = bond.key_rate_durations(settle_dt, ytm)[1]
+        assert np.max(np.abs(shared_durations[i] - krds)) < 1e-10
+
+    # The durations agree with rebuilding the curve with a bumped key rate
+    bond = bonds[3]
+    shift = 0.0001
+    prices = []
+    for bump in [shift, -shift, 0.0]:
+        bumped_rates = rates.copy()
+        bumped_rates[4] += bump
+        par_bonds = [Bond(settle_dt, settle_dt.add_years(tenor), rate,
+                          bond._freq_type, bond._dc_type)
+                     for tenor, rate in zip(tenors, bumped_rates)]
+        par_prices = [par_bond.clean_price_from_ytm(settle_dt, rate,
+                                                    YTMCalcType.US_STREET)
+                      for par_bond, rate in zip(par_bonds, bumped_rates)]
+        curve = BondZeroCurve(settle_dt, par_bonds, par_prices,
+                              InterpTypes.LINEAR_ZERO_RATES)
+        prices.append(bond.dirty_price_from_discount_curve(settle_dt, curve))
+
+    krd = (prices[1] - prices[0]) / (2.0 * shift * prices[2])
+    assert abs(durations[3, 4] - krd) < 1e-4 * abs(krd)
@@ -3,6 +3,7 @@
 ###############################################################################
 
 import time
+from copy import deepcopy
 import numpy as np
 
 from financepy.utils.global_types import SwapTypes
@@ -400,17 +401,17 @@ def test_par_spread():
         value_dt2,
         issuer_curve2,
         cdsRecovery) * 10000.0
-    assert round(spd, 4) == 99.5858
+    assert round(spd, 4) == 99.9994
 
 
 def test_value():
     v = cds_contract1.value(value_dt1, issuer_curve1, cdsRecovery)
-    assert round(v['dirty_pv'], 4) == 168514.5956
-    assert round(v['clean_pv'], 4) == 170639.5956
+    assert round(v['dirty_pv'], 4) == 168514.5901
+    assert round(v['clean_pv'], 4) == 170639.5901
 
     v = cds_contract2.value(value_dt2, issuer_curve2, cdsRecovery)
-    assert round(v['dirty_pv'], 4) == -199842.7922
-    assert round(v['clean_pv'], 4) == -191509.4589
+    assert round(v['dirty_pv'], 4) == -195349.0252
+    assert round(v['clean_pv'], 4) == -187015.6919
 
 
 def test_clean_price():
@@ -418,7 +419,7 @@ def test_clean_price():
     assert round(p, 4) == 82.936
 
     p = cds_contract2.clean_price(value_dt2, issuer_curve2, cdsRecovery)
-    assert round(p, 4) == 119.1509
+    assert round(p, 4) == 118.7016
 
 
 def test_accrued_days():
@@ -440,21 +441,21 @@ def test_accrued_interest():
 def test_protection_leg_pv():
     prot_pv = cds_contract1.protection_leg_pv(
         value_dt1, issuer_curve1, cdsRecovery)
-    assert round(prot_pv, 4) == 273023.5221
+    assert round(prot_pv, 4) == 273023.5123
 
     prot_pv = cds_contract2.protection_leg_pv(
         value_dt2, issuer_curve2, cdsRecovery)
-    assert round(prot_pv, 4) == 47629.7343
+    assert round(prot_pv, 4) == 46753.5516
 
 
 def test_premium_leg_pv():
     premPV = cds_contract1.premium_leg_pv(
         value_dt1, issuer_curve1, cdsRecovery)
-    assert round(premPV, 4) == 104508.9265
+    assert round(premPV, 4) == 104508.9223
 
     premPV = cds_contract2.premium_leg_pv(
         value_dt2, issuer_curve2, cdsRecovery)
-    assert round(premPV, 4) == 247472.5265
+    assert round(premPV, 4) == 242102.5768
 
 
 def test_value_approx():
@@ -477,3 +478,45 @@ def test_value_approx():
     assert round(v_approx[1], 4) == -187520.0342
     assert round(v_approx[2], 4) == 534.9973
     assert round(v_approx[3], 4) == 44.6327
+
+
+def test_bucketed_delta():
+    deltas = cds_contract1.bucketed_delta(value_dt1, issuer_curve1,
+                                          cdsRecovery)
+    v0 = cds_contract1.value(value_dt1, issuer_curve1,
+                             cdsRecovery)['dirty_pv']
+    h = 1e-6
+
+    ibor_curve = issuer_curve1._libor_curve
+    for j in range(0, len(ibor_curve._dfs), 3):
+        curve = deepcopy(issuer_curve1)
+        curve._libor_curve._dfs[j] *= np.exp(-h * ibor_curve._times[j])
+        v = cds_contract1.value(value_dt1, curve, cdsRecovery)['dirty_pv']
+        fd = (v - v0) * 1e-4 / h
+        assert abs(deltas['ibor_delta'][j] - fd) < 1e-3
+
+    for j in range(0, len(issuer_curve1._values)):
+        curve = deepcopy(issuer_curve1)
+        curve._values[j] *= np.exp(-h * issuer_curve1._times[j])
+        v = cds_contract1.value(value_dt1, curve, cdsRecovery)['dirty_pv']
+        fd = (v - v0) * 1e-4 / h
+        assert abs(deltas['credit_delta'][j] - fd) < 1e-2
+
+
+def test_protection_leg_flat_curves():
+    # With flat rates and hazard rates the protection leg has a closed form
+    r = 0.03
+    h = 0.02
+    curve = deepcopy(issuer_curve1)
+    ibor_curve = curve._libor_curve
+    ibor_curve._dfs = np.exp(-r * ibor_curve._times)
+    curve._values = np.exp(-h * curve._times)
+
+    prot_pv = cds_contract1.protection_leg_pv(value_dt1, curve, cdsRecovery)
+
+    teff = (cds_contract1._step_in_dt - value_dt1) / gDaysInYear
+    t_mat = (cds_contract1._maturity_dt - value_dt1) / gDaysInYear
+    v = (1.0 - cdsRecovery) * h / (h + r) * \
+        (np.exp(-(h + r) * teff) - np.exp(-(h + r) * t_mat))
+
+    assert abs(prot_pv - v * cds_contract1._notional) < 1e-6
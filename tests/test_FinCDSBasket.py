@@ -36,13 +36,13 @@ def test_inhomogeneous_curve():
                                              step_in_date,
                                              basketMaturity,
                                              issuer_curves) * 10000.0
-    assert round(intrinsicSpd, 4) == 32.0971
+    assert round(intrinsicSpd, 4) == 32.097
 
     totalSpd = cdsIndex.total_spread(value_dt,
                                      step_in_date,
                                      basketMaturity,
                                      issuer_curves) * 10000.0
-    assert round(totalSpd, 4) == 161.3169
+    assert round(totalSpd, 4) == 161.3167
 
     minSpd = cdsIndex.min_spread(value_dt,
                                  step_in_date,
@@ -54,7 +54,7 @@ def test_inhomogeneous_curve():
                                  step_in_date,
                                  basketMaturity,
                                  issuer_curves) * 10000.0
-    assert round(maxSpd, 4) == 81.1466
+    assert round(maxSpd, 4) == 81.1465
 
 
 def test_gaussian_copula():
@@ -81,7 +81,7 @@ def test_gaussian_copula():
                                        libor_curve)
 
     assert round(v1[2] * 10000, 4) == 151.7163
-    assert round(v2[3] * 10000, 4) == 160.0121
+    assert round(v2[3] * 10000, 4) == 159.0087
 
     ntd = 2
     beta = 0.5
@@ -104,7 +104,7 @@ def test_gaussian_copula():
                                        libor_curve)
 
     assert round(v1[2] * 10000, 4) == 15.6402
-    assert round(v2[3] * 10000, 4) == 16.6395
+    assert round(v2[3] * 10000, 4) == 16.4514
 
 
 def test_student_t():
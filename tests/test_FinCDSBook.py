@@ -0,0 +1,105 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+from copy import deepcopy
+import numpy as np
+
+from financepy.utils.date import Date
+from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
+from financepy.products.credit.cds import CDS
+from financepy.products.credit.cds_curve import CDSCurve
+from financepy.products.credit.cds_book import CDSBook
+
+
+value_dt = Date(20, 6, 2022)
+libor_curve = DiscountCurveFlat(value_dt, 0.03)
+
+
+def build_issuer_curve(spreads, tenors):
+    cds_contracts = [CDS(value_dt, value_dt.add_years(tenor), spread)
+                     for tenor, spread in zip(tenors, spreads)]
+    return CDSCurve(value_dt, cds_contracts, libor_curve, 0.40)
+
+
+def build_book():
+    issuer_curves = {
+        "ABC": build_issuer_curve([0.0050, 0.0060, 0.0075, 0.0090],
+                                  [1, 3, 5, 10]),
+        "DEF": build_issuer_curve([0.0200, 0.0180, 0.0170], [1, 5, 7]),
+        "GHI": build_issuer_curve([0.0010, 0.0015, 0.0020, 0.0030],
+                                  [1, 3, 5, 10])}
+
+    trades = [("ABC", 5, 0.0100, 1e6, True),
+              ("DEF", 3, 0.0500, 2e6, False),
+              ("ABC", 7, 0.0100, 5e5, False),
+              ("GHI", 10, 0.0100, 1e7, True),
+              ("DEF", 6, 0.0100, 3e6, True),
+              ("ABC", 2, 0.0500, 1e6, True)]
+
+    cds_contracts = [CDS(Date(21, 6, 2022), value_dt.add_years(tenor), cpn,
+                         notional, long_protection)
+                     for _, tenor, cpn, notional, long_protection in trades]
+
+    issuers = [issuer for issuer, _, _, _, _ in trades]
+    return CDSBook(cds_contracts, issuers), cds_contracts, issuers, \
+        issuer_curves
+
+
+def test_book_matches_cds():
+    book, cds_contracts, issuers, issuer_curves = build_book()
+
+    values = book.value(value_dt, issuer_curves, 0.35)
+
+    for i, (cds, issuer) in enumerate(zip(cds_contracts, issuers)):
+        curve = issuer_curves[issuer]
+
+        v = cds.value(value_dt, curve, 0.35)
+        assert abs(values['dirty_pv'][i] - v['dirty_pv']) < 1e-6
+        assert abs(values['clean_pv'][i] - v['clean_pv']) < 1e-6
+
+        rpv01 = cds.risky_pv01(value_dt, curve)
+        assert abs(values['dirty_rpv01'][i] - rpv01['dirty_rpv01']) < 1e-12
+        assert abs(values['clean_rpv01'][i] - rpv01['clean_rpv01']) < 1e-12
+
+        prot_pv = cds.protection_leg_pv(value_dt, curve, 0.35)
+        assert abs(values['protection_pv'][i] - prot_pv) < 1e-6
+
+        spd = cds.par_spread(value_dt, curve, 0.35)
+        assert abs(values['par_spread'][i] - spd) < 1e-12
+
+    credit_dv01s = book.credit_dv01(value_dt, issuer_curves, 0.35)
+
+    for i, (cds, issuer) in enumerate(zip(cds_contracts, issuers)):
+        dv01 = cds.credit_dv01(value_dt, issuer_curves[issuer], 0.35)
+        assert abs(credit_dv01s[i] - dv01) < 1e-6
+
+
+def test_book_bucketed_credit_dv01():
+    book, cds_contracts, issuers, issuer_curves = build_book()
+
+    dv01s = book.bucketed_credit_dv01(value_dt, issuer_curves)
+    assert dv01s.shape == (6, 4)
+
+    for i, (cds, issuer) in enumerate(zip(cds_contracts, issuers)):
+        curve = issuer_curves[issuer]
+        v0 = cds.value(value_dt, curve, 0.40)['dirty_pv']
+
+        for j in range(0, dv01s.shape[1]):
+
+            if j >= len(curve._cds_contracts):
+                assert dv01s[i, j] == 0.0
+                continue
+
+            cds_contracts = deepcopy(curve._cds_contracts)
+            cds_contracts[j]._running_cpn += 0.0001
+            bumped_curve = CDSCurve(value_dt, cds_contracts, libor_curve,
+                                    0.40)
+
+            v1 = cds.value(value_dt, bumped_curve, 0.40)['dirty_pv']
+            assert abs(dv01s[i, j] - (v1 - v0)) < 1e-6
+
+    # The buckets add up to roughly the parallel credit DV01
+    credit_dv01s = book.credit_dv01(value_dt, issuer_curves)
+    assert np.max(np.abs(dv01s.sum(axis=1) - credit_dv01s)) < \
+        0.01 * np.max(np.abs(credit_dv01s))
@@ -2,6 +2,8 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ###############################################################################
 
+import numpy as np
+
 from financepy.utils.global_types import SwapTypes
 from financepy.utils.date import Date
 from financepy.utils.day_count import DayCountTypes
@@ -10,6 +12,10 @@ from financepy.products.rates.ibor_single_curve import IborSingleCurve
 from financepy.products.credit.cds_curve import CDSCurve
 from financepy.products.rates.ibor_swap import IborSwap
 from financepy.products.credit.cds import CDS
+from financepy.products.credit.cds import _flat_fwd_interpolate
+from financepy.products.credit.cds import _add_flat_fwd_gradient
+from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
+from financepy.market.curves.interpolator import _uinterpolate
 
 
 def test_FinCDSCurve():
@@ -63,19 +69,91 @@ def test_FinCDSCurve():
     maturity_dt = curve_dt.add_months(12 * i)
     cds = CDS(curve_dt, maturity_dt, 0.005 + 0.001 * (i - 1))
     v = cds.value(curve_dt, issuer_curve, recovery_rate)
-    assert round(v['dirty_pv'] * 1000, 4) == -0.0086
-    assert round(v['clean_pv'] * 1000, 4) == -0.0086
+    assert abs(v['dirty_pv']) < 1e-6
+    assert abs(v['clean_pv']) < 1e-6
 
     i = 5
     maturity_dt = curve_dt.add_months(12 * i)
     cds = CDS(curve_dt, maturity_dt, 0.005 + 0.001 * (i - 1))
     v = cds.value(curve_dt, issuer_curve, recovery_rate)
-    assert round(v['dirty_pv'] * 1000, 4) == -0.1640
-    assert round(v['clean_pv'] * 1000, 4) == -0.1640
+    assert abs(v['dirty_pv']) < 1e-6
+    assert abs(v['clean_pv']) < 1e-6
 
     i = 10
     maturity_dt = curve_dt.add_months(12 * i)
     cds = CDS(curve_dt, maturity_dt, 0.005 + 0.001 * (i - 1))
     v = cds.value(curve_dt, issuer_curve, recovery_rate)
-    assert round(v['dirty_pv'] * 1000, 4) == -1.1491
-    assert round(v['clean_pv'] * 1000, 4) == -1.1491
+    assert abs(v['dirty_pv']) < 1e-6
+    assert abs(v['clean_pv']) < 1e-6
+
+
+def test_FinCDSCurveVectorised():
+
+    curve_dt = Date(20, 12, 2018)
+    libor_curve = DiscountCurveFlat(curve_dt, 0.03)
+
+    cds_contracts = [CDS(curve_dt, curve_dt.add_years(tenor), spread)
+                     for tenor, spread in [(1, 0.010), (3, 0.012),
+                                           (5, 0.015), (10, 0.020)]]
+
+    issuer_curve = CDSCurve(curve_dt, cds_contracts, libor_curve, 0.40)
+    method = issuer_curve._interp_method.value
+
+    # Unsorted times including the pillars and times after the last one
+    times = np.concatenate((np.linspace(12.0, 0.0, 97),
+                            issuer_curve._times))
+
+    qs = issuer_curve.survival_prob(times)
+    for t, q in zip(times, qs):
+        q_scalar = _uinterpolate(t, issuer_curve._times,
+                                 issuer_curve._values, method)
+        assert abs(q - q_scalar) < 1e-14
+        assert abs(issuer_curve.survival_prob(float(t)) - q_scalar) < 1e-14
+
+    dts = [curve_dt.add_months(m) for m in [1, 17, 60, 100]]
+    qs = issuer_curve.survival_prob(dts)
+    for dt, q in zip(dts, qs):
+        assert abs(q - issuer_curve.survival_prob(dt)) < 1e-14
+
+    times = np.array([0.25, 1.0, 3.5, 10.0, 12.0])
+    hs = issuer_curve.hazard_rate(times)
+    qs = issuer_curve.survival_prob(times)
+    assert np.max(np.abs(np.exp(-hs * times) - qs)) < 1e-12
+
+    # The forward hazard rates agree with a numerical derivative away from
+    # the pillars
+    times = np.array([0.5, 2.0, 4.0, 7.5, 11.0])
+    eps = 1e-6
+    log_q1 = np.log(issuer_curve.survival_prob(times - eps))
+    log_q2 = np.log(issuer_curve.survival_prob(times + eps))
+    fwd_hs = issuer_curve.fwd_hazard_rate(times)
+    assert np.max(np.abs(fwd_hs + (log_q2 - log_q1) / (2.0 * eps))) < 1e-8
+    assert abs(issuer_curve.fwd_hazard_rate(2.0) - fwd_hs[1]) < 1e-14
+
+    fwds = issuer_curve.fwd(times)
+    assert np.max(np.abs(fwds - 0.03 - fwd_hs)) < 1e-6
+
+    # Survival probabilities set directly on the curve are picked up
+    issuer_curve._values[2] *= 0.99
+    q = _uinterpolate(4.0, issuer_curve._times, issuer_curve._values, method)
+    assert abs(issuer_curve.survival_prob(np.array([4.0]))[0] - q) < 1e-14
+
+
+def test_FinCDSCurveExtrapolation():
+    # Times before the first pillar use the first segment of the curve
+    times = np.array([0.5, 1.0, 3.0])
+    values = np.array([0.99, 0.97, 0.90])
+    h = np.log(values[0] / values[1]) / 0.5
+
+    for t in [-0.25, 0.0, 0.25]:
+        q = _flat_fwd_interpolate(t, times, values)
+        assert abs(q - values[0] * np.exp(-h * (t - 0.5))) < 1e-14
+
+        grad = np.zeros(3)
+        _add_flat_fwd_gradient(t, 1.0, times, values, grad)
+
+        for j in range(0, 3):
+            bumped_values = values.copy()
+            bumped_values[j] += 1e-7
+            dq = _flat_fwd_interpolate(t, times, bumped_values) - q
+            assert abs(grad[j] - dq / 1e-7) < 1e-6
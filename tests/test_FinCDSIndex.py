@@ -40,8 +40,8 @@ def test_cds_index():
     assert round(spd, 4) == 48.3748
 
     v = cdsIndexContract.value(value_dt, issuer_curve, cdsRecovery)
-    assert round(v['dirty_pv'], 4) == 27064.9906
-    assert round(v['clean_pv'], 4) == 32620.5461
+    assert round(v['dirty_pv'], 4) == 27065.1008
+    assert round(v['clean_pv'], 4) == 32620.6564
 
     p = cdsIndexContract.clean_price(value_dt, issuer_curve, cdsRecovery)
     assert round(p, 4) == 99.6738
@@ -54,8 +54,8 @@ def test_cds_index():
 
     prot_pv = cdsIndexContract.protection_leg_pv(
         value_dt, issuer_curve, cdsRecovery)
-    assert round(prot_pv, 4) == 188423.9948
+    assert round(prot_pv, 4) == 188424.1039
 
     premPV = cdsIndexContract.premium_leg_pv(
         value_dt, issuer_curve, cdsRecovery)
-    assert round(premPV, 4) == 161359.0042
+    assert round(premPV, 4) == 161359.0031
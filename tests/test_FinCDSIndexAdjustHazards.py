@@ -109,3 +109,37 @@ def test_performCDSIndexHazardRateAdjustment():
     assert round(intrinsicSpd5Y, 4) == 35.5394
     assert round(intrinsicSpd7Y, 4) == 49.0121
     assert round(intrinsicSpd10Y, 4) == 61.4140
+
+    # Adjust the issuer curves so that the index reprices at each maturity
+    index_cpns = [0.0025, 0.0040, 0.0055, 0.0065]
+    index_upfronts = [0.0, 0.001, -0.001, 0.002]
+    index_maturity_dts = [Date(20, 12, 2009),
+                          Date(20, 12, 2011),
+                          Date(20, 12, 2013),
+                          Date(20, 12, 2016)]
+    index_recovery = 0.40
+
+    adjusted_issuer_curves = cdsIndex.hazard_rate_adjust_intrinsic(
+        value_dt,
+        issuer_curves,
+        index_cpns,
+        index_upfronts,
+        index_maturity_dts,
+        index_recovery,
+        1e-8)
+
+    assert len(adjusted_issuer_curves) == len(issuer_curves)
+
+    for i in range(0, len(index_maturity_dts)):
+        rpv01 = cdsIndex.intrinsic_rpv01(value_dt,
+                                         value_dt,
+                                         index_maturity_dts[i],
+                                         adjusted_issuer_curves)
+
+        prot_pv = cdsIndex.intrinsic_protection_leg_pv(value_dt,
+                                                       value_dt,
+                                                       index_maturity_dts[i],
+                                                       adjusted_issuer_curves)
+
+        upfront = prot_pv - rpv01 * index_cpns[i]
+        assert abs(upfront - index_upfronts[i]) < 1e-8
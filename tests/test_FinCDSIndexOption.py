@@ -79,7 +79,7 @@ def test_dirty_priceCDSIndexOption():
     index_strike_results = [
         (20.0, 20.0, [16.0, 6.2, -70.8, 22.9, -60.8, 16.1, 6.1]),
         (25.0, 30.0, [11.8, 16.9, -35.3, 28.6, -40.5, 11.8, 16.8]),
-        (50.0, 40.0, [63.3, 4.7, 0.0, 57.3, 60.2, 63.2, 4.7]),
+        (50.0, 40.0, [63.3, 4.7, 0.0, 57.3, 60.1, 63.2, 4.7]),
     ]
 
     for index, strike, results in index_strike_results:
@@ -21,7 +21,7 @@ def test_cds_option():
     volatility = 0.3
 
     strike_result = [
-        (100, 4.0007),
+        (100, 4.0006),
         (150, 1.5874),
         (200, 0.0955),
         (300, 0.0)
@@ -74,7 +74,7 @@ def test_homogeneous():
         corr2,
         num_points,
         method)
-    assert round(v[3] * 10000, 4) == 582.3189
+    assert round(v[3] * 10000, 4) == 582.318
 
     method = FinLossDistributionBuilder.ADJUSTED_BINOMIAL
     v = tranche3.value_bc(
@@ -86,7 +86,7 @@ def test_homogeneous():
         corr2,
         num_points,
         method)
-    assert round(v[3] * 10000, 4) == 29.9804
+    assert round(v[3] * 10000, 4) == 29.9802
 
     method = FinLossDistributionBuilder.GAUSSIAN
     v = tranche5.value_bc(
@@ -110,7 +110,7 @@ def test_homogeneous():
         corr2,
         num_points,
         method)
-    assert round(v[3] * 10000, 4) == 39.9617
+    assert round(v[3] * 10000, 4) == 39.9615
 
 
 def test_heterogeneous():
@@ -136,7 +136,7 @@ def test_heterogeneous():
         corr2,
         num_points,
         method)
-    assert round(v[3] * 10000, 4) == 868.1327
+    assert round(v[3] * 10000, 4) == 868.1315
 
     method = FinLossDistributionBuilder.ADJUSTED_BINOMIAL
     v = tranche2.value_bc(
@@ -148,7 +148,7 @@ def test_heterogeneous():
         corr2,
         num_points,
         method)
-    assert round(v[3] * 10000, 4) == 173.4304
+    assert round(v[3] * 10000, 4) == 173.4298
 
     method = FinLossDistributionBuilder.GAUSSIAN
     v = tranche4.value_bc(
@@ -5,6 +5,12 @@
 from financepy.utils.calendar import Calendar, CalendarTypes
 from financepy.utils.date import set_date_format, DateFormatTypes
 from financepy.utils.date import Date
+from financepy.utils.date_array import DateArray
+from financepy.utils.calendar import BusDayAdjustTypes
+from financepy.utils.calendar import JointCalendar, JointCalendarRuleTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.utils.schedule import Schedule
+import numpy as np
 import sys
 
 # Between 3rd of January 2020 and 3rd of January 2030
@@ -36,3 +42,63 @@ def test_add_business_day():
 
         assert cal.add_business_days(start, num_days) == end, \
             f"Landed on incorrect business day using {cal_type}"
+
+
+def test_business_day_count():
+    for cal_type in CalendarTypes:
+        num_days = bus_days_in_decade[str(cal_type)]
+        cal = Calendar(cal_type)
+        start = Date(3, 1, 2020)
+        end = Date(3, 1, 2030)
+
+        assert cal.num_business_days(start, end) == num_days
+        assert cal.num_business_days(end, start) == -num_days
+
+
+def test_vectorised_adjust():
+    start = Date(1, 1, 2020)
+    dts = DateArray(start).add_days(np.arange(0, 400, 3))
+
+    for cal_type in CalendarTypes:
+        cal = Calendar(cal_type)
+
+        for bd_type in BusDayAdjustTypes:
+            adjusted = cal.adjust(dts, bd_type)
+            assert adjusted.to_dates() == [cal.adjust(dt, bd_type)
+                                           for dt in dts]
+
+        for num_days in [-5, 1, 20]:
+            new_dts = cal.add_business_days(dts, num_days)
+            assert new_dts.to_dates() == [cal.add_business_days(dt, num_days)
+                                          for dt in dts]
+
+        assert list(cal.is_business_day(dts)) == [cal.is_business_day(dt)
+                                                  for dt in dts]
+
+
+def test_joint_calendar():
+    cal_types = [CalendarTypes.TARGET,
+                 CalendarTypes.UNITED_KINGDOM,
+                 CalendarTypes.UNITED_STATES]
+
+    dts = DateArray(Date(1, 1, 2020)).add_days(np.arange(0, 3650))
+    holidays = [Calendar(cal_type).is_holiday(dts) for cal_type in cal_types]
+
+    union_cal = JointCalendar(cal_types)
+    assert list(union_cal.is_holiday(dts)) == \
+        list(holidays[0] | holidays[1] | holidays[2])
+
+    intersect_cal = JointCalendar(cal_types,
+                                  JointCalendarRuleTypes.JOIN_BUSINESS_DAYS)
+    assert list(intersect_cal.is_holiday(dts)) == \
+        list(holidays[0] & holidays[1] & holidays[2])
+
+    # Christmas and Boxing Day 2021 are on a weekend and then the UK has
+    # substitute holidays on the Monday and Tuesday
+    dt = union_cal.adjust(Date(25, 12, 2021), BusDayAdjustTypes.FOLLOWING)
+    assert dt == Date(29, 12, 2021)
+
+    # A joint calendar can be used wherever a calendar type is accepted
+    schedule = Schedule(Date(1, 1, 2020), Date(1, 1, 2025),
+                        FrequencyTypes.QUARTERLY, union_cal)
+    assert schedule._adjusted_dts[-1] == Date(2, 1, 2025)
@@ -0,0 +1,205 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+from copy import copy, deepcopy
+
+import numpy as np
+
+from financepy.utils.global_types import SwapTypes
+from financepy.utils.date import Date
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.market.curves.curve_cache import CurveCache
+from financepy.market.curves.curve_cache import built_curve_key
+from financepy.market.curves.curve_cache import get_curve_cache
+from financepy.market.curves.curve_cache import set_curve_cache
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.products.rates.ibor_deposit import IborDeposit
+from financepy.products.rates.ibor_swap import IborSwap
+from financepy.products.rates.ibor_single_curve import IborSingleCurve
+from financepy.products.credit.cds import CDS
+from financepy.products.credit.cds_curve import CDSCurve
+
+
+value_dt = Date(9, 8, 2019)
+settle_dt = value_dt.add_weekdays(2)
+
+
+def build_instruments(swap_bump=0.0):
+
+    dc_type = DayCountTypes.ACT_360
+    depos = [IborDeposit(value_dt, settle_dt, 0.0220, dc_type),
+             IborDeposit(settle_dt, "3M", 0.0218, dc_type),
+             IborDeposit(settle_dt, "6M", 0.0205, dc_type)]
+
+    swaps = []
+    for years, rate in [(2, 0.0159), (5, 0.0152), (10, 0.0165)]:
+        swap = IborSwap(settle_dt, str(years) + "Y", SwapTypes.PAY,
+                        rate + swap_bump, FrequencyTypes.SEMI_ANNUAL,
+                        DayCountTypes.THIRTY_E_360_ISDA)
+        swaps.append(swap)
+
+    return depos, [], swaps
+
+
+def build_cds_curve(libor_curve, spread_bump=0.0):
+
+    cds_contracts = []
+    for years, spread in [(1, 0.0100), (3, 0.0150), (5, 0.0200)]:
+        cds = CDS(value_dt, value_dt.add_years(years), spread + spread_bump)
+        cds_contracts.append(cds)
+
+    return CDSCurve(value_dt, cds_contracts, libor_curve, 0.40)
+
+
+def test_curve_cache_hits():
+    cache = CurveCache()
+    depos, fras, swaps = build_instruments()
+
+    curve1 = cache.curve(IborSingleCurve, value_dt, depos, fras, swaps,
+                         InterpTypes.FLAT_FWD_RATES)
+
+    # New instrument objects with the same quotes give the cached curve
+    depos, fras, swaps = build_instruments()
+    curve2 = cache.curve(IborSingleCurve, value_dt, depos, fras, swaps,
+                         InterpTypes.FLAT_FWD_RATES)
+    assert curve2 is curve1
+
+    # A different quote or interpolation gives a new curve
+    depos, fras, swaps = build_instruments(0.0001)
+    curve3 = cache.curve(IborSingleCurve, value_dt, depos, fras, swaps,
+                         InterpTypes.FLAT_FWD_RATES)
+    assert curve3 is not curve1
+    dt = value_dt.add_years(10)
+    assert curve3.df(dt) < curve1.df(dt)
+
+    depos, fras, swaps = build_instruments()
+    curve4 = cache.curve(IborSingleCurve, value_dt, depos, fras, swaps,
+                         InterpTypes.LINEAR_ZERO_RATES)
+    assert curve4 is not curve1
+
+    assert len(cache) == 3
+    assert cache._hits == 1
+    assert cache._misses == 3
+
+    # Building a copy of a curve with the same inputs gives the cached curve
+    curve5 = cache.build(copy(curve1))
+    assert curve5 is not curve1
+    assert cache.build(copy(curve1)) is curve5
+    assert curve5.df(dt) == curve1.df(dt)
+    assert built_curve_key(curve1) == built_curve_key(deepcopy(curve1))
+    assert built_curve_key(curve1) != built_curve_key(curve3)
+
+
+def test_curve_cache_eviction_and_invalidation():
+    cache = CurveCache(2)
+    depos, fras, swaps = build_instruments()
+    libor_curve = cache.curve(IborSingleCurve, value_dt, depos, fras, swaps)
+
+    cds_curve1 = cache.build(build_cds_curve(libor_curve))
+    cds_curve2 = cache.build(build_cds_curve(libor_curve, 0.0001))
+    assert len(cache) == 2
+
+    # The Ibor curve was used least recently and so has been removed
+    assert cache.curve(IborSingleCurve, value_dt, depos, fras,
+                       swaps) is not libor_curve
+    assert cache.build(build_cds_curve(libor_curve, 0.0001)) is cds_curve2
+    assert cache.build(build_cds_curve(libor_curve)) is not cds_curve1
+
+    cache.invalidate(value_dt.add_days(1))
+    assert len(cache) == 2
+    cache.invalidate(value_dt)
+    assert len(cache) == 0
+
+    cache.build(build_cds_curve(libor_curve))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache._hits == 0
+
+    # A cache of size zero builds every curve
+    cache = CurveCache(0)
+    curve = cache.build(build_cds_curve(libor_curve))
+    assert len(curve._times) == 4
+    assert len(cache) == 0
+
+
+def test_cds_risk_reuses_curves():
+    depos, fras, swaps = build_instruments()
+    libor_curve = IborSingleCurve(value_dt, depos, fras, swaps)
+    issuer_curve = build_cds_curve(libor_curve)
+    cds = CDS(value_dt, Date(20, 6, 2024), 0.0150)
+
+    old_cache = get_curve_cache()
+
+    try:
+        set_curve_cache(CurveCache(0))
+        credit_dv01 = cds.credit_dv01(value_dt, issuer_curve, 0.40)
+        interest_dv01 = cds.interest_dv01(value_dt, issuer_curve, 0.40)
+
+        cache = CurveCache()
+        set_curve_cache(cache)
+        assert cds.credit_dv01(value_dt, issuer_curve, 0.40) == credit_dv01
+        assert cds.interest_dv01(value_dt, issuer_curve, 0.40) == \
+            interest_dv01
+        assert cache._hits == 0
+
+        # The second valuation reuses the bumped curves
+        assert cds.credit_dv01(value_dt, issuer_curve, 0.40) == credit_dv01
+        assert cds.interest_dv01(value_dt, issuer_curve, 0.40) == \
+            interest_dv01
+        assert cache._hits == 3
+        assert np.isfinite(credit_dv01) and credit_dv01 > 0.0
+    finally:
+        set_curve_cache(old_cache)
+
+
+def test_curve_key_ignores_valuation_state():
+    depos, fras, swaps = build_instruments()
+    libor_curve = IborSingleCurve(value_dt, depos, fras, swaps)
+    issuer_curve = build_cds_curve(libor_curve)
+    cds = CDS(value_dt, Date(20, 6, 2024), 0.0150)
+
+    # The library does not cache curves unless a cache is set
+    assert get_curve_cache()._max_size == 0
+
+    key = built_curve_key(issuer_curve)
+    old_cache = get_curve_cache()
+
+    try:
+        cache = CurveCache()
+        set_curve_cache(cache)
+        interest_dv01 = cds.interest_dv01(value_dt, issuer_curve, 0.40)
+
+        # Valuing the swaps of the curve stores values on their legs
+        for swap in swaps:
+            swap.value(value_dt, libor_curve)
+
+        assert built_curve_key(issuer_curve) == key
+
+        # Nor do the segments cached by the curve queries
+        issuer_curve.survival_prob(np.array([0.5, 1.5, 4.0]))
+        assert issuer_curve._segments is not None
+        assert built_curve_key(issuer_curve) == key
+        assert cds.interest_dv01(value_dt, issuer_curve, 0.40) == \
+            interest_dv01
+        assert cache._hits == 2
+        assert len(cache) == 2
+    finally:
+        set_curve_cache(old_cache)
+
+
+def test_curve_key_ignores_cached_segments():
+    # A class without a table of market inputs is keyed by its attributes
+    class IssuerCurve(CDSCurve):
+        pass
+
+    libor_curve = IborSingleCurve(value_dt, *build_instruments())
+    issuer_curve = build_cds_curve(libor_curve)
+    curve = IssuerCurve(value_dt, issuer_curve._cds_contracts, libor_curve,
+                        0.40)
+
+    key = built_curve_key(curve)
+    curve.survival_prob(np.array([0.5, 1.5, 4.0]))
+    assert curve._segments is not None
+    assert built_curve_key(curve) == key
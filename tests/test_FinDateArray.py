@@ -0,0 +1,103 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+
+from financepy.utils.date import Date
+from financepy.utils.date_array import DateArray
+from financepy.utils.day_count import DayCount, DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.utils.schedule import Schedule
+from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
+
+
+start_dts = [Date(1, 1, 2018), Date(31, 1, 2019), Date(29, 2, 2020),
+             Date(30, 6, 2021), Date(31, 12, 2022), Date(28, 2, 1901)]
+
+
+def test_excel_representation():
+    dts = DateArray(start_dts)
+    assert list(dts.excel_dt()) == [dt.excel_dt() for dt in start_dts]
+    assert dts[2] == Date(29, 2, 2020)
+    assert DateArray.from_dmy([5, 1], [1, 3], [1900, 2020])[1] == \
+        Date(1, 3, 2020)
+    assert list(DateArray.from_dmy(5, 1, 1900).excel_dt()) == [5]
+
+
+def test_weekday_and_eom():
+    dts = DateArray(start_dts)
+    assert list(dts.weekday()) == [dt.weekday() for dt in start_dts]
+    assert dts.eom().to_dates() == [dt.eom() for dt in start_dts]
+    assert list(dts.is_eom()) == [dt.is_eom() for dt in start_dts]
+
+
+def test_add_days_and_months():
+    dts = DateArray(start_dts)
+
+    for num_days in [-10, 0, 1, 45, 365]:
+        assert dts.add_days(num_days).to_dates() == \
+            [dt.add_days(num_days) for dt in start_dts]
+
+    for num_months in [-13, -1, 0, 1, 6, 25]:
+        assert dts.add_months(num_months).to_dates() == \
+            [dt.add_months(num_months) for dt in start_dts]
+
+    vector_dts = DateArray(Date(31, 1, 2020)).add_months(np.arange(0, 4))
+    assert vector_dts.to_dates() == Date(31, 1, 2020).add_months([0, 1, 2, 3])
+
+
+def test_add_tenor():
+    dts = DateArray(start_dts)
+
+    for tenor in ["ON", "5D", "-3D", "2W", "1M", "3M", "-6M", "1Y", "4Y",
+                  "10Y"]:
+        assert dts.add_tenor(tenor).to_dates() == \
+            [dt.add_tenor(tenor) for dt in start_dts]
+
+
+def test_subtraction_and_comparison():
+    dts = DateArray(start_dts)
+    value_dt = Date(1, 1, 2020)
+
+    assert list(dts - value_dt) == [dt - value_dt for dt in start_dts]
+    assert list(value_dt - dts) == [value_dt - dt for dt in start_dts]
+    assert list(dts > value_dt) == [dt > value_dt for dt in start_dts]
+    assert list(value_dt >= dts) == [value_dt >= dt for dt in start_dts]
+    assert list(dts == dts.add_days(0)) == [True] * len(start_dts)
+
+
+def test_year_frac():
+    dt1 = DateArray(start_dts[:-1])
+    dt2 = dt1.add_tenor("7M").add_days(3)
+    dt3 = dt1.add_tenor("1Y")
+
+    for dc_type in DayCountTypes:
+        day_count = DayCount(dc_type)
+        acc, num, den = day_count.year_frac(dt1, dt2, dt3,
+                                            FrequencyTypes.SEMI_ANNUAL)
+
+        for i in range(0, len(dt1)):
+            exp = day_count.year_frac(dt1[i], dt2[i], dt3[i],
+                                      FrequencyTypes.SEMI_ANNUAL)
+            assert abs(acc[i] - exp[0]) < 1e-12
+            assert abs(num[i] - exp[1]) < 1e-12
+            assert abs(den[i] - exp[2]) < 1e-12
+
+
+def test_discount_curve_df():
+    value_dt = Date(1, 1, 2018)
+    curve = DiscountCurveFlat(value_dt, 0.05)
+    dts = DateArray(value_dt).add_months(np.arange(0, 120, 6))
+
+    dfs = curve.df(dts)
+    exp = curve.df(dts.to_dates())
+    assert np.max(np.abs(dfs - exp)) < 1e-14
+
+
+def test_schedule_dt_array():
+    schedule = Schedule(Date(15, 3, 2020), Date(15, 3, 2030),
+                        FrequencyTypes.QUARTERLY)
+
+    dts = schedule.schedule_dt_array()
+    assert dts.to_dates() == schedule.schedule_dts()
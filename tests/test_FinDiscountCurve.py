@@ -0,0 +1,101 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+from financepy.market.curves.discount_curve import DiscountCurve
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.utils.date import Date
+from financepy.utils.date_array import DateArray
+from financepy.utils.frequency import FrequencyTypes
+from financepy.utils.helpers import times_from_dates
+import numpy as np
+
+
+value_dt = Date(1, 1, 2020)
+pillar_dts = value_dt.add_years(np.linspace(0.5, 20.0, 40))
+pillar_times = np.linspace(0.5, 20.0, 40)
+pillar_dfs = np.exp(-0.03 * pillar_times - 0.0005 * pillar_times**2)
+
+query_dts = DateArray(value_dt).add_days(np.arange(1, 9000, 7))
+
+
+def test_vectorised_df_and_zero_rate():
+    for interp_type in InterpTypes:
+        curve = DiscountCurve(value_dt, pillar_dts, pillar_dfs, interp_type)
+
+        dfs = curve.df(query_dts)
+        zero_rates = curve.zero_rate(query_dts, FrequencyTypes.SEMI_ANNUAL)
+
+        for i in range(0, len(query_dts), 97):
+            dt = query_dts[i]
+            assert abs(dfs[i] - curve.df(dt)) < 1e-12
+            assert abs(zero_rates[i] -
+                       curve.zero_rate(dt, FrequencyTypes.SEMI_ANNUAL)) < 1e-12
+
+
+
+def test_df_of_dates_with_time_of_day():
+    curve = DiscountCurve(value_dt, pillar_dts, pillar_dfs,
+                          InterpTypes.FLAT_FWD_RATES)
+
+    # A list of dates keeps their time of day
+    dt = Date(1, 7, 2020, 12, 0, 0)
+    assert times_from_dates([dt], value_dt)[0] == \
+        times_from_dates(dt, value_dt)
+    assert curve.df([dt])[0] == curve.df(dt)
+    assert curve.df([dt, Date(1, 7, 2020)])[1] == curve.df(Date(1, 7, 2020))
+
+def test_vectorised_fwd_and_swap_rate():
+    curve = DiscountCurve(value_dt, pillar_dts, pillar_dfs,
+                          InterpTypes.FLAT_FWD_RATES)
+
+    fwds = curve.fwd(query_dts)
+    fwd_rates = curve.fwd_rate(query_dts, "6M")
+
+    for i in range(0, len(query_dts), 97):
+        dt = query_dts[i]
+        assert abs(fwds[i] - curve.fwd(dt)) < 1e-10
+        assert abs(fwd_rates[i] - curve.fwd_rate(dt, "6M")) < 1e-12
+
+    maturity_dts = [value_dt.add_years(n) for n in range(1, 11)]
+    swap_rates = curve.swap_rate(value_dt, maturity_dts)
+
+    for i in range(0, len(maturity_dts)):
+        swap_rate = curve.swap_rate(value_dt, maturity_dts[i])
+        assert abs(swap_rates[i] - swap_rate) < 1e-12
+
+    assert round(swap_rates[-1], 6) == 0.035289
+
+
+def test_df_jacobian_and_zero_deltas():
+    dts = query_dts[0:1000:40]
+    weights = np.linspace(1.0, 2.0, len(dts))
+    h = 1e-6
+
+    for interp_type in [InterpTypes.FLAT_FWD_RATES,
+                        InterpTypes.LINEAR_FWD_RATES,
+                        InterpTypes.FINCUBIC_ZERO_RATES,
+                        InterpTypes.NATCUBIC_LOG_DISCOUNT,
+                        InterpTypes.PCHIP_ZERO_RATES]:
+
+        curve = DiscountCurve(value_dt, pillar_dts, pillar_dfs, interp_type)
+        jac = curve.df_jacobian(dts)
+        grad = curve.df_gradient(dts, weights)
+        assert np.max(np.abs(grad - weights @ jac)) < 1e-10
+
+        for j in [3, 17, 39]:
+            dfs = pillar_dfs.copy()
+            dfs[j] = pillar_dfs[j] + h
+            up_curve = DiscountCurve(value_dt, pillar_dts, dfs, interp_type)
+            dfs[j] = pillar_dfs[j] - h
+            down_curve = DiscountCurve(value_dt, pillar_dts, dfs, interp_type)
+            fd = (up_curve.df(dts) - down_curve.df(dts)) / (2.0 * h)
+            assert np.max(np.abs(jac[:, j + 1] - fd)) < 1e-6
+
+        # The sum of the bucketed deltas is close to a parallel bump
+        deltas = curve.zero_deltas(grad)
+        bumped_dfs = pillar_dfs * np.exp(-0.0001 * curve._times[1:])
+        parallel = DiscountCurve(value_dt, pillar_dts, bumped_dfs,
+                                 interp_type)
+        pv_change = weights @ (parallel.df(dts) - curve.df(dts))
+        assert abs(np.sum(deltas) - pv_change) < 1e-3 * abs(pv_change)
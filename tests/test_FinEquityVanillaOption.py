@@ -2,6 +2,8 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ###############################################################################
 
+import numpy as np
+
 from financepy.utils.global_types import OptionTypes
 from financepy.products.equity.equity_vanilla_option import EquityVanillaOption
 from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
@@ -57,3 +59,66 @@ def test_put_option():
     v = put_option.value(valueDate, stockPrice,
                          discountCurve, dividendCurve, model)
     assert v.round(4) == 7.3478
+
+
+def test_implied_volatility():
+    v = call_option.value(valueDate, stockPrice,
+                          discountCurve, dividendCurve, model)
+    sigma = call_option.implied_volatility(valueDate, stockPrice,
+                                           discountCurve, dividendCurve, v)
+    assert abs(sigma - volatility) < 1e-10
+
+    # Arrays of strikes, option types and prices are solved in one call
+    strikes = np.array([60.0, 90.0, 100.0, 110.0, 160.0, 60.0, 160.0])
+    vols = np.array([0.45, 0.32, 0.30, 0.28, 0.35, 0.50, 0.20])
+    option_types = [OptionTypes.EUROPEAN_CALL] * 5 + \
+        [OptionTypes.EUROPEAN_PUT] * 2
+    options = EquityVanillaOption(expiryDate, strikes, option_types)
+
+    prices = [EquityVanillaOption(expiryDate, k, option_type).value(
+              valueDate, stockPrice, discountCurve, dividendCurve,
+              BlackScholes(vol))
+              for k, option_type, vol in zip(strikes, option_types, vols)]
+
+    sigmas = options.implied_volatility(valueDate, stockPrice,
+                                        discountCurve, dividendCurve,
+                                        np.array(prices))
+    assert np.max(np.abs(sigmas - vols)) < 1e-8
+
+    # A price below intrinsic value has no implied volatility
+    sigma = put_option.implied_volatility(valueDate, stockPrice,
+                                          discountCurve, dividendCurve, -1.0)
+    assert np.isnan(sigma)
+
+    # An expiry less than a day away has no implied volatility either
+    sigma = call_option.implied_volatility(expiryDate, stockPrice,
+                                           discountCurve, dividendCurve, v)
+    assert np.isnan(sigma)
+
+    sigmas = call_option.implied_volatility(expiryDate, [90.0, 100.0],
+                                            discountCurve, dividendCurve, v)
+    assert sigmas.shape == (2,) and np.all(np.isnan(sigmas))
+
+
+def test_greeks_chain():
+    # A grid of strikes by expiry dates is valued by broadcasting
+    expiry_dts = [valueDate.add_months(m) for m in [1, 3, 6, 12]]
+    strikes = np.array([80.0, 100.0, 120.0])[:, None]
+    option_types = [OptionTypes.EUROPEAN_CALL, OptionTypes.EUROPEAN_PUT,
+                    OptionTypes.EUROPEAN_CALL, OptionTypes.EUROPEAN_PUT]
+    chain = EquityVanillaOption(expiry_dts, strikes, option_types)
+
+    greeks = chain.greeks(valueDate, stockPrice, discountCurve,
+                          dividendCurve, model)
+
+    for name in ['value', 'delta', 'gamma', 'vega', 'theta', 'rho', 'vanna']:
+        assert greeks[name].shape == (3, 4)
+
+        for i, strike in enumerate(strikes[:, 0]):
+            for j, expiry_dt in enumerate(expiry_dts):
+                option = EquityVanillaOption(expiry_dt, strike,
+                                             option_types[j])
+                greek = getattr(option, name)(valueDate, stockPrice,
+                                              discountCurve, dividendCurve,
+                                              model)
+                assert abs(greeks[name][i, j] - greek) < 1e-10
@@ -347,3 +347,27 @@ def test_vega_theta():
         model)
 
     assert round(theta, 4) == -0.0504
+
+
+def test_implied_volatility():
+    value_dt = Date(1, 1, 2015)
+    expiry_dt = value_dt.add_months(4)
+    dom_discount_curve = DiscountCurveFlat(value_dt, 0.08)
+    for_discount_curve = DiscountCurveFlat(value_dt, 0.11)
+    model = BlackScholes(0.1411)
+
+    for option_type in [OptionTypes.EUROPEAN_CALL, OptionTypes.EUROPEAN_PUT]:
+
+        option = FXVanillaOption(expiry_dt, 1.6, "EURUSD", option_type,
+                                 1000000, "USD", 2)
+
+        spot_fx_rates = np.array([1.40, 1.55, 1.60, 1.65, 1.80])
+        prices = option.value(value_dt, spot_fx_rates, dom_discount_curve,
+                              for_discount_curve, model)['v']
+
+        sigmas = option.implied_volatility(value_dt, spot_fx_rates,
+                                           dom_discount_curve,
+                                           for_discount_curve, prices)
+
+        assert np.max(np.abs(sigmas - 0.1411)) < 1e-8
+
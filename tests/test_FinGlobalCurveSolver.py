@@ -0,0 +1,209 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+from financepy.utils.global_types import SwapTypes, CurveBuildTypes
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.products.rates.ibor_swap import IborSwap
+from financepy.products.rates.ibor_deposit import IborDeposit
+from financepy.products.rates.ibor_fra import IborFRA
+from financepy.products.rates.ois import OIS
+from financepy.products.rates.ois_curve import OISCurve
+from financepy.products.rates.dual_curve import IborDualCurve
+from financepy.products.rates.ibor_single_curve import IborSingleCurve
+from financepy.products.rates.global_curve_solver import GlobalCurveSolver
+from financepy.utils.frequency import FrequencyTypes
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.date import Date
+import numpy as np
+
+
+value_dt = Date(6, 6, 2018)
+settle_dt = value_dt.add_weekdays(2)
+
+
+def build_ibor_instruments(bumped=None, bump=0.0):
+
+    rates = [0.0195, 0.0200, 0.0210, 0.0220, 0.0230,
+             0.0240, 0.0260, 0.0290, 0.0310, 0.0320]
+    if bumped is not None:
+        rates[bumped] += bump
+
+    depos = [IborDeposit(value_dt, settle_dt, rates[0],
+                         DayCountTypes.ACT_360),
+             IborDeposit(settle_dt, "1M", rates[1], DayCountTypes.ACT_360),
+             IborDeposit(settle_dt, "3M", rates[2], DayCountTypes.ACT_360)]
+
+    fras = [IborFRA(settle_dt.add_months(3), "3M", rates[3],
+                    DayCountTypes.ACT_360),
+            IborFRA(settle_dt.add_months(6), "3M", rates[4],
+                    DayCountTypes.ACT_360)]
+
+    swaps = []
+    for i, years in enumerate([1, 2, 5, 10, 20]):
+        swap = IborSwap(settle_dt, str(years) + "Y", SwapTypes.RECEIVE,
+                        rates[5 + i], FrequencyTypes.ANNUAL,
+                        DayCountTypes.ACT_365F,
+                        float_freq_type=FrequencyTypes.QUARTERLY,
+                        float_dc_type=DayCountTypes.ACT_360)
+        swaps.append(swap)
+
+    return depos, fras, swaps
+
+
+def build_ois_instruments(bumped=None, bump=0.0):
+
+    rates = [0.0180, 0.0200, 0.0230, 0.0250, 0.0260]
+    if bumped is not None:
+        rates[bumped] += bump
+
+    swaps = []
+    for i, years in enumerate([1, 2, 5, 10, 20]):
+        swap = OIS(settle_dt, str(years) + "Y", SwapTypes.PAY, rates[i],
+                   FrequencyTypes.ANNUAL, DayCountTypes.ACT_360)
+        swaps.append(swap)
+
+    depos = [IborDeposit(value_dt, settle_dt, 0.0175, DayCountTypes.ACT_360)]
+
+    return depos, swaps
+
+
+def joint_instruments(ois_depos, ois_swaps, depos, fras, swaps):
+    """ The OIS curve discounts the Ibor FRAs and swaps. """
+
+    instruments = [(depo, "OIS", None) for depo in ois_depos]
+    instruments += [(swap, "OIS", None) for swap in ois_swaps]
+    instruments += [(depo, "LIBOR", None) for depo in depos]
+    instruments += [(fra, "LIBOR", "OIS") for fra in fras]
+    instruments += [(swap, "LIBOR", "OIS") for swap in swaps]
+    return instruments
+
+
+def test_global_solve_refits_instruments():
+    depos, fras, swaps = build_ibor_instruments()
+
+    for interp_type in InterpTypes:
+
+        curve = IborSingleCurve(value_dt, list(depos), fras, swaps,
+                                interp_type,
+                                build_type=CurveBuildTypes.GLOBAL_SOLVE)
+
+        for depo in depos:
+            v = depo.value(value_dt, curve) / depo._notional
+            assert abs(v - 1.0) < 1e-12
+
+        for fra in fras:
+            assert abs(fra.value(value_dt, curve) / fra._notional) < 1e-12
+
+        for swap in swaps:
+            v = swap.value(value_dt, curve, curve, None)
+            assert abs(v / swap._fixed_leg._notional) < 1e-12
+
+    # With a local scheme it is the same curve as the bootstrap
+    bootstrap = IborSingleCurve(value_dt, list(depos), fras, swaps,
+                                InterpTypes.FLAT_FWD_RATES)
+    curve = IborSingleCurve(value_dt, list(depos), fras, swaps,
+                            InterpTypes.FLAT_FWD_RATES,
+                            build_type=CurveBuildTypes.GLOBAL_SOLVE)
+    assert np.max(np.abs(curve._dfs - bootstrap._dfs)) < 1e-10
+
+
+def test_joint_solve_matches_sequential_build():
+    ois_depos, ois_swaps = build_ois_instruments()
+    depos, fras, swaps = build_ibor_instruments()
+
+    ois_curve = OISCurve(value_dt, list(ois_depos), [], ois_swaps)
+    ibor_curve = IborDualCurve(value_dt, ois_curve, list(depos), fras,
+                               swaps)
+
+    global_ibor_curve = IborDualCurve(value_dt, ois_curve, list(depos),
+                                      fras, swaps,
+                                      build_type=CurveBuildTypes.GLOBAL_SOLVE)
+
+    assert np.max(np.abs(global_ibor_curve._dfs - ibor_curve._dfs)) < 1e-10
+
+    solver = GlobalCurveSolver(value_dt,
+                               joint_instruments(ois_depos, ois_swaps,
+                                                 depos, fras, swaps))
+
+    assert np.max(np.abs(solver.curve("OIS")._dfs - ois_curve._dfs)) < 1e-10
+    assert np.max(np.abs(solver.curve("LIBOR")._dfs -
+                         ibor_curve._dfs)) < 1e-10
+
+
+def test_jacobian_and_quote_deltas():
+    ois_depos, ois_swaps = build_ois_instruments()
+    depos, fras, swaps = build_ibor_instruments()
+    interp_type = {"OIS": InterpTypes.FLAT_FWD_RATES,
+                   "LIBOR": InterpTypes.NATCUBIC_ZERO_RATES}
+
+    instruments = joint_instruments(ois_depos, ois_swaps, depos, fras, swaps)
+    solver = GlobalCurveSolver(value_dt, instruments, interp_type)
+    ois_curve = solver.curve("OIS")
+    ibor_curve = solver.curve("LIBOR")
+
+    def instrument_values():
+        values = [depo.value(value_dt, ois_curve) / depo._notional - 1.0
+                  for depo in ois_depos]
+        values += [swap.value(value_dt, ois_curve) /
+                   swap._fixed_leg._notional for swap in ois_swaps]
+        values += [depo.value(value_dt, ibor_curve) / depo._notional - 1.0
+                   for depo in depos]
+        values += [fra.value(value_dt, ois_curve, ibor_curve) /
+                   fra._notional for fra in fras]
+        values += [swap.value(value_dt, ois_curve, ibor_curve) /
+                   swap._fixed_leg._notional for swap in swaps]
+        return np.array(values)
+
+    jac = solver.jacobian()
+    assert jac.shape == (16, 16)
+
+    h = 1e-6
+    column = 0
+    for curve in [ois_curve, ibor_curve]:
+        for j in range(1, len(curve._dfs)):
+            df = curve._dfs[j]
+            curve._dfs[j] = df + h
+            curve._interpolator.fit(curve._times, curve._dfs)
+            values_up = instrument_values()
+            curve._dfs[j] = df - h
+            curve._interpolator.fit(curve._times, curve._dfs)
+            values_down = instrument_values()
+            curve._dfs[j] = df
+            curve._interpolator.fit(curve._times, curve._dfs)
+            fd = (values_up - values_down) / (2.0 * h)
+            assert np.max(np.abs(jac[:, column] - fd)) < 1e-6
+            column += 1
+
+    # The quote deltas of a trade agree with bumping a quote and solving
+    trade = IborSwap(settle_dt, "7Y", SwapTypes.PAY, 0.03,
+                     FrequencyTypes.SEMI_ANNUAL, DayCountTypes.ACT_365F,
+                     float_freq_type=FrequencyTypes.QUARTERLY,
+                     float_dc_type=DayCountTypes.ACT_360)
+
+    discount_grad, index_grad = \
+        trade._float_leg.df_gradient(value_dt, ois_curve, ibor_curve, None)
+    discount_grad += trade._fixed_leg.df_gradient(value_dt, ois_curve)
+
+    deltas = solver.quote_deltas({"OIS": discount_grad,
+                                  "LIBOR": index_grad})
+    value = trade.value(value_dt, ois_curve, ibor_curve)
+
+    bumped_ois_swaps = build_ois_instruments(3, 0.0001)[1]
+    bumped = GlobalCurveSolver(value_dt,
+                               joint_instruments(ois_depos, bumped_ois_swaps,
+                                                 depos, fras, swaps),
+                               interp_type)
+    change = trade.value(value_dt, bumped.curve("OIS"),
+                         bumped.curve("LIBOR")) - value
+    assert abs(deltas[4] - change) < 1e-3 * abs(change) + 0.01
+
+    bumped_depos, bumped_fras, bumped_swaps = build_ibor_instruments(8, 0.0001)
+    bumped = GlobalCurveSolver(value_dt,
+                               joint_instruments(ois_depos, ois_swaps,
+                                                 bumped_depos, bumped_fras,
+                                                 bumped_swaps),
+                               interp_type)
+    change = trade.value(value_dt, bumped.curve("OIS"),
+                         bumped.curve("LIBOR")) - value
+    assert abs(deltas[14] - change) < 1e-3 * abs(change)
@@ -0,0 +1,57 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import pytest
+
+from financepy.utils.date import Date
+from financepy.utils.error import FinError
+from financepy.utils.global_types import ArgumentCheckTypes
+from financepy.utils.helpers import check_argument_types
+from financepy.utils.helpers import set_argument_check_type
+from financepy.utils.helpers import get_argument_check_type
+
+
+class FinTestProduct():
+
+    def __init__(self,
+                 start_dt: Date,
+                 rate: float,
+                 num_flows: int = 1):
+
+        check_argument_types(self.__init__, locals())
+        self._start_dt = start_dt
+        self._rate = rate
+
+
+def test_argument_check_types():
+    start_dt = Date(1, 1, 2020)
+    assert get_argument_check_type() == ArgumentCheckTypes.STRICT
+
+    try:
+        FinTestProduct(start_dt, 0.05)
+        FinTestProduct(start_dt, 1, 4)
+
+        with pytest.raises(FinError):
+            FinTestProduct(start_dt, "0.05")
+
+        with pytest.raises(FinError):
+            FinTestProduct(start_dt, 0.05, 4.0)
+
+        set_argument_check_type(ArgumentCheckTypes.FIRST_CALL)
+        FinTestProduct(start_dt, 0.05)
+        # The constructor has already been checked so this is not caught
+        FinTestProduct(start_dt, "0.05")
+
+        set_argument_check_type(ArgumentCheckTypes.FIRST_CALL)
+        with pytest.raises(FinError):
+            FinTestProduct(start_dt, "0.05")
+
+        set_argument_check_type(ArgumentCheckTypes.OFF)
+        FinTestProduct(start_dt, "0.05")
+
+        with pytest.raises(FinError):
+            set_argument_check_type("OFF")
+
+    finally:
+        set_argument_check_type(ArgumentCheckTypes.STRICT)
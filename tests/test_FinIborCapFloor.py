@@ -90,7 +90,7 @@ def test_cap():
     assert round(cvalue3, 4) == 28889.2445
     assert round(cvalue4, 4) == 28889.2445
     assert round(cvalue5, 4) == 82406.6040
-    assert round(cvalue6, 4) == 28889.3760
+    assert round(cvalue6, 4) == 28889.3761
 
     k = 0.05
     capfloor = IborCapFloor(start_dt, maturity_dt, capFloorType, k)
@@ -150,7 +150,7 @@ def test_floor():
     cvalue5 = capfloor.value(value_dt, libor_curve, model5)
     cvalue6 = capfloor.value(value_dt, libor_curve, model6)
     assert round(cvalue1, 4) == 2089.3995
-    assert round(cvalue2, 4) == 2583.5715
+    assert round(cvalue2, 4) == 2583.5714
     assert round(cvalue3, 4) == 701.3705
     assert round(cvalue4, 4) == 754.2243
     assert round(cvalue5, 4) == 62244.0904
@@ -164,8 +164,8 @@ def test_floor():
     cvalue4 = capfloor.value(value_dt, libor_curve, model4)
     cvalue5 = capfloor.value(value_dt, libor_curve, model5)
     cvalue6 = capfloor.value(value_dt, libor_curve, model6)
-    assert round(cvalue1, 4) == 29261.2132
-    assert round(cvalue2, 4) == 29279.3794
+    assert round(cvalue1, 4) == 29261.2131
+    assert round(cvalue2, 4) == 29279.3793
     assert round(cvalue3, 4) == 29258.1231
     assert round(cvalue4, 4) == 29258.1395
     assert round(cvalue5, 4) == 81255.1368
@@ -8,6 +8,7 @@ from financepy.market.curves.interpolator import InterpTypes
 from financepy.products.rates.ibor_swap import IborSwap
 from financepy.products.rates.ibor_deposit import IborDeposit
 from financepy.products.rates.ibor_future import IborFuture
+from financepy.products.rates.ibor_fra import IborFRA
 from financepy.products.rates.ibor_single_curve import IborSingleCurve
 from financepy.utils.frequency import FrequencyTypes
 from financepy.utils.day_count import DayCountTypes
@@ -137,3 +138,46 @@ def test_bloombergPricingExample():
         settle_dt, libor_curve), 4) == 53714.5507
     assert round(swaps[0]._float_leg.value(
         settle_dt, libor_curve, libor_curve, None), 4) == 53714.5507
+
+
+def test_bootstrap_refits_instruments():
+    value_dt = Date(6, 6, 2018)
+    settle_dt = value_dt.add_weekdays(2)
+
+    depos = [IborDeposit(settle_dt, "1M", 0.0200, DayCountTypes.ACT_360),
+             IborDeposit(settle_dt, "3M", 0.0210, DayCountTypes.ACT_360)]
+
+    fras = [IborFRA(settle_dt.add_months(3), "3M", 0.0220,
+                    DayCountTypes.ACT_360),
+            IborFRA(settle_dt.add_months(6), "3M", 0.0230,
+                    DayCountTypes.ACT_360)]
+
+    swaps = []
+    for years, swap_rate in [(1, 0.024), (2, 0.026), (5, 0.029),
+                             (10, 0.031), (20, 0.032)]:
+        swap = IborSwap(settle_dt, str(years) + "Y", SwapTypes.RECEIVE,
+                        swap_rate, FrequencyTypes.ANNUAL,
+                        DayCountTypes.ACT_365F,
+                        float_freq_type=FrequencyTypes.QUARTERLY,
+                        float_dc_type=DayCountTypes.ACT_360)
+        swaps.append(swap)
+
+    for interp_type in [InterpTypes.FLAT_FWD_RATES,
+                        InterpTypes.LINEAR_ZERO_RATES,
+                        InterpTypes.LINEAR_FWD_RATES]:
+
+        curve = IborSingleCurve(value_dt, list(depos), fras, swaps,
+                                interp_type)
+
+        for fra in fras:
+            assert abs(fra.value(value_dt, curve) / fra._notional) < 1e-10
+
+        for swap in swaps:
+            v = swap.value(value_dt, curve, curve, None)
+            assert abs(v / swap._fixed_leg._notional) < 1e-10
+
+    # The spline schemes move the earlier pillars so only the last refits
+    curve = IborSingleCurve(value_dt, list(depos), fras, swaps,
+                            InterpTypes.PCHIP_LOG_DISCOUNT)
+    v = swaps[-1].value(value_dt, curve, curve, None)
+    assert abs(v / swaps[-1]._fixed_leg._notional) < 1e-10
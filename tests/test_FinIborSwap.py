@@ -18,6 +18,7 @@ from financepy.products.rates.ibor_swap import IborSwap
 from financepy.products.rates.ibor_single_curve import IborSingleCurve
 from financepy.utils.math import ONE_MILLION
 import numpy as np
+from copy import deepcopy
 
 
 def test_LiborSwap():
@@ -112,3 +113,29 @@ def test_dp_example():
 
     # This is essentially zero
     assert round(v * 1000, 4) == 785300.0566
+
+
+def test_bucketed_delta():
+    value_dt = Date(30, 11, 2018)
+    settle_dt = value_dt.add_days(2)
+    libor_curve = buildIborSingleCurve(value_dt)
+
+    swap = IborSwap(settle_dt, "7Y", SwapTypes.PAY, 0.03,
+                    FrequencyTypes.ANNUAL, DayCountTypes.THIRTY_E_360,
+                    ONE_MILLION)
+
+    deltas = swap.bucketed_delta(settle_dt, libor_curve)
+    v0 = swap.value(settle_dt, libor_curve)
+
+    # Compare with bumping each pillar zero rate with the others held fixed
+    bump = 1e-6
+    for j in range(1, len(libor_curve._dfs)):
+        bumped_curve = deepcopy(libor_curve)
+        bumped_curve._dfs[j] *= np.exp(-bump * bumped_curve._times[j])
+        bumped_curve._interpolator.fit(bumped_curve._times,
+                                       bumped_curve._dfs)
+        v1 = swap.value(settle_dt, bumped_curve)
+        fd = (v1 - v0) * 0.0001 / bump
+        assert abs(deltas[j] - fd) < 1e-5 * abs(fd) + 1e-6
+
+    assert round(np.sum(deltas), 4) == 756.0547
@@ -0,0 +1,122 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+
+from financepy.utils.global_types import SwapTypes
+from financepy.utils.date import Date
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.products.rates.ibor_deposit import IborDeposit
+from financepy.products.rates.ibor_swap import IborSwap
+from financepy.products.rates.ibor_single_curve import IborSingleCurve
+from financepy.products.rates.ibor_swap_portfolio import IborSwapPortfolio
+
+
+value_dt = Date(6, 6, 2018)
+settle_dt = value_dt.add_weekdays(2)
+
+
+def build_curve():
+
+    depos = [IborDeposit(value_dt, settle_dt, 0.0195, DayCountTypes.ACT_360),
+             IborDeposit(settle_dt, "6M", 0.0210, DayCountTypes.ACT_360)]
+
+    swaps = []
+    for years, rate in [(1, 0.022), (2, 0.024), (5, 0.027), (10, 0.030),
+                        (20, 0.032)]:
+        swap = IborSwap(settle_dt, str(years) + "Y", SwapTypes.PAY, rate,
+                        FrequencyTypes.SEMI_ANNUAL, DayCountTypes.ACT_365F)
+        swaps.append(swap)
+
+    return IborSingleCurve(value_dt, depos, [], swaps,
+                           InterpTypes.FLAT_FWD_RATES)
+
+
+def build_trades():
+
+    trades = []
+    fixings = []
+
+    # A mix of new, forward starting and seasoned trades
+    starts = [settle_dt, settle_dt.add_months(9), value_dt.add_days(-200),
+              value_dt.add_days(-1500)]
+
+    for i in range(24):
+        start_dt = starts[i % 4]
+        leg_type = SwapTypes.PAY if i % 3 else SwapTypes.RECEIVE
+        swap = IborSwap(start_dt, str(2 + i % 7) + "Y", leg_type,
+                        0.02 + 0.0005 * i, FrequencyTypes.SEMI_ANNUAL,
+                        DayCountTypes.THIRTY_E_360,
+                        notional=1e6 * (1 + i),
+                        float_spread=0.0001 * (i % 5),
+                        float_freq_type=FrequencyTypes.QUARTERLY,
+                        float_dc_type=DayCountTypes.ACT_360)
+        trades.append(swap)
+
+        if start_dt < value_dt:
+            fixings.append(0.015 + 0.0001 * i)
+        else:
+            fixings.append(np.nan)
+
+    return trades, fixings
+
+
+def test_portfolio_matches_trades():
+
+    curve = build_curve()
+    index_curve = DiscountCurveFlat(value_dt, 0.025)
+    trades, fixings = build_trades()
+
+    portfolio = IborSwapPortfolio(trades)
+    assert len(portfolio) == len(trades)
+
+    for index in [None, index_curve]:
+
+        values, pv01s, swap_rates = portfolio.valuation(value_dt, curve,
+                                                        index, fixings)
+
+        assert np.allclose(values, portfolio.value(value_dt, curve, index,
+                                                   fixings), atol=1e-8)
+        assert np.allclose(pv01s, portfolio.pv01(value_dt, curve),
+                           atol=1e-14)
+
+        for i, swap in enumerate(trades):
+
+            fixing = None if np.isnan(fixings[i]) else fixings[i]
+
+            v = swap.value(value_dt, curve, index, fixing)
+            assert abs(values[i] - v) < 1e-6
+
+            assert abs(pv01s[i] - swap.pv01(value_dt, curve)) < 1e-12
+
+            if pv01s[i] == 0.0:
+                assert np.isnan(swap_rates[i])
+                continue
+
+            # The swap rate of IborSwap assumes the fixed leg is paid
+            if swap._fixed_leg._leg_type == SwapTypes.PAY or index is None:
+                r = swap.swap_rate(value_dt, curve, index, fixing)
+                assert abs(swap_rates[i] - r) < 1e-12
+
+
+def test_portfolio_matured_trades():
+
+    curve = build_curve()
+    trades, fixings = build_trades()
+
+    portfolio = IborSwapPortfolio(trades)
+    late_dt = value_dt.add_years(5)
+    values, pv01s, swap_rates = portfolio.valuation(late_dt, curve, None,
+                                                    np.full(len(trades),
+                                                            0.02))
+
+    matured = np.array([swap._maturity_dt <= late_dt for swap in trades])
+    assert np.any(matured)
+    assert np.all(values[matured] == 0.0)
+    assert np.all(pv01s[matured] == 0.0)
+    assert np.all(np.isnan(swap_rates[matured]))
+    assert np.all(np.isfinite(swap_rates[~matured]))
@@ -3,6 +3,7 @@
 ###############################################################################
 
 from financepy.market.curves.interpolator import Interpolator, InterpTypes
+from financepy.market.curves.interpolator import _uinterpolate
 import numpy as np
 import math
 
@@ -232,3 +233,21 @@ def test_PCHIP_LOG_DISCOUNT():
     y_int = interpolator.interpolate(x)
     assert round(x, 4) == 6.8421
     assert round(y_int, 4) == 0.5551
+
+
+def test_vector_matches_scalar():
+    sorted_x = np.linspace(0.0, 15.0, 1001)
+    unsorted_x = np.random.default_rng(0).permutation(sorted_x)
+
+    for interp_type in [InterpTypes.FLAT_FWD_RATES,
+                        InterpTypes.LINEAR_ZERO_RATES,
+                        InterpTypes.LINEAR_FWD_RATES]:
+
+        interpolator = Interpolator(interp_type)
+        interpolator.fit(xValues, yValues)
+
+        for x in [sorted_x, unsorted_x]:
+            y_vec = interpolator.interpolate(x)
+            y_scalar = [_uinterpolate(xi, xValues, yValues, interp_type.value)
+                        for xi in x]
+            assert np.max(np.abs(y_vec - y_scalar)) < 1e-12
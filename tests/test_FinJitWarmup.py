@@ -0,0 +1,43 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import os
+import sys
+import json
+import subprocess
+
+
+def run_warmup(cache_dir):
+    # Run in a new process so this session keeps its own Numba cache
+    code = ("import financepy\n"
+            "import json\n"
+            "results = financepy.warmup(%r, ['financepy.models.sabr', "
+            "'financepy.models.gauss_copula_lhp'], False)\n"
+            "print(json.dumps(dict((r[1], r[2]) for r in results)))\n"
+            % cache_dir)
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root_dir + os.pathsep + env.get("PYTHONPATH", "")
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_warmup(tmp_path):
+    cache_dir = str(tmp_path / "numba_cache")
+
+    statuses = run_warmup(cache_dir)
+    assert statuses["vol_function_sabr"] == "COMPILED"
+    # This has no declared signature but is compiled for its callers
+    assert statuses["_x"] == "COMPILED"
+    # Kernels without declared signatures are compiled by a sample call
+    assert statuses["tr_surv_prob_lhp"] == "COMPILED"
+    assert len(os.listdir(cache_dir)) > 0
+
+    # A new process loads the kernels from the warm cache
+    statuses = run_warmup(cache_dir)
+    assert statuses["vol_function_sabr"] == "LOADED"
+    assert statuses["vol_function_sabr_beta_one"] == "LOADED"
+    assert statuses["tr_surv_prob_lhp"] == "LOADED"
@@ -0,0 +1,81 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import os
+import sys
+import importlib
+import subprocess
+
+import pytest
+
+import financepy.products.rates as rates
+import financepy.utils as utils
+
+
+lazy_packages = ['financepy.utils',
+                 'financepy.market.curves',
+                 'financepy.market.volatility',
+                 'financepy.products.bonds',
+                 'financepy.products.credit',
+                 'financepy.products.equity',
+                 'financepy.products.fx',
+                 'financepy.products.inflation',
+                 'financepy.products.rates']
+
+
+def test_lazy_attribute_access():
+    from financepy.products.rates.ibor_swap import IborSwap
+    from financepy.utils.date import Date
+
+    assert rates.IborSwap is IborSwap
+    assert utils.Date is Date
+    assert "IborSwaption" in dir(rates)
+
+    with pytest.raises(AttributeError):
+        rates.NotAProduct
+
+
+def test_lazy_import_of_modules():
+    # A fresh process is needed to see which modules get imported
+    code = ("import sys\n"
+            "from financepy.utils import Date\n"
+            "from financepy.products.rates import IborDeposit\n"
+            "print(sorted(m for m in sys.modules if 'financepy' in m))\n")
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root_dir + os.pathsep + env.get("PYTHONPATH", "")
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True)
+    modules = output.stdout.strip().splitlines()[-1]
+
+    assert "financepy.products.rates.ibor_deposit" in modules
+    assert "financepy.products.rates.ibor_swaption" not in modules
+    assert "financepy.products.rates.bermudan_swaption" not in modules
+    assert "financepy.utils.stats" not in modules
+    assert "financepy.market.curves.discount_curve" not in modules
+
+
+
+def test_lazy_import_tables():
+    # The name tables of the packages must match their modules
+    for package_name in lazy_packages:
+        package = importlib.import_module(package_name)
+        listed_names = set()
+
+        for submodule, names in package._submodules.items():
+            module = importlib.import_module(package_name + "." + submodule)
+            for name in names:
+                assert name not in listed_names, name
+                assert hasattr(module, name), name
+                listed_names.add(name)
+
+        # Every class and function of the library found in a module is listed
+        for submodule in package._submodules:
+            module = importlib.import_module(package_name + "." + submodule)
+            for name, value in vars(module).items():
+                value_module = getattr(value, "__module__", None) or ""
+                if not name.startswith("_") and \
+                        value_module.startswith("financepy"):
+                    assert name in listed_names, package_name + "." + name
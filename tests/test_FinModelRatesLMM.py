@@ -3,11 +3,23 @@
 ##############################################################################
 
 from financepy.models.lmm_mc import lmm_sticky_caplet_pricer
+from financepy.models.lmm_mc import lmm_sticky_caplet_pricer_parallel
+from financepy.models.lmm_mc import lmm_ratchet_caplet_pricer_parallel
+from financepy.models.lmm_mc import lmm_cap_flr_pricer
+from financepy.models.lmm_mc import lmm_cap_flr_pricer_parallel
+from financepy.models.lmm_mc import lmm_swaption_pricer
+from financepy.models.lmm_mc import lmm_swaption_pricer_parallel
+from financepy.models.lmm_mc import lmm_simulate_fwds_mf_parallel
+from financepy.models.lmm_mc import lmm_simulate_fwds_1f_parallel
 from financepy.models.lmm_mc import lmm_ratchet_caplet_pricer
 from financepy.models.lmm_mc import lmm_simulate_fwds_mf
 from financepy.models.lmm_mc import lmm_simulate_fwds_1f
 from financepy.utils.helpers import check_vector_differences
 import numpy as np
+import json
+import os
+import sys
+import subprocess
 
 
 def test_HullBookExamples(capsys):
@@ -126,3 +138,107 @@ def test_HullBookExamples(capsys):
 
     assert captured.out == ""
     assert captured.err == ""
+
+
+def test_parallel_matches_serial():
+    numFwds = 11
+    taus = np.ones(numFwds)
+    fwd0 = np.full(numFwds, 0.05127)
+    num_paths = 20000
+    seed = 438
+
+    gammas = np.array([0.00, 0.1550, 0.2063674, 0.1720986, 0.1721993,
+                       0.1524579, 0.1414779, 0.1297711, 0.1381053,
+                       0.135955, 0.1339842])
+
+    # With Sobol numbers the simulated forwards are the same. Only forwards
+    # which have not yet reset are simulated.
+    live = np.triu(np.ones((numFwds, numFwds), dtype=bool))
+    fwds = lmm_simulate_fwds_1f(numFwds, num_paths, 0, fwd0, gammas,
+                                taus, 1, seed)
+    fwdsP = lmm_simulate_fwds_1f_parallel(numFwds, num_paths, 0, fwd0, gammas,
+                                          taus, 1, seed)
+    assert np.max(np.abs(fwds - fwdsP)[:, live]) < 1e-14
+
+    lambdas = gammas.reshape(1, numFwds)
+    fwdsMF = lmm_simulate_fwds_mf(numFwds, 1, num_paths, 0, fwd0, lambdas,
+                                  taus, 1, seed)
+    fwdsMFP = lmm_simulate_fwds_mf_parallel(numFwds, 1, num_paths, 0, fwd0,
+                                            lambdas, taus, 1, seed)
+    assert np.max(np.abs(fwdsMF - fwdsMFP)[:, live]) < 1e-14
+
+    spread = 0.0025
+    v = lmm_ratchet_caplet_pricer(spread, numFwds, num_paths, fwd0, fwds, taus)
+    vP = lmm_ratchet_caplet_pricer_parallel(spread, numFwds, num_paths, fwd0,
+                                            fwds, taus)
+    assert np.max(np.abs(v - vP)) < 1e-14
+
+    v = lmm_sticky_caplet_pricer(spread, numFwds, num_paths, fwd0, fwds, taus)
+    vP = lmm_sticky_caplet_pricer_parallel(spread, numFwds, num_paths, fwd0,
+                                           fwds, taus)
+    assert np.max(np.abs(v - vP)) < 1e-14
+
+    v = lmm_cap_flr_pricer(numFwds, num_paths, 0.05, fwd0, fwds, taus, 1)
+    vP = lmm_cap_flr_pricer_parallel(numFwds, num_paths, 0.05, fwd0, fwds,
+                                     taus, 1)
+    assert np.max(np.abs(v - vP)) < 1e-14
+
+    v = lmm_swaption_pricer(0.05, 2, 6, num_paths, fwd0, fwds, taus, 1)
+    vP = lmm_swaption_pricer_parallel(0.05, 2, 6, num_paths, fwd0, fwds,
+                                      taus, 1)
+    assert abs(v - vP) < 1e-14
+
+
+def test_cap_flr_pricer_values():
+    """ The serial cap and floor pricer discounts each caplet with the spot
+    numeraire. At the money the caplets are close to the Black values of
+    0.0036125, 0.0048575, 0.0056565 and 0.0062102. The first caplet has
+    already reset and has no value. """
+
+    numFwds = 5
+    num_paths = 2000
+    taus = np.ones(numFwds)
+    fwd0 = np.full(numFwds, 0.05)
+    gammas = np.full(numFwds, 0.20)
+
+    fwds = lmm_simulate_fwds_1f(numFwds, num_paths, 0, fwd0, gammas,
+                                taus, 1, 42)
+
+    caplets = lmm_cap_flr_pricer(numFwds, num_paths, 0.05, fwd0, fwds,
+                                 taus, 1)
+    floorlets = lmm_cap_flr_pricer(numFwds, num_paths, 0.05, fwd0, fwds,
+                                   taus, 0)
+
+    assert len(caplets) == numFwds
+    assert np.max(np.abs(caplets - [0.0, 0.0035889281, 0.0047934476,
+                                    0.0055703645, 0.0061127193])) < 1e-9
+    assert np.max(np.abs(floorlets - [0.0, 0.0036021781, 0.0048284924,
+                                      0.0056251981, 0.0061942013])) < 1e-9
+
+
+def run_parallel_simulation(num_threads):
+    # Run in a new process as the number of threads is fixed at start up
+    code = ("import json\n"
+            "import numpy as np\n"
+            "from financepy.models.lmm_mc import "
+            "lmm_simulate_fwds_1f_parallel\n"
+            "fwd0 = np.full(11, 0.05)\n"
+            "gammas = np.full(11, 0.15)\n"
+            "fwds = lmm_simulate_fwds_1f_parallel(11, 1001, 0, fwd0, gammas, "
+            "np.ones(11), 0, 1234)\n"
+            "print(json.dumps(fwds[:, -1, -1].tolist()))\n")
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root_dir + os.pathsep + env.get("PYTHONPATH", "")
+    env["NUMBA_NUM_THREADS"] = str(num_threads)
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_parallel_thread_independent():
+    fwds1 = run_parallel_simulation(1)
+    fwds4 = run_parallel_simulation(4)
+    assert len(fwds1) == 1000
+    assert fwds1 == fwds4
@@ -8,7 +8,7 @@ from financepy.products.rates.swap_fixed_leg import SwapFixedLeg
 from financepy.utils.date import Date
 from financepy.utils.calendar import CalendarTypes
 from financepy.utils.frequency import FrequencyTypes
-from financepy.utils.day_count import DayCountTypes
+from financepy.utils.day_count import DayCount, DayCountTypes
 from financepy.utils.calendar import DateGenRuleTypes
 from financepy.utils.calendar import BusDayAdjustTypes
 from financepy.utils.global_types import SwapTypes
@@ -159,3 +159,61 @@ def test_FinFloatOISLeg():
     v = swapFloatLeg.value(effective_dt, libor_curve, libor_curve,
                            firstFixing)
     assert round(v, 4) == -2038364.5665
+
+
+def test_leg_values_match_flow_by_flow():
+
+    effective_dt = Date(28, 10, 2020)
+    value_dt = Date(15, 3, 2022)
+    maturity_dt = Date(28, 10, 2025)
+    notional = 10.0 * ONE_MILLION
+
+    fixed_leg = SwapFixedLeg(effective_dt, maturity_dt, SwapTypes.RECEIVE,
+                             0.02, FrequencyTypes.SEMI_ANNUAL,
+                             DayCountTypes.ACT_360, notional, 1.0, 2,
+                             CalendarTypes.TARGET)
+
+    float_leg = SwapFloatLeg(effective_dt, maturity_dt, SwapTypes.PAY,
+                             0.001, FrequencyTypes.QUARTERLY,
+                             DayCountTypes.ACT_360, notional, 0.0, 2,
+                             CalendarTypes.TARGET)
+
+    discount_curve = DiscountCurveFlat(value_dt, 0.03)
+    index_curve = DiscountCurveFlat(value_dt, 0.04)
+    df_value = discount_curve.df(value_dt)
+
+    pv = 0.0
+    for pmnt_dt, pmnt in zip(fixed_leg._payment_dts, fixed_leg._payments):
+        if pmnt_dt > value_dt:
+            pv += pmnt * discount_curve.df(pmnt_dt) / df_value
+    pv += notional * discount_curve.df(fixed_leg._payment_dts[-1]) / df_value
+
+    v = fixed_leg.value(value_dt, discount_curve)
+    assert abs(v - pv) < 1e-6
+
+    payment_pvs, cumulative_pvs = fixed_leg._payment_pvs()
+    assert abs(cumulative_pvs[-1] - v) < 1e-6
+
+    index_day_count = DayCount(index_curve._dc_type)
+    first_fixing = 0.01
+    pv = 0.0
+    for i, pmnt_dt in enumerate(float_leg._payment_dts):
+        if pmnt_dt > value_dt:
+            start_dt = float_leg._startAccruedDates[i]
+            end_dt = float_leg._endAccruedDates[i]
+            if first_fixing is not None:
+                rate = first_fixing
+                first_fixing = None
+            else:
+                alpha = index_day_count.year_frac(start_dt, end_dt)[0]
+                rate = (index_curve.df(start_dt) /
+                        index_curve.df(end_dt) - 1.0) / alpha
+            pmnt = (rate + 0.001) * float_leg._year_fracs[i] * notional
+            pv -= pmnt * discount_curve.df(pmnt_dt) / df_value
+
+    v = float_leg.value(value_dt, discount_curve, index_curve, 0.01)
+    assert abs(v - pv) < 1e-6
+    assert float_leg._rates[0] == 0.0
+
+    payment_pvs, cumulative_pvs = float_leg._payment_pvs()
+    assert abs(cumulative_pvs[-1] + v) < 1e-6